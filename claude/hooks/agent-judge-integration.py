@@ -50,6 +50,12 @@ except ImportError:
     def get_full_timestamp() -> str:
         return datetime.now().strftime("%Y-%m-%d %H:%M")
 
+# Input-file hash manifest (re-read todo.md/HANDOFF.md every time if unavailable)
+try:
+    import change_cache
+except ImportError:
+    change_cache = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -115,17 +121,9 @@ def save_evaluation_index(index: Dict) -> bool:
     return safe_write_file(index_path, json.dumps(index, indent=2, ensure_ascii=False))
 
 
-def collect_session_context() -> Dict:
-    """Collect context about the completed session"""
-    claude_dir = get_claude_dir()
-
-    context = {
-        "timestamp": get_full_timestamp(),
-        "todo_status": None,
-        "handoff_content": None,
-        "files_modified": [],
-        "complexity_estimate": "medium"
-    }
+def read_file_context(claude_dir: Path) -> Dict:
+    """Summarize todo.md and HANDOFF.md"""
+    context = {"todo_status": None, "handoff_content": None}
 
     # Check todo.md
     todo_file = claude_dir / "todo.md"
@@ -141,6 +139,37 @@ def collect_session_context() -> Dict:
     if handoff_file.exists():
         context["handoff_content"] = safe_read_file(handoff_file)[:1000]
 
+    return context
+
+
+def collect_file_context(claude_dir: Path) -> Dict:
+    """File-derived part of the session context (cached until the inputs change)"""
+    if change_cache is None:
+        return read_file_context(claude_dir)
+    cache = change_cache.ChangeCache(claude_dir, "agent-judge")
+    context = cache.get("files", [claude_dir / "todo.md", claude_dir / "HANDOFF.md"])
+    if context is None:
+        context = read_file_context(claude_dir)
+        cache.put("files", context)
+        cache.save()
+    return context
+
+
+def collect_session_context() -> Dict:
+    """Collect context about the completed session"""
+    claude_dir = get_claude_dir()
+
+    context = {
+        "timestamp": get_full_timestamp(),
+        "todo_status": None,
+        "handoff_content": None,
+        "files_modified": [],
+        "complexity_estimate": "medium"
+    }
+
+    # todo.md / HANDOFF.md summary (reused while both files are unchanged)
+    context.update(collect_file_context(claude_dir))
+
     # Get git status (if available)
     try:
         import subprocess
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Change Cache - 입력 파일 내용 해시 기반 hook 결과 재사용
+
+Stop 시점 hook들이 대부분 바뀌지 않은 todo.md/HANDOFF.md/knowledge 파일을 매번 다시 읽고
+같은 결과를 다시 계산/기록하던 것을 작은 매니페스트로 건너뜁니다.
+
+- 매니페스트: .claude/.change-cache/<hook>.json (hook별 파일 - 병렬 Stop hook끼리 잠금 경합 없음)
+- 항목: {name: {"key", "files": {경로: [mtime_ns, size, 해시] | null}, "value"}}
+- 검사: stat(mtime_ns, size)이 같으면 파일을 읽지 않고 일치로 봄,
+  stat이 달라도 내용 해시가 같으면 일치 (touch/동일 내용 재기록) - stat만 갱신
+- 해시: xxhash(xxh3_64)가 있으면 사용, 없으면 hashlib.blake2b (알고리즘이 바뀌면 전부 무효)
+- key: 파일 외 입력 (날짜 등) - 다르면 불일치
+- 없는 파일은 null로 기록하고, 계속 없으면 일치
+
+사용법:
+    cache = ChangeCache(claude_dir, "stop")
+    record = cache.get("context", [todo_file, context_file], key=today)
+    if record is None:
+        ...                                          # 계산 + context.md 기록
+        cache.put("context", timestamp, key=today, changed=[context_file])
+        cache.save()
+
+    python3 change_cache.py [hook]                   # 매니페스트 요약
+"""
+import json
+import os
+import sys
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+CACHE_DIR_NAME = ".change-cache"
+CACHE_VERSION = 1
+HASH_NAME = "xxh3_64" if xxhash is not None else "blake2b-128"
+READ_CHUNK = 1024 * 1024
+
+
+def _hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    import hashlib
+    return hashlib.blake2b(digest_size=16)
+
+
+def file_hash(path) -> str | None:
+    """파일 내용 해시 (읽을 수 없으면 None)"""
+    digest = _hasher()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def fingerprint(path, previous=None) -> list | None:
+    """[mtime_ns, size, 해시] (없으면 None) - stat이 previous와 같으면 해시를 다시 계산하지 않음"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+        return previous
+    content_hash = file_hash(path)
+    return None if content_hash is None else [st.st_mtime_ns, st.st_size, content_hash]
+
+
+def cache_path(claude_dir, hook: str) -> str:
+    return os.path.join(str(claude_dir), CACHE_DIR_NAME, f"{hook}.json")
+
+
+class ChangeCache:
+    """hook 하나의 매니페스트 (get → 불일치면 계산 → put → save)"""
+
+    def __init__(self, claude_dir, hook: str):
+        self.path = cache_path(claude_dir, hook)
+        self.entries = self._load()
+        self.dirty = False
+        self._seen = {}  # name → get()에서 계산한 현재 지문
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("hash") != HASH_NAME:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, name: str, paths, key=None):
+        """입력 파일과 key가 기록과 같으면 저장된 값, 아니면 None"""
+        entry = self.entries.get(name)
+        recorded = entry.get("files") if isinstance(entry, dict) else None
+        recorded = recorded if isinstance(recorded, dict) else {}
+        current = {path: fingerprint(path, recorded.get(path)) for path in map(str, paths)}
+        self._seen[name] = current
+        if not recorded or entry.get("key") != key or current.keys() != recorded.keys():
+            return None
+        for path, now in current.items():
+            before = recorded[path]
+            if (now is None) != (before is None) or (now is not None and now[2] != before[2]):
+                return None
+        if current != recorded:
+            # 내용은 같고 stat만 바뀜 (touch 등) - 다음 검사에서 다시 해시하지 않도록 갱신
+            entry["files"] = current
+            self.dirty = True
+        return entry.get("value")
+
+    def put(self, name: str, value, key=None, changed=()):
+        """get()에서 본 입력 지문으로 결과 기록 (changed: 이번 계산에서 hook이 직접 쓴 파일)
+
+        입력 지문을 계산 전에 잡아 두므로, 계산 중에 바뀐 입력은 다음 get()에서 불일치가 됩니다.
+        """
+        files = dict(self._seen.get(name, {}))
+        for path in map(str, changed):
+            files[path] = fingerprint(path)
+        self.entries[name] = {"key": key, "files": files, "value": value}
+        self.dirty = True
+
+    def save(self):
+        """바뀐 경우에만 매니페스트 저장 (잠금 + 원자적 교체)"""
+        if not self.dirty:
+            return
+        data = {"version": CACHE_VERSION, "hash": HASH_NAME, "entries": self.entries}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            from utils import write_json
+            write_json(self.path, data)
+        except ImportError:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError:
+            return
+        self.dirty = False
+
+
+def main():
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    cache_dir = os.path.join(project_dir, ".claude", CACHE_DIR_NAME)
+    hooks = sys.argv[1:]
+    if not hooks and os.path.isdir(cache_dir):
+        hooks = sorted(name[:-5] for name in os.listdir(cache_dir) if name.endswith(".json"))
+    print(f"hash: {HASH_NAME}")
+    for hook in hooks:
+        cache = ChangeCache(os.path.join(project_dir, ".claude"), hook)
+        for name, entry in sorted(cache.entries.items()):
+            fresh = cache.get(name, entry.get("files", {}), entry.get("key")) is not None
+            print(f"{hook}:{name}  {'fresh' if fresh else 'stale'}  files={len(entry.get('files', {}))}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ oh-my-opencode의 context-window-monitor + preemptive-compaction 패턴 적용:
 - 임계점 도달 전 사전 압축 권장
 - 중요 컨텍스트 보존 전략 제안
 - 세션 상태 스냅샷 생성
+- ORANGE 이상에서 knowledge 파일 자동 압축 (knowledge_compactor)
 
 트리거:
 - PreCompact: 압축 직전에 실행
@@ -20,6 +21,40 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# utils 모듈 로드 (없으면 기본 동작)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import read_cached_text, atomic_write, estimate_token_count, estimate_tokens_from_counts
+except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+
+    def atomic_write(path, content):
+        Path(path).write_text(content, encoding="utf-8")
+
+    def estimate_tokens_from_counts(total_chars, korean_chars):
+        # 한글 비중이 높으면 ~2자, 그 외 ~4자 = 1토큰
+        return total_chars // 2 if korean_chars > total_chars * 0.3 else total_chars // 4
+
+    def estimate_token_count(text):
+        korean_chars = len([c for c in text if '\uac00' <= c <= '\ud7a3'])
+        return estimate_tokens_from_counts(len(text), korean_chars)
+
+# knowledge 섹션 색인 (문자 수를 저장해 두므로 파일을 읽지 않고 추정)
+try:
+    import knowledge_index
+except ImportError:
+    knowledge_index = None
+
+# knowledge 압축 엔진 (없으면 권장 조치만 표시)
+try:
+    import knowledge_compactor
+except ImportError:
+    knowledge_compactor = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTEXT WINDOW THRESHOLDS
@@ -56,29 +91,6 @@ STATUS_MESSAGES = {
 # CONTEXT ESTIMATION
 # ═══════════════════════════════════════════════════════════════════════════
 
-def estimate_token_count(text: str) -> int:
-    """텍스트 토큰 수 추정 (대략적)
-
-    Claude 토큰 추정:
-    - 영어: ~4자 = 1토큰
-    - 한글: ~2자 = 1토큰 (UTF-8 특성)
-    - 코드: ~3.5자 = 1토큰
-    """
-    if not text:
-        return 0
-
-    # 한글 비율 체크
-    korean_chars = len([c for c in text if '\uac00' <= c <= '\ud7a3'])
-    total_chars = len(text)
-
-    if korean_chars > total_chars * 0.3:
-        # 한글 비중 높음
-        return total_chars // 2
-    else:
-        # 영어/코드 비중 높음
-        return total_chars // 4
-
-
 def get_knowledge_files_size(claude_dir: Path) -> dict:
     """knowledge 파일들의 토큰 사용량 추정"""
     knowledge_dir = claude_dir / "knowledge"
@@ -88,8 +100,10 @@ def get_knowledge_files_size(claude_dir: Path) -> dict:
     sizes = {}
     for file in knowledge_dir.glob("*.md"):
         try:
-            content = file.read_text(encoding="utf-8")
-            tokens = estimate_token_count(content)
+            if knowledge_index is not None:
+                tokens = estimate_tokens_from_counts(*knowledge_index.text_stats(file))
+            else:
+                tokens = estimate_token_count(read_cached_text(file))
             sizes[file.name] = tokens
         except Exception:
             pass
@@ -153,6 +167,29 @@ COMPACTION_SUGGESTIONS = {
 }
 
 
+# 자동 압축을 시작하는 상태 (CLAUDE_KNOWLEDGE_COMPACTION=0이면 끔)
+AUTO_COMPACTION_STATUSES = ("ORANGE", "RED", "CRITICAL")
+
+
+def compaction_budget(max_tokens: int, fixed_tokens: int = 0) -> int:
+    """압축 후 knowledge 파일 목표 토큰 (GREEN 임계값까지, CLAUDE.md 등 고정분 제외)"""
+    return max(int(max_tokens * THRESHOLDS["GREEN"] / 100) - fixed_tokens, 0)
+
+
+def run_compaction(claude_dir: Path, max_tokens: int, fixed_tokens: int) -> list[str]:
+    """knowledge 압축 실행 후 보고 줄 반환"""
+    if knowledge_compactor is None or os.environ.get("CLAUDE_KNOWLEDGE_COMPACTION") == "0":
+        return []
+    budget = compaction_budget(max_tokens, fixed_tokens)
+    results = knowledge_compactor.compact(claude_dir, budget, estimate_token_count)
+    if not results:
+        return []
+    lines = [f"\n🗜️ **knowledge 자동 압축** (목표 ~{budget:,} tokens, 원본은 knowledge/archive/):"]
+    for r in results:
+        lines.append(f"  - {r['file']}: ~{r['before']:,} → ~{r['after']:,} ({r['step']})")
+    return lines
+
+
 def generate_context_snapshot(claude_dir: Path, sizes: dict) -> str:
     """컨텍스트 스냅샷 생성"""
     snapshot = []
@@ -194,7 +231,7 @@ def main():
         claude_md = claude_dir.parent / "CLAUDE.md"
         if claude_md.exists():
             try:
-                content = claude_md.read_text(encoding="utf-8")
+                content = read_cached_text(claude_md)
                 sizes["CLAUDE.md"] = estimate_token_count(content)
                 total_tokens += sizes["CLAUDE.md"]
             except Exception:
@@ -228,9 +265,16 @@ def main():
                 for s in suggestions:
                     parts.append(f"  - {s}")
 
-            # ORANGE 이상에서 보존 우선순위 표시
-            if status in ["ORANGE", "RED", "CRITICAL"]:
+            # ORANGE 이상에서 보존 우선순위 표시 + 자동 압축
+            if status in AUTO_COMPACTION_STATUSES:
                 parts.append(PRESERVATION_PRIORITIES)
+                compacted = run_compaction(claude_dir, max_tokens, sizes.get("CLAUDE.md", 0))
+                if compacted:
+                    parts.extend(compacted)
+                    claude_md_tokens = sizes.get("CLAUDE.md")
+                    sizes = get_knowledge_files_size(claude_dir)
+                    if claude_md_tokens is not None:
+                        sizes["CLAUDE.md"] = claude_md_tokens
 
         # 스냅샷 생성 (RED 이상에서)
         if status in ["RED", "CRITICAL"]:
@@ -238,7 +282,7 @@ def main():
             snapshot_file = claude_dir / "knowledge" / "context-snapshot.md"
             try:
                 snapshot_file.parent.mkdir(parents=True, exist_ok=True)
-                snapshot_file.write_text(snapshot, encoding="utf-8")
+                atomic_write(snapshot_file, snapshot)
                 parts.append(f"\n📸 스냅샷 저장됨: {snapshot_file.name}")
             except Exception:
                 pass
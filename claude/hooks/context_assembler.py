@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Context Assembler - 토큰 예산 안에서 SessionStart 컨텍스트 조립
+
+session-start가 섹션마다 다른 글자 수 자르기([:1000] 등)로만 크기를 제한하던 것을
+하나의 토큰 예산으로 대체합니다.
+
+- 섹션마다 추정 토큰을 계산하고 우선순위(작을수록 먼저) 순으로 예산을 채움
+  (우선순위는 context-window-monitor의 PRESERVATION_PRIORITIES 순서)
+- 남은 예산보다 큰 섹션은 경계(헤더 → 빈 줄 → 줄)에서 잘라 넣고 생략 표시를 붙임
+  (잘라 낸 결과가 헤더 줄뿐이면 넣지 않음)
+- keep="tail"이면 첫 단위(제목)와 뒤쪽 단위를 남김 (최근 기록이 끝에 쌓이는 context.md)
+- required 섹션(철학, 환경 정보)은 항상 포함하고 예산에서 먼저 뺌
+- 출력은 섹션을 추가한 순서 그대로
+
+사용법:
+    assembler = ContextAssembler(budget_tokens=6000)
+    assembler.add("todo", "# 📋 미완료 작업\\n...", priority=1)
+    assembler.add("context", context_text, priority=5, keep="tail")
+    text = assembler.assemble()
+"""
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import estimate_token_count
+except ImportError:
+    def estimate_token_count(text):
+        return len(text) // 4
+
+DEFAULT_BUDGET = 6000
+SEPARATOR = "\n\n---\n\n"
+
+# 이보다 적게 남으면 잘라 넣지 않고 건너뜀
+MIN_SECTION_TOKENS = 40
+
+# 자를 경계 (굵은 단위부터) - (패턴, 다시 이을 때 구분자)
+BOUNDARIES = (
+    (re.compile(r"\n(?=#{1,3} )"), "\n"),
+    (re.compile(r"\n[ \t]*\n"), "\n\n"),
+    (re.compile(r"\n"), "\n"),
+)
+
+OMISSION_NOTE = "> ... (토큰 예산 초과로 ~{tokens:,} tokens 생략)"
+
+HEADER_LINE = re.compile(r"^\s*#{1,6}\s")
+
+# name, text, priority, keep ("head" | "tail"), required
+Section = namedtuple("Section", "name text priority keep required")
+
+
+def has_body(text: str) -> bool:
+    """헤더가 아닌 내용 줄이 하나라도 있는지"""
+    return any(line.strip() and not HEADER_LINE.match(line) for line in text.splitlines())
+
+
+def truncate(text: str, budget: int, estimate=estimate_token_count, keep: str = "head", level: int = 0) -> str:
+    """budget 토큰 안에 들어가도록 경계에서 자름 (들어갈 단위가 없거나 헤더만 남으면 "")"""
+    if estimate(text) <= budget:
+        return text
+    if budget <= 0 or level >= len(BOUNDARIES):
+        return ""
+    pattern, joiner = BOUNDARIES[level]
+    units = pattern.split(text)
+    if len(units) == 1:
+        return truncate(text, budget, estimate, keep, level + 1)
+
+    joiner_cost = estimate(joiner) or 0
+    order = list(range(len(units))) if keep == "head" else [0] + list(range(len(units) - 1, 0, -1))
+    chosen = {}
+    used = 0
+    for index in order:
+        cost = estimate(units[index]) + joiner_cost
+        if used + cost <= budget:
+            chosen[index] = units[index]
+            used += cost
+            continue
+        # 경계에 걸친 단위는 더 작은 경계에서 앞부분만 채움
+        # (keep="tail"은 제목 또는 가장 최근 단위일 때만 - 중간이 빠진 오래된 기록은 넣지 않음)
+        if keep == "head" or len(chosen) <= 1:
+            partial = truncate(units[index], budget - used - joiner_cost, estimate, "head", level + 1)
+            if has_body(partial):
+                chosen[index] = partial
+        break
+    result = joiner.join(chosen[i] for i in sorted(chosen))
+    return result if has_body(result) else ""
+
+
+class ContextAssembler:
+    """우선순위 기반 토큰 예산 조립기"""
+
+    def __init__(self, budget_tokens: int = DEFAULT_BUDGET, estimate=estimate_token_count,
+                 separator: str = SEPARATOR):
+        self.budget = budget_tokens
+        self.estimate = estimate
+        self.separator = separator
+        self.sections = []
+        self.report = []  # [(name, 원래 토큰, 넣은 토큰)]
+
+    def add(self, name: str, text: str, priority: int = 10, keep: str = "head", required: bool = False):
+        if text and text.strip():
+            self.sections.append(Section(name, text.strip(), priority, keep, required))
+
+    def assemble(self) -> str:
+        estimate = self.estimate
+        remaining = self.budget - estimate(self.separator) * max(len(self.sections) - 1, 0)
+        placed = {}
+
+        for index, section in enumerate(self.sections):
+            if section.required:
+                placed[index] = section.text
+                remaining -= estimate(section.text)
+
+        ranked = sorted((i for i, s in enumerate(self.sections) if not s.required),
+                        key=lambda i: (self.sections[i].priority, i))
+        for index in ranked:
+            section = self.sections[index]
+            cost = estimate(section.text)
+            if cost <= remaining:
+                placed[index] = section.text
+                remaining -= cost
+                continue
+            note_cost = estimate(OMISSION_NOTE.format(tokens=cost)) + 1
+            if remaining - note_cost < MIN_SECTION_TOKENS:
+                continue
+            partial = truncate(section.text, remaining - note_cost, estimate, section.keep)
+            if partial:
+                omitted = cost - estimate(partial)
+                placed[index] = partial + "\n" + OMISSION_NOTE.format(tokens=omitted)
+                remaining -= estimate(placed[index])
+
+        self.report = [(s.name, estimate(s.text), estimate(placed[i]) if i in placed else 0)
+                       for i, s in enumerate(self.sections)]
+        return self.separator.join(placed[i] for i in sorted(placed))
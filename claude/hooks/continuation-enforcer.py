@@ -21,6 +21,13 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import todo_model
+except ImportError:
+    todo_model = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTINUATION ENFORCER PHILOSOPHY
@@ -70,6 +77,9 @@ def get_todo_file(claude_dir: Path) -> Path:
 
 def parse_todos(content: str) -> dict:
     """todo.md 파싱 - 상태별 분류"""
+    if todo_model is not None:
+        return todo_model.parse(content).by_status()
+
     result = {
         "pending": [],
         "in_progress": [],
@@ -193,8 +203,10 @@ def main():
         if not todo_file.exists():
             sys.exit(0)
 
-        content = todo_file.read_text(encoding="utf-8")
-        todos = parse_todos(content)
+        if todo_model is not None:
+            todos = todo_model.load_status(todo_file)
+        else:
+            todos = parse_todos(todo_file.read_text(encoding="utf-8"))
 
         incomplete = get_incomplete_count(todos)
 
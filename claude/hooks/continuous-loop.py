@@ -12,13 +12,21 @@ References:
 - https://github.com/AnandChowdhary/continuous-claude
 """
 
-import json
-import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# 루프 공용 엔진 (HANDOFF.md 파싱, 로그, 상태 섹션)
+sys.path.insert(0, str(Path(__file__).parent))
+import loop_engine  # noqa: E402
+
+# 루프 hook 공용 transcript 분석 (없으면 매번 transcript 전체 검사)
+try:
+    import transcript_analysis
+except ImportError:
+    transcript_analysis = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -30,37 +38,6 @@ COMPLETION_SIGNALS = [
     "[CONTINUOUS_DONE]",
 ]
 
-HANDOFF_FILE = ".claude/HANDOFF.md"
-LOG_FILE = ".claude/continuous-log.md"
-
-# ═══════════════════════════════════════════════════════════════════════════
-# UTILITIES
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def get_project_root() -> Path:
-    """프로젝트 루트 디렉토리 반환"""
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
-
-
-def get_handoff_file() -> Path:
-    """HANDOFF.md 파일 경로"""
-    custom = os.environ.get("CONTINUOUS_HANDOFF_FILE")
-    if custom:
-        return Path(custom)
-    return get_project_root() / HANDOFF_FILE
-
-
-def get_log_file() -> Path:
-    """continuous-log.md 파일 경로"""
-    return get_project_root() / LOG_FILE
-
-
-def output_context(msg: str):
-    """컨텍스트 메시지 출력"""
-    print(json.dumps({"additionalContext": msg}, ensure_ascii=False))
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # COMPLETION DETECTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -75,20 +52,25 @@ def has_completion_signal(text: str) -> bool:
     return False
 
 
-def get_handoff_status(handoff_path: Path) -> str:
-    """HANDOFF.md에서 현재 상태 추출"""
-    if not handoff_path.exists():
-        return "UNKNOWN"
+def transcript_completed(ctx) -> bool:
+    """transcript 어딘가에 완료 신호가 있는지 (이전 Stop 이후 추가된 부분만 검사)"""
+    if transcript_analysis is None:
+        return has_completion_signal(ctx.transcript)
+    result = transcript_analysis.scan(ctx.transcript, "continuous-loop", ctx.input_data, ctx.claude_dir)
+    return result.totals["continuous.complete"] > 0
 
-    content = handoff_path.read_text(encoding="utf-8")
 
-    # 상태 라인 찾기
-    status_match = re.search(r"\*\*상태\*\*:\s*`?(\w+)`?", content)
-    if status_match:
-        return status_match.group(1).upper()
+def get_handoff_status(handoff: dict) -> str:
+    """HANDOFF.md에서 현재 상태 추출 (handoff: LoopContext.handoff())"""
+    if not handoff["exists"]:
+        return "UNKNOWN"
+
+    # 상태 라인
+    if handoff["status"]:
+        return handoff["status"]
 
     # 완료 신호 확인
-    if has_completion_signal(content):
+    if has_completion_signal(handoff["content"]):
         return "CONTINUOUS_COMPLETE"
 
     return "CONTINUING"
@@ -99,95 +81,25 @@ def get_handoff_status(handoff_path: Path) -> str:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def parse_run_number(handoff_path: Path) -> int:
-    """현재 Run 번호 추출"""
-    if not handoff_path.exists():
-        return 0
-
-    content = handoff_path.read_text(encoding="utf-8")
-    match = re.search(r"\*\*Run #\*\*\s*\|\s*(\d+)", content)
-    if match:
-        return int(match.group(1))
-    return 0
-
-
-def increment_run_number(handoff_path: Path) -> int:
-    """Run 번호 증가 및 업데이트"""
-    if not handoff_path.exists():
-        return 1
-
-    content = handoff_path.read_text(encoding="utf-8")
-    current_run = parse_run_number(handoff_path)
-    new_run = current_run + 1
-
-    # Run 번호 업데이트
+def increment_run_number(content: str, current_run: int) -> str:
+    """Run 번호 증가 + Last Updated 갱신한 HANDOFF.md 내용"""
     content = re.sub(
         r"(\*\*Run #\*\*\s*\|\s*)\d+",
-        f"\\g<1>{new_run}",
+        f"\\g<1>{current_run + 1}",
         content
     )
 
-    # Last Updated 업데이트
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    content = re.sub(
+    return re.sub(
         r"(\*\*Last Updated\*\*\s*\|\s*)[^\|]+",
         f"\\g<1>{timestamp} ",
         content
     )
 
-    handoff_path.write_text(content, encoding="utf-8")
-    return new_run
 
-
-def get_next_steps(handoff_path: Path) -> list[str]:
-    """다음 단계 목록 추출"""
-    if not handoff_path.exists():
-        return []
-
-    content = handoff_path.read_text(encoding="utf-8")
-
-    # Next Steps 섹션 찾기
-    next_section = re.search(
-        r"## Next Steps.*?\n(.*?)(?=\n##|\n---|\Z)",
-        content,
-        re.DOTALL
-    )
-
-    if not next_section:
-        return []
-
-    steps = []
-    for line in next_section.group(1).split("\n"):
-        match = re.match(r"\d+\.\s+(.+)", line.strip())
-        if match:
-            step = match.group(1).strip()
-            if step and not step.startswith("["):
-                steps.append(step)
-
-    return steps
-
-
-def log_run_event(event_type: str, details: str = ""):
-    """continuous-log.md에 이벤트 기록"""
-    log_path = get_log_file()
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    handoff_path = get_handoff_file()
-    run_number = parse_run_number(handoff_path)
-
-    entry = f"\n### [{timestamp}] Run #{run_number} - {event_type}\n"
-    if details:
-        entry += f"{details}\n"
-
-    if log_path.exists():
-        content = log_path.read_text(encoding="utf-8")
-    else:
-        content = "# Continuous Claude Log\n\n"
-        content += "> 연속 실행 로그입니다.\n\n---\n"
-
-    content += entry
-    log_path.write_text(content, encoding="utf-8")
+def get_next_steps(handoff: dict) -> list[str]:
+    """다음 단계 목록 (템플릿 자리표시 "[...]" 제외)"""
+    return [step for step in handoff["nextSteps"] if step and not step.startswith("[")]
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -227,59 +139,56 @@ COMPLETION_MESSAGE = """
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# MAIN HANDLER
+# LOOP STRATEGY
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def main():
-    try:
-        # stdin에서 입력 읽기
-        input_data = json.loads(sys.stdin.read())
-        transcript = input_data.get("transcript", "")
-        stop_reason = input_data.get("stop_reason", "")
-
-        # 사용자가 명시적으로 중단한 경우 무시
-        if stop_reason in ["user_interrupt", "max_tokens"]:
-            sys.exit(0)
-
-        handoff_path = get_handoff_file()
+class ContinuousStrategy(loop_engine.LoopStrategy):
+    """HANDOFF.md 릴레이 루프 (진행 상태는 HANDOFF.md, 섹션에는 마지막 Run만)"""
+    name = "continuous"
 
+    def active(self, ctx, status, auto_activate=True) -> bool:
         # HANDOFF.md가 없으면 Continuous Mode가 아님
-        if not handoff_path.exists():
-            sys.exit(0)
-
-        # 완료 신호 확인
-        status = get_handoff_status(handoff_path)
-
-        if status == "CONTINUOUS_COMPLETE" or has_completion_signal(transcript):
-            # 완료됨
-            run_number = parse_run_number(handoff_path)
-            log_run_event("COMPLETE", "목표 달성")
+        return ctx.handoff()["exists"]
 
-            output_context(COMPLETION_MESSAGE.format(run_number=run_number))
-            sys.exit(0)
+    def step(self, ctx, status) -> str:
+        handoff = ctx.handoff()
 
-        # 계속 진행 - Run 번호 증가
-        new_run = increment_run_number(handoff_path)
+        # 완료 신호 확인
+        if get_handoff_status(handoff) == "CONTINUOUS_COMPLETE" or transcript_completed(ctx):
+            self.log(ctx, "complete", "목표 달성", iteration=handoff["runNumber"])
+            status["runNumber"] = handoff["runNumber"]
+            return COMPLETION_MESSAGE.format(run_number=handoff["runNumber"])
+
+        # 계속 진행 - Run 번호 증가 (HANDOFF.md는 모델이 읽는 파일이므로 직접 갱신)
+        new_run = handoff["runNumber"] + 1
+        handoff_path = ctx.handoff_path()
+        handoff_path.write_text(increment_run_number(handoff["content"], handoff["runNumber"]), encoding="utf-8")
+        ctx.forget("handoff")
+        status["runNumber"] = new_run
 
         # 다음 단계 확인
-        next_steps = get_next_steps(handoff_path)
+        next_steps = get_next_steps(handoff)
         next_step = next_steps[0] if next_steps else "HANDOFF.md를 확인하세요"
 
-        # 로그 기록
-        log_run_event("CONTINUE", f"다음 단계: {next_step}")
+        self.log(ctx, "iteration", iteration=new_run, next=next_step)
 
-        # 계속 진행 메시지
-        output_context(CONTINUATION_MESSAGE.format(
+        return CONTINUATION_MESSAGE.format(
             run_number=new_run,
             next_step=next_step[:50] + "..." if len(next_step) > 50 else next_step
-        ))
+        )
+
+
+STRATEGY = ContinuousStrategy()
 
-    except Exception as e:
-        # 에러 발생 시 조용히 종료
-        pass
 
-    sys.exit(0)
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN HANDLER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def main():
+    loop_engine.main([STRATEGY])
 
 
 if __name__ == "__main__":
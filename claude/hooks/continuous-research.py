@@ -3,6 +3,7 @@
 
 무중단 문헌 연구를 위한 Hook:
 - 연구 모드 활성화 시 자동 감지
+- agent-state.json "research" 섹션으로 진행 상황 관리 (loop_engine.py)
 - 문헌 검색 → 분석 → 인용 사이클 지속
 - RESEARCH_COMPLETE 신호까지 계속 진행
 - 인용 체크리스트 자동 생성
@@ -12,13 +13,21 @@ References:
 - Systematic Literature Review 방법론
 """
 
-import json
-import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# 루프 공용 엔진 (상태 섹션, 로그, 경과 시간)
+sys.path.insert(0, str(Path(__file__).parent))
+import loop_engine  # noqa: E402
+
+# 루프 hook 공용 transcript 분석 (없으면 매번 transcript 전체 검사)
+try:
+    import transcript_analysis
+except ImportError:
+    transcript_analysis = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -33,6 +42,7 @@ RESEARCH_COMPLETION_SIGNALS = [
 ]
 
 # 연구 모드 활성화 키워드
+# preconditions.json의 continuous-research 항목과 같게 유지 (hook_preconditions.py --check로 확인)
 RESEARCH_KEYWORDS = [
     "research",
     "literature",
@@ -44,9 +54,15 @@ RESEARCH_KEYWORDS = [
     "리서치",
 ]
 
-# 상태 파일
+# 연구 단계 감지 키워드 (앞 단계 우선)
+RESEARCH_PHASES = [
+    ("searching", ["search", "find paper", "검색", "논문 찾"]),
+    ("analyzing", ["analyze", "read", "분석", "읽"]),
+    ("synthesizing", ["synthesize", "summary", "종합", "요약"]),
+]
+
+# 연구 스킬이 루프를 시작할 때 쓰는 상태 파일 (진행 상태는 agent-state.json "research" 섹션)
 RESEARCH_STATUS_FILE = ".claude/research-status.json"
-RESEARCH_LOG_FILE = ".claude/research-log.md"
 CITATIONS_FILE = ".claude/citations.md"
 
 # 기본 설정
@@ -54,65 +70,6 @@ DEFAULT_MAX_ITERATIONS = 15
 DEFAULT_PAPERS_PER_ITERATION = 5
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# UTILITIES
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def get_project_root() -> Path:
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
-
-
-def output_context(msg: str):
-    print(json.dumps({"additionalContext": msg}, ensure_ascii=False))
-
-
-def log_research(message: str):
-    log_path = get_project_root() / RESEARCH_LOG_FILE
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    entry = f"\n### [{timestamp}]\n{message}\n"
-
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(entry)
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# STATUS MANAGEMENT
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def load_research_status() -> dict:
-    status_path = get_project_root() / RESEARCH_STATUS_FILE
-
-    if not status_path.exists():
-        return {
-            "active": False,
-            "iteration": 0,
-            "maxIterations": DEFAULT_MAX_ITERATIONS,
-            "topic": "",
-            "phase": "idle",  # idle, searching, analyzing, synthesizing
-            "papersFound": 0,
-            "papersAnalyzed": 0,
-            "citations": [],
-            "gaps": [],
-            "startTime": None,
-        }
-
-    try:
-        return json.loads(status_path.read_text(encoding="utf-8"))
-    except Exception:
-        return load_research_status.__wrapped__() if hasattr(load_research_status, '__wrapped__') else {}
-
-
-def save_research_status(status: dict):
-    status_path = get_project_root() / RESEARCH_STATUS_FILE
-    status_path.parent.mkdir(parents=True, exist_ok=True)
-    status["lastUpdated"] = datetime.now().isoformat()
-    status_path.write_text(json.dumps(status, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # DETECTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -126,22 +83,20 @@ def has_completion_signal(text: str) -> bool:
     return False
 
 
-def is_research_mode_active(transcript: str) -> bool:
-    transcript_lower = transcript.lower()
-    return any(kw in transcript_lower for kw in RESEARCH_KEYWORDS)
+def has_any_keyword(text: str, keywords: list[str]) -> bool:
+    text_lower = text.lower()
+    return any(kw in text_lower for kw in keywords)
 
 
-def detect_research_phase(transcript: str) -> str:
-    """현재 연구 단계 감지"""
-    transcript_lower = transcript.lower()
+def is_research_mode_active(transcript: str) -> bool:
+    return has_any_keyword(transcript, RESEARCH_KEYWORDS)
 
-    if any(kw in transcript_lower for kw in ["search", "find paper", "검색", "논문 찾"]):
-        return "searching"
-    elif any(kw in transcript_lower for kw in ["analyze", "read", "분석", "읽"]):
-        return "analyzing"
-    elif any(kw in transcript_lower for kw in ["synthesize", "summary", "종합", "요약"]):
-        return "synthesizing"
 
+def detect_research_phase(signals: dict) -> str:
+    """현재 연구 단계 감지 (scan_transcript 누적 값 기준)"""
+    for phase, _ in RESEARCH_PHASES:
+        if signals[f"phase:{phase}"]:
+            return phase
     return "searching"
 
 
@@ -161,6 +116,33 @@ def count_citations(transcript: str) -> int:
     return doi_count + arxiv_count + academic_urls
 
 
+def scan_transcript(ctx) -> tuple[dict, dict]:
+    """(transcript 전체 기준 누적 값, 이번 Stop에서 추가된 부분의 값)"""
+    transcript = ctx.transcript
+    if transcript_analysis is None:
+        counts = {
+            "active": int(is_research_mode_active(transcript)),
+            "complete": int(has_completion_signal(transcript)),
+            "citations": count_citations(transcript),
+        }
+        for phase, keywords in RESEARCH_PHASES:
+            counts[f"phase:{phase}"] = int(has_any_keyword(transcript, keywords))
+        return counts, counts
+
+    result = transcript_analysis.scan(transcript, "continuous-research", ctx.input_data, ctx.claude_dir)
+
+    def signals(features: dict) -> dict:
+        counts = {
+            "active": features["research.keywords"],
+            "complete": features["research.complete"],
+            "citations": features["citations"],
+        }
+        counts.update((f"phase:{phase}", features[f"research.phase.{phase}"]) for phase, _ in RESEARCH_PHASES)
+        return counts
+
+    return signals(result.totals), signals(result.new)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTINUATION MESSAGES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -219,86 +201,82 @@ def get_next_action(phase: str, status: dict) -> str:
     return "→ 연구 시작"
 
 
-def format_elapsed_time(start_time_str: str) -> str:
-    if not start_time_str:
-        return "측정 불가"
-    try:
-        start = datetime.fromisoformat(start_time_str)
-        elapsed = datetime.now() - start
-        minutes = int(elapsed.total_seconds() // 60)
-        if minutes < 60:
-            return f"{minutes}분"
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours}시간 {mins}분"
-    except Exception:
-        return "측정 불가"
-
-
 # ═══════════════════════════════════════════════════════════════════════════
-# MAIN HANDLER
+# LOOP STRATEGY
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-        transcript = input_data.get("transcript", "")
-        stop_reason = input_data.get("stop_reason", "")
+class ResearchStrategy(loop_engine.LoopStrategy):
+    """문헌 연구 루프 (agent-state.json "research" 섹션)"""
+    name = "research"
+    legacy_file = RESEARCH_STATUS_FILE
+
+    def defaults(self) -> dict:
+        return {
+            "active": False,
+            "iteration": 0,
+            "maxIterations": DEFAULT_MAX_ITERATIONS,
+            "topic": "",
+            "phase": "idle",  # idle, searching, analyzing, synthesizing
+            "papersFound": 0,
+            "papersAnalyzed": 0,
+            "citations": [],
+            "gaps": [],
+            "startTime": None,
+        }
 
-        # 사용자 인터럽트 시 무시
-        if stop_reason in ["user_interrupt", "max_tokens"]:
-            sys.exit(0)
+    def signals(self, ctx) -> tuple[dict, dict]:
+        return ctx.memo("research-signals", lambda: scan_transcript(ctx))
 
-        # 상태 로드
-        status = load_research_status()
+    def active(self, ctx, status, auto_activate=True) -> bool:
+        # 연구 모드가 비활성화면 연구 키워드가 있을 때만 (개별 hook으로 실행될 때)
+        if status.get("active", False):
+            return True
+        return auto_activate and bool(self.signals(ctx)[0]["active"])
 
-        # 연구 모드가 비활성화면 무시
-        if not status.get("active", False):
-            # 연구 키워드가 있으면 활성화 확인
-            if not is_research_mode_active(transcript):
-                sys.exit(0)
+    def step(self, ctx, status) -> str:
+        # 이전 Stop 이후 추가된 transcript만 검사
+        signals, new_signals = self.signals(ctx)
+        status["lastUpdated"] = datetime.now().isoformat()
 
         # 완료 신호 확인
-        if has_completion_signal(transcript):
+        if signals["complete"]:
             status["active"] = False
             status["phase"] = "complete"
-            save_research_status(status)
-            log_research(f"Research completed: {status.get('topic', 'Unknown')}")
-
-            output_context(RESEARCH_COMPLETE_MESSAGE.format(
+            self.log(ctx, "complete", f"Research completed: {status.get('topic', 'Unknown')}",
+                     iteration=status.get("iteration", 0))
+            return RESEARCH_COMPLETE_MESSAGE.format(
                 topic=status.get("topic", "Unknown")[:40],
                 iteration=status.get("iteration", 0),
                 papers_analyzed=status.get("papersAnalyzed", 0),
                 citations=len(status.get("citations", [])),
-                elapsed_time=format_elapsed_time(status.get("startTime"))
-            ))
-            sys.exit(0)
+                elapsed_time=loop_engine.format_elapsed_time(status.get("startTime"))
+            )
 
         # 최대 반복 확인
         max_iterations = status.get("maxIterations", DEFAULT_MAX_ITERATIONS)
         if status.get("iteration", 0) >= max_iterations:
             status["active"] = False
-            save_research_status(status)
-            output_context(f"⚠️ 연구 최대 반복 횟수({max_iterations}) 도달. 계속하려면 다시 시작하세요.")
-            sys.exit(0)
+            self.log(ctx, "max_iterations", iteration=status.get("iteration", 0))
+            return f"⚠️ 연구 최대 반복 횟수({max_iterations}) 도달. 계속하려면 다시 시작하세요."
 
-        # 인용 수 업데이트
-        new_citations = count_citations(transcript)
+        # 인용 수 업데이트 (이번 Stop에서 추가된 인용)
+        new_citations = new_signals["citations"]
         if new_citations > 0:
             status["citations"] = status.get("citations", [])
             # 실제로는 여기서 인용 추출 및 저장
 
         # 단계 감지
-        phase = detect_research_phase(transcript)
+        phase = detect_research_phase(signals)
         status["phase"] = phase
 
         # 반복 증가
         status["iteration"] = status.get("iteration", 0) + 1
-        save_research_status(status)
+        self.log(ctx, "iteration", iteration=status["iteration"], phase=phase,
+                 next=get_next_action(phase, status).removeprefix("→ "))
 
         # 계속 진행 메시지
-        output_context(RESEARCH_CONTINUATION_MESSAGE.format(
+        return RESEARCH_CONTINUATION_MESSAGE.format(
             iteration=status["iteration"],
             max_iterations=max_iterations,
             topic=status.get("topic", "연구 주제")[:30],
@@ -307,14 +285,19 @@ def main():
             papers_analyzed=status.get("papersAnalyzed", 0),
             citations=len(status.get("citations", [])),
             next_action=get_next_action(phase, status)
-        ))
+        )
+
 
-        log_research(f"Iteration {status['iteration']}: Phase={phase}")
+STRATEGY = ResearchStrategy()
 
-    except Exception as e:
-        log_research(f"Error: {str(e)}")
 
-    sys.exit(0)
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN HANDLER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def main():
+    loop_engine.main([STRATEGY])
 
 
 if __name__ == "__main__":
@@ -6,19 +6,29 @@
 - 다중 관점 순환 리뷰 (security → performance → architecture → ...)
 - REVIEW_COMPLETE 신호까지 계속 진행
 - 발견된 이슈 자동 추적
+- agent-state.json "review" 섹션으로 진행 상황 관리 (loop_engine.py)
 
 References:
 - Boris Journey의 Verification Loop
 - 3-Phase Review Framework (Critical → Feedback → Feedforward)
 """
 
-import json
 import os
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# 루프 공용 엔진 (상태 섹션, 로그, 경과 시간)
+sys.path.insert(0, str(Path(__file__).parent))
+import loop_engine  # noqa: E402
+
+# 루프 hook 공용 transcript 분석 (없으면 매번 transcript 전체 검사)
+try:
+    import transcript_analysis
+except ImportError:
+    transcript_analysis = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -33,6 +43,7 @@ REVIEW_COMPLETION_SIGNALS = [
 ]
 
 # 리뷰 모드 활성화 키워드
+# preconditions.json의 continuous-review 항목과 같게 유지 (hook_preconditions.py --check로 확인)
 REVIEW_KEYWORDS = [
     "review",
     "critique",
@@ -54,9 +65,20 @@ REVIEW_PERSPECTIVES = [
     ("best_practices", "📚 Best Practices", "컨벤션, 패턴, 안티패턴"),
 ]
 
-# 상태 파일
+# 이슈 심각도 키워드
+SEVERITY_KEYWORDS = {
+    "critical": ["critical", "🔴", "심각"],
+    "high": ["high", "🟠", "높음"],
+    "medium": ["medium", "🟡", "중간"],
+    "low": ["low", "🟢", "낮음"],
+}
+SEVERITY_PATTERNS = {
+    severity: re.compile("(" + "|".join(map(re.escape, words)) + ")", re.IGNORECASE)
+    for severity, words in SEVERITY_KEYWORDS.items()
+}
+
+# 리뷰 스킬이 루프를 시작할 때 쓰는 상태 파일 (진행 상태는 agent-state.json "review" 섹션)
 REVIEW_STATUS_FILE = ".claude/review-status.json"
-REVIEW_LOG_FILE = ".claude/review-log.md"
 ISSUES_FILE = ".claude/review-issues.md"
 
 # 기본 설정
@@ -72,21 +94,6 @@ def get_project_root() -> Path:
     return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
 
 
-def output_context(msg: str):
-    print(json.dumps({"additionalContext": msg}, ensure_ascii=False))
-
-
-def log_review(message: str):
-    log_path = get_project_root() / REVIEW_LOG_FILE
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    entry = f"\n### [{timestamp}]\n{message}\n"
-
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(entry)
-
-
 def save_issue(severity: str, category: str, description: str, file_path: str = ""):
     issues_path = get_project_root() / ISSUES_FILE
     issues_path.parent.mkdir(parents=True, exist_ok=True)
@@ -101,45 +108,6 @@ def save_issue(severity: str, category: str, description: str, file_path: str =
         f.write(entry)
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# STATUS MANAGEMENT
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def load_review_status() -> dict:
-    status_path = get_project_root() / REVIEW_STATUS_FILE
-
-    if not status_path.exists():
-        return {
-            "active": False,
-            "iteration": 0,
-            "maxIterations": DEFAULT_MAX_ITERATIONS,
-            "target": "",  # 리뷰 대상
-            "currentPerspective": 0,  # 현재 관점 인덱스
-            "completedPerspectives": [],
-            "issues": {
-                "critical": 0,
-                "high": 0,
-                "medium": 0,
-                "low": 0,
-            },
-            "phase": "idle",  # idle, reviewing, synthesizing
-            "startTime": None,
-        }
-
-    try:
-        return json.loads(status_path.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
-
-
-def save_review_status(status: dict):
-    status_path = get_project_root() / REVIEW_STATUS_FILE
-    status_path.parent.mkdir(parents=True, exist_ok=True)
-    status["lastUpdated"] = datetime.now().isoformat()
-    status_path.write_text(json.dumps(status, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # DETECTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -160,26 +128,48 @@ def is_review_mode_active(transcript: str) -> bool:
 
 def count_issues_by_severity(transcript: str) -> dict:
     """트랜스크립트에서 이슈 심각도 카운트"""
-    issues = {
-        "critical": len(re.findall(r'(critical|🔴|심각)', transcript, re.IGNORECASE)),
-        "high": len(re.findall(r'(high|🟠|높음)', transcript, re.IGNORECASE)),
-        "medium": len(re.findall(r'(medium|🟡|중간)', transcript, re.IGNORECASE)),
-        "low": len(re.findall(r'(low|🟢|낮음)', transcript, re.IGNORECASE)),
-    }
-    return issues
+    return {severity: len(pattern.findall(transcript)) for severity, pattern in SEVERITY_PATTERNS.items()}
 
 
-def detect_current_perspective(transcript: str) -> tuple[int, str]:
-    """현재 리뷰 관점 감지"""
-    transcript_lower = transcript.lower()
+def mentions_perspective(text: str, key: str, name: str) -> bool:
+    text_lower = text.lower()
+    return key in text_lower or name.lower() in text_lower
 
-    for idx, (key, name, _) in enumerate(REVIEW_PERSPECTIVES):
-        if key in transcript_lower or name.lower() in transcript_lower:
+
+def detect_current_perspective(signals: dict) -> tuple[int, str]:
+    """현재 리뷰 관점 감지 (scan_transcript 누적 값 기준)"""
+    for idx, (key, _, _) in enumerate(REVIEW_PERSPECTIVES):
+        if signals[f"perspective:{key}"]:
             return idx, key
 
     return 0, "security"
 
 
+def scan_transcript(ctx) -> tuple[dict, dict]:
+    """(transcript 전체 기준 누적 값, 이번 Stop에서 추가된 부분의 값)"""
+    transcript = ctx.transcript
+    if transcript_analysis is None:
+        counts = {
+            "active": int(is_review_mode_active(transcript)),
+            "complete": int(has_completion_signal(transcript)),
+        }
+        counts.update((f"issues:{severity}", n) for severity, n in count_issues_by_severity(transcript).items())
+        for key, name, _ in REVIEW_PERSPECTIVES:
+            counts[f"perspective:{key}"] = int(mentions_perspective(transcript, key, name))
+        return counts, counts
+
+    result = transcript_analysis.scan(transcript, "continuous-review", ctx.input_data, ctx.claude_dir)
+
+    def signals(features: dict) -> dict:
+        counts = {"active": features["review.keywords"], "complete": features["review.complete"]}
+        counts.update((f"issues:{severity}", features[f"severity.{severity}"]) for severity in SEVERITY_KEYWORDS)
+        counts.update((f"perspective:{key}", features[f"review.perspective.{key}"])
+                      for key, _, _ in REVIEW_PERSPECTIVES)
+        return counts
+
+    return signals(result.totals), signals(result.new)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTINUATION MESSAGES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -276,80 +266,81 @@ def get_perspectives_status(completed: list) -> str:
     return "\n".join(lines)
 
 
-def format_elapsed_time(start_time_str: str) -> str:
-    if not start_time_str:
-        return "측정 불가"
-    try:
-        start = datetime.fromisoformat(start_time_str)
-        elapsed = datetime.now() - start
-        minutes = int(elapsed.total_seconds() // 60)
-        if minutes < 60:
-            return f"{minutes}분"
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours}시간 {mins}분"
-    except Exception:
-        return "측정 불가"
-
-
 # ═══════════════════════════════════════════════════════════════════════════
-# MAIN HANDLER
+# LOOP STRATEGY
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-        transcript = input_data.get("transcript", "")
-        stop_reason = input_data.get("stop_reason", "")
+class ReviewStrategy(loop_engine.LoopStrategy):
+    """다중 관점 리뷰 루프 (agent-state.json "review" 섹션)"""
+    name = "review"
+    legacy_file = REVIEW_STATUS_FILE
 
-        # 사용자 인터럽트 시 무시
-        if stop_reason in ["user_interrupt", "max_tokens"]:
-            sys.exit(0)
+    def defaults(self) -> dict:
+        return {
+            "active": False,
+            "iteration": 0,
+            "maxIterations": DEFAULT_MAX_ITERATIONS,
+            "target": "",  # 리뷰 대상
+            "currentPerspective": 0,  # 현재 관점 인덱스
+            "completedPerspectives": [],
+            "issues": {
+                "critical": 0,
+                "high": 0,
+                "medium": 0,
+                "low": 0,
+            },
+            "phase": "idle",  # idle, reviewing, synthesizing
+            "startTime": None,
+        }
+
+    def signals(self, ctx) -> tuple[dict, dict]:
+        return ctx.memo("review-signals", lambda: scan_transcript(ctx))
 
-        # 상태 로드
-        status = load_review_status()
+    def active(self, ctx, status, auto_activate=True) -> bool:
+        # 리뷰 모드가 비활성화면 리뷰 키워드가 있을 때만 (개별 hook으로 실행될 때)
+        if status.get("active", False):
+            return True
+        return auto_activate and bool(self.signals(ctx)[0]["active"])
 
-        # 리뷰 모드가 비활성화면 무시
-        if not status.get("active", False):
-            if not is_review_mode_active(transcript):
-                sys.exit(0)
+    def step(self, ctx, status) -> str:
+        # 이전 Stop 이후 추가된 transcript만 검사
+        signals, new_signals = self.signals(ctx)
+        status["lastUpdated"] = datetime.now().isoformat()
 
         # 완료 신호 확인
-        if has_completion_signal(transcript):
+        if signals["complete"]:
             status["active"] = False
             status["phase"] = "complete"
-            save_review_status(status)
-            log_review(f"Review completed: {status.get('target', 'Unknown')}")
+            self.log(ctx, "complete", f"Review completed: {status.get('target', 'Unknown')}",
+                     iteration=status.get("iteration", 0))
 
             issues = status.get("issues", {})
-            output_context(REVIEW_COMPLETE_MESSAGE.format(
+            return REVIEW_COMPLETE_MESSAGE.format(
                 target=status.get("target", "Unknown")[:40],
                 iteration=status.get("iteration", 0),
                 perspectives_count=len(status.get("completedPerspectives", [])),
-                elapsed_time=format_elapsed_time(status.get("startTime")),
+                elapsed_time=loop_engine.format_elapsed_time(status.get("startTime")),
                 critical=issues.get("critical", 0),
                 high=issues.get("high", 0),
                 medium=issues.get("medium", 0),
                 low=issues.get("low", 0),
-            ))
-            sys.exit(0)
+            )
 
         # 최대 반복 확인
         max_iterations = status.get("maxIterations", DEFAULT_MAX_ITERATIONS)
         if status.get("iteration", 0) >= max_iterations:
             status["active"] = False
-            save_review_status(status)
-            output_context(f"⚠️ 리뷰 최대 반복 횟수({max_iterations}) 도달.")
-            sys.exit(0)
+            self.log(ctx, "max_iterations", iteration=status.get("iteration", 0))
+            return f"⚠️ 리뷰 최대 반복 횟수({max_iterations}) 도달."
 
-        # 이슈 카운트 업데이트
-        new_issues = count_issues_by_severity(transcript)
-        for severity, count in new_issues.items():
-            status["issues"][severity] = status.get("issues", {}).get(severity, 0) + count
+        # 이슈 카운트 업데이트 (이번 Stop에서 추가된 부분만 더함 - 이전 부분은 이미 반영됨)
+        issues = status.setdefault("issues", {})
+        for severity in SEVERITY_KEYWORDS:
+            issues[severity] = issues.get(severity, 0) + new_signals[f"issues:{severity}"]
 
         # 현재 관점 감지 및 업데이트
-        current_idx, current_key = detect_current_perspective(transcript)
+        current_idx, current_key = detect_current_perspective(signals)
         completed = status.get("completedPerspectives", [])
 
         if current_key not in completed:
@@ -363,13 +354,12 @@ def main():
         # 반복 증가
         status["iteration"] = status.get("iteration", 0) + 1
         status["currentPerspective"] = next_idx
-        save_review_status(status)
+        self.log(ctx, "iteration", iteration=status["iteration"], perspective=current_key,
+                 next=next_key, issues=dict(issues))
 
         # 계속 진행 메시지
         current_name = REVIEW_PERSPECTIVES[current_idx][1]
-        issues = status.get("issues", {})
-
-        output_context(REVIEW_CONTINUATION_MESSAGE.format(
+        return REVIEW_CONTINUATION_MESSAGE.format(
             iteration=status["iteration"],
             max_iterations=max_iterations,
             target=status.get("target", "리뷰 대상")[:30],
@@ -383,14 +373,19 @@ def main():
             next_perspective=f"{next_name}: {next_desc}",
             checklist=get_perspective_checklist(current_key),
             perspectives_status=get_perspectives_status(completed)
-        ))
+        )
+
 
-        log_review(f"Iteration {status['iteration']}: Perspective={current_key}")
+STRATEGY = ReviewStrategy()
 
-    except Exception as e:
-        log_review(f"Error: {str(e)}")
 
-    sys.exit(0)
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN HANDLER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def main():
+    loop_engine.main([STRATEGY])
 
 
 if __name__ == "__main__":
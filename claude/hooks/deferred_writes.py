@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""Deferred Writes - 로그성 파일 쓰기를 hook 응답 이후로 미루는 큐
+
+post-edit, post-bash, research-source-log, subagent-stop처럼 모델에게 즉시
+돌려줄 출력 없이 todo.md/errors.md/로그 파일만 수정하는 hook은 쓰기를 큐에
+넣고 바로 반환합니다. 실제 파일 수정은 백그라운드에서 일괄 처리됩니다.
+
+- 큐: hooks 디렉토리의 .pending-writes.jsonl (레코드당 JSON 한 줄, 절대 경로)
+- hook 데몬 자식: 응답을 보낸 뒤 같은 프로세스에서 flush
+- 그 외 실행 (run-hook, 데몬 없는 hook-client): 분리된 flush 프로세스 1회 실행
+- 같은 파일의 append는 한 번의 쓰기로, 변환(transform)은 읽기/쓰기 1회로 묶음
+- 변환은 대상 파일 잠금 안에서 읽고 임시 파일 + rename으로 교체 (utils.FileUpdate)
+  (utils가 없으면 처음 달라진 바이트부터만 다시 씀)
+
+레코드 종류:
+- append:    {"path", "append": text}
+- transform: {"path", "hook", "transform": 함수 이름, "args": [...]}
+  → hook 모듈의 transform(content, *args)가 새 내용을 반환 (None이면 변경 없음)
+
+CLAUDE_DEFERRED_WRITES=0 이거나 fcntl이 없는 플랫폼(Windows)에서는 즉시 씁니다.
+
+사용법:
+    python3 deferred_writes.py --flush    # 대기 중인 쓰기 처리
+    python3 deferred_writes.py --status   # 대기 중인 레코드 수
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+HOOKS_DIR = Path(__file__).parent.resolve()
+QUEUE_NAME = ".pending-writes.jsonl"
+
+# 이 프로세스에서 flush를 예약했는지 (True면 추가 spawn 없음)
+_flush_scheduled = False
+
+
+def queue_path() -> Path:
+    return HOOKS_DIR / QUEUE_NAME
+
+
+def deferred_enabled() -> bool:
+    return fcntl is not None and os.environ.get("CLAUDE_DEFERRED_WRITES", "1") != "0"
+
+
+def hold_flush():
+    """이 프로세스가 직접 flush_pending()을 호출할 예정 (hook 데몬 자식)"""
+    global _flush_scheduled
+    _flush_scheduled = True
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ENQUEUE (hook 쪽)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def defer_append(path, text: str):
+    """파일 끝에 text 추가 (부모 디렉토리는 필요 시 생성)"""
+    _enqueue({"path": os.path.abspath(path), "append": text})
+
+
+def defer_transform(hook: str, path, transform, *args):
+    """hook 모듈의 transform(content, *args)로 파일 내용 갱신
+
+    transform은 모듈 최상위 함수여야 합니다 (flush 시 이름으로 다시 찾음).
+    파일이 없으면 아무것도 하지 않습니다.
+    """
+    record = {
+        "path": os.path.abspath(path),
+        "hook": hook,
+        "transform": transform.__name__,
+        "args": list(args),
+    }
+    _enqueue(record, sys.modules.get(transform.__module__))
+
+
+def _enqueue(record: dict, module=None):
+    if not deferred_enabled():
+        _apply_now(record, module)
+        return
+
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    path = queue_path()
+    # flush가 큐를 rename으로 가져간 직후라면 새 큐 파일에 다시 씀
+    for _ in range(3):
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            if not _same_file(fd, path):
+                continue
+            os.write(fd, line)
+            break
+        finally:
+            os.close(fd)
+    else:
+        _apply_now(record, module)
+        return
+
+    _schedule_flush()
+
+
+def _apply_now(record: dict, module=None):
+    """큐를 거치지 않고 즉시 적용 (비활성화/미지원 플랫폼)"""
+    modules = {record["hook"]: module} if module is not None and "hook" in record else {}
+    try:
+        _apply_path(record["path"], [record], modules)
+    except Exception:
+        pass
+
+
+def _same_file(fd: int, path: Path) -> bool:
+    """fd가 아직 path의 파일인지 (rename/unlink되지 않았는지)"""
+    try:
+        return os.fstat(fd).st_ino == os.stat(path).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def _schedule_flush():
+    """분리된 프로세스로 flush 실행 (프로세스당 1회)"""
+    global _flush_scheduled
+    if _flush_scheduled:
+        return
+    _flush_scheduled = True
+
+    pid = os.fork()
+    if pid:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+        return
+
+    # 중간 자식: 새 세션에서 flush 프로세스를 띄우고 즉시 종료 (hook을 기다리게 하지 않음)
+    try:
+        os.setsid()
+        if os.fork() == 0:
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            os.execv(sys.executable, [sys.executable, str(Path(__file__).resolve()), "--flush"])
+    finally:
+        os._exit(0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FLUSH (백그라운드 쪽)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _claimed_queues() -> list[Path]:
+    return sorted(HOOKS_DIR.glob(QUEUE_NAME + ".*"))
+
+
+def flush_pending() -> int:
+    """큐를 가져와(rename) 레코드를 적용. 처리한 레코드 수 반환
+
+    이전 flush가 비정상 종료해 남긴 큐(.pending-writes.jsonl.<pid>-<ns>)도 함께 처리합니다.
+    """
+    if fcntl is None:
+        return 0
+
+    path = queue_path()
+    claimed = path.with_name(f"{QUEUE_NAME}.{os.getpid()}-{time.time_ns()}")
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        pass
+
+    applied = 0
+    for queue in _claimed_queues():
+        try:
+            fd = os.open(queue, os.O_RDWR)
+        except FileNotFoundError:
+            continue
+        try:
+            # 다른 flush가 처리 중이면 건너뜀, 진행 중인 enqueue는 끝날 때까지 대기
+            if queue != claimed:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            if not _same_file(fd, queue):
+                continue  # 다른 flush가 이미 처리함
+            with open(fd, "rb", closefd=False) as f:
+                raw = f.read()
+            records = []
+            for line in raw.decode("utf-8", errors="replace").splitlines():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass
+            applied += apply_records(records)
+            try:
+                os.unlink(queue)
+            except FileNotFoundError:
+                pass
+        finally:
+            os.close(fd)
+    return applied
+
+
+def apply_records(records: list[dict]) -> int:
+    """레코드를 파일별로 묶어 순서대로 적용"""
+    by_path: dict = {}
+    for record in records:
+        if isinstance(record, dict) and record.get("path"):
+            by_path.setdefault(record["path"], []).append(record)
+
+    modules: dict = {}
+    for path, path_records in by_path.items():
+        try:
+            _apply_path(path, path_records, modules)
+        except Exception:
+            pass
+    return sum(len(r) for r in by_path.values())
+
+
+def _apply_path(path: str, records: list[dict], modules: dict):
+    """한 파일의 레코드 적용 - 연속된 append는 한 번에, transform은 읽기/쓰기 1회"""
+    target = Path(path)
+    index = 0
+    while index < len(records):
+        if "append" in records[index]:
+            chunk = []
+            while index < len(records) and "append" in records[index]:
+                chunk.append(str(records[index]["append"]))
+                index += 1
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "a", encoding="utf-8") as f:
+                f.write("".join(chunk))
+            _invalidate(target)
+            continue
+
+        batch = []
+        while index < len(records) and "append" not in records[index]:
+            batch.append(records[index])
+            index += 1
+        _apply_transforms(target, batch, modules)
+        _invalidate(target)
+
+
+def _apply_transforms(target: Path, records: list[dict], modules: dict):
+    """연속된 transform을 읽기/쓰기 1회로 적용 (utils가 있으면 잠금 + 원자적 교체)"""
+    try:
+        if str(HOOKS_DIR) not in sys.path:
+            sys.path.insert(0, str(HOOKS_DIR))
+        from utils import FileUpdate
+    except ImportError:
+        FileUpdate = None
+
+    def run(content: str) -> str:
+        for record in records:
+            transform = _find_transform(record, modules)
+            if transform is None:
+                continue
+            try:
+                updated = transform(content, *record.get("args", []))
+            except Exception:
+                continue
+            if updated is not None:
+                content = updated
+        return content
+
+    if FileUpdate is not None:
+        try:
+            with FileUpdate(target) as update:
+                if update.exists:
+                    update.content = run(update.content)
+        except (OSError, UnicodeDecodeError):
+            pass
+        return
+
+    try:
+        original = target.read_text(encoding="utf-8")
+    except (FileNotFoundError, UnicodeDecodeError):
+        return
+    content = run(original)
+    if content != original:
+        write_changed(target, original, content)
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """a, b의 공통 앞부분 길이 (블록 단위로 비교한 뒤 바이트 단위로)"""
+    limit = min(len(a), len(b))
+    start = 0
+    block = 4096
+    while start + block <= limit and a[start:start + block] == b[start:start + block]:
+        start += block
+    while start < limit and a[start] == b[start]:
+        start += 1
+    return start
+
+
+def write_changed(path, original: str, updated: str):
+    """original → updated 변경을 처음 달라진 바이트부터만 씀 (파일 전체를 다시 쓰지 않음)"""
+    old = original.encode("utf-8")
+    new = updated.encode("utf-8")
+    start = _common_prefix(old, new)
+    with open(path, "r+b") as f:
+        if os.fstat(f.fileno()).st_size != len(old):
+            start = 0  # 읽은 뒤 다른 곳에서 바뀜 - 전체를 씀
+        f.seek(start)
+        f.write(new[start:])
+        f.truncate()
+
+
+def _find_transform(record: dict, modules: dict):
+    hook = record.get("hook", "")
+    if hook not in modules:
+        try:
+            if str(HOOKS_DIR) not in sys.path:
+                sys.path.insert(0, str(HOOKS_DIR))
+            from hook_runtime import load_hook
+            modules[hook] = load_hook(hook)
+        except Exception:
+            modules[hook] = None
+    return getattr(modules[hook], str(record.get("transform")), None)
+
+
+def _invalidate(path: Path):
+    """같은 프로세스의 utils 읽기 캐시 무효화"""
+    utils = sys.modules.get("utils")
+    if utils is not None and hasattr(utils, "invalidate_cached_text"):
+        utils.invalidate_cached_text(path)
+
+
+def pending_count() -> int:
+    count = 0
+    for queue in [queue_path()] + _claimed_queues():
+        try:
+            with open(queue, "rb") as f:
+                count += sum(1 for _ in f)
+        except FileNotFoundError:
+            pass
+    return count
+
+
+def main():
+    if "--status" in sys.argv[1:]:
+        print(f"{pending_count()} pending writes ({queue_path()})")
+        sys.exit(0)
+
+    if "--flush" in sys.argv[1:]:
+        applied = flush_pending()
+        if sys.stdout.isatty():
+            print(f"applied {applied} writes")
+        sys.exit(0)
+
+    print("Usage: python3 deferred_writes.py --flush | --status", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
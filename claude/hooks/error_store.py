@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Error Store - 자동 기록 오류의 세그먼트 저장소 + 요약 압축
+
+post-bash가 오류 출력마다 남기는 기록을 knowledge/errors.md 대신
+knowledge/errors.d/ 아래 크기 기반 세그먼트에 덧붙입니다. errors.md는
+사람이 관리하는 "## 알려진 해결책" 등만 남아 작게 유지됩니다.
+
+- 세그먼트: errors.d/segment-000001.md, ... (SEGMENT_MAX_BYTES 초과 시 다음 번호)
+- 최근 기록 조회: 마지막 세그먼트 끝에서 필요한 만큼만 읽음 (O(최근))
+- 압축: 최근 KEEP_SEGMENTS개를 제외한 세그먼트를 (분류, 패턴, 명령어)별
+  횟수로 합쳐 errors.d/summary.json에 누적하고 summary.md로 렌더링한 뒤 삭제
+- 이전 형식 이전: errors.md에 쌓인 자동 기록 블록을 요약으로 옮기고 errors.md에서 제거
+- session-start가 세션마다 maintain()으로 이전/압축 (필요할 때만)
+
+사용법:
+    python3 error_store.py --status  [<project-dir>]
+    python3 error_store.py --compact [<project-dir>]   # 이전 + 모든 밀봉 세그먼트 압축
+"""
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from utils import FileUpdate
+except ImportError:
+    FileUpdate = None
+
+ERRORS_DIR_NAME = "errors.d"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_MAX_BYTES = 256 * 1024
+KEEP_SEGMENTS = 2           # 압축하지 않고 원문으로 두는 최근 세그먼트 수
+SUMMARY_MAX_ENTRIES = 200   # 요약에 남기는 (분류, 패턴, 명령어) 수 (오래된 것부터 제거)
+TAIL_READ_BYTES = 64 * 1024
+
+SEGMENT_PATTERN = re.compile(rf"^{SEGMENT_PREFIX}(\d+)\.md$")
+
+# post-bash 기록 블록 (format_entry와 같은 형식)
+ENTRY_HEADER = re.compile(r"^## \[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\] (\S+) Error[ \t]*$", re.MULTILINE)
+ENTRY_FIELDS = re.compile(
+    r"\*\*패턴\*\*: `(?P<pattern>[^`\n]*)`\n"
+    r"\*\*명령어\*\*:\n```bash\n(?P<command>.*?)\n```\n"
+    r"\*\*출력\*\*:\n```\n(?P<output>.*?)\n```\n"
+    r"(?:\*\*추천 해결책\*\*:\n(?P<solution>.*?)\n)?"
+    r"\n---",
+    re.DOTALL,
+)
+
+
+def errors_dir(knowledge_dir) -> Path:
+    return Path(knowledge_dir) / ERRORS_DIR_NAME
+
+
+def summary_path(knowledge_dir) -> Path:
+    return errors_dir(knowledge_dir) / "summary.json"
+
+
+def segment_paths(knowledge_dir) -> list[Path]:
+    """세그먼트 파일 (번호 순)"""
+    try:
+        names = os.listdir(errors_dir(knowledge_dir))
+    except OSError:
+        return []
+    numbered = []
+    for name in names:
+        match = SEGMENT_PATTERN.match(name)
+        if match:
+            numbered.append((int(match.group(1)), name))
+    return [errors_dir(knowledge_dir) / name for _, name in sorted(numbered)]
+
+
+def segment_name(number: int) -> str:
+    return f"{SEGMENT_PREFIX}{number:06d}.md"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WRITE (post-bash)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def current_segment(knowledge_dir) -> Path:
+    """새 기록을 덧붙일 세그먼트 (마지막 세그먼트가 가득 차면 다음 번호)"""
+    directory = errors_dir(knowledge_dir)
+    directory.mkdir(exist_ok=True)
+    segments = segment_paths(knowledge_dir)
+    if not segments:
+        return directory / segment_name(1)
+    last = segments[-1]
+    try:
+        size = last.stat().st_size
+    except OSError:
+        size = 0
+    if size < SEGMENT_MAX_BYTES:
+        return last
+    number = int(SEGMENT_PATTERN.match(last.name).group(1)) + 1
+    return directory / segment_name(number)
+
+
+def format_entry(timestamp: str, category: str, pattern: str, command: str,
+                 output: str, solution: str = "") -> str:
+    """오류 기록 블록 (parse_entries로 다시 읽을 수 있는 형식)"""
+    entry = f"""
+## [{timestamp}] {category} Error
+**패턴**: `{pattern}`
+**명령어**:
+```bash
+{command}
+```
+**출력**:
+```
+{output}
+```
+"""
+    if solution:
+        entry += f"**추천 해결책**:\n{solution}\n"
+    return entry + "\n---\n"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _entry_blocks(text: str) -> list[str]:
+    """기록 블록 목록 (첫 헤더 앞의 텍스트는 버림)"""
+    starts = [m.start() for m in ENTRY_HEADER.finditer(text)]
+    return [text[a:b].strip() for a, b in zip(starts, starts[1:] + [len(text)])]
+
+
+def _iter_parsed(text: str):
+    """(헤더 시작, 기록 끝, 기록) - 형식이 맞지 않는 헤더 블록은 건너뜀"""
+    headers = list(ENTRY_HEADER.finditer(text))
+    for header, following in zip(headers, headers[1:] + [None]):
+        fields = ENTRY_FIELDS.search(text, header.end(), following.start() if following else len(text))
+        if not fields or fields.start() != header.end() + 1:
+            continue
+        yield header.start(), fields.end(), {
+            "timestamp": header.group(1),
+            "category": header.group(2),
+            "pattern": fields.group("pattern"),
+            "command": fields.group("command"),
+            "output": fields.group("output"),
+            "solution": fields.group("solution") or "",
+        }
+
+
+def parse_entries(text: str) -> list[dict]:
+    """기록 블록 파싱 → {"timestamp", "category", "pattern", "command", "output", "solution"}"""
+    return [entry for _, _, entry in _iter_parsed(text)]
+
+
+def _read_tail(path: Path, limit: int) -> tuple[str, bool]:
+    """파일 끝 limit바이트 (전체를 읽었는지 여부와 함께)"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - limit))
+        raw = f.read()
+    return raw.decode("utf-8", errors="ignore"), size <= limit
+
+
+def recent_errors(knowledge_dir, limit: int = 3) -> list[str]:
+    """최근 오류 기록 블록 (오래된 것 → 최신 순, 세그먼트 끝에서부터 필요한 만큼만 읽음)"""
+    if limit <= 0:
+        return []
+    found = []
+    for segment in reversed(segment_paths(knowledge_dir)):
+        wanted = limit - len(found)
+        read_bytes = TAIL_READ_BYTES
+        try:
+            while True:
+                text, whole = _read_tail(segment, read_bytes)
+                blocks = _entry_blocks(text)
+                if not whole:
+                    blocks = blocks[1:]  # 첫 블록은 중간부터 읽었을 수 있음
+                if whole or len(blocks) >= wanted:
+                    break
+                read_bytes *= 4
+        except OSError:
+            continue
+        if blocks:
+            found = blocks[-wanted:] + found
+        if len(found) >= limit:
+            break
+    return found
+
+
+def load_summary(knowledge_dir) -> dict:
+    """{키: {"category", "pattern", "command", "count", "first", "last", "output", "solution"}}"""
+    try:
+        data = json.loads(summary_path(knowledge_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries", {}) if isinstance(data, dict) else {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def top_errors(knowledge_dir, limit: int = 5) -> list[dict]:
+    """요약에서 자주 반복된 오류 (횟수, 최근 순)"""
+    entries = load_summary(knowledge_dir).values()
+    return sorted(entries, key=lambda e: (e.get("count", 0), e.get("last", "")), reverse=True)[:limit]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COMPACTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _entry_key(entry: dict) -> str:
+    return "\x1f".join((entry["category"], entry["pattern"], entry["command"]))
+
+
+def merge_entries(summary: dict, entries: list[dict]) -> dict:
+    """기록을 (분류, 패턴, 명령어)별 횟수로 합침 (마지막 출력/해결책 유지)"""
+    for entry in entries:
+        key = _entry_key(entry)
+        item = summary.get(key)
+        if item is None:
+            item = summary[key] = {
+                "category": entry["category"],
+                "pattern": entry["pattern"],
+                "command": entry["command"],
+                "count": 0,
+                "first": entry["timestamp"],
+                "last": entry["timestamp"],
+            }
+        item["count"] += entry.get("count", 1)
+        item["first"] = min(item["first"], entry["timestamp"])
+        if entry["timestamp"] >= item["last"]:
+            item["last"] = entry["timestamp"]
+            item["output"] = entry["output"][:300]
+            if entry["solution"]:
+                item["solution"] = entry["solution"]
+    return summary
+
+
+def render_summary(summary: dict) -> str:
+    """summary.md (사람이 읽는 요약)"""
+    lines = ["# 오류 요약", "", "> error_store.py가 압축한 자동 기록 (횟수, 최근 순). 원문은 최근 세그먼트에만 남습니다.", ""]
+    for item in sorted(summary.values(), key=lambda e: (e["count"], e["last"]), reverse=True):
+        lines.append(f"## {item['category']} Error ×{item['count']}")
+        lines.append(f"**패턴**: `{item['pattern']}` | **처음**: {item['first']} | **마지막**: {item['last']}")
+        lines.append(f"**명령어**: `{item['command'][:200]}`")
+        if item.get("solution"):
+            lines.append(f"**추천 해결책**:\n{item['solution']}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _save_summary(knowledge_dir, summary: dict):
+    if len(summary) > SUMMARY_MAX_ENTRIES:
+        keep = sorted(summary.items(), key=lambda kv: kv[1]["last"], reverse=True)[:SUMMARY_MAX_ENTRIES]
+        summary = dict(keep)
+    directory = errors_dir(knowledge_dir)
+    directory.mkdir(exist_ok=True)
+    for name, content in (
+        ("summary.json", json.dumps({"version": 1, "entries": summary}, ensure_ascii=False, indent=1)),
+        ("summary.md", render_summary(summary)),
+    ):
+        path = directory / name
+        tmp = path.with_name(f"{name}.tmp{os.getpid()}")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def _lock(knowledge_dir):
+    """압축 잠금 (다른 프로세스가 압축 중이면 None)"""
+    directory = errors_dir(knowledge_dir)
+    directory.mkdir(exist_ok=True)
+    fd = os.open(directory / ".lock", os.O_WRONLY | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+    return fd
+
+
+def _split_errors_md(text: str) -> tuple[str, list[dict]]:
+    """errors.md → (자동 기록을 뺀 내용, 자동 기록 목록)
+
+    같은 헤더 형식이라도 post-bash 형식이 아닌 직접 작성한 항목은 그대로 둡니다.
+    """
+    kept = []
+    entries = []
+    position = 0
+    for start, end, entry in _iter_parsed(text):
+        kept.append(text[position:start])
+        position = end
+        while position < len(text) and text[position] == "\n":
+            position += 1  # 구분선 뒤 빈 줄까지 제거
+        entries.append(entry)
+    kept.append(text[position:])
+    return "".join(kept).rstrip("\n") + "\n", entries
+
+
+def migrate_errors_md(knowledge_dir) -> int:
+    """errors.md에 쌓인 자동 기록을 요약으로 옮김 (옮긴 기록 수)
+
+    errors.md 잠금(utils.FileUpdate) 안에서 읽고 다시 쓰므로 같은 파일을 고치는
+    다른 쓰기(knowledge_compactor, 직접 편집 도구)의 변경을 덮어쓰지 않습니다.
+    """
+    if FileUpdate is None:
+        return 0
+    try:
+        with FileUpdate(Path(knowledge_dir) / "errors.md") as update:
+            if not update.exists:
+                return 0
+            cleaned, entries = _split_errors_md(update.content)
+            if not entries:
+                return 0
+            _save_summary(knowledge_dir, merge_entries(load_summary(knowledge_dir), entries))
+            update.content = cleaned
+    except (OSError, UnicodeDecodeError):
+        return 0
+    return len(entries)
+
+
+def compact(knowledge_dir, keep: int = KEEP_SEGMENTS) -> dict:
+    """오래된 세그먼트를 요약으로 압축하고 errors.md 자동 기록을 이전
+
+    Returns:
+        dict: {"segments": 압축한 세그먼트 수, "entries": 합친 기록 수, "migrated": errors.md에서 옮긴 수}
+    """
+    result = {"segments": 0, "entries": 0, "migrated": 0}
+    fd = _lock(knowledge_dir)
+    if fd is None:
+        return result
+    try:
+        result["migrated"] = migrate_errors_md(knowledge_dir)
+        sealed = segment_paths(knowledge_dir)[:-keep] if keep else segment_paths(knowledge_dir)
+        if not sealed:
+            return result
+        summary = load_summary(knowledge_dir)
+        for segment in sealed:
+            try:
+                entries = parse_entries(segment.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+            merge_entries(summary, entries)
+            result["entries"] += len(entries)
+        _save_summary(knowledge_dir, summary)
+        for segment in sealed:
+            try:
+                segment.unlink()
+            except OSError:
+                pass
+            result["segments"] += 1
+    finally:
+        os.close(fd)
+    return result
+
+
+def needs_maintenance(knowledge_dir, errors_md_headers=None) -> bool:
+    """압축할 세그먼트가 있거나 errors.md에 자동 기록이 남아 있는지
+
+    errors_md_headers: errors.md 헤더 줄 목록 (knowledge_index로 얻으면 파일을 읽지 않음)
+    """
+    if len(segment_paths(knowledge_dir)) > KEEP_SEGMENTS:
+        return True
+    if errors_md_headers is None:
+        try:
+            text = (Path(knowledge_dir) / "errors.md").read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return False
+        return ENTRY_HEADER.search(text) is not None
+    return any(ENTRY_HEADER.match(title) for title in errors_md_headers)
+
+
+def maintain(knowledge_dir, errors_md_headers=None) -> dict | None:
+    """필요할 때만 compact() 실행 (session-start)"""
+    if not errors_dir(knowledge_dir).parent.exists():
+        return None
+    if not needs_maintenance(knowledge_dir, errors_md_headers):
+        return None
+    return compact(knowledge_dir)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    project_dir = Path(args[0] if args else os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+    knowledge_dir = project_dir / ".claude" / "knowledge"
+    if not knowledge_dir.exists():
+        print(f"no knowledge directory: {knowledge_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    if "--compact" in sys.argv[1:]:
+        result = compact(knowledge_dir)
+        print(f"compacted {result['segments']} segments ({result['entries']} entries), "
+              f"migrated {result['migrated']} entries from errors.md")
+        sys.exit(0)
+
+    segments = segment_paths(knowledge_dir)
+    total = sum(s.stat().st_size for s in segments)
+    print(f"segments: {len(segments)} ({total:,} bytes) in {errors_dir(knowledge_dir)}")
+    print(f"summary:  {len(load_summary(knowledge_dir))} distinct errors")
+    for item in top_errors(knowledge_dir):
+        print(f"  ×{item['count']:<4} {item['category']:<10} {item['command'][:60]}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Event Log - 루프 hook 구조화 이벤트 기록 (JSONL + 오프셋 색인, 크기 기준 교체)
+
+unified-loop, ralph-loop, continuous-loop/research/review가 loop-log.md, ralph-loop.log,
+continuous-log.md, research-log.md, review-log.md에 자유 형식 줄을 계속 덧붙이던 것을
+레코드 하나당 JSON 한 줄로 바꿉니다. 파일은 교체되므로 크기가 제한되고, 최근 N개는
+색인으로 파일 끝부분만 읽습니다.
+
+- 기록: .claude/loop-events.jsonl
+  {"ts", "loop", "event", "iteration", "mode", "next", "duration", "message", ...}
+  loop: ralph / continuous / research / review / unified
+  event: iteration / complete / cancel / max_iterations / error ...
+  duration: 같은 loop의 직전 레코드 이후 경과 초 (없으면 null)
+- 색인: .claude/loop-events.idx - 레코드 시작 오프셋 (uint64 little-endian, 레코드당 8바이트)
+  → 최근 N개 = 색인 끝 8N바이트 + 기록 파일의 그 오프셋 이후 (파일 크기와 무관)
+  색인 마지막 레코드가 기록 끝과 맞지 않으면(중간에 끊긴 쓰기 등) 기록을 한 번 훑어 다시 만듦
+- 교체: 기록이 MAX_BYTES를 넘으면 기록과 색인을 .1로 교체 (최근 2개 파일 유지)
+- 쓰기는 잠금 안에서 기록 append 1회 + 색인 append 1회
+
+사용법:
+    event_log.append([{"loop": "ralph", "event": "iteration", "iteration": 3}])
+    event_log.last(10)                    # 최근 10개 (오래된 순)
+    event_log.last(5, loop="research")    # 최근 LOOKBACK개 안에서 research만
+
+    python3 event_log.py [-n 20] [--loop ralph]    # 최근 이벤트 출력
+"""
+import contextlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import FileLock
+except ImportError:
+    def FileLock(path):
+        return contextlib.nullcontext()
+
+EVENT_LOG = "loop-events.jsonl"
+EVENT_INDEX = "loop-events.idx"
+ROTATED_SUFFIX = ".1"
+MAX_BYTES = 512_000  # 초과 시 .1로 교체 (최근 2개 파일 유지)
+
+# loop 필터가 있을 때 거꾸로 살펴볼 최대 레코드 수 (조회 비용 상한)
+LOOKBACK = 256
+
+# 레코드 필드 길이 상한 (한 줄이 색인 단위이므로 레코드 크기도 제한)
+MAX_FIELD_CHARS = 500
+
+OFFSET = struct.Struct("<Q")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PATHS
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def claude_dir_path(claude_dir=None) -> Path:
+    if claude_dir:
+        return Path(claude_dir)
+    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())) / ".claude"
+
+
+def _paths(claude_dir, rotated: bool = False) -> tuple[Path, Path]:
+    suffix = ROTATED_SUFFIX if rotated else ""
+    base = claude_dir_path(claude_dir)
+    return base / (EVENT_LOG + suffix), base / (EVENT_INDEX + suffix)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def rebuild_index(log_path: Path, index_path: Path) -> int:
+    """기록 파일을 훑어 색인을 다시 만듦 (완전한 줄만) → 레코드 수"""
+    offsets = []
+    try:
+        with open(log_path, "rb") as f:
+            position = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    offsets.append(position)
+                position += len(line)
+    except OSError:
+        pass
+    try:
+        index_path.write_bytes(b"".join(OFFSET.pack(offset) for offset in offsets))
+    except OSError:
+        pass
+    return len(offsets)
+
+
+def _index_valid(log_path: Path, log_size: int, index_path: Path) -> bool:
+    """색인 마지막 오프셋의 레코드가 기록 끝에서 정확히 끝나는지 (기록이 비었으면 색인도 비었는지)"""
+    index_size = _size(index_path)
+    if index_size % OFFSET.size:
+        return False
+    if not index_size:
+        return log_size == 0
+    try:
+        with open(index_path, "rb") as f:
+            f.seek(index_size - OFFSET.size)
+            (last_offset,) = OFFSET.unpack(f.read(OFFSET.size))
+        if last_offset >= log_size:
+            return False
+        with open(log_path, "rb") as f:
+            f.seek(last_offset)
+            tail = f.read(log_size - last_offset)
+    except (OSError, struct.error):
+        return False
+    return tail.count(b"\n") == 1 and tail.endswith(b"\n")
+
+
+def _ends_with_newline(log_path: Path, log_size: int) -> bool:
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(log_size - 1)
+            return f.read(1) == b"\n"
+    except OSError:
+        return True
+
+
+def _tail_offsets(index_path: Path, count: int) -> list[int]:
+    index_size = _size(index_path)
+    start = max(0, index_size - count * OFFSET.size)
+    start -= start % OFFSET.size
+    try:
+        with open(index_path, "rb") as f:
+            f.seek(start)
+            data = f.read(index_size - start)
+    except OSError:
+        return []
+    return [offset for (offset,) in OFFSET.iter_unpack(data[:len(data) - len(data) % OFFSET.size])]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WRITE
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _clip(record: dict) -> dict:
+    return {key: value[:MAX_FIELD_CHARS] if isinstance(value, str) else value for key, value in record.items()}
+
+
+def append(records: list[dict], claude_dir=None) -> None:
+    """레코드를 기록 append 1회 + 색인 append 1회로 추가 (.claude/ 디렉토리가 없으면 기록하지 않음)"""
+    if not records:
+        return
+    log_path, index_path = _paths(claude_dir)
+    try:
+        if not log_path.parent.is_dir():
+            return
+        with FileLock(log_path):
+            log_size = _size(log_path)
+            if log_size > MAX_BYTES:
+                os.replace(log_path, log_path.with_name(log_path.name + ROTATED_SUFFIX))
+                if index_path.exists():
+                    os.replace(index_path, index_path.with_name(index_path.name + ROTATED_SUFFIX))
+                log_size = 0
+            if not _index_valid(log_path, log_size, index_path):
+                rebuild_index(log_path, index_path)
+
+            lines = [
+                (json.dumps(_clip(record), ensure_ascii=False, default=str).replace("\n", " ") + "\n").encode("utf-8")
+                for record in records
+            ]
+            if log_size and not _ends_with_newline(log_path, log_size):
+                lines.insert(0, b"\n")  # 끊긴 마지막 줄은 색인 없이 남겨 둠
+            offsets = []
+            position = log_size
+            for line in lines:
+                if line != b"\n":
+                    offsets.append(position)
+                position += len(line)
+
+            fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b"".join(lines))
+            finally:
+                os.close(fd)
+            fd = os.open(index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b"".join(OFFSET.pack(offset) for offset in offsets))
+            finally:
+                os.close(fd)
+    except OSError:
+        pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def _read_tail(log_path: Path, index_path: Path, count: int) -> list[dict]:
+    """한 파일 쌍의 마지막 count개 레코드 (오래된 순)"""
+    log_size = _size(log_path)
+    if not log_size or count <= 0:
+        return []
+    if not _index_valid(log_path, log_size, index_path):
+        with FileLock(log_path):
+            rebuild_index(log_path, index_path)
+    offsets = _tail_offsets(index_path, count)
+    if not offsets:
+        return []
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(offsets[0])
+            data = f.read(log_size - offsets[0])
+    except OSError:
+        return []
+
+    records = []
+    for line in data.split(b"\n"):
+        try:
+            record = json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records[-count:]
+
+
+def last(n: int = 10, loop: str | None = None, claude_dir=None) -> list[dict]:
+    """최근 n개 레코드 (오래된 순) - loop가 있으면 최근 LOOKBACK개 안에서 그 loop만"""
+    if n <= 0:
+        return []
+    want = LOOKBACK if loop else n
+    collected = []
+    for rotated in (False, True):
+        records = _read_tail(*_paths(claude_dir, rotated), want - len(collected))
+        collected = records + collected
+        if len(collected) >= want:
+            break
+    if loop:
+        collected = [record for record in collected if record.get("loop") == loop]
+    return collected[-n:]
+
+
+def format_record(record: dict) -> str:
+    """레코드 한 줄 표시 ("[ts] loop event #iteration (duration) next - message")"""
+    parts = [f"[{record.get('ts', '?')}]", record.get("loop", "?"), record.get("event", "?")]
+    if record.get("iteration") is not None:
+        parts.append(f"#{record['iteration']}")
+    if record.get("duration") is not None:
+        parts.append(f"({record['duration']}s)")
+    if record.get("next"):
+        parts.append(f"→ {record['next']}")
+    if record.get("message"):
+        parts.append(f"- {record['message']}")
+    return " ".join(str(part) for part in parts)
+
+
+def main(argv: list[str]) -> int:
+    n, loop = 20, None
+    args = iter(argv)
+    for arg in args:
+        if arg == "-n":
+            n = int(next(args, n))
+        elif arg == "--loop":
+            loop = next(args, None)
+    for record in last(n, loop):
+        print(format_record(record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -29,7 +29,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 try:
     from utils import (
         get_project_dir, get_claude_dir, ensure_dir,
-        safe_read_file, safe_write_file, get_full_timestamp
+        safe_read_file, get_full_timestamp, update_file, update_json
     )
 except ImportError:
     # Fallback implementations
@@ -50,17 +50,37 @@ except ImportError:
         except:
             return default
 
-    def safe_write_file(path, content) -> bool:
+    def update_file(path, *transforms, default=""):
+        content = safe_read_file(path, default)
+        updated = content
+        for transform in transforms:
+            updated = transform(updated)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(updated, encoding="utf-8")
+        return updated != content
+
+    def update_json(path, *mutators):
         try:
-            Path(path).parent.mkdir(parents=True, exist_ok=True)
-            Path(path).write_text(content, encoding="utf-8")
-            return True
-        except:
-            return False
+            data = json.loads(safe_read_file(path, "{}"))
+        except ValueError:
+            data = {}
+        for mutate in mutators:
+            result = mutate(data)
+            if isinstance(result, dict):
+                data = result
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return data
 
     def get_full_timestamp() -> str:
         return datetime.now().strftime("%Y-%m-%d %H:%M")
 
+# Input-file hash manifest (recompute every time if unavailable)
+try:
+    import change_cache
+except ImportError:
+    change_cache = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # EVOLUTION METRICS CONFIGURATION
@@ -97,11 +117,22 @@ def load_session_metrics() -> dict:
         return {}
 
 
-def save_session_metrics(metrics: dict) -> bool:
-    """Save session metrics"""
+def save_session_metrics(updates: dict) -> Optional[dict]:
+    """Merge updates into session metrics under the file lock (None if the update failed)
+
+    Concurrent Stop hooks each re-read the file inside the lock, so one hook's
+    fields are never overwritten by another hook's stale copy.
+    """
     metrics_path = get_evolution_dir() / METRICS_FILE
-    metrics["last_updated"] = get_full_timestamp()
-    return safe_write_file(metrics_path, json.dumps(metrics, indent=2, ensure_ascii=False))
+
+    def merge(metrics: dict):
+        metrics.update(updates)
+        metrics["last_updated"] = get_full_timestamp()
+
+    try:
+        return update_json(metrics_path, merge)
+    except (OSError, ValueError):
+        return None
 
 
 def collect_file_metrics() -> dict:
@@ -142,11 +173,27 @@ def collect_file_metrics() -> dict:
     return metrics
 
 
+def cached_result(name: str, paths: list, compute):
+    """Reuse the previous result while the input files are unchanged"""
+    if change_cache is None:
+        return compute()
+    cache = change_cache.ChangeCache(get_claude_dir(), "evolution-feedback")
+    value = cache.get(name, paths)
+    if value is None:
+        value = compute()
+        cache.put(name, value)
+        cache.save()
+    return value
+
+
 def collect_task_metrics() -> dict:
-    """Collect metrics about completed tasks"""
-    claude_dir = get_claude_dir()
-    todo_file = claude_dir / "todo.md"
+    """Collect metrics about completed tasks (cached until todo.md changes)"""
+    todo_file = get_claude_dir() / "todo.md"
+    return cached_result("tasks", [todo_file], lambda: count_task_metrics(todo_file))
 
+
+def count_task_metrics(todo_file: Path) -> dict:
+    """Count task states in todo.md"""
     metrics = {
         "tasks_completed": 0,
         "tasks_pending": 0,
@@ -163,6 +210,21 @@ def collect_task_metrics() -> dict:
     return metrics
 
 
+def count_spec_predictions(spec_files: list[Path]) -> dict:
+    """Count predicted tasks and files across spec files"""
+    predictions = {"specs_found": 0, "tasks_predicted": 0, "files_predicted": 0}
+    for spec_file in spec_files:
+        predictions["specs_found"] += 1
+        content = safe_read_file(spec_file)
+
+        # Count predicted tasks
+        predictions["tasks_predicted"] += len(re.findall(r'TASK-\d+', content))
+
+        # Count predicted files
+        predictions["files_predicted"] += len(re.findall(r'`[^`]+\.(ts|js|py|md)`', content))
+    return predictions
+
+
 def collect_spec_accuracy() -> Optional[dict]:
     """Compare spec predictions vs actual outcomes"""
     claude_dir = get_claude_dir()
@@ -183,15 +245,8 @@ def collect_spec_accuracy() -> Optional[dict]:
 
     # This is a simplified version - actual implementation would
     # parse spec files and compare with git history
-    for spec_file in spec_dir.glob("*.md"):
-        accuracy["specs_found"] += 1
-        content = safe_read_file(spec_file)
-
-        # Count predicted tasks
-        accuracy["tasks_predicted"] += len(re.findall(r'TASK-\d+', content))
-
-        # Count predicted files
-        accuracy["files_predicted"] += len(re.findall(r'`[^`]+\.(ts|js|py|md)`', content))
+    spec_files = sorted(spec_dir.glob("*.md"))
+    accuracy.update(cached_result("spec_predictions", spec_files, lambda: count_spec_predictions(spec_files)))
 
     # Get actual from git
     file_metrics = collect_file_metrics()
@@ -260,14 +315,15 @@ def update_learned_patterns(patterns: list[str]) -> bool:
     patterns_path = get_evolution_dir() / PATTERNS_FILE
     timestamp = get_full_timestamp()
 
-    content = safe_read_file(patterns_path, "# Learned Patterns\n\n")
-
     # Add new patterns section
-    content += f"\n## Session {timestamp}\n\n"
+    section = f"\n## Session {timestamp}\n\n"
     for pattern in patterns:
-        content += f"- {pattern}\n"
+        section += f"- {pattern}\n"
 
-    return safe_write_file(patterns_path, content)
+    try:
+        return update_file(patterns_path, lambda content: content + section, default="# Learned Patterns\n\n")
+    except OSError:
+        return False
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -278,21 +334,25 @@ def log_routing_decision(decision: dict) -> bool:
     """Log agent routing decisions for analysis"""
     routing_path = get_evolution_dir() / ROUTING_LOG
 
-    # Load existing log
-    content = safe_read_file(routing_path, "[]")
-    try:
-        log = json.loads(content)
-    except:
-        log = []
-
-    # Add new decision
     decision["timestamp"] = get_full_timestamp()
-    log.append(decision)
 
-    # Keep last 100 decisions
-    log = log[-100:]
-
-    return safe_write_file(routing_path, json.dumps(log, indent=2, ensure_ascii=False))
+    def append_decision(content: str) -> str:
+        try:
+            log = json.loads(content)
+        except ValueError:
+            log = []
+        if not isinstance(log, list):
+            log = []
+        log.append(decision)
+        # Keep last 100 decisions
+        return json.dumps(log[-100:], indent=2, ensure_ascii=False)
+
+    # Read-modify-write inside one lock (update_json only handles objects; the log is a list)
+    try:
+        update_file(routing_path, append_decision, default="[]")
+        return True
+    except OSError:
+        return False
 
 
 def analyze_routing_effectiveness() -> dict:
@@ -346,19 +406,22 @@ def run_evolution_cycle() -> dict:
         "recommendations": [],
     }
 
-    # 1. Collect all metrics
-    metrics = load_session_metrics()
-
-    metrics["files"] = collect_file_metrics()
-    metrics["tasks"] = collect_task_metrics()
+    # 1. Collect all metrics (outside the lock - git/todo/spec scans can be slow)
+    updates = {
+        "files": collect_file_metrics(),
+        "tasks": collect_task_metrics(),
+    }
 
     spec_accuracy = collect_spec_accuracy()
     if spec_accuracy:
-        metrics["spec_accuracy"] = spec_accuracy
+        updates["spec_accuracy"] = spec_accuracy
 
-    # 2. Save updated metrics
-    if save_session_metrics(metrics):
+    # 2. Merge into the saved metrics (locked read-modify-write)
+    metrics = save_session_metrics(updates)
+    if metrics is not None:
         results["metrics_collected"] = True
+    else:
+        metrics = {**load_session_metrics(), **updates}
 
     # 3. Extract patterns
     patterns = extract_successful_patterns(metrics)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Hook Client - hook 데몬 클라이언트 (경량 shim)
+
+settings.json의 모든 hook 명령이 이 스크립트를 거칩니다.
+stdin/cwd/env를 hook 데몬에 전달하고 응답의 stdout/stderr/exit code를
+그대로 재현합니다. 데몬 요청 왕복은 ~6 ms지만, 이 클라이언트도 python3 프로세스라
+인터프리터 시작(~13 ms)과 json/socket import가 명령마다 남습니다 (README "Hook 데몬" 측정 참고).
+
+동작:
+1. 데몬 소켓에 연결 → 요청 전송 → 응답 재현
+2. 연결 실패 시 데몬을 백그라운드로 시작하고, 이번 요청은 로컬에서 실행
+3. Unix socket 미지원(Windows) 또는 CLAUDE_HOOKD=0 이면 항상 로컬 실행
+
+사용법:
+    python3 ~/.claude/hooks/hook-client.py <hook-name> [<hook-name> ...]
+
+여러 hook을 지정하면 한 번의 요청으로 순서대로 실행하고 출력을 병합합니다.
+preconditions.json의 사전 조건을 통과하지 못한 hook은 데몬에 보내지 않고,
+모두 건너뛰면 바로 종료합니다 (hook_preconditions.py).
+명령 단위 실행 시간(데몬 왕복 포함)은 .claude/hook-latency.jsonl에 기록합니다.
+
+CLAUDE_HOOKS_RECORD=<파일>이면 받은 이벤트를 JSONL로 기록합니다
+(scripts/bench-hooks.py --stream 으로 재생).
+"""
+import json
+import os
+import socket
+import sys
+import time
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+CONNECT_TIMEOUT = 0.2
+
+
+def get_socket_path() -> str:
+    return os.environ.get("CLAUDE_HOOKD_SOCKET") or os.path.join(HOOKS_DIR, ".hookd.sock")
+
+
+def daemon_enabled() -> bool:
+    return hasattr(socket, "AF_UNIX") and os.environ.get("CLAUDE_HOOKD", "1") != "0"
+
+
+def request_daemon(request: dict):
+    """데몬에 요청 (연결 실패 시 None)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(get_socket_path())
+    except OSError:
+        sock.close()
+        return None
+
+    try:
+        sock.settimeout(None)
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def spawn_daemon():
+    """데몬을 세션에서 분리된 백그라운드 프로세스로 시작"""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(HOOKS_DIR, "hook-daemon.py")],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except Exception:
+        pass
+
+
+def filter_hooks(hook_names: list, stdin_text: str) -> list:
+    """사전 조건을 통과한 hook만 (검사 모듈이 없거나 실패하면 전부)"""
+    if HOOKS_DIR not in sys.path:
+        sys.path.insert(0, HOOKS_DIR)
+    try:
+        from hook_preconditions import filter_hooks as precondition_filter
+        return precondition_filter(hook_names, stdin_text)
+    except Exception:
+        return hook_names
+
+
+def run_local(hook_names: list, stdin_text: str) -> dict:
+    if HOOKS_DIR not in sys.path:
+        sys.path.insert(0, HOOKS_DIR)
+    from hook_runtime import run_hooks
+
+    return run_hooks(hook_names, stdin_text, check_preconditions=False)._asdict()
+
+
+def record_latency(entry: dict):
+    """명령 단위 지연 시간 기록 (utils.record_hook_latency와 같은 파일, import 없이 직접 append)"""
+    if os.environ.get("CLAUDE_HOOK_LATENCY", "1") == "0":
+        return
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    path = os.path.join(project_dir, ".claude", "hook-latency.jsonl")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    except OSError:
+        return  # .claude/ 가 없는 프로젝트
+    try:
+        os.write(fd, (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def record_event(path: str, hook_names: list, stdin_text: str):
+    """벤치마크 재생용 이벤트 기록 ({"hooks": [...], "stdin": "..."})"""
+    line = json.dumps({"hooks": hook_names, "stdin": stdin_text}, ensure_ascii=False) + "\n"
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    except OSError:
+        return
+    try:
+        os.write(fd, line.encode("utf-8"))
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def main():
+    started = time.time()
+    start = time.perf_counter()
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 hook-client.py <hook-name> [<hook-name> ...]", file=sys.stderr)
+        sys.exit(1)
+
+    hook_names = []
+    for arg in sys.argv[1:]:
+        name = os.path.basename(arg)
+        hook_names.append(name[:-3] if name.endswith(".py") else name)
+
+    stdin_text = sys.stdin.read()
+
+    record_path = os.environ.get("CLAUDE_HOOKS_RECORD")
+    if record_path:
+        record_event(record_path, hook_names, stdin_text)
+
+    command = " ".join(hook_names)
+    hook_names = filter_hooks(hook_names, stdin_text)
+
+    response = None
+    via = "daemon"
+    if not hook_names:
+        via = "skipped"
+        response = {}
+    elif daemon_enabled():
+        response = request_daemon({
+            "hooks": hook_names,
+            "stdin": stdin_text,
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+            "check_preconditions": False,
+        })
+        if response is None:
+            spawn_daemon()
+
+    if response is None:
+        via = "local"
+        response = run_local(hook_names, stdin_text)
+
+    stdout = response.get("stdout", "")
+    sys.stdout.write(stdout)
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+
+    record_latency({
+        "ts": round(started, 3),
+        "event": os.environ.get("CLAUDE_HOOK_EVENT", ""),
+        "command": command,
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+        "stdin": len(stdin_text.encode("utf-8")),
+        "stdout": len(stdout.encode("utf-8")),
+        "exit": response.get("exit_code", 0),
+        "via": via,
+    })
+    sys.exit(response.get("exit_code", 0))
+
+
+if __name__ == "__main__":
+    main()
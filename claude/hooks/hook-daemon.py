@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Hook Daemon - 상주 hook 서버 (Unix socket)
+
+hook 이벤트마다 python3 인터프리터를 새로 띄우는 대신,
+모든 hook 모듈을 미리 import한 상태로 상주하며 요청을 처리합니다.
+
+기능:
+- 시작 시 claude/hooks의 모든 hook 모듈, 공유 모듈(utils, hook_preconditions + manifest,
+  deferred_writes, todo_model), 규칙 번들 사전 로드 (warm) → fork된 자식은 import 없이 바로 실행
+- 요청마다 fork 전에 부모에서 그 프로젝트의 todo.md 스냅샷과 (user-prompt-submit이면) knowledge
+  검색 색인을 갱신 → 자식의 todo_model.load()/knowledge_search.search()는 stat()만
+  (자식에서 채운 캐시는 자식과 함께 사라지므로 부모에 두어야 이벤트 사이에 유지됨)
+- 요청마다 fork → 자식 프로세스에서 cwd/env/stdin을 격리해 실행
+- hook 파일이 수정되면 다음 요청에서 자동 재로드
+- hook의 지연 쓰기(deferred_writes)는 응답을 보낸 뒤 자식 프로세스에서 처리
+- 유휴 시간 초과 시 자동 종료 (CLAUDE_HOOKD_IDLE, 기본 1800초)
+
+사용법:
+    python3 hook-daemon.py           # 포그라운드 실행
+    python3 hook-daemon.py --stop    # 실행 중인 데몬 종료
+    python3 hook-daemon.py --status  # 상태 확인
+
+hook-client.py가 데몬이 없을 때 자동으로 백그라운드 실행합니다.
+"""
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.resolve()))
+import hook_runtime  # noqa: E402
+from hook_runtime import (  # noqa: E402
+    HOOKS_DIR, LOCK_NAME, decode_message, encode_message,
+    get_socket_path, recv_all,
+)
+
+DEFAULT_IDLE_TIMEOUT = 1800
+LISTEN_BACKLOG = 64
+
+
+def get_idle_timeout() -> float:
+    try:
+        return float(os.environ.get("CLAUDE_HOOKD_IDLE", DEFAULT_IDLE_TIMEOUT))
+    except ValueError:
+        return DEFAULT_IDLE_TIMEOUT
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLIENT HELPERS (--stop / --status)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def send_control(command: str) -> dict | None:
+    """실행 중인 데몬에 제어 명령 전송"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(2)
+        sock.connect(str(get_socket_path()))
+        sock.sendall(encode_message({"command": command}))
+        sock.shutdown(socket.SHUT_WR)
+        return decode_message(recv_all(sock))
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REQUEST HANDLING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def request_hooks(request: dict) -> list[str]:
+    """요청의 hook 목록 ("hooks" 목록 또는 단일 "hook")"""
+    hooks = request.get("hooks")
+    if isinstance(hooks, list):
+        return [str(h) for h in hooks]
+    return [str(request.get("hook", ""))]
+
+
+def execute_request(request: dict) -> dict:
+    """요청 환경(cwd/env)을 적용하고 hook 실행 - fork된 자식에서 호출"""
+    env = request.get("env")
+    if isinstance(env, dict):
+        os.environ.clear()
+        os.environ.update(env)
+
+    cwd = request.get("cwd")
+    if cwd:
+        try:
+            os.chdir(cwd)
+        except OSError:
+            pass
+
+    result = hook_runtime.run_hooks(
+        request_hooks(request), request.get("stdin", ""),
+        check_preconditions=request.get("check_preconditions", True),
+    )
+    return result._asdict()
+
+
+def warm_shared_modules():
+    """hook_runtime이 요청마다 쓰는 공유 모듈을 부모에서 미리 import (manifest 포함)
+
+    자식에서 처음 import하면 요청마다 import 비용을 다시 냄 (fork 전에 부모에 있어야 공유됨)
+    """
+    for name in ("utils", "deferred_writes", "hook_preconditions", "todo_model"):
+        try:
+            __import__(name)
+        except Exception:
+            pass
+    refresh_manifest()
+
+
+def refresh_manifest():
+    """preconditions.json이 바뀌었으면 부모에서 다시 읽음 (바뀌지 않았으면 stat 1회)"""
+    preconditions = sys.modules.get("hook_preconditions")
+    if preconditions is not None:
+        try:
+            preconditions.load_manifest()
+        except Exception:
+            pass
+
+
+def request_project_dir(request: dict) -> str | None:
+    """요청의 프로젝트 디렉토리 (env의 CLAUDE_PROJECT_DIR, 없으면 cwd)"""
+    env = request.get("env")
+    project_dir = env.get("CLAUDE_PROJECT_DIR") if isinstance(env, dict) else None
+    return project_dir or request.get("cwd") or None
+
+
+def refresh_project_caches(request: dict):
+    """요청 프로젝트의 파싱 캐시를 부모에서 갱신 (바뀌지 않았으면 stat 1회) → fork된 자식이 물려받음
+
+    - todo.md 스냅샷 (todo_model)
+    - knowledge 검색 색인 (knowledge_search를 쓰는 hook이 요청에 있을 때만 - search.json/refs 로드, postings mmap)
+    """
+    project_dir = request_project_dir(request)
+    if not project_dir:
+        return
+    todo_model = sys.modules.get("todo_model")
+    if todo_model is not None:
+        try:
+            todo_model.load(todo_model.todo_path(project_dir))
+        except Exception:
+            pass
+    knowledge_search = sys.modules.get("knowledge_search")
+    if knowledge_search is not None and any(
+            getattr(entry[1], "knowledge_search", None) is not None
+            for entry in map(hook_runtime._modules.get, request_hooks(request)) if entry):
+        try:
+            knowledge_search.warm(Path(project_dir) / ".claude" / "knowledge")
+        except Exception:
+            pass
+
+
+def hold_deferred_writes():
+    """hook의 지연 쓰기를 이 프로세스가 응답 후 직접 처리하도록 설정"""
+    try:
+        import deferred_writes
+        deferred_writes.hold_flush()
+    except ImportError:
+        pass
+
+
+def flush_deferred_writes():
+    try:
+        import deferred_writes
+        deferred_writes.flush_pending()
+    except ImportError:
+        pass
+
+
+def respond(conn, data: dict):
+    try:
+        conn.sendall(encode_message(data))
+    except OSError:
+        pass
+
+
+def handle_connection(conn, server) -> bool:
+    """연결 하나 처리. 데몬을 계속 실행할지 여부 반환"""
+    request = decode_message(recv_all(conn))
+    if request is None:
+        respond(conn, {"exit_code": 1, "stdout": "", "stderr": "hook-daemon: invalid request\n"})
+        return True
+
+    command = request.get("command")
+    if command == "ping":
+        respond(conn, {"pid": os.getpid(), "hooks": sorted(hook_runtime._modules)})
+        return True
+    if command == "shutdown":
+        respond(conn, {"stopping": True})
+        return False
+
+    # 부모에서 최신 모듈/manifest를 로드해 두면 fork된 자식들이 이를 공유 (copy-on-write)
+    for name in request_hooks(request):
+        try:
+            hook_runtime.load_hook(name)
+        except Exception:
+            pass  # 자식에서 동일한 오류를 hook 결과로 보고
+    refresh_manifest()
+    refresh_project_caches(request)
+
+    if not hasattr(os, "fork"):
+        respond(conn, execute_request(request))
+        return True
+
+    pid = os.fork()
+    if pid == 0:
+        exit_status = 0
+        try:
+            server.close()
+            hold_deferred_writes()
+            respond(conn, execute_request(request))
+            conn.close()
+            flush_deferred_writes()  # 응답 이후 - hook 지연에 포함되지 않음
+        except BaseException:
+            exit_status = 1
+        finally:
+            try:
+                conn.close()
+            finally:
+                os._exit(exit_status)
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SERVER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def acquire_lock():
+    """단일 데몬 보장을 위한 lock 파일 (획득 실패 시 None)"""
+    import fcntl
+
+    lock_file = open(HOOKS_DIR / LOCK_NAME, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def serve() -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        print("hook-daemon: Unix socket을 지원하지 않는 플랫폼입니다.", file=sys.stderr)
+        return 1
+
+    lock_file = acquire_lock()
+    if lock_file is None:
+        return 0  # 이미 다른 데몬이 실행 중
+
+    socket_path = get_socket_path()
+    try:
+        socket_path.unlink()
+    except FileNotFoundError:
+        pass
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # 소켓 파일이 처음부터 0600으로 생기도록 (bind 후 chmod하면 잠깐 기본 권한으로 열림)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(old_umask)
+    server.listen(LISTEN_BACKLOG)
+    server.settimeout(get_idle_timeout())
+
+    # 종료된 자식 프로세스 자동 회수
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    hook_runtime.preload_hooks()
+    warm_shared_modules()
+    try:
+        import rule_bundle
+        rule_bundle.warm_rules()
+    except Exception:
+        pass
+
+    try:
+        running = True
+        while running:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break  # 유휴 시간 초과
+            except InterruptedError:
+                continue
+            with conn:
+                conn.settimeout(None)
+                running = handle_connection(conn, server)
+    finally:
+        server.close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        lock_file.close()
+
+    return 0
+
+
+def main():
+    args = sys.argv[1:]
+
+    if "--stop" in args:
+        response = send_control("shutdown")
+        print("hook-daemon stopped" if response else "hook-daemon not running")
+        sys.exit(0)
+
+    if "--status" in args:
+        response = send_control("ping")
+        if response:
+            print(f"hook-daemon running (pid {response.get('pid')}, {len(response.get('hooks', []))} hooks warm)")
+            sys.exit(0)
+        print("hook-daemon not running")
+        sys.exit(1)
+
+    sys.exit(serve())
+
+
+if __name__ == "__main__":
+    main()
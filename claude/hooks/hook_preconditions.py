@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Hook Preconditions - hook 실행 전 선언적 사전 조건 검사
+
+spec-check, post-edit, continuous-*, unified-loop처럼 대부분의 이벤트에서
+바로 종료하는 hook은 종료 조건을 preconditions.json에 선언합니다.
+hook-client.py와 hook_runtime.run_hooks가 이 조건을 먼저 평가해, 아무것도 하지 않을
+hook은 모듈 로드/데몬 요청 없이 건너뜁니다. scripts/setup.py는 파일 존재 조건만 있는
+명령에 셸 가드를 붙여 인터프리터 시작 자체를 생략합니다.
+
+조건은 hook의 실제 종료 조건보다 넓어야 합니다 (필요조건).
+조건이 통과해도 hook은 기존 검사를 그대로 수행하고, 판단할 수 없으면 항상 실행합니다.
+
+manifest 형식 (hook → 조건 목록, 모두 만족해야 실행):
+- {"file": ".claude/todo.md"}                       프로젝트 기준 파일 존재
+- {"input": "tool_input.file_path", ...}           stdin JSON 필드 (점 경로, 없으면 "")
+    present: true       비어 있지 않은 문자열
+    glob / not_glob     fnmatch 패턴 중 하나와 일치 / 모두 불일치
+    match / not_match   re.match 패턴 (flags: "i" → 대소문자 무시)
+    contains            소문자로 비교한 부분 문자열 중 하나 포함
+    in / not_in         값 목록
+- {"state": ".claude/agent-state.json", "field": "mode", "default": "idle", ...}
+    truthy / equals / in / not_in  JSON 상태 파일 필드 (점 경로 "research.active" 가능,
+                                   파일이 없거나 깨졌거나 필드가 없으면 default)
+- {"any": [...]} / {"all": [...]}
+
+CLAUDE_HOOK_PRECONDITIONS=0 이면 검사하지 않습니다.
+hook 상수를 옮겨 적은 조건(spec-check 패턴, continuous-* 키워드, unified-loop이 함께 실행하는
+전략의 시작 상태 파일)은 `python3 hook_preconditions.py --check`로 hook과 일치하는지 확인할 수 있습니다.
+
+사용법:
+    python3 hook_preconditions.py <hook-name> [...] < event.json   # run/skip 확인
+    python3 hook_preconditions.py --check                          # hook 상수와 manifest 비교
+"""
+import fnmatch
+import json
+import os
+import re
+import sys
+
+# hook-client.py가 import하므로 pathlib 없이 os.path만 사용 (시작 비용 최소화)
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_NAME = "preconditions.json"
+
+# (mtime_ns, hook → 조건 목록)
+_manifest: tuple | None = None
+
+# (pattern, flags) → 컴파일된 정규식
+_patterns: dict = {}
+
+
+def manifest_path() -> str:
+    return os.path.join(HOOKS_DIR, MANIFEST_NAME)
+
+
+def get_project_dir() -> str:
+    return os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+
+
+def preconditions_enabled() -> bool:
+    return os.environ.get("CLAUDE_HOOK_PRECONDITIONS", "1") != "0"
+
+
+def load_manifest() -> dict:
+    """hook → 조건 목록 (파일이 바뀌지 않았으면 메모리 캐시 재사용)"""
+    global _manifest
+    path = manifest_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+
+    if _manifest and _manifest[0] == mtime:
+        return _manifest[1]
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        hooks = data.get("hooks", {}) if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        hooks = {}
+    if not isinstance(hooks, dict):
+        hooks = {}
+
+    _manifest = (mtime, hooks)
+    return hooks
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EVALUATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _Context:
+    """한 이벤트의 평가 상태 (상태 파일은 이벤트당 한 번만 읽음)"""
+    __slots__ = ("data", "project_dir", "states")
+
+    def __init__(self, data, project_dir: str):
+        self.data = data
+        self.project_dir = project_dir
+        self.states = {}
+
+    def input_value(self, dotted: str):
+        """stdin JSON 필드 값 (stdin이 JSON 객체가 아니면 None → 판단 불가)"""
+        if not isinstance(self.data, dict):
+            return None
+        value = self.data
+        for key in dotted.split("."):
+            value = value.get(key, "") if isinstance(value, dict) else ""
+        return value
+
+    def state(self, rel_path: str) -> dict:
+        if rel_path not in self.states:
+            try:
+                with open(os.path.join(self.project_dir, rel_path), encoding="utf-8") as f:
+                    loaded = json.load(f)
+            except (OSError, ValueError):
+                loaded = None
+            self.states[rel_path] = loaded if isinstance(loaded, dict) else {}
+        return self.states[rel_path]
+
+
+def _compile(pattern: str, flags: str):
+    key = (pattern, flags)
+    if key not in _patterns:
+        _patterns[key] = re.compile(pattern, re.IGNORECASE if "i" in flags else 0)
+    return _patterns[key]
+
+
+def _check_value(value, condition: dict) -> bool:
+    """값 비교 연산 (조건에 있는 연산을 모두 만족해야 True)"""
+    if "truthy" in condition and bool(value) != bool(condition["truthy"]):
+        return False
+    if "equals" in condition and value != condition["equals"]:
+        return False
+    if "in" in condition and value not in condition["in"]:
+        return False
+    if "not_in" in condition and value in condition["not_in"]:
+        return False
+
+    text = value if isinstance(value, str) else ""
+    if condition.get("present") and not text.strip():
+        return False
+    if "glob" in condition and not any(fnmatch.fnmatchcase(text, p) for p in condition["glob"]):
+        return False
+    if "not_glob" in condition and any(fnmatch.fnmatchcase(text, p) for p in condition["not_glob"]):
+        return False
+
+    flags = condition.get("flags", "")
+    if "match" in condition and not any(_compile(p, flags).match(text) for p in condition["match"]):
+        return False
+    if "not_match" in condition and any(_compile(p, flags).match(text) for p in condition["not_match"]):
+        return False
+    if "contains" in condition:
+        lowered = text.lower()
+        if not any(word.lower() in lowered for word in condition["contains"]):
+            return False
+    return True
+
+
+def _evaluate(condition, context: _Context) -> bool:
+    if not isinstance(condition, dict):
+        return True
+    if "all" in condition:
+        return all(_evaluate(c, context) for c in condition["all"])
+    if "any" in condition:
+        return any(_evaluate(c, context) for c in condition["any"])
+    if "file" in condition:
+        return os.path.exists(os.path.join(context.project_dir, condition["file"]))
+    if "input" in condition:
+        value = context.input_value(condition["input"])
+        return value is None or _check_value(value, condition)
+    if "state" in condition:
+        value = context.state(condition["state"])
+        for key in condition.get("field", "").split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is None:
+            value = condition.get("default")
+        return _check_value(value, condition)
+    return True  # 알 수 없는 조건은 실행 쪽으로
+
+
+def should_run(hook: str, data=None, project_dir=None, context: _Context = None) -> bool:
+    """hook의 사전 조건 충족 여부 (조건이 없거나 평가 오류면 True)"""
+    conditions = load_manifest().get(hook)
+    if not conditions:
+        return True
+    if context is None:
+        context = _Context(data, project_dir or get_project_dir())
+    try:
+        return all(_evaluate(c, context) for c in conditions)
+    except Exception:
+        return True
+
+
+def filter_hooks(names: list, stdin_text: str = "", data=None) -> list:
+    """사전 조건을 통과한 hook 이름만 (순서 유지)
+
+    data가 없으면 stdin_text를 파싱합니다. 비활성화 시 names 그대로 반환.
+    """
+    if not preconditions_enabled() or not load_manifest():
+        return list(names)
+    if data is None:
+        try:
+            data = json.loads(stdin_text) if stdin_text else None
+        except ValueError:
+            data = None
+    context = _Context(data, get_project_dir())
+    return [name for name in names if should_run(name, context=context)]
+
+
+def required_files(hook: str) -> list[str]:
+    """hook이 실행되려면 반드시 있어야 하는 파일 (최상위 file 조건)"""
+    return [c["file"] for c in load_manifest().get(hook, [])
+            if isinstance(c, dict) and "file" in c]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MANIFEST CHECK
+# ═══════════════════════════════════════════════════════════════════════════
+
+def hook_constants() -> dict:
+    """hook 모듈의 상수로 만든 조건 값 ((hook, 조건 키) → 목록, preconditions.json과 같아야 함)"""
+    from hook_runtime import load_hook
+
+    spec, research, review = load_hook("spec-check"), load_hook("continuous-research"), load_hook("continuous-review")
+    return {
+        ("spec-check", "match"): spec.SIGNIFICANT_CHANGE_PATTERNS,
+        ("spec-check", "not_match"): spec.EXCLUDE_PATTERNS,
+        ("continuous-research", "contains"): research.RESEARCH_KEYWORDS,
+        ("continuous-review", "contains"): review.REVIEW_KEYWORDS,
+    }
+
+
+def _walk(hook: str):
+    """hook의 모든 조건 (any/all 안까지, 선언 순서)"""
+    pending = list(load_manifest().get(hook, []))
+    while pending:
+        condition = pending.pop(0)
+        if isinstance(condition, dict):
+            yield condition
+            pending[:0] = condition.get("any", []) + condition.get("all", [])
+
+
+def _manifest_value(hook: str, key: str):
+    """hook 조건 중 key를 가진 첫 조건의 값 (없으면 None)"""
+    return next((condition[key] for condition in _walk(hook) if key in condition), None)
+
+
+def _state_conditions(hook: str) -> set:
+    """hook 조건의 (상태 파일, 필드) 전체"""
+    return {(condition["state"], condition.get("field")) for condition in _walk(hook) if "state" in condition}
+
+
+def hosted_state_files() -> dict:
+    """unified-loop이 함께 실행하는 전략의 시작 상태 파일 (전략 이름 → legacy_file)"""
+    from hook_runtime import load_hook
+
+    return {strategy.name: strategy.legacy_file for strategy in load_hook("unified-loop").hosted_strategies()
+            if strategy.legacy_file}
+
+
+def check_manifest() -> list[str]:
+    """hook 상수와 다른 manifest 조건 ("hook.key" 목록)"""
+    mismatched = [f"{hook}.{key}" for (hook, key), expected in hook_constants().items()
+                  if _manifest_value(hook, key) != list(expected)]
+    # 스킬이 상태 파일만 써서 시작한 루프도 unified-loop이 건너뛰지 않아야 함
+    states = _state_conditions("unified-loop")
+    mismatched += [f"unified-loop.state({legacy_file})" for legacy_file in hosted_state_files().values()
+                   if (legacy_file, "active") not in states]
+    return mismatched
+
+
+def main():
+    if "--check" in sys.argv[1:]:
+        mismatched = check_manifest()
+        for name in mismatched:
+            print(f"✗ {name}: hook 정의와 다름", file=sys.stderr)
+        print(f"{MANIFEST_NAME}: {'OK' if not mismatched else f'{len(mismatched)} mismatched'}")
+        sys.exit(1 if mismatched else 0)
+
+    names = [os.path.basename(arg)[:-3] if arg.endswith(".py") else arg for arg in sys.argv[1:]]
+    if not names:
+        print("Usage: python3 hook_preconditions.py <hook-name> [...] < event.json", file=sys.stderr)
+        sys.exit(1)
+
+    stdin_text = "" if sys.stdin.isatty() else sys.stdin.read()
+    passed = set(filter_hooks(names, stdin_text))
+    for name in names:
+        print(f"{name}: {'run' if name in passed else 'skip'}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""Hook Runtime - hook 모듈 로드 및 인프로세스 실행
+
+run-hook.py, hook-daemon.py, hook-client.py가 공유하는 실행 계층입니다.
+
+기능:
+- hook 모듈 로드 및 캐시 (파일 mtime 변경 시 자동 재로드)
+- stdin/stdout/stderr/exit code를 격리한 인프로세스 실행
+- 한 이벤트의 여러 hook을 한 프로세스에서 실행하고 출력 병합 (fan-out)
+- hook 데몬 소켓 경로 및 요청/응답 프레이밍
+- hook별 cold-start import 시간 측정 (-X importtime)
+- hook 실행마다 지연 시간 기록 (utils.record_hook_latency → .claude/hook-latency.jsonl)
+- 사전 조건(preconditions.json)을 통과하지 못한 hook은 로드하지 않고 건너뜀
+"""
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+HOOKS_DIR = Path(__file__).parent.resolve()
+
+# hook이 아닌 실행 도구 (공용 모듈은 파일명에 '_'가 있거나 utils)
+TOOL_SCRIPTS = {"run-hook", "hook-daemon", "hook-client"}
+
+SOCKET_NAME = ".hookd.sock"
+LOCK_NAME = ".hookd.lock"
+
+# hook 하나의 cold-start 모듈 로드 허용 시간 (인터프리터 시작 제외)
+IMPORT_BUDGET_MS = 25.0
+
+
+class HookResult(NamedTuple):
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+# hook 이름 → (mtime_ns, module)
+_modules: dict = {}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# HOOK DISCOVERY & LOADING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def normalize_hook_name(name: str) -> str:
+    """경로/확장자를 제거한 hook 이름 반환"""
+    name = Path(name).name
+    if name.endswith(".py"):
+        name = name[:-3]
+    return name
+
+
+def hook_file(name: str) -> Path:
+    """hook 파일 경로"""
+    return HOOKS_DIR / f"{normalize_hook_name(name)}.py"
+
+
+def is_hook_name(name: str) -> bool:
+    """실행 가능한 hook인지 여부 (공용 모듈 및 도구 제외)"""
+    return name not in TOOL_SCRIPTS and name != "utils" and "_" not in name
+
+
+def list_hooks() -> list[str]:
+    """hooks 디렉토리의 모든 hook 이름"""
+    return sorted(p.stem for p in HOOKS_DIR.glob("*.py") if is_hook_name(p.stem))
+
+
+def load_hook(name: str):
+    """hook 모듈 로드 (mtime이 같으면 캐시 재사용)
+
+    Raises:
+        FileNotFoundError: hook 파일이 없을 때
+        ImportError: 모듈 spec을 만들 수 없을 때
+    """
+    name = normalize_hook_name(name)
+    path = hook_file(name)
+    mtime = path.stat().st_mtime_ns
+
+    cached = _modules.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load hook: {path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    _modules[name] = (mtime, module)
+    return module
+
+
+def preload_hooks() -> list[str]:
+    """모든 hook을 미리 import (실패한 hook은 건너뜀)"""
+    loaded = []
+    for name in list_hooks():
+        try:
+            load_hook(name)
+            loaded.append(name)
+        except Exception:
+            pass
+    return loaded
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# IN-PROCESS EXECUTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def exit_code_of(exc: SystemExit) -> int:
+    """SystemExit를 프로세스 종료 코드로 변환 (인터프리터와 동일 규칙)"""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _execute(name: str, stdin_text: str) -> HookResult:
+    """hook 하나를 현재 프로세스에서 실행
+
+    hook은 sys.stdin을 읽고 stdout에 JSON을 쓰고 sys.exit()로 끝나므로
+    세 스트림을 모두 바꿔 끼운 뒤 SystemExit를 종료 코드로 변환합니다.
+    """
+    name = normalize_hook_name(name)
+    out, err = io.StringIO(), io.StringIO()
+    saved_stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin_text)
+    exit_code = 0
+
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                module = load_hook(name)
+                if hasattr(module, "main"):
+                    module.main()
+            except FileNotFoundError:
+                print(f"Error: Hook not found: {hook_file(name)}", file=sys.stderr)
+                exit_code = 1
+            except SystemExit as e:
+                exit_code = exit_code_of(e)
+            except Exception as e:
+                print(f"Error running hook {name}: {e}", file=sys.stderr)
+                exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+
+    return HookResult(exit_code, out.getvalue(), err.getvalue())
+
+
+def merge_exit_codes(codes: list[int]) -> int:
+    """차단(2)이 하나라도 있으면 2, 아니면 첫 번째 비정상 코드"""
+    if 2 in codes:
+        return 2
+    return next((code for code in codes if code != 0), 0)
+
+
+def merge_outputs(outputs: list[str]) -> str:
+    """hook stdout 병합
+
+    additionalContext는 실행 순서대로 이어 붙이고, 나머지 키는 먼저 출력한
+    hook의 값을 유지합니다. JSON이 아닌 출력은 컨텍스트 텍스트로 취급합니다.
+    """
+    outputs = [o for o in outputs if o.strip()]
+    if len(outputs) <= 1:
+        return outputs[0] if outputs else ""
+
+    merged: dict = {}
+    contexts = []
+    for raw in outputs:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            contexts.append(raw.strip())
+            continue
+        context = data.pop("additionalContext", None)
+        if context:
+            contexts.append(context)
+        for key, value in data.items():
+            merged.setdefault(key, value)
+
+    if contexts:
+        merged["additionalContext"] = "\n\n".join(contexts)
+    return json.dumps(merged, ensure_ascii=False) + "\n"
+
+
+def _hook_context_module():
+    """utils의 공유 입력/읽기 캐시 (없으면 None)"""
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+    try:
+        import utils
+    except ImportError:
+        return None
+    return utils if hasattr(utils, "set_hook_input") else None
+
+
+def _filter_preconditions(names: list[str], parsed) -> list[str]:
+    """사전 조건을 통과한 hook 이름 (검사 모듈이 없으면 전부)"""
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+    try:
+        from hook_preconditions import filter_hooks
+    except ImportError:
+        return names
+    return filter_hooks(names, data=parsed if isinstance(parsed, dict) else None)
+
+
+def run_hooks(names: list[str], stdin_text: str = "", check_preconditions: bool = True) -> HookResult:
+    """한 이벤트의 hook들을 순서대로 현재 프로세스에서 실행하고 결과 병합
+
+    stdin JSON은 한 번만 파싱하고, .claude/ 파일 읽기 캐시를 hook 간에 공유합니다.
+    차단 hook이 있어도 나머지 hook은 모두 실행됩니다 (개별 프로세스 실행과 동일).
+    사전 조건을 통과하지 못한 hook은 실행하지 않습니다 (호출자가 이미 걸렀으면
+    check_preconditions=False). hook마다 실행 시간을 재서 지연 시간 기록에 남깁니다.
+    """
+    try:
+        parsed = json.loads(stdin_text)
+    except json.JSONDecodeError:
+        parsed = None  # hook이 직접 stdin을 읽어 기존대로 처리
+
+    if check_preconditions:
+        names = _filter_preconditions(names, parsed)
+        if not names:
+            return HookResult(0, "", "")
+
+    context = _hook_context_module()
+    if context is not None:
+        context.reset_hook_context()
+        context.set_hook_input(parsed if isinstance(parsed, dict) else None)
+
+    results = []
+    timings = []
+    try:
+        for name in names:
+            started = time.time()
+            start = time.perf_counter()
+            results.append(_execute(name, stdin_text))
+            timings.append((started, (time.perf_counter() - start) * 1000))
+    finally:
+        if context is not None:
+            context.reset_hook_context()
+
+    if context is not None and hasattr(context, "record_hook_latency"):
+        event = parsed.get("hook_event_name") if isinstance(parsed, dict) else None
+        event = event or os.environ.get("CLAUDE_HOOK_EVENT", "")
+        stdin_bytes = len(stdin_text.encode("utf-8"))
+        context.record_hook_latency([
+            {
+                "ts": round(started, 3),
+                "event": event,
+                "hook": normalize_hook_name(name),
+                "ms": round(ms, 3),
+                "stdin": stdin_bytes,
+                "stdout": len(result.stdout.encode("utf-8")),
+                "exit": result.exit_code,
+            }
+            for name, result, (started, ms) in zip(names, results, timings)
+        ])
+
+    if len(results) == 1:
+        return results[0]
+
+    return HookResult(
+        merge_exit_codes([r.exit_code for r in results]),
+        merge_outputs([r.stdout for r in results]),
+        "".join(r.stderr for r in results),
+    )
+
+
+def run_hook(name: str, stdin_text: str = "") -> HookResult:
+    """hook 하나를 현재 프로세스에서 실행"""
+    return run_hooks([name], stdin_text)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# IMPORT PROFILING
+# ═══════════════════════════════════════════════════════════════════════════
+
+_PROFILE_MARKER = "__hook_import_profile__"
+
+# 인터프리터 기본 import 이후(마커 이후)의 hook 로드만 측정
+_PROFILE_SCRIPT = """
+import importlib.util, sys, time
+sys.path.insert(0, {hooks_dir!r})
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location({name!r}, {path!r})
+module = importlib.util.module_from_spec(spec)
+sys.modules[{name!r}] = module
+spec.loader.exec_module(module)
+sys.stderr.write({marker!r} + " %.3f\\n" % ((time.perf_counter() - start) * 1000))
+"""
+
+
+def profile_import(name: str) -> dict:
+    """새 인터프리터에서 hook 모듈을 로드하며 -X importtime 결과 집계
+
+    Returns:
+        dict: {"hook", "total_ms", "imports_ms", "top": [(module, ms), ...], "error"}
+    """
+    import subprocess
+
+    name = normalize_hook_name(name)
+    script = _PROFILE_SCRIPT.format(
+        hooks_dir=str(HOOKS_DIR), marker=_PROFILE_MARKER,
+        name=name, path=str(hook_file(name)),
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        stdin=subprocess.DEVNULL, capture_output=True, text=True,
+    )
+
+    result = {"hook": name, "total_ms": 0.0, "imports_ms": 0.0, "top": [], "error": ""}
+    started = False
+    self_us = 0
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if line.startswith(_PROFILE_MARKER):
+            value = line[len(_PROFILE_MARKER):].strip()
+            if value:
+                result["total_ms"] = float(value)
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        # "import time:   self [us] | cumulative | imported package"
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us += int(fields[0])
+        module = fields[2][1:]
+        if not module.startswith(" "):
+            top_level.append((module, int(fields[1]) / 1000))
+
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+    result["imports_ms"] = self_us / 1000
+    result["top"] = sorted(top_level, key=lambda item: item[1], reverse=True)[:3]
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DAEMON PROTOCOL
+# ═══════════════════════════════════════════════════════════════════════════
+
+def get_socket_path() -> Path:
+    """hook 데몬 소켓 경로 (CLAUDE_HOOKD_SOCKET으로 변경 가능)"""
+    custom = os.environ.get("CLAUDE_HOOKD_SOCKET")
+    if custom:
+        return Path(custom)
+    return HOOKS_DIR / SOCKET_NAME
+
+
+def recv_all(conn) -> bytes:
+    """상대가 쓰기를 닫을 때까지 모두 읽기"""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def encode_message(data: dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def decode_message(raw: bytes) -> Optional[dict]:
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Keyword Matcher - 다중 키워드 단일 패스 검색 (Aho–Corasick)
+
+magic-keywords, user-prompt-submit처럼 프롬프트에서 수십 개의 키워드/별칭/다국어
+용어를 찾는 hook이 공용으로 사용합니다. 키워드마다 `in`/re.search를 반복하는 대신
+오토마톤을 한 번 빌드해 두고 프롬프트를 한 번만 훑습니다.
+
+- 대소문자 무시: 키워드와 텍스트 모두 str.lower() 후 비교
+- 실패 링크를 전이 테이블에 미리 펼친 DFA → 문자당 dict 조회 1회
+- 겹치는 키워드도 모두 찾음 (예: "research" 안의 "search")
+- pickle 가능 → rule_bundle에 hook 규칙으로 캐시
+
+사용법:
+    matcher = KeywordMatcher([("ultrawork", "ultrawork"), ("ulw", "ultrawork")])
+    matcher.find(prompt)  # → {"ultrawork"}
+"""
+from collections import deque
+
+
+class KeywordMatcher:
+    """(keyword, value) 목록에 대한 Aho–Corasick 매처
+
+    같은 value를 여러 키워드(별칭)에 줄 수 있고, 한 키워드가 여러 value를 가질 수도
+    있습니다. find()는 텍스트에 나타난 키워드들의 value 집합을 반환합니다.
+    """
+    __slots__ = ("transitions", "outputs")
+
+    def __init__(self, keywords):
+        goto = [{}]
+        outputs = [set()]
+        for keyword, value in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = goto[state][ch] = len(goto)
+                    goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(value)
+
+        # BFS 순서로 실패 링크를 계산하면서 전이 테이블을 완성 (DFA)
+        fail = [0] * len(goto)
+        transitions = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            table = dict(transitions[fail[state]])
+            for ch, next_state in goto[state].items():
+                fail[next_state] = transitions[fail[state]].get(ch, 0)
+                outputs[next_state] |= outputs[fail[next_state]]
+                queue.append(next_state)
+            table.update(goto[state])
+            transitions[state] = table
+
+        self.transitions = transitions
+        self.outputs = [frozenset(values) for values in outputs]
+
+    def __len__(self) -> int:
+        return len(self.transitions)
+
+    def find(self, text: str) -> set:
+        """텍스트에 나타난 모든 키워드의 value 집합"""
+        getters = [table.get for table in self.transitions]
+        accepting = [bool(values) for values in self.outputs]
+        hits = set()
+        state = 0
+        for ch in text.lower():
+            state = getters[state](ch, 0)
+            if accepting[state]:
+                hits.add(state)
+
+        found = set()
+        for state in hits:
+            found |= self.outputs[state]
+        return found
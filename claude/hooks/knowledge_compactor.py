@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Knowledge Compactor - SessionStart에 주입되는 파일을 토큰 예산 안으로 압축
+
+context-window-monitor가 COMPACTION_SUGGESTIONS로 권장만 하던 정리를 실제로 수행합니다.
+ORANGE 이상에서 monitor가 compact()를 호출하고, 예산(GREEN 임계값 × 컨텍스트 윈도우)
+아래로 내려갈 때까지 덜 파괴적인 단계부터 순서대로 적용합니다.
+
+단계:
+1. todo.md      완료된 항목("- [x]") 제거
+2. context.md   날짜가 있는 이전 세션 섹션을 "## 이전 세션 요약"의 한 줄 요약으로 접음
+                (최근 KEEP_RECENT_SESSIONS개는 그대로)
+3. errors.md    자동 기록을 errors.d/ 요약으로 이전 (error_store), 해결됨 표시/중복 섹션 제거
+4. patterns.md  헤더와 링크 줄만 남기고 본문은 보관 파일로 (헤더 목록 + 링크)
+
+바꾸기 전 원본은 knowledge/archive/<이름>-<시각>.md에 보관되고 (knowledge/*.md 집계에서 제외,
+같은 초에 이미 있으면 -2, -3 ... 접미사), 각 파일은 utils.FileUpdate로 잠금 + 원자적 교체합니다.
+단계 결과가 원본보다 작아질 때만 (추정 토큰 after < before) 적용합니다.
+
+사용법:
+    python3 knowledge_compactor.py [--budget <tokens>] [--dry-run]
+"""
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import FileUpdate, atomic_write, estimate_token_count
+except ImportError:
+    FileUpdate = atomic_write = None
+
+    def estimate_token_count(text):
+        return len(text) // 4
+
+try:
+    import todo_model
+except ImportError:
+    todo_model = None
+
+try:
+    import error_store
+except ImportError:
+    error_store = None
+
+ARCHIVE_DIR = "archive"
+KEEP_RECENT_SESSIONS = 2
+SESSION_SUMMARY_HEADER = "## 이전 세션 요약"
+SESSION_SUMMARY_MAX_LINES = 20
+
+DATED_HEADER = re.compile(r"\d{4}-\d{2}-\d{2}")
+RESOLVED_HEADER = re.compile(r"\b(resolved|fixed)\b|해결됨|\[해결\]|✅", re.IGNORECASE)
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MARKDOWN HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def split_sections(content: str, level: int = 2) -> tuple[str, list[tuple[str, str]]]:
+    """(첫 헤더 앞 내용, [(헤더 줄, 본문)]) - 코드 블록 안의 "#"은 헤더로 보지 않음"""
+    prefix = "#" * level + " "
+    preamble = []
+    sections = []
+    in_fence = False
+    for line in content.split("\n"):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        is_header = not in_fence and line.startswith(prefix)
+        if is_header:
+            sections.append([line, []])
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            preamble.append(line)
+    return "\n".join(preamble), [(header, "\n".join(body)) for header, body in sections]
+
+
+def join_sections(preamble: str, sections: list[tuple[str, str]]) -> str:
+    parts = [preamble.rstrip("\n")] if preamble.strip() else []
+    for header, body in sections:
+        body = body.strip("\n")
+        parts.append(header + ("\n" + body if body else ""))
+    return "\n\n".join(parts).rstrip("\n") + "\n"
+
+
+def _first_line(body: str, limit: int = 80) -> str:
+    for line in body.split("\n"):
+        text = line.strip().lstrip("-*> ").strip()
+        if text and not FENCE.match(line):
+            return text[:limit]
+    return ""
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TRANSFORMS (content → 새 content, 바뀔 것이 없으면 None)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def drop_completed_todos(content: str, archive_rel: str = "") -> str | None:
+    """완료된 항목 줄 제거"""
+    if todo_model is not None:
+        completed = {item.line_no for item in todo_model.parse(content).of("completed")}
+    else:
+        completed = {i for i, line in enumerate(content.split("\n"))
+                     if line.strip().startswith(("- [x]", "- [X]"))}
+    if not completed:
+        return None
+    lines = [line for i, line in enumerate(content.split("\n")) if i not in completed]
+    return "\n".join(lines)
+
+
+def collapse_old_sessions(content: str, archive_rel: str = "") -> str | None:
+    """날짜가 있는 이전 세션 섹션을 요약 한 줄로 접음 (최근 KEEP_RECENT_SESSIONS개 유지)"""
+    preamble, sections = split_sections(content)
+    dated = [i for i, (header, _) in enumerate(sections)
+             if DATED_HEADER.search(header) and header.strip() != SESSION_SUMMARY_HEADER]
+    old = set(dated[:-KEEP_RECENT_SESSIONS] if KEEP_RECENT_SESSIONS else dated)
+    if not old:
+        return None
+
+    summary_lines = []
+    kept = []
+    for i, (header, body) in enumerate(sections):
+        if header.strip() == SESSION_SUMMARY_HEADER:
+            summary_lines.extend(line for line in body.split("\n") if line.strip())
+        elif i in old:
+            title = header[3:].strip()
+            first = _first_line(body)
+            summary_lines.append(f"- {title}" + (f": {first}" if first else ""))
+        else:
+            kept.append((header, body))
+
+    # 원문 링크는 마지막 보관본 하나만 (이전 보관본에는 더 이전 요약이 들어 있음)
+    summary_lines = [line for line in summary_lines if not line.startswith("> 원문:")]
+    summary_lines = summary_lines[-SESSION_SUMMARY_MAX_LINES:]
+    if archive_rel:
+        summary_lines.append(f"> 원문: `{archive_rel}`")
+    return join_sections(preamble, [(SESSION_SUMMARY_HEADER, "\n".join(summary_lines))] + kept)
+
+
+def dedupe_errors(content: str, archive_rel: str = "") -> str | None:
+    """해결됨 표시가 있는 섹션과 (헤더, 본문)이 같은 중복 섹션 제거"""
+    preamble, sections = split_sections(content)
+    seen = set()
+    kept = []
+    for header, body in sections:
+        key = (header.strip().lower(), " ".join(body.split()))
+        if key in seen or RESOLVED_HEADER.search(header):
+            continue
+        seen.add(key)
+        kept.append((header, body))
+    if len(kept) == len(sections):
+        return None
+    return join_sections(preamble, kept)
+
+
+def trim_patterns(content: str, archive_rel: str = "") -> str | None:
+    """헤더와 링크 줄만 남김 (본문은 보관 파일 링크로)"""
+    lines = []
+    in_fence = False
+    for line in content.split("\n"):
+        if FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if line.startswith("#") or "](" in line:
+            lines.append(line)
+    if not lines:
+        return None
+    note = f"> 본문은 `{archive_rel}`에 보관됨 (knowledge_compactor)" if archive_rel else ""
+    title = 1 if lines[0].startswith("# ") else 0
+    result = lines[:title] + ([note] if note else []) + lines[title:]
+    trimmed = "\n".join(result).rstrip("\n") + "\n"
+    return trimmed if trimmed.strip() != content.strip() else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def knowledge_tokens(knowledge_dir: Path, estimate) -> dict:
+    """knowledge/*.md 파일별 추정 토큰 (context-window-monitor와 같은 집계)"""
+    sizes = {}
+    for path in knowledge_dir.glob("*.md"):
+        try:
+            sizes[path.name] = estimate(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            pass
+    return sizes
+
+
+def _archive_rel(knowledge_dir: Path, name: str, stamp: str) -> str:
+    """아직 없는 보관 파일 이름 (knowledge 기준 상대 경로) - 같은 초의 이전 압축과 겹치면 -2, -3 ..."""
+    stem = f"{Path(name).stem}-{stamp}"
+    candidate, n = f"{stem}.md", 1
+    while (knowledge_dir / ARCHIVE_DIR / candidate).exists():
+        n += 1
+        candidate = f"{stem}-{n}.md"
+    return f"{ARCHIVE_DIR}/{candidate}"
+
+
+def compact(claude_dir, budget_tokens: int, estimate=estimate_token_count, dry_run: bool = False) -> list[dict]:
+    """knowledge 합계가 budget_tokens 이하가 될 때까지 단계별 압축
+
+    Returns:
+        list[dict]: 적용한 단계 {"file", "step", "before", "after"} (추정 토큰)
+    """
+    if FileUpdate is None:
+        return []
+    claude_dir = Path(claude_dir)
+    knowledge_dir = claude_dir / "knowledge"
+    if not knowledge_dir.is_dir():
+        return []
+
+    sizes = knowledge_tokens(knowledge_dir, estimate)
+    total = sum(sizes.values())
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    steps = [
+        (claude_dir / "todo.md", drop_completed_todos),
+        (knowledge_dir / "context.md", collapse_old_sessions),
+        (knowledge_dir / "errors.md", dedupe_errors),
+        (knowledge_dir / "patterns.md", trim_patterns),
+    ]
+
+    results = []
+    for index, (path, transform) in enumerate(steps):
+        # todo.md는 집계에 들어가지 않으므로 항상 정리, 나머지는 예산 초과일 때만
+        if index > 0 and total <= budget_tokens:
+            break
+        if path.name == "errors.md" and error_store is not None and not dry_run:
+            error_store.compact(knowledge_dir)
+        try:
+            with FileUpdate(path) as update:
+                if not update.exists:
+                    continue
+                # 파일 잠금 안에서 이름을 정하므로 동시 압축끼리도 겹치지 않음
+                archive_rel = _archive_rel(knowledge_dir, path.name, stamp)
+                updated = transform(update.content, archive_rel)
+                if updated is None or updated == update.content:
+                    continue
+                before = estimate(update.content)
+                after = estimate(updated)
+                if after >= before:
+                    continue  # 요약/링크가 본문보다 길면 그대로 둠
+                if not dry_run:
+                    atomic_write(knowledge_dir / archive_rel, update.content)
+                    update.content = updated
+        except (OSError, UnicodeDecodeError):
+            continue
+        if path.parent == knowledge_dir:
+            total -= before - after
+        results.append({"file": path.name, "step": transform.__name__, "before": before, "after": after})
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    budget = 76800  # 기본 윈도우(128k) × GREEN 60%
+    if "--budget" in args:
+        try:
+            budget = int(args[args.index("--budget") + 1])
+        except (IndexError, ValueError):
+            print("Error: --budget requires a token count", file=sys.stderr)
+            sys.exit(1)
+
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    results = compact(Path(project_dir) / ".claude", budget, estimate_token_count, "--dry-run" in args)
+    for r in results:
+        print(f"{r['file']:<14} {r['step']:<22} ~{r['before']:,} → ~{r['after']:,} tokens")
+    if not results:
+        print("nothing to compact")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
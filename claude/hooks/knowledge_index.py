@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""Knowledge Index - .claude/knowledge/*.md 섹션 오프셋 인덱스
+
+session-start, user-prompt-submit, pre-compact, stop, context-window-monitor는
+knowledge 파일 전체를 읽어 "## [" 결정사항, 패턴 헤더, "## 알려진 해결책" 등을
+정규식으로 다시 나눕니다. errors.md처럼 계속 커지는 파일은 세션마다 느려지므로,
+헤더 줄의 바이트 오프셋을 사이드카에 저장해 두고 필요한 섹션만 seek해서 읽습니다.
+
+- 색인: .claude/.knowledge-index/<파일명>.idx  (헤더 한 줄씩: "오프셋\t수준\t헤더", 파일 순서)
+        .claude/.knowledge-index/<파일명>.json (메타: 검증 키, 인코딩, 문자 수, .idx 크기)
+- 읽을 때마다 (inode, size, mtime)로 검증 → 바뀌었으면 자동 갱신 (.idx flock)
+- 뒤에 덧붙이기만 한 경우(errors.md) 마지막 줄부터 새 부분만 스캔해 .idx 끝에 추가
+- 앞부분이 바뀐 경우(context.md 재작성 등) 전체 재색인
+- 조회는 .idx를 앞에서부터 필요한 만큼만 읽음 (최근 결정 3개, 알려진 해결책 등)
+- 헤더: 줄 시작의 "#"×1~6 + 공백. 섹션은 같거나 더 높은 수준의 다음 헤더 전까지
+- 문자 수/한글 수도 함께 저장 → 파일을 읽지 않고 토큰 수 추정
+- 색인 생성은 section_reader로 mmap 위에서 바이트 스캔 (인코딩은 앞부분 샘플로 한 번 판별,
+  파일 전체를 메모리에 복사/디코딩하지 않음)
+
+사용법:
+    python3 knowledge_index.py [<project-dir>]    # 색인 갱신 및 요약 출력
+"""
+import json
+import mmap
+import os
+import re
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# mmap 바이트 스캔 (없으면 파일을 읽어 디코딩)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import section_reader
+except ImportError:
+    section_reader = None
+
+INDEX_DIR_NAME = ".knowledge-index"
+INDEX_VERSION = 1
+
+# 앞부분 변경 감지용 지문 길이 (파일 시작, 재스캔 지점 직전)
+FINGERPRINT_BYTES = 64
+
+ENCODINGS = ["utf-8", "utf-8-sig", "cp949", "euc-kr", "latin-1"]
+
+HEADER_PATTERN = re.compile(rb"^(#{1,6}) [^\n]*", re.MULTILINE)
+KOREAN_PATTERN = re.compile("[가-힣]")
+
+
+class Section(NamedTuple):
+    level: int
+    title: str   # 헤더 줄 전체 (예: "## [2026-01-05] 결정")
+    start: int   # 헤더 줄 시작 바이트
+    end: int     # 섹션 끝 바이트 (다음 같은/상위 수준 헤더 또는 파일 끝)
+
+
+# 메타 경로 → (메타 mtime_ns, 메타) - 데몬/fan-out 안에서 재사용
+_loaded: dict = {}
+
+
+def index_dir(path) -> Path:
+    """knowledge 파일의 색인 디렉토리 (.claude/.knowledge-index)"""
+    return Path(path).parent.parent / INDEX_DIR_NAME
+
+
+def meta_path(path) -> Path:
+    return index_dir(path) / f"{Path(path).name}.json"
+
+
+def headers_path(path) -> Path:
+    return index_dir(path) / f"{Path(path).name}.idx"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDEXING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _decode(raw: bytes, encoding: str | None = None) -> tuple[str, str]:
+    """(텍스트, 사용한 인코딩) - read_cached_text와 같은 인코딩 순서"""
+    if encoding is None and section_reader is not None:
+        encoding = section_reader.detect_encoding(raw[:section_reader.SAMPLE_BYTES])
+        return section_reader.decode(raw, encoding), encoding
+    for candidate in ([encoding] if encoding else []) + ENCODINGS:
+        try:
+            return raw.decode(candidate), candidate
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return raw.decode("utf-8", errors="replace"), "utf-8"
+
+
+def _scan(raw: bytes, base: int, encoding: str) -> tuple[list, int, int]:
+    """raw(파일의 base 오프셋부터)의 헤더 목록, 문자 수, 한글 수"""
+    headers = []
+    for match in HEADER_PATTERN.finditer(raw):
+        title = _decode(match.group(0).rstrip(b"\r"), encoding)[0]
+        headers.append((base + match.start(), len(match.group(1)), title))
+    text = _decode(raw, encoding)[0]
+    return headers, len(text), len(KOREAN_PATTERN.findall(text))
+
+
+def _header_line(header: tuple) -> bytes:
+    start, level, title = header
+    return f"{start}\t{level}\t{title}\n".encode("utf-8")
+
+
+def _fingerprints(f, scan_from: int) -> tuple[str, str]:
+    """(파일 앞, scan_from 직전) 바이트 지문"""
+    f.seek(0)
+    head = f.read(min(FINGERPRINT_BYTES, scan_from))
+    tail_start = max(0, scan_from - FINGERPRINT_BYTES)
+    f.seek(tail_start)
+    return head.hex(), f.read(scan_from - tail_start).hex()
+
+
+def _is_append(f, st, meta: dict | None, idx_size: int) -> bool:
+    """이전 색인 이후 파일 뒤에 덧붙이기만 했는지"""
+    return bool(
+        meta
+        and meta.get("ino") == st.st_ino
+        and st.st_size > meta.get("size", 0)
+        and meta.get("idx_size") == idx_size
+        and _fingerprints(f, meta["scan_from"]) == (meta.get("head"), meta.get("tail"))
+    )
+
+
+def _scan_read(f, st, scan_from: int, encoding: str | None) -> tuple:
+    """scan_from 이후를 읽어 (헤더, 인코딩, 다음 scan_from, 확정 통계, 나머지 통계)"""
+    f.seek(scan_from)
+    raw = f.read(st.st_size - scan_from)
+    if encoding is None:
+        encoding = _decode(raw)[1]
+    headers, _, _ = _scan(raw, scan_from, encoding)
+
+    # 다음 덧붙이기가 이어질 수 있는 마지막 줄 시작 - 그 앞까지의 통계를 base로 누적
+    next_scan_from = scan_from + raw.rfind(b"\n") + 1
+    settled = _decode(raw[:next_scan_from - scan_from], encoding)[0]
+    rest = _decode(raw[next_scan_from - scan_from:], encoding)[0]
+    return (headers, encoding, next_scan_from,
+            (len(settled), len(KOREAN_PATTERN.findall(settled))),
+            (len(rest), len(KOREAN_PATTERN.findall(rest))))
+
+
+def _scan_mapped(f, st, scan_from: int, encoding: str | None) -> tuple:
+    """_scan_read와 같은 결과를 mmap 위에서 (새 부분을 복사/디코딩하지 않음)"""
+    buf = mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ)
+    try:
+        if encoding is None:
+            encoding = section_reader.detect_encoding(buf[:section_reader.SAMPLE_BYTES])
+        headers = [(start, level, section_reader.decode(line, encoding))
+                   for start, level, line in section_reader.iter_headings(buf, scan_from, st.st_size)]
+        next_scan_from = buf.rfind(b"\n", scan_from) + 1 or scan_from
+        settled = section_reader.text_stats(buf, scan_from, next_scan_from, encoding)
+        rest = section_reader.text_stats(buf, next_scan_from, st.st_size, encoding)
+    finally:
+        buf.close()
+    return headers, encoding, next_scan_from, settled, rest
+
+
+def _build(f, st, meta: dict | None, idx) -> dict:
+    """색인 갱신 - 덧붙이기만 했으면 마지막 줄부터 새 부분만 스캔해 .idx 끝에 추가"""
+    idx_size = os.fstat(idx.fileno()).st_size
+    if _is_append(f, st, meta, idx_size):
+        scan_from = meta["scan_from"]
+        encoding = meta["encoding"]
+        base_chars, base_korean = meta["base_chars"], meta["base_korean"]
+        idx_keep = meta["idx_keep"]
+    else:
+        scan_from = 0
+        encoding = None
+        base_chars = base_korean = 0
+        idx_keep = 0
+
+    try:
+        if section_reader is None or not st.st_size:
+            raise ValueError
+        scanned = _scan_mapped(f, st, scan_from, encoding)
+    except (ValueError, OSError):
+        # mmap을 쓸 수 없음 (빈 파일, stat 이후 줄어든 파일, 특수 파일시스템 등)
+        scanned = _scan_read(f, st, scan_from, encoding)
+    headers, encoding, next_scan_from, settled, rest = scanned
+    base_chars += settled[0]
+    base_korean += settled[1]
+
+    lines = [_header_line(h) for h in headers]
+    settled_lines = b"".join(line for h, line in zip(headers, lines) if h[0] < next_scan_from)
+    idx.truncate(idx_keep)
+    idx.seek(idx_keep)
+    idx.write(b"".join(lines))
+    idx.flush()
+
+    head, tail = _fingerprints(f, next_scan_from)
+    return {
+        "version": INDEX_VERSION,
+        "ino": st.st_ino,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "encoding": encoding,
+        "scan_from": next_scan_from,
+        "head": head,
+        "tail": tail,
+        "base_chars": base_chars,
+        "base_korean": base_korean,
+        "chars": base_chars + rest[0],
+        "korean": base_korean + rest[1],
+        "idx_keep": idx_keep + len(settled_lines),
+        "idx_size": idx_keep + sum(len(line) for line in lines),
+    }
+
+
+def _load_meta(path: Path) -> dict | None:
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        meta = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get("version") != INDEX_VERSION:
+        return None
+    _loaded[path] = (mtime, meta)
+    return meta
+
+
+def _save_meta(path: Path, meta: dict):
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    _loaded[path] = (path.stat().st_mtime_ns, meta)
+
+
+def _is_current(meta: dict | None, st, idx_file: Path) -> bool:
+    if not meta or (meta["ino"], meta["size"], meta["mtime_ns"]) != (st.st_ino, st.st_size, st.st_mtime_ns):
+        return False
+    try:
+        return idx_file.stat().st_size == meta["idx_size"]
+    except OSError:
+        return False
+
+
+def get_index(path) -> dict | None:
+    """파일의 최신 색인 메타 (파일이 없거나 색인을 쓸 수 없으면 None)"""
+    path = Path(path)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f:
+        st = os.fstat(f.fileno())
+        meta_file, idx_file = meta_path(path), headers_path(path)
+        meta = _load_meta(meta_file)
+        if _is_current(meta, st, idx_file):
+            return meta
+
+        try:
+            idx_file.parent.mkdir(parents=True, exist_ok=True)
+            idx = open(idx_file, "a+b")
+        except OSError:
+            return None  # 읽기 전용 디렉토리 등 - 호출자가 파일 전체를 읽음
+        with idx:
+            if fcntl is not None:
+                fcntl.flock(idx.fileno(), fcntl.LOCK_EX)
+            # 잠금을 기다리는 동안 다른 hook이 갱신했을 수 있음
+            meta = _load_meta(meta_file)
+            if _is_current(meta, st, idx_file):
+                return meta
+            meta = _build(f, st, meta, idx)
+            try:
+                _save_meta(meta_file, meta)
+            except OSError:
+                return None
+    return meta
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERIES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _iter_headers(path, meta: dict):
+    """.idx의 (start, level, title)을 앞에서부터 (필요한 만큼만 읽음)"""
+    try:
+        f = open(headers_path(path), "rb")
+    except OSError:
+        return
+    with f:
+        remaining = meta["idx_size"]
+        for line in f:
+            remaining -= len(line)
+            if remaining < 0:
+                break
+            start, level, title = line.rstrip(b"\n").split(b"\t", 2)
+            yield int(start), int(level), title.decode("utf-8", errors="replace")
+
+
+def _find(path, predicate, limit: int | None = None) -> list[Section]:
+    """predicate(level, title)를 만족하는 섹션 (파일 순서, limit개를 찾고 끝이 정해지면 중단)"""
+    meta = get_index(path)
+    if not meta:
+        return []
+    found = []
+    pending = []  # 끝이 정해지지 않은 found 항목
+    for start, level, title in _iter_headers(path, meta):
+        if pending:
+            for item in pending:
+                if item[0] >= level:
+                    item[3] = start
+            pending = [item for item in pending if item[3] is None]
+        if limit is not None and len(found) >= limit:
+            if not pending:
+                break
+            continue
+        if predicate(level, title):
+            item = [level, title, start, None]
+            found.append(item)
+            pending.append(item)
+    for item in pending:
+        item[3] = meta["size"]
+    return [Section(*item) for item in found]
+
+
+def sections(path) -> list[Section]:
+    """파일의 모든 헤더 섹션 (파일 순서)"""
+    return _find(path, lambda level, title: True)
+
+
+def _read_sections(path, wanted: list[Section], body_only: bool = False) -> list[str]:
+    """섹션들을 한 번 연 파일에서 seek해서 읽기 (body_only면 헤더 줄 제외)"""
+    meta = get_index(path)
+    encoding = meta["encoding"] if meta else None
+    texts = []
+    try:
+        with open(path, "rb") as f:
+            for section in wanted:
+                f.seek(section.start)
+                raw = f.read(section.end - section.start)
+                if body_only:
+                    newline = raw.find(b"\n")
+                    raw = raw[newline + 1:] if newline >= 0 else b""
+                texts.append(_decode(raw, encoding)[0])
+    except OSError:
+        return []
+    return texts
+
+
+def read_section(path, section: Section, body_only: bool = False) -> str:
+    """섹션 내용만 seek해서 읽기 (body_only면 헤더 줄 제외)"""
+    texts = _read_sections(path, [section], body_only)
+    return texts[0] if texts else ""
+
+
+def find_section(path, name: str, min_level: int = 1) -> Section | None:
+    """헤더 텍스트("#" 제외)가 name으로 시작하는 첫 섹션"""
+    found = _find(
+        path,
+        lambda level, title: level >= min_level and title.lstrip("#").strip().startswith(name),
+        limit=1,
+    )
+    return found[0] if found else None
+
+
+def matching_sections(path, prefix: str, limit: int | None = None) -> list[str]:
+    """헤더 줄이 prefix로 시작하는 섹션 내용 (파일 순서, 최대 limit개)"""
+    wanted = _find(path, lambda level, title: title.startswith(prefix), limit)
+    return [text.rstrip() for text in _read_sections(path, wanted)]
+
+
+def header_lines(path, levels=(2, 3)) -> list[str]:
+    """지정한 수준의 헤더 줄 (파일을 읽지 않음)"""
+    meta = get_index(path)
+    if not meta:
+        return []
+    return [title for _, level, title in _iter_headers(path, meta) if level in levels]
+
+
+def read_head(path, limit: int) -> str:
+    """파일 앞부분 limit자 (전체를 읽지 않음)"""
+    meta = get_index(path)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(limit * 4)  # UTF-8 최대 4바이트/문자
+    except OSError:
+        return ""
+    text = raw.decode(meta["encoding"] if meta else "utf-8", errors="ignore")
+    return text[:limit]
+
+
+def text_stats(path) -> tuple[int, int]:
+    """(문자 수, 한글 문자 수) - 파일을 읽지 않고 색인에서"""
+    meta = get_index(path)
+    if not meta:
+        return 0, 0
+    return meta["chars"], meta["korean"]
+
+
+def main():
+    project_dir = Path(sys.argv[1] if len(sys.argv) > 1 else
+                       os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+    knowledge_dir = project_dir / ".claude" / "knowledge"
+    files = sorted(knowledge_dir.glob("*.md"))
+    if not files:
+        print(f"no knowledge files in {knowledge_dir}")
+        sys.exit(0)
+
+    for path in files:
+        meta = get_index(path)
+        if meta:
+            count = sum(1 for _ in _iter_headers(path, meta))
+            print(f"{path.name}: {count} headers, {meta['size']:,} bytes, {meta['chars']:,} chars")
+    print(f"index: {index_dir(files[0])}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
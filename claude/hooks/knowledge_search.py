@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""Knowledge Search - knowledge/*.md 섹션 BM25 검색
+
+user-prompt-submit이 KEYWORD_MAPPINGS의 고정 키워드가 있을 때만 파일 앞부분 800~1000자를
+넣던 것을, 프롬프트와 관련도가 높은 섹션을 골라 넣도록 합니다.
+
+- 문서 단위: 헤더 하나부터 다음 헤더 전까지 (수준 무관, 첫 헤더 앞 내용은 파일 이름 제목)
+- 토큰: 영문/숫자 단어(2자 이상, 불용어 제외) + 한글은 음절 bigram (형태소 분석 없이 조사 차이 흡수)
+  헤더 토큰은 TITLE_WEIGHT배로 셈
+- 색인: .claude/.knowledge-index/
+    <파일명>.terms.json  파일별 섹션 오프셋 + 용어 빈도 (그 파일이 바뀔 때만 다시 만듦)
+    search.json          전체 역색인 (용어 → 공용 array의 [문서, 빈도, ...] 구간) + 문서 길이 정규화 값
+                         + 파일 서명 + search.postings 크기 + 빌드 번호
+    search.postings      공용 array 원본 바이트 (uint32, 기록된 바이트 순서) - mmap으로 읽음
+    search.refs.json     문서 번호 → [파일명, start, end, 제목] (결과가 있을 때 처음 읽음)
+  색인은 프로젝트 트리 안에 있으므로 코드를 실행할 수 없는 형식(JSON + 원본 정수 배열)만 쓰고,
+  로드는 작은 search.json만 읽고 나머지는 쓰는 부분만 검사 (질의 용어의 구간/문서 번호, 결과 문서의 ref)
+- 데몬은 user-prompt-submit 요청마다 fork 전에 부모에서 warm()을 불러 두므로 (hook-daemon.py)
+  바뀌지 않은 색인/ref는 이벤트마다 다시 로드하지 않음
+- 순위 계산은 질의 용어의 postings 구간만 list로 꺼내 문서 수 크기의 점수 list에 누적
+- 조회마다 knowledge/*.md를 stat해서 서명이 다르면 바뀐 파일만 다시 토큰화하고 역색인 병합
+- 점수: BM25 (k1=1.2, b=0.75), 상위 k개 중 MIN_SCORE 이상만
+- 결과 섹션은 해당 바이트 범위만 읽어 토큰 예산 안에서 줄 경계로 자름
+
+사용법:
+    python3 knowledge_search.py "<질의>" [--top 5]     # 결과 출력
+    python3 knowledge_search.py --build                 # 색인 갱신
+"""
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import estimate_token_count  # noqa: E402
+
+try:
+    import section_reader
+except ImportError:
+    section_reader = None
+
+INDEX_DIR_NAME = ".knowledge-index"  # knowledge_index와 같은 디렉토리
+SEARCH_FILE = "search.json"
+POSTINGS_FILE = "search.postings"
+REFS_FILE = "search.refs.json"
+TERMS_SUFFIX = ".terms.json"
+SEARCH_VERSION = 3
+POSTING_TYPE = "I"
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+MIN_SCORE = 1.0
+TOP_K = 3
+BUDGET_TOKENS = 1200
+
+WORD = re.compile(r"[a-z0-9_]+|[가-힣]+")
+HEADING = re.compile(rb"^#{1,6} [^\n]*", re.MULTILINE)
+STOPWORDS = frozenset(
+    "the and for with this that from into are was were been have has had not but you your "
+    "can will would should could what when where which who how why all any its our out use "
+    "please let just also then than them they there here some more most".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for word in WORD.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 and word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDEXING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def index_dir(knowledge_dir) -> Path:
+    return Path(knowledge_dir).parent / INDEX_DIR_NAME
+
+
+def _signature(st) -> list:
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _load_json(path: Path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and data.get("version") == SEARCH_VERSION else None
+
+
+def _save_json(path: Path, data: dict):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _valid_terms(entry) -> bool:
+    """파일별 용어 색인 구조 검사 (프로젝트에 들어 있던 파일을 그대로 믿지 않음)"""
+    if entry is None or not isinstance(entry.get("sig"), list) or not isinstance(entry.get("encoding"), str):
+        return False
+    docs = entry.get("docs")
+    return isinstance(docs, list) and all(
+        isinstance(doc, list) and len(doc) == 5 and isinstance(doc[0], int) and isinstance(doc[1], int)
+        and isinstance(doc[2], str) and isinstance(doc[3], int) and isinstance(doc[4], dict)
+        and all(isinstance(count, int) and 0 < count < 2 ** 32 for count in doc[4].values())
+        for doc in docs
+    )
+
+
+def _save_search(directory: Path, index: dict):
+    """search.refs.json, search.postings(원본 바이트)를 먼저 쓰고, 마지막에 search.json을 씀
+
+    세 파일은 같은 빌드 번호/크기로 묶임 (다른 빌드의 파일이 섞이면 로드 또는 ref 조회에서 거부)
+    """
+    build = time.time_ns()
+    _save_json(directory / REFS_FILE, {"version": SEARCH_VERSION, "build": build, "refs": index["refs"]})
+    raw = index["data"].tobytes()
+    tmp = directory / f".{POSTINGS_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, directory / POSTINGS_FILE)
+    stored = {key: value for key, value in index.items() if key not in ("data", "refs")}
+    stored["build"] = build
+    stored["layout"] = [POSTING_TYPE, index["data"].itemsize, sys.byteorder, len(raw)]
+    _save_json(directory / SEARCH_FILE, stored)
+    index["build"] = build
+
+
+def _map_postings(path: Path, size: int):
+    """search.postings → uint32 시퀀스 (mmap 읽기 전용, 크기가 다르면 None)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size != size:
+            return None
+        if not size or os.name == "nt":  # 빈 파일은 mmap 불가, Windows는 매핑 중 교체가 막힘
+            data = array(POSTING_TYPE)
+            data.frombytes(f.read())
+            return data
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(POSTING_TYPE)
+
+
+def _load_search(directory: Path) -> dict | None:
+    """저장된 색인 → 메모리 색인 (작은 구조만 검사, 구간/ref는 쓸 때 검사 - 맞지 않으면 None → 다시 만듦)"""
+    stored = _load_json(directory / SEARCH_FILE)
+    layout = stored.get("layout") if stored else None
+    itemsize = array(POSTING_TYPE).itemsize
+    if not (isinstance(layout, list) and len(layout) == 4
+            and layout[:3] == [POSTING_TYPE, itemsize, sys.byteorder]
+            and isinstance(layout[3], int) and layout[3] % itemsize == 0):
+        return None
+    try:
+        if not (isinstance(stored["postings"], dict) and isinstance(stored["sigs"], dict)
+                and isinstance(stored["encodings"], dict) and isinstance(stored["build"], int)):
+            return None
+        norms = array("d", stored["norms"]).tolist()  # 숫자가 아니면 TypeError, 순위 계산은 list 색인이 빠름
+        if norms and min(norms) <= 0:
+            return None
+        data = _map_postings(directory / POSTINGS_FILE, layout[3])
+        if data is None:
+            return None
+    except (OSError, KeyError, TypeError, ValueError, OverflowError):
+        return None
+    stored["norms"] = norms
+    stored["data"] = data
+    return stored
+
+
+def _refs(index: dict, directory: Path) -> list | None:
+    """문서 번호 → ref (처음 쓸 때 search.refs.json을 읽어 색인에 보관)
+
+    빌드가 다르거나 손상됐으면 None + search.json 삭제 → 다음 조회에서 terms.json으로 다시 병합
+    """
+    refs = index.get("refs")
+    if refs is None:
+        stored = _load_json(directory / REFS_FILE)
+        refs = stored.get("refs") if stored and stored.get("build") == index.get("build") else None
+        if not isinstance(refs, list) or len(refs) != len(index["norms"]):
+            _loaded.pop(directory / SEARCH_FILE, None)
+            try:
+                (directory / SEARCH_FILE).unlink()
+            except OSError:
+                pass
+            return None
+        index["refs"] = refs
+    return refs
+
+
+def _valid_ref(index: dict, ref) -> bool:
+    """섹션은 서명에 있는 knowledge 파일 이름만 (경로가 섞인 이름은 거부)"""
+    return (isinstance(ref, list) and len(ref) == 4 and ref[0] in index["sigs"]
+            and os.path.basename(ref[0]) == ref[0]
+            and isinstance(ref[1], int) and isinstance(ref[2], int) and 0 <= ref[1] <= ref[2])
+
+
+def _decode(raw: bytes, encoding: str) -> str:
+    return raw.decode(encoding, errors="replace")
+
+
+def scan_file(path: Path, signature: tuple) -> dict:
+    """파일 하나의 섹션별 용어 빈도 {"sig", "encoding", "docs": [(start, end, title, length, tf)]}"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if section_reader is not None:
+        encoding = section_reader.detect_encoding(raw[:section_reader.SAMPLE_BYTES])
+    else:
+        encoding = "utf-8"
+
+    starts = [m.start() for m in HEADING.finditer(raw)]
+    if not starts or starts[0] > 0:
+        starts.insert(0, 0)
+    bounds = list(zip(starts, starts[1:] + [len(raw)]))
+
+    docs = []
+    for start, end in bounds:
+        text = _decode(raw[start:end], encoding)
+        first, _, body = text.partition("\n")
+        if first.startswith("#"):
+            title = first.rstrip("\r")
+        else:
+            title, body = path.name, text
+        tf = {}
+        for term in tokenize(title) * TITLE_WEIGHT + tokenize(body):
+            tf[term] = tf.get(term, 0) + 1
+        if tf:
+            docs.append([start, end, title, sum(tf.values()), tf])
+    return {"version": SEARCH_VERSION, "sig": signature, "encoding": encoding, "docs": docs}
+
+
+def _merge(files: dict) -> dict:
+    """파일별 용어 빈도 → 전체 역색인"""
+    postings = {}
+    refs = []       # 문서 번호 → (파일명, start, end, title)
+    lengths = []
+    for name, entry in sorted(files.items()):
+        for start, end, title, length, tf in entry["docs"]:
+            doc = len(refs)
+            refs.append([name, start, end, title])
+            lengths.append(length)
+            for term, count in tf.items():
+                plist = postings.get(term)
+                if plist is None:
+                    plist = postings[term] = array("I")
+                plist.append(doc)
+                plist.append(count)
+
+    # 용어별 array 대신 하나의 array + [시작, 끝] - 조회마다 하는 색인 로드 비용을 줄임
+    data = array("I")
+    spans = {}
+    for term, plist in postings.items():
+        spans[term] = [len(data), len(data) + len(plist)]
+        data.extend(plist)
+
+    # BM25 분모의 문서 길이 항을 미리 계산 (조회 시 문서마다 나눗셈 한 번)
+    avgdl = (sum(lengths) / len(lengths)) if lengths else 1.0
+    norms = [K1 * (1 - B + B * length / avgdl) for length in lengths]
+    return {
+        "version": SEARCH_VERSION,
+        "sigs": {name: entry["sig"] for name, entry in files.items()},
+        "encodings": {name: entry["encoding"] for name, entry in files.items()},
+        "postings": spans,
+        "data": data,
+        "refs": refs,
+        "norms": norms,
+    }
+
+
+def _current_sigs(knowledge_dir: Path) -> dict:
+    sigs = {}
+    try:
+        entries = os.scandir(knowledge_dir)
+    except OSError:
+        return sigs
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(".md") and entry.is_file():
+                try:
+                    sigs[entry.name] = _signature(entry.stat())
+                except OSError:
+                    pass
+    return sigs
+
+
+# 색인 경로 → (search.json mtime_ns, 색인) - 데몬/fan-out 안에서 재사용
+_loaded: dict = {}
+
+
+def get_index(knowledge_dir) -> dict | None:
+    """최신 검색 색인 (바뀐 파일만 다시 토큰화, 색인을 쓸 수 없으면 메모리에서만 사용)"""
+    knowledge_dir = Path(knowledge_dir)
+    sigs = _current_sigs(knowledge_dir)
+    if not sigs:
+        return None
+
+    directory = index_dir(knowledge_dir)
+    search_file = directory / SEARCH_FILE
+    try:
+        mtime = search_file.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = _loaded.get(search_file)
+    if cached and cached[0] == mtime and mtime is not None:
+        index = cached[1]
+    else:
+        index = _load_search(directory) if mtime is not None else None
+    if index is not None and index["sigs"] == sigs:
+        _loaded[search_file] = (mtime, index)
+        return index
+
+    files = {}
+    for name, sig in sigs.items():
+        terms_file = directory / f"{name}{TERMS_SUFFIX}"
+        entry = _load_json(terms_file)
+        if not _valid_terms(entry) or entry["sig"] != sig:
+            try:
+                entry = scan_file(knowledge_dir / name, sig)
+            except OSError:
+                continue
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                _save_json(terms_file, entry)
+            except OSError:
+                pass
+        files[name] = entry
+
+    # 사라진 파일의 용어 색인 + 예전 pickle 색인 정리 (읽지 않고 삭제)
+    try:
+        for stale in directory.glob(f"*{TERMS_SUFFIX}"):
+            if stale.name[:-len(TERMS_SUFFIX)] not in sigs:
+                stale.unlink()
+        for legacy in directory.glob("*.pickle"):
+            legacy.unlink()
+    except OSError:
+        pass
+
+    index = _merge(files)
+    try:
+        _save_search(directory, index)
+        _loaded[search_file] = (search_file.stat().st_mtime_ns, index)
+    except OSError:
+        pass
+    return index
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def rank(index: dict, query: str, top_k: int = TOP_K, min_score: float = MIN_SCORE) -> list[tuple]:
+    """[(점수, 문서 번호)] 점수 내림차순"""
+    postings = index["postings"]
+    data = index["data"]
+    norms = index["norms"]
+    total = len(norms)
+    scores = [0.0] * total  # 문서 수만큼의 list 누적이 dict보다 빠름 (질의 용어가 대부분 문서에 걸침)
+    for term in set(tokenize(query)):
+        span = postings.get(term)
+        # 구간/문서 번호는 질의에 쓰인 용어만 검사 (손상된 색인이면 그 용어를 건너뜀)
+        if not (isinstance(span, list) and len(span) == 2 and isinstance(span[0], int) and isinstance(span[1], int)
+                and 0 <= span[0] < span[1] <= len(data) and span[0] % 2 == 0 and span[1] % 2 == 0):
+            continue
+        plist = data[span[0]:span[1]].tolist()
+        docs = plist[::2]
+        if max(docs) >= total:
+            continue
+        df = len(docs)
+        weight = math.log(1 + (total - df + 0.5) / (df + 0.5)) * (K1 + 1)
+        for doc, tf in zip(docs, plist[1::2]):
+            scores[doc] += weight * tf / (tf + norms[doc])
+    best = heapq.nlargest(top_k, zip(scores, range(total)))
+    return [(score, doc) for score, doc in best if score >= min_score]
+
+
+def warm(knowledge_dir):
+    """색인과 ref를 미리 로드 (상주 프로세스가 fork 전에 불러 자식들이 물려받게 함)"""
+    index = get_index(knowledge_dir)
+    if index and index["norms"]:
+        _refs(index, index_dir(knowledge_dir))
+
+
+def _fit(text: str, budget: int) -> str:
+    """budget 토큰 안에 들어가도록 줄 경계에서 자름"""
+    if estimate_token_count(text) <= budget:
+        return text
+    lines = []
+    for line in text.split("\n"):
+        if estimate_token_count("\n".join(lines + [line])) > budget:
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def search(knowledge_dir, query: str, top_k: int = TOP_K, budget_tokens: int = BUDGET_TOKENS) -> list[dict]:
+    """관련 섹션 [{"file", "title", "score", "text"}] (합계가 budget_tokens 이내)"""
+    index = get_index(knowledge_dir)
+    if not index or not index["norms"]:
+        return []
+    ranked = rank(index, query, top_k)
+    refs = _refs(index, index_dir(knowledge_dir)) if ranked else None
+    if refs is None:
+        return []
+    results = []
+    remaining = budget_tokens
+    for score, doc in ranked:
+        if not _valid_ref(index, refs[doc]):
+            continue
+        name, start, end, title = refs[doc]
+        try:
+            with open(Path(knowledge_dir) / name, "rb") as f:
+                f.seek(start)
+                text = _decode(f.read(end - start), index["encodings"].get(name, "utf-8")).strip()
+        except OSError:
+            continue
+        text = _fit(text, remaining)
+        if not text:
+            break
+        remaining -= estimate_token_count(text)
+        results.append({"file": name, "title": title, "score": score, "text": text})
+    return results
+
+
+def main():
+    args = sys.argv[1:]
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    knowledge_dir = Path(project_dir) / ".claude" / "knowledge"
+
+    if "--build" in args:
+        index = get_index(knowledge_dir)
+        if index is None:
+            print(f"no knowledge files: {knowledge_dir}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{len(index['norms'])} sections, {len(index['postings'])} terms, {len(index['sigs'])} files")
+        sys.exit(0)
+
+    top_k = TOP_K
+    if "--top" in args:
+        i = args.index("--top")
+        try:
+            top_k = int(args[i + 1])
+        except (IndexError, ValueError):
+            print("Error: --top requires a number", file=sys.stderr)
+            sys.exit(1)
+        del args[i:i + 2]
+    if not args:
+        print('Usage: python3 knowledge_search.py "<query>" [--top N] | --build', file=sys.stderr)
+        sys.exit(1)
+
+    for r in search(knowledge_dir, " ".join(args), top_k):
+        print(f"{r['score']:6.2f}  {r['file']}  {r['title']}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Loop Engine - 루프 hook 공용 실행 엔진 (모드별 전략 + 상태 파일 하나)
+
+ralph-loop, continuous-loop, continuous-research, continuous-review, unified-loop가 각자
+상태 파일을 읽고 쓰고, 반복 횟수/경과 시간/로그/todo.md·HANDOFF.md 파싱을 따로 하던 것을
+하나의 엔진으로 모읍니다. 각 hook은 모드 전략(LoopStrategy)만 정의합니다.
+
+- 상태: .claude/agent-state.json 하나 - 모드별 섹션 ("ralph", "continuous", "research", "review")
+  unified-loop 상태는 예전처럼 최상위 필드 (preconditions.json의 mode/active 조건 유지)
+- 예전 전용 상태 파일(ralph-status.json, research-status.json, review-status.json)은
+  명령/스킬이 루프를 시작할 때 쓰는 파일로만 취급 - 바뀌었을 때(mtime) 섹션으로 한 번 가져옴
+- 이벤트당: 상태 파일 읽기 1회, todo.md/HANDOFF.md 파싱 1회, 상태 쓰기 최대 1회
+  (바뀐 최상위 키만 잠금 read-modify-write), 이벤트 기록 append 1회
+- 기록: 전략별 markdown 로그 대신 event_log.py의 구조화 레코드 (.claude/loop-events.jsonl,
+  loop/event/iteration/mode/next/duration, 크기 기준 교체 + 최근 N개 색인)
+- 같은 이벤트를 두 번 처리하지 않음: 섹션에 "lastEvent"(세션 + 이벤트 + transcript 길이)를
+  기록해 unified-loop와 개별 hook이 함께 등록되어 있어도 한 반복만 진행
+
+사용법 (hook 쪽):
+    class ResearchStrategy(loop_engine.LoopStrategy):
+        name = "research"
+        legacy_file = ".claude/research-status.json"
+        def defaults(self): return {...}
+        def step(self, ctx, status): ...; return message
+
+    def main():
+        loop_engine.main([ResearchStrategy()])
+
+    python3 loop_engine.py               # 섹션별 상태 요약 + 최근 이벤트
+"""
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import read_cached_text, read_hook_input, update_json
+except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+    def read_hook_input(): return json.loads(sys.stdin.read())
+    def update_json(path, *mutators):
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        for mutate in mutators:
+            mutate(data)
+        Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        return data
+
+# 구조화 이벤트 기록 (없으면 기록하지 않음)
+try:
+    import event_log
+except ImportError:
+    event_log = None
+
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    import todo_model
+except ImportError:
+    todo_model = None
+
+STATE_FILE = ".claude/agent-state.json"
+TODO_FILE = ".claude/todo.md"
+HANDOFF_FILE = ".claude/HANDOFF.md"
+
+# 루프를 진행하지 않는 종료 사유
+SKIP_STOP_REASONS = ("user_interrupt", "max_tokens")
+
+LAST_EVENT_KEY = "lastEvent"
+LEGACY_MTIME_KEY = "legacyMtime"
+
+# 상태 요약에 표시할 최근 이벤트 수
+SUMMARY_EVENTS = 5
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# UTILITIES
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def get_project_root() -> Path:
+    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
+
+
+def format_elapsed_time(start_time_str: str, compact: bool = False) -> str:
+    """경과 시간 ("12분", "1시간 5분" / compact: "12m", "1h 5m")"""
+    unknown = "?" if compact else "측정 불가"
+    if not start_time_str:
+        return unknown
+    try:
+        minutes = int((datetime.now() - datetime.fromisoformat(start_time_str)).total_seconds() // 60)
+    except Exception:
+        return unknown
+    if minutes < 60:
+        return f"{minutes}m" if compact else f"{minutes}분"
+    if compact:
+        return f"{minutes // 60}h {minutes % 60}m"
+    return f"{minutes // 60}시간 {minutes % 60}분"
+
+
+def event_id(input_data: dict) -> str | None:
+    """이벤트 식별자 (세션 + 이벤트 이름 + transcript 길이) - 식별할 수 없으면 None"""
+    transcript = input_data.get("transcript") or ""
+    size = len(transcript)
+    if not size and input_data.get("transcript_path"):
+        try:
+            size = os.path.getsize(input_data["transcript_path"])
+        except OSError:
+            size = 0
+    if not size:
+        return None
+    return f"{input_data.get('session_id', '')}:{input_data.get('hook_event_name') or 'Stop'}:{size}"
+
+
+def _fingerprint(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def parse_handoff(content: str) -> dict:
+    """HANDOFF.md → {"runNumber", "nextSteps", "status"} (status는 상태 줄이 없으면 "")"""
+    result = {"runNumber": 0, "nextSteps": [], "status": ""}
+
+    match = re.search(r"\*\*Run #\*\*\s*\|\s*(\d+)", content)
+    if match:
+        result["runNumber"] = int(match.group(1))
+
+    next_section = re.search(r"## Next Steps.*?\n(.*?)(?=\n##|\n---|\Z)", content, re.DOTALL)
+    if next_section:
+        for line in next_section.group(1).split("\n"):
+            match = re.match(r"\d+\.\s+(.+)", line.strip())
+            if match:
+                result["nextSteps"].append(match.group(1).strip())
+
+    status_match = re.search(r"\*\*상태\*\*:\s*`?(\w+)`?", content)
+    if status_match:
+        result["status"] = status_match.group(1).upper()
+    return result
+
+
+def load_section(name: str, legacy_file: str | None = None, project_root=None) -> dict:
+    """섹션 읽기 전용 조회 (다른 hook용 - 예전 상태 파일이 더 새로우면 그 값을 덮어씀)"""
+    root = Path(project_root or get_project_root())
+    try:
+        state = json.loads(read_cached_text(root / STATE_FILE) or "{}")
+    except ValueError:
+        state = {}
+    section = state.get(name) if isinstance(state, dict) else None
+    section = dict(section) if isinstance(section, dict) else {}
+    if legacy_file:
+        _merge_legacy(section, root / legacy_file)
+    return section
+
+
+def _merge_legacy(section: dict, legacy_path: Path) -> bool:
+    """예전 상태 파일이 마지막으로 가져온 뒤 바뀌었으면 섹션에 덮어씀"""
+    try:
+        mtime = legacy_path.stat().st_mtime_ns
+    except OSError:
+        return False
+    if section.get(LEGACY_MTIME_KEY) == mtime:
+        return False
+    try:
+        loaded = json.loads(read_cached_text(legacy_path) or "{}")
+    except ValueError:
+        loaded = {}
+    if isinstance(loaded, dict):
+        section.update(loaded)
+    section[LEGACY_MTIME_KEY] = mtime
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EVENT CONTEXT
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class LoopContext:
+    """Stop/SubagentStop 이벤트 하나의 공유 상태 (읽기는 한 번씩, 쓰기는 commit()에서 한 번)"""
+
+    def __init__(self, input_data: dict, project_root=None):
+        self.input_data = input_data
+        self.transcript = input_data.get("transcript", "") or ""
+        self.project_root = Path(project_root or get_project_root())
+        self.claude_dir = self.project_root / ".claude"
+        self.event = event_id(input_data)
+        self.state = self._load_state()
+        self._original = {key: _fingerprint(value) for key, value in self.state.items()}
+        self._memo = {}
+        self._records = []  # commit()에서 event_log에 한 번에 추가
+
+    def _load_state(self) -> dict:
+        try:
+            loaded = json.loads(read_cached_text(self.project_root / STATE_FILE) or "{}")
+        except ValueError:
+            loaded = {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    def memo(self, key, compute):
+        """이벤트 안에서 한 번만 계산 (전략 간 공유)"""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def section(self, name: str, defaults: dict, legacy_file: str | None = None) -> dict:
+        """모드 섹션 (name이 ""이면 최상위) - 빠진 키는 기본값, 예전 상태 파일이 바뀌었으면 가져옴"""
+        if name:
+            section = self.state.get(name)
+            if not isinstance(section, dict):
+                section = self.state[name] = {}
+        else:
+            section = self.state
+        for key, value in defaults.items():
+            section.setdefault(key, value)
+        if legacy_file:
+            _merge_legacy(section, self.project_root / legacy_file)
+        return section
+
+    # ── todo.md / HANDOFF.md ──────────────────────────────────────────────
+
+    def todos(self) -> dict:
+        """todo.md 상태별 작업 + 원문 {"pending", "in_progress", "completed", "blocked", "content"}"""
+        return self.memo("todos", self._parse_todos)
+
+    def _parse_todos(self) -> dict:
+        path = self.claude_dir / "todo.md"
+        if todo_model is not None:
+            snapshot = todo_model.load(path)
+            if snapshot is None:
+                return {status: [] for status in todo_model.STATUSES} | {"content": ""}
+            return snapshot.by_status() | {"content": snapshot.content}
+
+        content = read_cached_text(path)
+        result = {"pending": [], "in_progress": [], "completed": [], "blocked": [], "content": content}
+        for line in content.split("\n"):
+            line = line.strip()
+            if line.startswith("- [ ]"):
+                result["pending"].append(line[6:].strip())
+            elif line.startswith("- [x]"):
+                result["completed"].append(line[6:].strip())
+            elif line.startswith("- [~]") or line.startswith("- [>]"):
+                result["in_progress"].append(line[6:].strip())
+            elif line.startswith("- [!]"):
+                result["blocked"].append(line[6:].strip())
+        return result
+
+    def handoff(self) -> dict:
+        """HANDOFF.md 파싱 결과 + {"exists", "content"}"""
+        return self.memo("handoff", self._parse_handoff)
+
+    def _parse_handoff(self) -> dict:
+        path = self.handoff_path()
+        if not path.exists():
+            return {"exists": False, "content": "", "runNumber": 0, "nextSteps": [], "status": ""}
+        content = read_cached_text(path)
+        return parse_handoff(content) | {"exists": True, "content": content}
+
+    def handoff_path(self) -> Path:
+        custom = os.environ.get("CONTINUOUS_HANDOFF_FILE")
+        return Path(custom) if custom else self.project_root / HANDOFF_FILE
+
+    def forget(self, key: str):
+        """파일을 직접 고친 뒤 다음 조회에서 다시 읽도록"""
+        self._memo.pop(key, None)
+
+    # ── 로그 / 저장 ──────────────────────────────────────────────────────
+
+    def record(self, loop: str, event: str, **fields):
+        """이벤트 레코드 (commit()에서 한 번에 추가, 값이 None인 필드는 생략)"""
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "loop": loop, "event": event}
+        record.update((key, value) for key, value in fields.items() if value is not None)
+        self._records.append(record)
+
+    def _fill_durations(self):
+        """duration: 같은 loop의 직전 레코드 이후 경과 초 (이번 이벤트 → 기록 끝부분 순으로 찾음)"""
+        previous = {}
+        for record in self._records:
+            loop = record["loop"]
+            if loop not in previous:
+                earlier = event_log.last(1, loop=loop, claude_dir=self.claude_dir)
+                previous[loop] = earlier[0].get("ts") if earlier else None
+            try:
+                seconds = (datetime.fromisoformat(record["ts"]) - datetime.fromisoformat(previous[loop])).total_seconds()
+                record.setdefault("duration", int(seconds))
+            except (TypeError, ValueError):
+                pass
+            previous[loop] = record["ts"]
+
+    def changed_keys(self) -> dict:
+        """바뀐 최상위 키 (처음 생긴 빈 섹션은 제외)"""
+        return {key: value for key, value in self.state.items()
+                if _fingerprint(value) != self._original.get(key) and (key in self._original or value != {})}
+
+    def commit(self):
+        """바뀐 최상위 키만 상태 파일에 한 번 쓰고, 이벤트 레코드를 한 번에 추가"""
+        changed = self.changed_keys()
+        if changed:
+            state_path = self.project_root / STATE_FILE
+            try:
+                state_path.parent.mkdir(parents=True, exist_ok=True)
+                update_json(state_path, lambda data: data.update(changed))
+                self._original.update((key, _fingerprint(value)) for key, value in changed.items())
+            except Exception:
+                pass
+
+        if self._records and event_log is not None:
+            try:
+                self.claude_dir.mkdir(parents=True, exist_ok=True)
+                self._fill_durations()
+                event_log.append(self._records, self.claude_dir)
+            except Exception:
+                pass
+        self._records = []
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STRATEGY
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+class LoopStrategy:
+    """모드 전략 - 자기 섹션 상태로 한 반복을 진행하고 출력할 메시지를 반환
+
+    name: agent-state.json 섹션 이름 ("" = 최상위, unified-loop)
+    legacy_file: 루프 시작 시 명령/스킬이 쓰는 예전 상태 파일 (선택)
+    loop: 이벤트 레코드의 loop 이름 (기본은 name, 최상위면 "unified")
+    """
+    name = ""
+    legacy_file = None
+
+    @property
+    def loop(self) -> str:
+        return self.name or "unified"
+
+    def defaults(self) -> dict:
+        return {}
+
+    def status(self, ctx: LoopContext) -> dict:
+        return ctx.section(self.name, self.defaults(), self.legacy_file)
+
+    def active(self, ctx: LoopContext, status: dict, auto_activate: bool = True) -> bool:
+        """이번 이벤트에 진행할지 (auto_activate=False면 명시적으로 시작된 루프만)"""
+        return bool(status.get("active"))
+
+    def step(self, ctx: LoopContext, status: dict) -> str | None:
+        """한 반복 진행 → 출력할 메시지 (없으면 None)"""
+        return None
+
+    def log(self, ctx: LoopContext, event: str, message: str = "", **fields):
+        """이벤트 레코드 (event: iteration / complete / cancel / max_iterations / error ...)"""
+        ctx.record(self.loop, event, message=message or None, **fields)
+
+
+def run(strategies: list, input_data: dict, project_root=None, auto_activate: bool = True) -> list[str]:
+    """전략들을 한 이벤트 안에서 순서대로 실행 → 메시지 목록 (상태/기록 쓰기는 마지막에 한 번)"""
+    if input_data.get("stop_reason", "") in SKIP_STOP_REASONS:
+        return []
+
+    ctx = LoopContext(input_data, project_root)
+    messages = []
+    try:
+        for strategy in strategies:
+            try:
+                status = strategy.status(ctx)
+                if ctx.event and status.get(LAST_EVENT_KEY) == ctx.event:
+                    continue  # 이 이벤트는 다른 hook에서 이미 진행함
+                if not strategy.active(ctx, status, auto_activate):
+                    continue
+                message = strategy.step(ctx, status)
+                if ctx.event:
+                    status[LAST_EVENT_KEY] = ctx.event
+                if message:
+                    messages.append(message)
+            except Exception as e:
+                strategy.log(ctx, "error", str(e))
+    finally:
+        ctx.commit()
+    return messages
+
+
+def main(strategies: list, auto_activate: bool = True):
+    """hook 진입점 - stdin 입력으로 run() 후 메시지를 additionalContext로 출력"""
+    try:
+        messages = run(strategies, read_hook_input(), auto_activate=auto_activate)
+        if messages:
+            print(json.dumps({"additionalContext": "\n\n".join(messages)}, ensure_ascii=False))
+    except Exception:
+        pass
+    sys.exit(0)
+
+
+def _summary():
+    root = get_project_root()
+    try:
+        state = json.loads(read_cached_text(root / STATE_FILE) or "{}")
+    except ValueError:
+        state = {}
+    print(f"unified: mode={state.get('mode', 'idle')} active={state.get('active', False)} "
+          f"iteration={state.get('iteration', 0)}")
+    for name, legacy in (("ralph", ".claude/ralph-status.json"), ("continuous", None),
+                         ("research", ".claude/research-status.json"), ("review", ".claude/review-status.json")):
+        section = load_section(name, legacy, root)
+        flag = section.get("status") if name == "ralph" else section.get("active")
+        print(f"{name}: active={flag} iteration={section.get('iteration', 0)} lastEvent={section.get(LAST_EVENT_KEY)}")
+    if event_log is not None:
+        print("recent events:")
+        for record in event_log.last(SUMMARY_EVENTS, claude_dir=root / ".claude"):
+            print(f"  {event_log.format_record(record)}")
+
+
+if __name__ == "__main__":
+    _summary()
+    sys.exit(0)
@@ -28,32 +28,110 @@ import json
 import os
 import re
 import sys
-from pathlib import Path
+
+# 규칙 번들 (없으면 첫 사용 시 직접 빌드)
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from rule_bundle import get_rules
+except ImportError:
+    get_rules = None
+
+# 다중 키워드 매처 (없으면 키워드별 `in` 검사)
+try:
+    from keyword_matcher import KeywordMatcher
+except ImportError:
+    KeywordMatcher = None
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # MULTILINGUAL PATTERNS (oh-my-opencode 원본 패턴)
 # ═══════════════════════════════════════════════════════════════════════════
 
+# 패턴은 소스 문자열로 두고 키워드 매처로 빌드 - 리터럴 분기는 매처가,
+# 그 외 분기(deep.?dive 등)만 정규식으로 검사
+
 # SEARCH 패턴 - 다국어 지원
-SEARCH_PATTERN = re.compile(
+SEARCH_PATTERN = (
     r'(search|find|locate|lookup|explore|discover|scan|grep|query|browse|'
     r'검색|찾|탐색|조회|'  # Korean
     r'検索|探す|調べる|'  # Japanese
     r'搜索|查找|搜|找|'  # Chinese
-    r'tìm|tìm kiếm)',  # Vietnamese
-    re.IGNORECASE
+    r'tìm|tìm kiếm)'  # Vietnamese
 )
 
 # ANALYZE 패턴 - 다국어 지원
-ANALYZE_PATTERN = re.compile(
+ANALYZE_PATTERN = (
     r'(analyze|analyse|investigate|examine|research|study|deep.?dive|inspect|audit|debug|comprehend|'
     r'분석|조사|연구|검토|디버그|'  # Korean
     r'分析|調査|研究|検査|デバッグ|'  # Japanese
-    r'分析|调查|研究|检查|审计)',  # Chinese
-    re.IGNORECASE
+    r'分析|调查|研究|检查|审计)'  # Chinese
 )
 
+REGEX_META = set(".^$*+?{}[]\\|()")
+
+_rules: dict | None = None
+
+
+def split_pattern(source: str) -> tuple[list[str], str | None]:
+    """alternation 패턴을 리터럴 분기와 나머지 정규식으로 분리"""
+    if source.startswith("(") and source.endswith(")") and "(" not in source[1:-1]:
+        source = source[1:-1]
+    literals, residual = [], []
+    for branch in source.split("|"):
+        if REGEX_META.isdisjoint(branch):
+            literals.append(branch)
+        else:
+            residual.append(branch)
+    return literals, "|".join(residual) or None
+
+
+def build_rules() -> dict:
+    """모드 키워드 매처 + 나머지 정규식 (rule_bundle에 캐시됨)
+
+    매처의 value는 (모드 이름, is_explicit) - 명시적 키워드와 암묵적 모드를
+    프롬프트 한 번의 스캔으로 함께 찾습니다.
+    """
+    keywords = []
+    residual = {}
+
+    def add_pattern(key: tuple, source: str):
+        literals, rest = split_pattern(source)
+        keywords.extend((literal, key) for literal in literals)
+        if rest:
+            residual[key] = re.compile(rest, re.IGNORECASE)
+
+    for keyword, config in MAGIC_KEYWORDS.items():
+        key = (keyword, True)
+        if "pattern" in config:
+            add_pattern(key, config["pattern"])
+        else:
+            keywords.append((keyword, key))
+            keywords.extend((alias, key) for alias in config.get("aliases", []))
+
+    for mode_name, mode_config in IMPLICIT_MODES.items():
+        add_pattern((mode_name, False), mode_config["pattern"])
+
+    matcher = KeywordMatcher(keywords) if KeywordMatcher is not None else None
+    return {"matcher": matcher, "keywords": keywords, "residual": residual}
+
+
+def find_modes(prompt: str) -> set:
+    """프롬프트에 나타난 (모드 이름, is_explicit) 집합"""
+    global _rules
+    if _rules is None:
+        _rules = get_rules("magic-keywords", build_rules) if get_rules else build_rules()
+
+    if _rules["matcher"] is not None:
+        found = _rules["matcher"].find(prompt)
+    else:
+        prompt_lower = prompt.lower()
+        found = {key for keyword, key in _rules["keywords"] if keyword.lower() in prompt_lower}
+
+    for key, pattern in _rules["residual"].items():
+        if key not in found and pattern.search(prompt):
+            found.add(key)
+    return found
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # MAGIC KEYWORDS CONFIGURATION
@@ -63,7 +141,7 @@ MAGIC_KEYWORDS = {
     # === ULTRAWORK: 전체 기능 활성화 (oh-my-opencode 원본 충실) ===
     "ultrawork": {
         "aliases": ["ulw", "/ultra", "/ultrathink", "울트라워크"],
-        "pattern": re.compile(r'ultrawork|ulw|/ultra', re.IGNORECASE),
+        "pattern": r'ultrawork|ulw|/ultra',
         "description": "모든 기능 최대 활성화 + TODO 필수 + TDD + 검증",
         "activation": {
             "thinking": "--ultrathink",
@@ -551,60 +629,37 @@ def detect_magic_keyword(prompt: str) -> tuple[str | None, dict | None, bool]:
         is_explicit: True if explicitly triggered (ultrawork, deepwork, etc.)
                     False if implicitly triggered (search, analyze patterns)
     """
-    prompt_lower = prompt.lower().strip()
-
-    # 1. 명시적 키워드 체크 (우선순위 높음)
-    for keyword, config in MAGIC_KEYWORDS.items():
-        # 패턴이 있으면 패턴 사용
-        if "pattern" in config:
-            if config["pattern"].search(prompt):
-                return keyword, config, True
-        else:
-            # 메인 키워드 체크
-            if keyword in prompt_lower:
-                return keyword, config, True
-
-            # 별칭 체크
-            for alias in config.get("aliases", []):
-                if alias.lower() in prompt_lower:
-                    return keyword, config, True
-
-    # 2. 암묵적 모드 체크 (다국어 패턴 기반)
-    for mode_name, mode_config in IMPLICIT_MODES.items():
-        if mode_config["pattern"].search(prompt):
-            return mode_name, mode_config, False
-
+    detected = detect_all_modes(prompt)
+    if detected:
+        return detected[0]
     return None, None, False
 
 
 def detect_all_modes(prompt: str) -> list[tuple[str, dict, bool]]:
     """프롬프트에서 모든 활성화 가능한 모드 감지 (복합 모드 지원)
 
+    명시적 키워드는 MAGIC_KEYWORDS 순서(우선순위)로 반환하고,
+    암묵적 모드는 명시적 키워드가 없을 때만 IMPLICIT_MODES 순서로 반환합니다.
+
     Returns:
         List of (mode_name, config, is_explicit)
     """
-    detected = []
-    prompt_lower = prompt.lower().strip()
+    found = find_modes(prompt)
 
     # 명시적 키워드
-    for keyword, config in MAGIC_KEYWORDS.items():
-        if "pattern" in config:
-            if config["pattern"].search(prompt):
-                detected.append((keyword, config, True))
-        else:
-            if keyword in prompt_lower:
-                detected.append((keyword, config, True))
-            else:
-                for alias in config.get("aliases", []):
-                    if alias.lower() in prompt_lower:
-                        detected.append((keyword, config, True))
-                        break
+    detected = [
+        (keyword, config, True)
+        for keyword, config in MAGIC_KEYWORDS.items()
+        if (keyword, True) in found
+    ]
 
     # 암묵적 모드 (명시적 키워드가 없을 때만)
     if not detected:
-        for mode_name, mode_config in IMPLICIT_MODES.items():
-            if mode_config["pattern"].search(prompt):
-                detected.append((mode_name, mode_config, False))
+        detected = [
+            (mode_name, mode_config, False)
+            for mode_name, mode_config in IMPLICIT_MODES.items()
+            if (mode_name, False) in found
+        ]
 
     return detected
 
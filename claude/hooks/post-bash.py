@@ -4,8 +4,10 @@
 기능:
 - 오류 자동 감지 및 분류 (Import, Network, Type, Runtime)
 - 유사 오류 해결책 자동 추천
-- knowledge/errors.md에 구조화된 형태로 기록
+- knowledge/errors.d/ 세그먼트에 구조화된 형태로 기록 (error_store.py)
+  (errors.md는 알려진 해결책 등 직접 관리하는 내용만 유지)
 - 오류 패턴 학습 지원
+- 오류 기록은 지연 쓰기 큐로 처리 (도구 호출을 기다리게 하지 않음)
 """
 import json
 import os
@@ -14,6 +16,45 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# 규칙 번들 (없으면 패턴 목록을 순서대로 검사)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from rule_bundle import RuleSet, get_rules
+except ImportError:
+    RuleSet = get_rules = None
+
+# 지연 쓰기 (없으면 즉시 추가)
+try:
+    from deferred_writes import defer_append
+except ImportError:
+    def defer_append(path, text):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+# 오류 세그먼트 저장소 (없으면 errors.md에 추가)
+try:
+    from error_store import current_segment, format_entry
+except ImportError:
+    def current_segment(knowledge_dir):
+        return knowledge_dir / "errors.md"
+
+    def format_entry(timestamp, category, pattern, command, output, solution=""):
+        entry = f"""
+## [{timestamp}] {category} Error
+**패턴**: `{pattern}`
+**명령어**:
+```bash
+{command}
+```
+**출력**:
+```
+{output}
+```
+"""
+        if solution:
+            entry += f"**추천 해결책**:\n{solution}\n"
+        return entry + "\n---\n"
+
 
 # 오류 분류 규칙
 ERROR_CATEGORIES = {
@@ -62,8 +103,20 @@ KNOWN_SOLUTIONS = {
 }
 
 
+def build_rules() -> dict:
+    """오류 분류 결합 정규식 - label은 (카테고리, 패턴) (rule_bundle에 캐시됨)"""
+    rules = [(pattern, (category, pattern))
+             for category, patterns in ERROR_CATEGORIES.items()
+             for pattern in patterns]
+    return {"ERROR_CATEGORIES": RuleSet(rules, re.IGNORECASE)}
+
+
 def classify_error(output: str) -> tuple[str, str]:
     """오류 분류 및 카테고리 반환"""
+    if get_rules is not None:
+        label = get_rules("post-bash", build_rules)["ERROR_CATEGORIES"].match(output)
+        return label if label else ("Unknown", "")
+
     for category, patterns in ERROR_CATEGORIES.items():
         for pattern in patterns:
             if re.search(pattern, output, re.IGNORECASE):
@@ -96,9 +149,9 @@ def main():
             sys.exit(0)
 
         project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
-        errors_file = Path(project_dir) / ".claude" / "knowledge" / "errors.md"
+        knowledge_dir = Path(project_dir) / ".claude" / "knowledge"
 
-        if not errors_file.parent.exists():
+        if not knowledge_dir.exists():
             sys.exit(0)
 
         # 오류 분류
@@ -109,25 +162,8 @@ def main():
         truncated_output = output[:500] + ("..." if len(output) > 500 else "")
 
         # 구조화된 오류 기록
-        entry = f"""
-## [{timestamp}] {category} Error
-**패턴**: `{pattern}`
-**명령어**:
-```bash
-{command}
-```
-**출력**:
-```
-{truncated_output}
-```
-"""
-        if solution:
-            entry += f"**추천 해결책**:\n{solution}\n"
-
-        entry += "\n---\n"
-
-        with open(errors_file, "a", encoding="utf-8") as f:
-            f.write(entry)
+        entry = format_entry(timestamp, category, pattern, command, truncated_output, solution)
+        defer_append(current_segment(knowledge_dir), entry)
 
         # 해결책이 있으면 컨텍스트로 주입
         if solution:
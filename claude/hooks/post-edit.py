@@ -1,19 +1,102 @@
 #!/usr/bin/env python3
 """PostToolUse:Edit|Write|MultiEdit - 프로젝트별 수정 파일 추적
 
-파일 수정 시 프로젝트의 todo.md에 최근 수정 목록을 자동으로 기록합니다.
+파일 수정 시 최근 수정 목록을 .claude/recent-edits.json 링 버퍼에 기록합니다
+(todo.md가 있는 프로젝트만, markdown 목록은 recent_edits.render()로 필요할 때 생성).
 
 개선 사항:
 - 최근 10개 항목만 유지 (컨텍스트 오염 방지)
 - 같은 파일 중복 방지 (가장 최근 시간으로 업데이트)
 - .claude/ 내부 파일은 추적하지 않음
+- 기록은 지연 쓰기 큐로 처리 (도구 호출을 기다리게 하지 않음)
+- recent_edits 모듈이 없으면 todo.md "## 최근 수정" 섹션을 직접 갱신
 """
 import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
+
+# 지연 쓰기 (없으면 즉시 갱신)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from deferred_writes import defer_transform
+except ImportError:
+    def defer_transform(hook, path, transform, *args):
+        content = transform(Path(path).read_text(encoding="utf-8"), *args)
+        if content is not None:
+            Path(path).write_text(content, encoding="utf-8")
+
+# 최근 수정 링 버퍼 (없으면 todo.md "## 최근 수정" 섹션을 직접 갱신)
+try:
+    import recent_edits
+except ImportError:
+    recent_edits = None
+
+
+def push_recent_edit(content: str, rel_path: str, timestamp: str) -> str | None:
+    """recent-edits.json 링 맨 앞에 항목 추가 (지연 쓰기 transform)"""
+    return recent_edits.push_entry(content, "edits", rel_path, timestamp)
+
+
+def add_recent_edit(content: str, rel_path: str, timestamp: str) -> str:
+    """todo.md 내용의 "## 최근 수정" 섹션 맨 앞에 항목 추가 (지연 쓰기 transform)"""
+    new_entry = f"- `{rel_path}` ({timestamp})"
+
+    # "## 최근 수정" 섹션 처리
+    if "## 최근 수정" in content:
+        parts = content.split("## 최근 수정", 1)
+        before = parts[0]
+        after = parts[1].lstrip('\n') if len(parts) > 1 else ""
+
+        # 기존 항목들 파싱
+        lines = after.split('\n')
+        existing_entries = []
+        remaining = []
+        in_entries = True
+
+        for line in lines:
+            if in_entries and line.startswith("- `"):
+                existing_entries.append(line)
+            elif in_entries and (line.startswith("##") or line.startswith("---")):
+                in_entries = False
+                remaining.append(line)
+            elif not in_entries:
+                remaining.append(line)
+            elif line.strip() == "" and in_entries:
+                continue
+            elif in_entries and line.startswith("<!--"):
+                continue
+            elif in_entries and not line.startswith("- `"):
+                in_entries = False
+                remaining.append(line)
+
+        # 중복 제거: 같은 파일이 이미 있으면 제거
+        filtered_entries = []
+        for entry in existing_entries:
+            # 경로 추출: - `path` (time) 패턴
+            match = re.match(r"- `([^`]+)`", entry)
+            if match:
+                existing_path = match.group(1)
+                if existing_path != rel_path:
+                    filtered_entries.append(entry)
+
+        # 새 항목 추가 + 최근 9개만 유지 (새 항목 포함 10개)
+        all_entries = [new_entry] + filtered_entries[:9]
+
+        # 재구성
+        new_content = before + "## 최근 수정\n" + '\n'.join(all_entries)
+        if remaining:
+            # 빈 줄 정리
+            remaining_text = '\n'.join(remaining).strip()
+            if remaining_text:
+                new_content += '\n\n' + remaining_text
+
+        return new_content
+
+    # 섹션이 없으면 끝에 추가
+    return content.rstrip() + f"\n\n## 최근 수정\n{new_entry}"
 
 
 def main():
@@ -37,9 +120,7 @@ def main():
         if not todo_file.exists():
             sys.exit(0)
 
-        content = todo_file.read_text(encoding="utf-8")
-
-        timestamp = datetime.now().strftime("%H:%M")
+        timestamp = time.strftime("%H:%M")
 
         # 상대 경로로 변환 (가능한 경우)
         try:
@@ -47,63 +128,11 @@ def main():
         except ValueError:
             rel_path = file_path
 
-        new_entry = f"- `{rel_path}` ({timestamp})"
-
-        # "## 최근 수정" 섹션 처리
-        if "## 최근 수정" in content:
-            parts = content.split("## 최근 수정", 1)
-            before = parts[0]
-            after = parts[1].lstrip('\n') if len(parts) > 1 else ""
-
-            # 기존 항목들 파싱
-            lines = after.split('\n')
-            existing_entries = []
-            remaining = []
-            in_entries = True
-
-            for line in lines:
-                if in_entries and line.startswith("- `"):
-                    existing_entries.append(line)
-                elif in_entries and (line.startswith("##") or line.startswith("---")):
-                    in_entries = False
-                    remaining.append(line)
-                elif not in_entries:
-                    remaining.append(line)
-                elif line.strip() == "" and in_entries:
-                    continue
-                elif in_entries and line.startswith("<!--"):
-                    continue
-                elif in_entries and not line.startswith("- `"):
-                    in_entries = False
-                    remaining.append(line)
-
-            # 중복 제거: 같은 파일이 이미 있으면 제거
-            filtered_entries = []
-            for entry in existing_entries:
-                # 경로 추출: - `path` (time) 패턴
-                match = re.match(r"- `([^`]+)`", entry)
-                if match:
-                    existing_path = match.group(1)
-                    if existing_path != rel_path:
-                        filtered_entries.append(entry)
-
-            # 새 항목 추가 + 최근 9개만 유지 (새 항목 포함 10개)
-            all_entries = [new_entry] + filtered_entries[:9]
-
-            # 재구성
-            new_content = before + "## 최근 수정\n" + '\n'.join(all_entries)
-            if remaining:
-                # 빈 줄 정리
-                remaining_text = '\n'.join(remaining).strip()
-                if remaining_text:
-                    new_content += '\n\n' + remaining_text
-
-            content = new_content
+        if recent_edits is not None:
+            ring = recent_edits.ensure_ring(todo_file.parent)
+            defer_transform("post-edit", ring, push_recent_edit, rel_path, timestamp)
         else:
-            # 섹션이 없으면 끝에 추가
-            content = content.rstrip() + f"\n\n## 최근 수정\n{new_entry}"
-
-        todo_file.write_text(content, encoding="utf-8")
+            defer_transform("post-edit", todo_file, add_recent_edit, rel_path, timestamp)
 
     except Exception:
         pass  # 추적 실패는 무시
@@ -2,7 +2,7 @@
 """PreToolUse:Bash - 위험 명령 차단 (고도화 버전)
 
 기능:
-- 정규식 기반 위험 명령 차단
+- 정규식 기반 위험 명령 차단 (전체 패턴을 결합한 단일 스캔)
 - 위험 수준별 분류 (CRITICAL, HIGH, MEDIUM)
 - 컨텍스트 기반 경고 (차단하지 않고 주의 환기)
 - updatedInput으로 안전한 명령으로 자동 변환
@@ -21,6 +21,12 @@ except ImportError:
     def block_action(msg): print(f"🚫 {msg}", file=sys.stderr); sys.exit(2)
     def output_context(ctx): print(json.dumps({"additionalContext": ctx}))
 
+# 규칙 번들 (없으면 패턴 목록을 순서대로 검사)
+try:
+    from rule_bundle import RuleSet, get_rules
+except ImportError:
+    RuleSet = get_rules = None
+
 
 # CRITICAL: 즉시 차단 (exit 2)
 CRITICAL_PATTERNS = [
@@ -53,18 +59,43 @@ MEDIUM_PATTERNS = [
     (r"pip\s+install\s+--upgrade", "패키지 업그레이드"),
 ]
 
+# 심각도 순서 (앞선 수준이 우선)
+SEVERITY_LEVELS = [
+    ("CRITICAL", CRITICAL_PATTERNS),
+    ("HIGH", HIGH_PATTERNS),
+    ("MEDIUM", MEDIUM_PATTERNS),
+]
+
+# 차단 수준 (exit 2) - 그 외는 경고만
+BLOCKING_LEVELS = {"CRITICAL", "HIGH"}
+
 # 안전한 버전으로 자동 변환
 SAFE_TRANSFORMS = {
     r"rm\s+-rf\s+([^/~\$].+)": lambda m: f"rm -rf ./{m.group(1)}" if not m.group(1).startswith('./') else None,
 }
 
 
-def check_patterns(command: str, patterns: list, level: str) -> tuple[bool, str]:
-    """패턴 매칭 검사"""
-    for pattern, description in patterns:
-        if re.search(pattern, command, re.IGNORECASE):
-            return True, f"[{level}] {description}"
-    return False, ""
+def build_rules() -> dict:
+    """전체 위험 패턴의 단일 결합 정규식 - label은 (수준, 설명) (rule_bundle에 캐시됨)
+
+    패턴은 심각도 순서로 이어 붙이므로 목록상 첫 번째 일치가 곧 최고 심각도입니다.
+    """
+    rules = [(pattern, (level, description))
+             for level, patterns in SEVERITY_LEVELS
+             for pattern, description in patterns]
+    return {"DANGER": RuleSet(rules, re.IGNORECASE)}
+
+
+def classify_command(command: str) -> tuple[str, str] | None:
+    """명령의 최고 심각도 위험 패턴 (수준, 설명) - 한 번의 스캔으로 판별"""
+    if get_rules is not None:
+        return get_rules("pre-bash", build_rules)["DANGER"].match(command)
+
+    for level, patterns in SEVERITY_LEVELS:
+        for pattern, description in patterns:
+            if re.search(pattern, command, re.IGNORECASE):
+                return level, description
+    return None
 
 
 def try_safe_transform(command: str) -> str | None:
@@ -83,19 +114,13 @@ def main():
         input_data = json.loads(sys.stdin.read())
         command = input_data.get("tool_input", {}).get("command", "")
 
-        # CRITICAL 패턴 체크 - 즉시 차단
-        matched, msg = check_patterns(command, CRITICAL_PATTERNS, "CRITICAL")
-        if matched:
-            block_action(f"BLOCKED: {msg}")
-
-        # HIGH 패턴 체크 - 경고 후 차단
-        matched, msg = check_patterns(command, HIGH_PATTERNS, "HIGH")
-        if matched:
-            block_action(f"BLOCKED: {msg}")
-
-        # MEDIUM 패턴 체크 - 경고만 (차단하지 않음)
-        matched, msg = check_patterns(command, MEDIUM_PATTERNS, "MEDIUM")
-        if matched:
+        # 위험 패턴 체크 - CRITICAL/HIGH는 차단, MEDIUM은 경고만
+        danger = classify_command(command)
+        if danger:
+            level, description = danger
+            msg = f"[{level}] {description}"
+            if level in BLOCKING_LEVELS:
+                block_action(f"BLOCKED: {msg}")
             output_context(f"⚠️ 주의: {msg}. 실행 전 확인이 필요합니다.")
             sys.exit(0)
 
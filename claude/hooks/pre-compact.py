@@ -15,6 +15,37 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# utils 모듈 로드 (없으면 기본 동작)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import read_cached_text, read_hook_input, update_file
+except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+    def read_hook_input(): return json.loads(sys.stdin.read())
+
+    def update_file(path, *transforms, default=""):
+        content = read_cached_text(path, default)
+        for transform in transforms:
+            content = transform(content)
+        Path(path).write_text(content, encoding="utf-8")
+        return True
+
+# knowledge 섹션 색인 (없으면 파일 전체를 읽어 검색)
+try:
+    import knowledge_index
+except ImportError:
+    knowledge_index = None
+
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    import todo_model
+except ImportError:
+    todo_model = None
+
 
 def extract_session_summary(project_dir: str) -> str:
     """세션 요약 생성"""
@@ -23,8 +54,12 @@ def extract_session_summary(project_dir: str) -> str:
 
     # 1. 현재 미완료 작업
     todo_file = claude_dir / "todo.md"
-    if todo_file.exists():
-        content = todo_file.read_text(encoding="utf-8")
+    if todo_model is not None:
+        pending = todo_model.load_status(todo_file)["pending"]
+        if pending:
+            summary_parts.append(f"미완료: {', '.join(pending[:5])}")
+    elif todo_file.exists():
+        content = read_cached_text(todo_file)
         pending = []
         for line in content.split('\n'):
             if line.strip().startswith('- [ ]'):
@@ -35,17 +70,21 @@ def extract_session_summary(project_dir: str) -> str:
     # 2. 최근 결정
     decisions_file = claude_dir / "knowledge" / "decisions.md"
     if decisions_file.exists():
-        content = decisions_file.read_text(encoding="utf-8")
-        # 첫 번째 ## [ 패턴 찾기
+        # 첫 번째 ## [ 패턴 찾기 (색인이 있으면 헤더 줄만 검사)
         import re
-        match = re.search(r'## \[([^\]]+)\] (.+)', content)
+        pattern = re.compile(r'## \[([^\]]+)\] (.+)')
+        if knowledge_index is not None:
+            titles = knowledge_index.header_lines(decisions_file, levels=(2, 3, 4, 5, 6))
+            match = next(filter(None, map(pattern.search, titles)), None)
+        else:
+            match = pattern.search(read_cached_text(decisions_file))
         if match:
             summary_parts.append(f"최근결정: [{match.group(1)}] {match.group(2)[:50]}")
 
     # 3. 현재 집중
     context_file = claude_dir / "knowledge" / "context.md"
     if context_file.exists():
-        content = context_file.read_text(encoding="utf-8")
+        content = read_cached_text(context_file)
         for line in content.split('\n'):
             if '집중' in line or '현재' in line:
                 summary_parts.append(f"집중: {line.strip()[:60]}")
@@ -64,11 +103,15 @@ def backup_pending_todos(project_dir: str):
         if not todo_file.exists():
             return
 
-        todo_content = todo_file.read_text(encoding="utf-8")
-        pending = []
-        for line in todo_content.split('\n'):
-            if line.strip().startswith('- [ ]'):
-                pending.append(line.strip())
+        if todo_model is not None:
+            snapshot = todo_model.load(todo_file)
+            pending = [item.line for item in snapshot.of("pending")] if snapshot else []
+        else:
+            todo_content = read_cached_text(todo_file)
+            pending = []
+            for line in todo_content.split('\n'):
+                if line.strip().startswith('- [ ]'):
+                    pending.append(line.strip())
 
         if not pending:
             return
@@ -77,13 +120,14 @@ def backup_pending_todos(project_dir: str):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         backup_section = f"\n\n## Compact 전 백업 ({timestamp})\n" + '\n'.join(pending)
 
-        if context_file.exists():
-            content = context_file.read_text(encoding="utf-8")
+        def replace_backup(content: str) -> str:
             # 이전 백업 섹션 제거
             if "## Compact 전 백업" in content:
                 content = content.split("## Compact 전 백업")[0].rstrip()
-            content += backup_section
-            context_file.write_text(content, encoding="utf-8")
+            return content + backup_section
+
+        if context_file.exists():
+            update_file(context_file, replace_backup)
 
     except Exception:
         pass
@@ -91,7 +135,7 @@ def backup_pending_todos(project_dir: str):
 
 def main():
     try:
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_hook_input()
         trigger = input_data.get("trigger", "manual")  # "manual" or "auto"
 
         project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
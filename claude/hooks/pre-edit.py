@@ -15,6 +15,25 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# 공유 파일 잠금 + 원자적 갱신 (없으면 바로 씀)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import update_file
+except ImportError:
+    def update_file(path, *transforms, default=""):
+        content = Path(path).read_text(encoding="utf-8")
+        for transform in transforms:
+            content = transform(content)
+        Path(path).write_text(content, encoding="utf-8")
+        return True
+
+# 최근 수정 링 버퍼 + 지연 쓰기 (없으면 context.md "## 최근 수정" 섹션을 직접 갱신)
+try:
+    import recent_edits
+    from deferred_writes import defer_transform
+except ImportError:
+    recent_edits = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ULTRATHINK: SIMPLIFY RUTHLESSLY
 # ═══════════════════════════════════════════════════════════════════════════
@@ -75,8 +94,30 @@ def count_change_lines(tool_input: dict) -> int:
     return 0
 
 
+def add_edit_log(content: str, filename: str, timestamp: str, action: str) -> str:
+    """context.md 내용의 "## 최근 수정" 섹션에 항목 추가 (최근 10개 유지, 링 버퍼가 없을 때)"""
+    if "## 최근 수정" not in content:
+        content += "\n\n## 최근 수정\n"
+
+    lines = content.split('\n')
+    header = max(i for i, line in enumerate(lines) if line.strip() == "## 최근 수정")
+    lines.insert(header + 1, f"- `{filename}` ({timestamp}) - {action}")
+
+    # 최근 수정 항목 10개로 제한 (가장 오래된 항목 제거)
+    entries = [i for i, line in enumerate(lines) if line.startswith("- `")]
+    for i in reversed(entries[10:]):
+        del lines[i]
+
+    return '\n'.join(lines)
+
+
+def push_edit_attempt(content: str, rel_path: str, timestamp: str, action: str) -> str | None:
+    """recent-edits.json 링의 attempts 채널에 항목 추가 (지연 쓰기 transform)"""
+    return recent_edits.push_entry(content, "attempts", rel_path, timestamp, action)
+
+
 def log_edit_attempt(project_dir: str, file_path: str, action: str):
-    """수정 시도 이력 기록"""
+    """수정 시도 이력 기록 (링 버퍼, 없으면 context.md 섹션을 잠금 후 교체)"""
     try:
         claude_dir = Path(project_dir) / ".claude"
         log_file = claude_dir / "knowledge" / "context.md"
@@ -85,36 +126,18 @@ def log_edit_attempt(project_dir: str, file_path: str, action: str):
             return
 
         timestamp = datetime.now().strftime("%H:%M")
-        filename = Path(file_path).name
-
-        content = log_file.read_text(encoding="utf-8")
-
-        if "## 최근 수정" not in content:
-            content += "\n\n## 최근 수정\n"
-
-        lines = content.split('\n')
-        new_lines = []
-        insert_idx = None
 
-        for i, line in enumerate(lines):
-            new_lines.append(line)
-            if line.strip() == "## 최근 수정":
-                insert_idx = i + 1
-
-        if insert_idx:
-            new_entry = f"- `{filename}` ({timestamp}) - {action}"
-            new_lines.insert(insert_idx, new_entry)
-
-            # 최근 수정 항목 10개로 제한
-            edit_lines = [l for l in new_lines if l.startswith("- `")]
-            if len(edit_lines) > 10:
-                for i in range(len(new_lines) - 1, -1, -1):
-                    if new_lines[i].startswith("- `") and new_lines[i] != new_entry:
-                        if len([l for l in new_lines if l.startswith("- `")]) > 10:
-                            new_lines.pop(i)
-                            break
+        if recent_edits is not None:
+            try:
+                rel_path = str(Path(file_path).relative_to(project_dir))
+            except ValueError:
+                rel_path = Path(file_path).name
+            ring = recent_edits.ensure_ring(claude_dir)
+            defer_transform("pre-edit", ring, push_edit_attempt, rel_path, timestamp, action)
+            return
 
-        log_file.write_text('\n'.join(new_lines), encoding="utf-8")
+        filename = Path(file_path).name
+        update_file(log_file, lambda content: add_edit_log(content, filename, timestamp, action))
 
     except Exception:
         pass
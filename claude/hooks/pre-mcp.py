@@ -18,6 +18,12 @@ try:
 except ImportError:
     def output_context(ctx): print(json.dumps({"additionalContext": ctx}))
 
+# 규칙 번들 (없으면 패턴 목록을 순서대로 검사)
+try:
+    from rule_bundle import RuleSet, get_rules
+except ImportError:
+    RuleSet = get_rules = None
+
 
 # 알려진 MCP 서버 목록 (허용됨)
 KNOWN_MCP_SERVERS = {
@@ -57,8 +63,17 @@ def extract_mcp_server(tool_name: str) -> str | None:
     return match.group(1) if match else None
 
 
+def build_rules() -> dict:
+    """민감 작업 결합 정규식 (rule_bundle에 캐시됨)"""
+    return {"SENSITIVE": RuleSet(SENSITIVE_PATTERNS, re.IGNORECASE)}
+
+
 def check_sensitive(tool_name: str) -> tuple[bool, str]:
     """민감한 작업 패턴 검사"""
+    if get_rules is not None:
+        description = get_rules("pre-mcp", build_rules)["SENSITIVE"].match(tool_name)
+        return (True, description) if description else (False, "")
+
     for pattern, description in SENSITIVE_PATTERNS:
         if re.search(pattern, tool_name, re.IGNORECASE):
             return True, description
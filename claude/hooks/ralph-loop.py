@@ -6,7 +6,8 @@ Ralph Wiggum 플러그인 패턴 구현:
 - 명시적 완료 신호(RALPH_COMPLETE) 감지
 - todo.md 기반 작업 추적
 - TDD 모드 지원
-- 상태 파일로 반복 횟수 및 진행 상황 관리
+- agent-state.json "ralph" 섹션으로 반복 횟수 및 진행 상황 관리
+  (/ralph-loop가 쓰는 ralph-status.json은 바뀌었을 때 섹션으로 가져옴 - loop_engine.py)
 
 References:
 - https://github.com/anthropics/claude-code/tree/main/plugins
@@ -14,13 +15,20 @@ References:
 - Boris Journey: 30일 259 PR, 40,000줄 코드 자동 생성
 """
 
-import json
-import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# 루프 공용 엔진 (상태 섹션, todo.md 파싱, 로그, 경과 시간)
+sys.path.insert(0, str(Path(__file__).parent))
+import loop_engine  # noqa: E402
+
+# 완료/취소 신호 끝부분 감지 (없으면 transcript 전체 검사)
+try:
+    import signal_window
+except ImportError:
+    signal_window = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -44,10 +52,11 @@ CANCEL_SIGNALS = [
     "[취소]",
 ]
 
-# 상태 파일 경로
+# /ralph-loop가 루프를 시작할 때 쓰는 상태 파일 (진행 상태는 agent-state.json "ralph" 섹션)
 STATUS_FILE = ".claude/ralph-status.json"
-TODO_FILE = ".claude/todo.md"
-LOG_FILE = ".claude/ralph-loop.log"
+
+# 진행하지 않는 상태 (취소/완료/최대 반복은 신호가 창 밖으로 밀려나도 유지)
+TERMINAL_STATUSES = ("idle", "cancelled", "completed", "max_iterations_reached")
 
 # 기본 설정
 DEFAULT_MAX_ITERATIONS = 10
@@ -55,81 +64,6 @@ DEFAULT_MAX_CONSECUTIVE_FAILURES = 3
 DEFAULT_TIMEOUT_MINUTES = 60
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# UTILITIES
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def get_project_root() -> Path:
-    """프로젝트 루트 디렉토리 반환"""
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
-
-
-def output_context(msg: str):
-    """컨텍스트 메시지 출력"""
-    print(json.dumps({"additionalContext": msg}, ensure_ascii=False))
-
-
-def log_event(message: str):
-    """로그 파일에 이벤트 기록"""
-    log_path = get_project_root() / LOG_FILE
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    entry = f"[{timestamp}] {message}\n"
-
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(entry)
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# STATUS MANAGEMENT
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def get_status_file() -> Path:
-    """상태 파일 경로 반환"""
-    return get_project_root() / STATUS_FILE
-
-
-def load_status() -> dict:
-    """상태 파일 로드"""
-    status_path = get_status_file()
-
-    if not status_path.exists():
-        return {
-            "iteration": 0,
-            "maxIterations": DEFAULT_MAX_ITERATIONS,
-            "status": "idle",
-            "currentTask": "",
-            "lastTestResult": None,
-            "consecutiveFailures": 0,
-            "startTime": None,
-            "safeWord": "RALPH_COMPLETE",
-            "tddMode": False,
-            "verifyCommand": None,
-        }
-
-    try:
-        return json.loads(status_path.read_text(encoding="utf-8"))
-    except Exception:
-        return load_status.__wrapped__() if hasattr(load_status, '__wrapped__') else {}
-
-
-def save_status(status: dict):
-    """상태 파일 저장"""
-    status_path = get_status_file()
-    status_path.parent.mkdir(parents=True, exist_ok=True)
-    status_path.write_text(json.dumps(status, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
-def increment_iteration(status: dict) -> dict:
-    """반복 횟수 증가"""
-    status["iteration"] = status.get("iteration", 0) + 1
-    status["lastUpdated"] = datetime.now().isoformat()
-    return status
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # COMPLETION DETECTION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -162,49 +96,37 @@ def has_cancel_signal(text: str) -> bool:
     return False
 
 
-def check_todo_status() -> dict:
-    """todo.md에서 작업 상태 확인"""
-    todo_path = get_project_root() / TODO_FILE
+def detect_signals(transcript: str, safe_word: str, state: dict) -> dict:
+    """이번 반복의 완료/취소 신호 (agent-state.json signalWindow 창 안에서 단어 경계로 검사)"""
+    if signal_window is None:
+        return {"complete": has_completion_signal(transcript, safe_word), "cancel": has_cancel_signal(transcript)}
+    window = signal_window.load_window(state=state)
+    tail = signal_window.tail(transcript, window)
+    return {
+        "complete": signal_window.has_signal(tail, [safe_word, *COMPLETION_SIGNALS]),
+        "cancel": signal_window.has_signal(tail, CANCEL_SIGNALS),
+    }
+
 
+def check_todo_status(todos: dict) -> dict:
+    """todo.md 작업 상태 + 취소 여부 (todos: LoopContext.todos())"""
     result = {
-        "pending": [],
-        "in_progress": [],
-        "completed": [],
+        "pending": list(todos["pending"]),
+        "in_progress": list(todos["in_progress"]),
+        "completed": list(todos["completed"]),
         "blocked": [],
         "cancelled": False,
     }
 
-    if not todo_path.exists():
-        return result
-
-    try:
-        content = todo_path.read_text(encoding="utf-8")
+    # 취소 신호 확인
+    if has_cancel_signal(todos["content"]):
+        return {key: [] for key in result} | {"cancelled": True}
 
-        # 취소 신호 확인
-        if has_cancel_signal(content):
+    for task in todos["blocked"]:
+        if "CANCEL" in task.upper():
             result["cancelled"] = True
-            return result
-
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("- [ ]"):
-                task = line[6:].strip()
-                result["pending"].append(task)
-            elif line.startswith("- [x]"):
-                task = line[6:].strip()
-                result["completed"].append(task)
-            elif line.startswith("- [~]") or line.startswith("- [>]"):
-                task = line[6:].strip()
-                result["in_progress"].append(task)
-            elif line.startswith("- [!]"):
-                task = line[6:].strip()
-                if "CANCEL" in task.upper():
-                    result["cancelled"] = True
-                else:
-                    result["blocked"].append(task)
-    except Exception:
-        pass
-
+        else:
+            result["blocked"].append(task)
     return result
 
 
@@ -287,99 +209,79 @@ MAX_ITERATIONS_MESSAGE = """
 """
 
 
-def format_elapsed_time(start_time_str: str) -> str:
-    """경과 시간 포맷"""
-    if not start_time_str:
-        return "측정 불가"
-
-    try:
-        start = datetime.fromisoformat(start_time_str)
-        elapsed = datetime.now() - start
-        minutes = int(elapsed.total_seconds() // 60)
-
-        if minutes < 60:
-            return f"{minutes}분"
-
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours}시간 {mins}분"
-    except Exception:
-        return "측정 불가"
-
-
 # ═══════════════════════════════════════════════════════════════════════════
-# MAIN HANDLER
+# LOOP STRATEGY
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def main():
-    try:
-        # stdin에서 입력 읽기
-        input_data = json.loads(sys.stdin.read())
-        transcript = input_data.get("transcript", "")
-        stop_reason = input_data.get("stop_reason", "")
+class RalphStrategy(loop_engine.LoopStrategy):
+    """todo.md 기반 자율 루프 (agent-state.json "ralph" 섹션)"""
+    name = "ralph"
+    legacy_file = STATUS_FILE
 
-        # 사용자가 명시적으로 중단한 경우 무시
-        if stop_reason in ["user_interrupt", "max_tokens"]:
-            sys.exit(0)
+    def defaults(self) -> dict:
+        return {
+            "iteration": 0,
+            "maxIterations": DEFAULT_MAX_ITERATIONS,
+            "status": "idle",
+            "currentTask": "",
+            "lastTestResult": None,
+            "consecutiveFailures": 0,
+            "startTime": None,
+            "safeWord": "RALPH_COMPLETE",
+            "tddMode": False,
+            "verifyCommand": None,
+        }
 
-        # 상태 로드
-        status = load_status()
+    def active(self, ctx, status, auto_activate=True) -> bool:
+        # 비활성(idle) 또는 이미 끝난 루프는 무시 - /ralph-loop가 ralph-status.json을 다시 쓰면 재시작
+        return status.get("status") not in TERMINAL_STATUSES
 
-        # Ralph Loop가 활성화되지 않은 경우 (idle 상태) 무시
-        if status.get("status") == "idle":
-            sys.exit(0)
+    def step(self, ctx, status) -> str:
+        todo_status = check_todo_status(ctx.todos())
+        pending_count = len(todo_status["pending"]) + len(todo_status["in_progress"])
 
-        # todo.md 상태 확인
-        todo_status = check_todo_status()
+        # 이번 반복에서 출력된 신호만 (마지막 assistant 턴 / 끝 N KB)
+        safe_word = status.get("safeWord", "RALPH_COMPLETE")
+        signals = detect_signals(ctx.transcript, safe_word, ctx.state)
 
         # 취소 신호 확인
-        if todo_status["cancelled"] or has_cancel_signal(transcript):
+        if todo_status["cancelled"] or signals["cancel"]:
             status["status"] = "cancelled"
-            save_status(status)
-            log_event("Ralph Loop cancelled by user")
-
-            output_context(CANCELLED_MESSAGE.format(
+            self.log(ctx, "cancel", "Ralph Loop cancelled by user", iteration=status.get("iteration", 0))
+            return CANCELLED_MESSAGE.format(
                 iteration=status.get("iteration", 0),
                 completed_count=len(todo_status["completed"]),
-                pending_count=len(todo_status["pending"]) + len(todo_status["in_progress"])
-            ))
-            sys.exit(0)
+                pending_count=pending_count
+            )
 
         # 완료 신호 확인
-        safe_word = status.get("safeWord", "RALPH_COMPLETE")
-        if has_completion_signal(transcript, safe_word) or is_all_tasks_complete(todo_status):
+        if signals["complete"] or is_all_tasks_complete(todo_status):
             status["status"] = "completed"
-            save_status(status)
-            log_event(f"Ralph Loop completed after {status.get('iteration', 0)} iterations")
-
-            output_context(COMPLETION_MESSAGE.format(
+            self.log(ctx, "complete", f"Ralph Loop completed after {status.get('iteration', 0)} iterations",
+                     iteration=status.get("iteration", 0), completed=len(todo_status["completed"]))
+            return COMPLETION_MESSAGE.format(
                 iteration=status.get("iteration", 0),
                 completed_count=len(todo_status["completed"]),
-                elapsed_time=format_elapsed_time(status.get("startTime"))
-            ))
-            sys.exit(0)
+                elapsed_time=loop_engine.format_elapsed_time(status.get("startTime"))
+            )
 
         # 최대 반복 횟수 확인
         max_iterations = status.get("maxIterations", DEFAULT_MAX_ITERATIONS)
-        current_iteration = status.get("iteration", 0)
-
-        if current_iteration >= max_iterations:
+        if status.get("iteration", 0) >= max_iterations:
             status["status"] = "max_iterations_reached"
-            save_status(status)
-            log_event(f"Ralph Loop reached max iterations ({max_iterations})")
-
-            output_context(MAX_ITERATIONS_MESSAGE.format(
+            self.log(ctx, "max_iterations", f"Ralph Loop reached max iterations ({max_iterations})",
+                     iteration=status.get("iteration", 0), pending=pending_count)
+            return MAX_ITERATIONS_MESSAGE.format(
                 max_iterations=max_iterations,
                 completed_count=len(todo_status["completed"]),
-                pending_count=len(todo_status["pending"]) + len(todo_status["in_progress"])
-            ))
-            sys.exit(0)
+                pending_count=pending_count
+            )
 
         # 반복 계속 - 반복 횟수 증가
-        status = increment_iteration(status)
+        status["iteration"] = status.get("iteration", 0) + 1
         status["status"] = "running"
-        save_status(status)
+        status["lastUpdated"] = datetime.now().isoformat()
 
         # 다음 작업 결정
         next_task = "다음 작업을 계속 진행하세요"
@@ -387,25 +289,31 @@ def main():
             next_task = todo_status["in_progress"][0]
         elif todo_status["pending"]:
             next_task = todo_status["pending"][0]
+        status["currentTask"] = next_task
 
-        pending_count = len(todo_status["pending"]) + len(todo_status["in_progress"])
-        remaining = max_iterations - status["iteration"]
-
-        log_event(f"Ralph Loop iteration {status['iteration']}/{max_iterations}: {next_task[:50]}")
+        self.log(ctx, "iteration", iteration=status["iteration"], maxIterations=max_iterations,
+                 next=next_task[:50], pending=pending_count)
 
-        # 계속 진행 메시지 출력
-        output_context(CONTINUATION_MESSAGE.format(
+        # 계속 진행 메시지
+        return CONTINUATION_MESSAGE.format(
             iteration=status["iteration"],
             max_iterations=max_iterations,
             pending_count=pending_count,
             next_task=next_task[:50] + "..." if len(next_task) > 50 else next_task,
-            remaining=remaining
-        ))
+            remaining=max_iterations - status["iteration"]
+        )
+
+
+STRATEGY = RalphStrategy()
+
 
-    except Exception as e:
-        log_event(f"Ralph Loop error: {str(e)}")
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN HANDLER
+# ═══════════════════════════════════════════════════════════════════════════
 
-    sys.exit(0)
+
+def main():
+    loop_engine.main([STRATEGY])
 
 
 if __name__ == "__main__":
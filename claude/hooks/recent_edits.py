@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Recent Edits - 최근 수정 기록 고정 크기 링 버퍼
+
+post-edit/subagent-stop(todo.md "## 최근 수정")과 pre-edit(context.md "## 최근 수정")이
+수정마다 markdown 파일 전체를 나누고 다시 쓰던 것을 작은 JSON 링 버퍼로 대체합니다.
+
+- 파일: .claude/recent-edits.json  {"version": 1, "edits": [...], "attempts": [...]}
+- 채널별 최대 CAPACITY개, 같은 경로는 맨 앞으로 이동 (중복 제거)
+- 항목: {"path", "time": "HH:MM", "action"(선택)}
+- markdown 목록은 필요할 때만 render()로 생성 (session-start, stop, CLI)
+
+채널:
+- edits:    완료된 수정 (post-edit, subagent-stop)
+- attempts: 수정 시도 (pre-edit, action 포함)
+
+push_entry()는 내용 문자열 → 새 내용 문자열 변환이라 지연 쓰기 transform으로 그대로 씁니다.
+
+사용법:
+    python3 recent_edits.py [edits|attempts]     # markdown 목록 출력
+"""
+import json
+import os
+import sys
+
+RING_FILE = "recent-edits.json"
+CAPACITY = 10
+CHANNELS = ("edits", "attempts")
+
+
+def ring_path(claude_dir) -> str:
+    return os.path.join(str(claude_dir), RING_FILE)
+
+
+def ensure_ring(claude_dir) -> str:
+    """링 파일 경로 (없으면 빈 링 생성 - 지연 쓰기 transform은 파일이 있어야 적용됨)"""
+    path = ring_path(claude_dir)
+    if not os.path.exists(path):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return path
+        try:
+            os.write(fd, b'{"version": 1}')
+        finally:
+            os.close(fd)
+    return path
+
+
+def _parse(content: str) -> dict | None:
+    try:
+        data = json.loads(content) if content.strip() else {}
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def push_entry(content: str, channel: str, path: str, time: str, action: str = "") -> str | None:
+    """링 내용에 항목 추가 (같은 경로는 제거 후 맨 앞, CAPACITY개 유지)
+
+    링 JSON이 아닌 내용이면 None (변경 없음).
+    """
+    data = _parse(content)
+    if data is None:
+        return None
+    entry = {"path": path, "time": time}
+    if action:
+        entry["action"] = action
+    previous = data.get(channel) if isinstance(data.get(channel), list) else []
+    kept = [e for e in previous if isinstance(e, dict) and e.get("path") != path]
+    data["version"] = 1
+    data[channel] = [entry] + kept[:CAPACITY - 1]
+    return json.dumps(data, ensure_ascii=False)
+
+
+def load(claude_dir) -> dict:
+    try:
+        with open(ring_path(claude_dir), encoding="utf-8") as f:
+            return _parse(f.read()) or {}
+    except OSError:
+        return {}
+
+
+def entries(claude_dir, channel: str = "edits") -> list[dict]:
+    """최근 항목 (최신 순)"""
+    items = load(claude_dir).get(channel)
+    return [e for e in items if isinstance(e, dict)] if isinstance(items, list) else []
+
+
+def format_entry(entry: dict) -> str:
+    line = f"- `{entry.get('path', '')}` ({entry.get('time', '')})"
+    if entry.get("action"):
+        line += f" - {entry['action']}"
+    return line
+
+
+def render(claude_dir, channel: str = "edits", title: str = "## 최근 수정") -> str:
+    """markdown 목록 (항목이 없으면 "")"""
+    items = entries(claude_dir, channel)
+    if not items:
+        return ""
+    lines = [format_entry(e) for e in items]
+    return "\n".join(([title] if title else []) + lines)
+
+
+def main():
+    channel = sys.argv[1] if len(sys.argv) > 1 else "edits"
+    if channel not in CHANNELS:
+        print(f"Usage: python3 recent_edits.py [{'|'.join(CHANNELS)}]", file=sys.stderr)
+        sys.exit(1)
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    print(render(os.path.join(project_dir, ".claude"), channel) or "(no recent edits)")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
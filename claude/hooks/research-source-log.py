@@ -3,6 +3,7 @@
 
 Claude Code 2.1+ Agent Hooks in Frontmatter 기능 활용
 /moon-research 명령어에서 웹 검색/페치 전 소스 로깅
+(로그 기록은 지연 쓰기 큐로 처리)
 """
 import json
 import sys
@@ -15,17 +16,23 @@ try:
 except ImportError:
     def output_context(ctx): print(json.dumps({"additionalContext": ctx}))
 
+try:
+    from deferred_writes import defer_append
+except ImportError:
+    def defer_append(path, text):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+
 
 def log_source(source_type: str, query_or_url: str):
     """연구 소스 로깅"""
     log_path = Path(".claude/knowledge/research/search-log.md")
-    log_path.parent.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.now().isoformat()
     entry = f"- [{timestamp}] {source_type}: {query_or_url}\n"
 
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(entry)
+    defer_append(log_path, entry)
 
 
 def main():
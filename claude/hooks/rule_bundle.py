@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Rule Bundle - hook 규칙 테이블 사전 빌드 캐시
+
+pre-bash, pre-mcp, post-bash의 패턴 테이블(결합 정규식 RuleSet)과
+magic-keywords, user-prompt-submit의 키워드 매처(keyword_matcher.KeywordMatcher)를
+hooks 디렉토리의 .rule-bundle.pickle 하나에 저장합니다.
+
+- 각 hook은 build_rules()로 자신의 규칙을 정의 (번들 빌드와 fallback 공용)
+- hook 파일 또는 이 모듈의 mtime이 바뀌면 해당 항목은 무효 → hook이 직접 빌드
+- scripts/setup.py의 hooks/install/bundle 명령에서 빌드
+
+pickle은 정규식을 (pattern, flags)로 저장하고 로드 시 다시 컴파일합니다.
+번들의 이점은 테이블당 수십 번의 re.search를 결합 정규식 하나로 줄이고
+테이블 구성 작업을 프로세스마다 반복하지 않는 데 있습니다.
+
+사용법:
+    python3 rule_bundle.py           # 번들 빌드
+    python3 rule_bundle.py --check   # 번들 상태 확인
+"""
+import os
+import re
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).parent.resolve()
+BUNDLE_NAME = ".rule-bundle.pickle"
+BUNDLE_VERSION = 1
+
+# 번들에 포함되는 hook (각 hook은 build_rules()를 정의)
+BUNDLED_HOOKS = ["pre-bash", "pre-mcp", "post-bash", "magic-keywords", "user-prompt-submit"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COMBINED MATCHER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class RuleSet:
+    """(pattern, label) 목록을 결합한 정규식
+
+    목록을 순서대로 re.search 하는 것과 같은 결과(목록상 첫 번째 일치 규칙)를 반환합니다.
+
+    - any_pattern: 단순 alternation - 일치하는 규칙이 있는지 한 번에 확인
+      (대부분의 입력은 여기서 끝남)
+    - ordered_pattern: 위치마다 시도하는 lookahead alternation - 같은 위치에서는
+      앞선 규칙이 이기므로, 모든 위치의 최소 규칙 번호가 목록상 첫 번째 일치 규칙
+    """
+    __slots__ = ("any_pattern", "ordered_pattern", "labels")
+
+    def __init__(self, rules: list, flags: int = 0):
+        sources = [pattern for pattern, _ in rules]
+        self.labels = [label for _, label in rules]
+        self.any_pattern = re.compile("|".join(f"(?:{s})" for s in sources), flags)
+        self.ordered_pattern = re.compile(
+            "(?=" + "|".join(f"(?P<r{i}>{s})" for i, s in enumerate(sources)) + ")",
+            flags,
+        )
+
+    def first_index(self, text: str) -> int | None:
+        """목록 순서상 첫 번째로 일치하는 규칙 번호 (없으면 None)"""
+        if not self.any_pattern.search(text):
+            return None
+        best = None
+        for match in self.ordered_pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def match(self, text: str):
+        """첫 번째로 일치하는 규칙의 label (없으면 None)"""
+        index = self.first_index(text)
+        return None if index is None else self.labels[index]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BUNDLE LOADING
+# ═══════════════════════════════════════════════════════════════════════════
+
+# (번들 파일 시그니처, 번들 데이터)
+_bundle: tuple | None = None
+
+# hook → (소스 시그니처, 규칙) - 번들이 없을 때 직접 빌드한 결과
+_built: dict = {}
+
+# hook → (builder, 규칙) - 같은 모듈 로드 안에서는 stat 없이 재사용
+_resolved: dict = {}
+
+
+def bundle_path() -> Path:
+    return HOOKS_DIR / BUNDLE_NAME
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def source_signature(hook: str) -> tuple:
+    """hook 규칙의 유효성 키 (hook 파일 mtime, 이 모듈 mtime)"""
+    return (_mtime_ns(HOOKS_DIR / f"{hook}.py"), _mtime_ns(Path(__file__)))
+
+
+def load_bundle() -> dict | None:
+    """번들 로드 (파일이 바뀌지 않았으면 메모리 캐시 재사용)"""
+    global _bundle
+    path = bundle_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+
+    signature = (st.st_mtime_ns, st.st_size)
+    if _bundle and _bundle[0] == signature:
+        return _bundle[1]
+
+    import pickle
+
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except Exception:
+        return None
+
+    if (not isinstance(data, dict)
+            or data.get("version") != BUNDLE_VERSION
+            or data.get("python") != tuple(sys.version_info[:2])):
+        return None
+
+    _bundle = (signature, data)
+    return data
+
+
+def get_rules(hook: str, builder):
+    """hook 규칙 반환 - 번들 항목이 유효하면 사용하고, 아니면 builder()로 빌드
+
+    hook 모듈이 다시 로드되면 builder도 새 함수 객체가 되므로 그때 다시 검증합니다.
+    """
+    resolved = _resolved.get(hook)
+    if resolved and resolved[0] is builder:
+        return resolved[1]
+
+    rules = _lookup_rules(hook, builder)
+    _resolved[hook] = (builder, rules)
+    return rules
+
+
+def _lookup_rules(hook: str, builder):
+    signature = source_signature(hook)
+
+    data = load_bundle()
+    if data:
+        entry = data.get("rules", {}).get(hook)
+        if entry and entry[0] == signature:
+            return entry[1]
+
+    built = _built.get(hook)
+    if built and built[0] == signature:
+        return built[1]
+
+    rules = builder()
+    _built[hook] = (signature, rules)
+    return rules
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BUNDLE BUILD
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _load_hook_module(hook: str):
+    if str(HOOKS_DIR) not in sys.path:
+        sys.path.insert(0, str(HOOKS_DIR))
+    from hook_runtime import load_hook
+    return load_hook(hook)
+
+
+def build_bundle() -> dict:
+    """모든 번들 대상 hook의 build_rules()를 모아 번들 파일 작성
+
+    Returns:
+        dict: hook → 규칙 개수 요약 (빌드 실패한 hook은 오류 메시지)
+    """
+    import pickle
+
+    rules = {}
+    summary = {}
+    for hook in BUNDLED_HOOKS:
+        try:
+            module = _load_hook_module(hook)
+            rules[hook] = (source_signature(hook), module.build_rules())
+            summary[hook] = len(rules[hook][1])
+        except Exception as e:
+            summary[hook] = f"error: {e}"
+
+    data = {
+        "version": BUNDLE_VERSION,
+        "python": tuple(sys.version_info[:2]),
+        "rules": rules,
+    }
+
+    path = bundle_path()
+    tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return summary
+
+
+def warm_rules() -> list[str]:
+    """모든 번들 대상 hook의 규칙을 메모리에 로드 (hook 데몬 사전 로드용)"""
+    warmed = []
+    for hook in BUNDLED_HOOKS:
+        try:
+            module = _load_hook_module(hook)
+            get_rules(hook, module.build_rules)
+            warmed.append(hook)
+        except Exception:
+            pass
+    return warmed
+
+
+def main():
+    if "--check" in sys.argv[1:]:
+        data = load_bundle()
+        if data is None:
+            print(f"rule bundle missing or incompatible: {bundle_path()}")
+            sys.exit(1)
+        stale = [hook for hook in BUNDLED_HOOKS
+                 if data["rules"].get(hook, (None,))[0] != source_signature(hook)]
+        if stale:
+            print(f"rule bundle stale for: {', '.join(stale)}")
+            sys.exit(1)
+        print(f"rule bundle up to date ({len(data['rules'])} hooks)")
+        sys.exit(0)
+
+    summary = build_bundle()
+    for hook, count in summary.items():
+        print(f"{hook}: {count}")
+    print(f"wrote {bundle_path()}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
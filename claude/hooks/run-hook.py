@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Cross-Platform Hook Runner - 크로스 플랫폼 훅 실행기
+
+Windows, macOS, Linux에서 동일하게 동작하는 hook 실행기입니다.
+
+사용법:
+    python run-hook.py <hook-name> [<hook-name> ...]
+    python run-hook.py magic-keywords
+    python run-hook.py unified-loop evolution-feedback stop
+
+여러 hook을 지정하면 한 프로세스에서 순서대로 실행하고 출력을 병합합니다
+(stdin 1회 파싱, .claude/ 파일 읽기 캐시 공유, 차단 exit 2 유지).
+
+Import 프로파일 (cold-start 예산 검사):
+    python run-hook.py --profile-import                  # 모든 hook
+    python run-hook.py --profile-import pre-bash stop    # 지정 hook
+    python run-hook.py --profile-import --budget 20      # 예산(ms) 초과 시 exit 1
+
+이 스크립트는 settings.json에서 사용됩니다:
+    Windows: python "%USERPROFILE%\\.claude\\hooks\\run-hook.py" <hook-name>
+    Unix:    python ~/.claude/hooks/run-hook.py <hook-name>
+
+hook 데몬을 거치는 빠른 경로는 hook-client.py를 참조하세요.
+hook별/명령별 실행 시간은 .claude/hook-latency.jsonl에 기록됩니다
+(`python scripts/setup.py doctor --hook-latency`로 p50/p95/p99 확인).
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.resolve()))
+from hook_runtime import (  # noqa: E402
+    IMPORT_BUDGET_MS, list_hooks, normalize_hook_name, profile_import, run_hooks,
+)
+
+
+def profile_imports(args: list[str]) -> int:
+    """hook별 모듈 로드 시간 출력, 예산 초과 hook이 있으면 1 반환"""
+    budget = IMPORT_BUDGET_MS
+    if "--budget" in args:
+        index = args.index("--budget")
+        try:
+            budget = float(args[index + 1])
+        except (IndexError, ValueError):
+            print("Error: --budget requires milliseconds", file=sys.stderr)
+            return 1
+        del args[index:index + 2]
+
+    names = [normalize_hook_name(arg) for arg in args] or list_hooks()
+
+    print(f"{'hook':<28} {'load ms':>8} {'import ms':>10}  top imports (cumulative ms)")
+    over_budget = []
+    for name in names:
+        result = profile_import(name)
+        if result["error"]:
+            print(f"{name:<28} {'ERROR':>8}  {result['error']}")
+            over_budget.append(name)
+            continue
+        top = ", ".join(f"{module} {ms:.1f}" for module, ms in result["top"])
+        mark = " ⚠️" if result["total_ms"] > budget else ""
+        print(f"{name:<28} {result['total_ms']:>8.1f} {result['imports_ms']:>10.1f}  {top}{mark}")
+        if result["total_ms"] > budget:
+            over_budget.append(name)
+
+    print(f"\nbudget: {budget:.1f} ms per hook (interpreter startup excluded)")
+    if over_budget:
+        print(f"over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python run-hook.py <hook-name> [<hook-name> ...]", file=sys.stderr)
+        print("Example: python run-hook.py magic-keywords", file=sys.stderr)
+        sys.exit(1)
+
+    if sys.argv[1] == "--profile-import":
+        sys.exit(profile_imports(sys.argv[2:]))
+
+    started = time.time()
+    start = time.perf_counter()
+    hook_names = [normalize_hook_name(arg) for arg in sys.argv[1:]]
+
+    stdin_text = sys.stdin.read()
+    result = run_hooks(hook_names, stdin_text)
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    sys.stdout.flush()
+
+    try:
+        from utils import record_hook_latency
+        record_hook_latency([{
+            "ts": round(started, 3),
+            "event": os.environ.get("CLAUDE_HOOK_EVENT", ""),
+            "command": " ".join(hook_names),
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "stdin": len(stdin_text.encode("utf-8")),
+            "stdout": len(result.stdout.encode("utf-8")),
+            "exit": result.exit_code,
+            "via": "run-hook",
+        }])
+    except ImportError:
+        pass
+    sys.exit(result.exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Section Reader - mmap 기반 markdown 섹션 스트리밍 추출
+
+큰 knowledge 파일에서 섹션 하나만 필요할 때 파일 전체를 문자열로 디코딩(인코딩 후보마다 한 번씩)하고
+DOTALL 정규식을 돌리던 것을 바이트 수준 스캔으로 대체합니다.
+
+- 파일은 읽기 전용 mmap으로 열어 "#" 헤더를 바이트 정규식으로 찾음 (전체 복사/디코딩 없음)
+- 인코딩은 앞부분 샘플(SAMPLE_BYTES)로 한 번만 판별 (BOM → UTF-8 → cp949 → latin-1)
+- 요청한 섹션의 바이트만 잘라 디코딩
+- 문자 수/한글 수도 청크 단위로 계산 (UTF-8은 디코딩 없이 바이트에서 셈)
+
+헤더/섹션 규칙은 knowledge_index와 같음: 줄 시작 "#"×1~6 + 공백, 섹션은 같거나 더 높은
+수준의 다음 헤더 전까지 (코드 블록은 구분하지 않음).
+
+사용법:
+    python3 section_reader.py <file.md> <섹션 이름>
+"""
+import codecs
+import mmap
+import os
+import re
+import sys
+
+# 인코딩 판별에 쓰는 앞부분 크기
+SAMPLE_BYTES = 64 * 1024
+
+# 통계 계산 청크 크기 (줄 경계로 맞춤)
+CHUNK_BYTES = 1024 * 1024
+
+# UTF-8이 아니면 순서대로 시도 (cp949는 euc-kr 상위 집합, latin-1은 항상 성공)
+FALLBACK_ENCODINGS = ("cp949", "latin-1")
+
+HEADING = re.compile(rb"^(#{1,6}) [^\n]*", re.MULTILINE)
+HANGUL = re.compile("[가-힣]")
+# U+AC00..U+D7A3 (가-힣)의 UTF-8 바이트열
+HANGUL_UTF8 = re.compile(rb"\xea[\xb0-\xbf][\x80-\xbf]|[\xeb\xec][\x80-\xbf][\x80-\xbf]"
+                         rb"|\xed[\x80-\x9d][\x80-\xbf]|\xed\x9e[\x80-\xa3]")
+UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+
+
+def detect_encoding(sample: bytes) -> str:
+    """앞부분 샘플로 인코딩 판별 (샘플 끝에서 잘린 멀티바이트 문자는 허용)"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ("utf-8",) + FALLBACK_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def decode(raw: bytes, encoding: str) -> str:
+    """판별한 인코딩으로 한 번 디코딩 (샘플 뒤에서 깨진 바이트는 치환)"""
+    try:
+        return raw.decode(encoding)
+    except UnicodeDecodeError:
+        return raw.decode(encoding, errors="replace")
+
+
+class mapped:
+    """읽기 전용 mmap 컨텍스트 (빈 파일은 b"")
+
+    utils가 import하므로 contextlib 대신 직접 구현 (시작 비용 최소화)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.buf = b""
+
+    def __enter__(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.buf
+
+    def __exit__(self, *exc):
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BYTE-LEVEL SCAN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def iter_headings(buf, start: int = 0, end: int | None = None):
+    """(헤더 시작 오프셋, 수준, 헤더 줄 바이트) - 파일 순서"""
+    end = len(buf) if end is None else end
+    for match in HEADING.finditer(buf, start, end):
+        yield match.start(), len(match.group(1)), match.group(0).rstrip(b"\r")
+
+
+def section_span(buf, name: str, min_level: int = 1, encoding: str = "utf-8") -> tuple[int, int] | None:
+    """헤더 텍스트("#" 제외)가 name으로 시작하는 첫 섹션의 (시작, 끝) 바이트"""
+    wanted = name.encode("utf-8" if encoding.startswith("utf-8") else encoding, errors="replace")
+    found = None
+    for offset, level, header in iter_headings(buf):
+        if found is not None:
+            if level <= found[1]:
+                return found[0], offset
+        elif level >= min_level and header[level:].strip().startswith(wanted):
+            found = (offset, level)
+    return (found[0], len(buf)) if found else None
+
+
+def _chunks(buf, start: int, end: int):
+    """[start, end)를 줄 경계(없으면 UTF-8 문자 경계)에서 나눈 바이트 청크"""
+    pos = start
+    while pos < end:
+        stop = min(pos + CHUNK_BYTES, end)
+        if stop < end:
+            newline = buf.rfind(b"\n", pos, stop)
+            if newline >= 0:
+                stop = newline + 1
+            else:
+                while stop > pos + 1 and buf[stop] & 0xC0 == 0x80:
+                    stop -= 1
+        yield buf[pos:stop]
+        pos = stop
+
+
+def text_stats(buf, start: int = 0, end: int | None = None, encoding: str = "utf-8") -> tuple[int, int]:
+    """[start, end)의 (문자 수, 한글 문자 수) - 전체를 한 번에 디코딩하지 않음"""
+    end = len(buf) if end is None else end
+    chars = korean = 0
+    utf8 = encoding.startswith("utf-8")
+    for chunk in _chunks(buf, start, end):
+        if utf8:
+            chars += len(chunk.translate(None, UTF8_CONTINUATION))
+            korean += len(HANGUL_UTF8.findall(chunk))
+        else:
+            text = decode(chunk, encoding)
+            chars += len(text)
+            korean += len(HANGUL.findall(text))
+    if encoding == "utf-8-sig" and start == 0 and end >= len(codecs.BOM_UTF8):
+        chars -= 1  # BOM
+    return chars, korean
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FILE-LEVEL HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def read_section(path, name: str, min_level: int = 1, body_only: bool = False) -> str:
+    """파일에서 섹션 하나만 읽기 (없으면 "")"""
+    try:
+        with mapped(path) as buf:
+            encoding = detect_encoding(buf[:SAMPLE_BYTES])
+            span = section_span(buf, name, min_level, encoding)
+            if span is None:
+                return ""
+            raw = buf[span[0]:span[1]]
+    except (OSError, ValueError):
+        return ""
+    if body_only:
+        newline = raw.find(b"\n")
+        raw = raw[newline + 1:] if newline >= 0 else b""
+    return decode(raw, encoding)
+
+
+def read_head(path, limit: int) -> str:
+    """파일 앞부분 limit자 (전체를 읽지 않음)"""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(limit * 4)  # UTF-8 최대 4바이트/문자
+    except OSError:
+        return ""
+    return raw.decode(detect_encoding(raw[:SAMPLE_BYTES]), errors="ignore")[:limit]
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 section_reader.py <file.md> <section name>", file=sys.stderr)
+        sys.exit(1)
+    section = read_section(sys.argv[1], sys.argv[2])
+    if not section:
+        print(f"section not found: {sys.argv[2]}", file=sys.stderr)
+        sys.exit(1)
+    print(section.rstrip())
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,21 @@ import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 
+# 상태 파일 잠금 + 원자적 저장 (없으면 바로 씀)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import write_json
+except ImportError:
+    def write_json(path, data):
+        Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    import todo_model
+except ImportError:
+    todo_model = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # SESSION RECOVERY CONFIGURATION
@@ -104,7 +119,7 @@ def save_session_state(claude_dir: Path, state: dict):
     state_file = get_session_state_path(claude_dir)
     try:
         state_file.parent.mkdir(parents=True, exist_ok=True)
-        state_file.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(state_file, state)
     except Exception:
         pass
 
@@ -192,6 +207,8 @@ def needs_recovery(state: dict) -> tuple[bool, str]:
 def get_pending_todos(claude_dir: Path) -> list[str]:
     """미완료 작업 목록"""
     todo_file = claude_dir / "todo.md"
+    if todo_model is not None:
+        return todo_model.load_status(todo_file)["pending"]
     if not todo_file.exists():
         return []
 
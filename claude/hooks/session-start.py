@@ -9,6 +9,7 @@
 - 5개 knowledge 파일 + todo.md 로드
 - 환경 정보 주입 (Docker 상태, Git 브랜치)
 - 오늘의 질문: "What dent will we make today?"
+- 토큰 예산 안에서 우선순위 순으로 조립 (context_assembler)
 """
 import json
 import os
@@ -18,6 +19,56 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# knowledge 섹션 색인 (없으면 파일 전체를 읽어 추출)
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import knowledge_index
+except ImportError:
+    knowledge_index = None
+
+# 오류 세그먼트 저장소 (없으면 errors.md를 그대로 사용)
+try:
+    import error_store
+except ImportError:
+    error_store = None
+
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    import todo_model
+except ImportError:
+    todo_model = None
+
+# 최근 수정 링 버퍼 (todo.md/context.md 섹션 대신 여기서 목록 생성)
+try:
+    import recent_edits
+except ImportError:
+    recent_edits = None
+
+# mmap 섹션 추출 (색인이 없을 때 파일 전체 대신 해당 섹션만)
+try:
+    import section_reader
+except ImportError:
+    section_reader = None
+
+# 토큰 예산 조립기 (없으면 섹션별 글자 수 제한으로 이어 붙임)
+try:
+    import context_assembler
+except ImportError:
+    context_assembler = None
+
+# SessionStart 주입 전체 토큰 예산 (CLAUDE_SESSION_CONTEXT_BUDGET으로 변경)
+SESSION_CONTEXT_BUDGET = 6000
+
+# 섹션 우선순위 (context-window-monitor PRESERVATION_PRIORITIES 순서, 작을수록 먼저 채움)
+SECTION_PRIORITIES = {
+    "todo": 1,
+    "decisions": 2,
+    "patterns": 3,
+    "errors": 4,
+    "context": 5,
+    "recent_edits": 5,
+}
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONTEXT-ENGINEERING SYNC
@@ -116,7 +167,7 @@ def extract_known_solutions(content: str) -> str:
             next_section = solutions.find("\n## [")
             if next_section > 0:
                 solutions = solutions[:next_section]
-            return solutions.strip()[:1000]
+            return solutions.strip()
     return ""
 
 
@@ -130,6 +181,32 @@ def extract_patterns_summary(content: str) -> str:
     return '\n'.join(summary_lines) if summary_lines else ""
 
 
+def load_recent_decisions(path: Path, max_count: int = 3) -> str:
+    """decisions.md 최근 N개 결정사항 (색인으로 해당 섹션만 읽음)"""
+    if knowledge_index is None:
+        return extract_recent_decisions(path.read_text(encoding="utf-8"), max_count)
+    return '\n\n'.join(knowledge_index.matching_sections(path, '## [', max_count))
+
+
+def load_known_solutions(path: Path) -> str:
+    """errors.md '알려진 해결책' 섹션 (파일이 커져도 해당 섹션만 읽음)"""
+    if knowledge_index is None:
+        if section_reader is not None:
+            return section_reader.read_section(path, "알려진 해결책", min_level=2, body_only=True).strip()
+        return extract_known_solutions(path.read_text(encoding="utf-8"))
+    section = knowledge_index.find_section(path, "알려진 해결책", min_level=2)
+    if section is None:
+        return ""
+    return knowledge_index.read_section(path, section, body_only=True).strip()
+
+
+def load_patterns_summary(path: Path) -> str:
+    """patterns.md 섹션 헤더 (색인에서 바로, 파일을 읽지 않음)"""
+    if knowledge_index is None:
+        return extract_patterns_summary(path.read_text(encoding="utf-8"))
+    return '\n'.join(knowledge_index.header_lines(path, levels=(2, 3)))
+
+
 def extract_pending_todos(content: str) -> str:
     """todo.md에서 미완료 항목만 추출"""
     lines = content.split('\n')
@@ -160,13 +237,25 @@ def load_ultrathink_philosophy(claude_dir: Path) -> str:
 def main():
     project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
     claude_dir = Path(project_dir) / ".claude"
+    try:
+        budget = int(os.environ.get("CLAUDE_SESSION_CONTEXT_BUDGET", SESSION_CONTEXT_BUDGET))
+    except ValueError:
+        budget = SESSION_CONTEXT_BUDGET
+    assembler = context_assembler.ContextAssembler(budget) if context_assembler else None
     context_parts = []
 
+    def add(name: str, text: str, keep: str = "head"):
+        """섹션 추가 (우선순위가 없는 섹션은 항상 포함)"""
+        if assembler is not None:
+            assembler.add(name, text, SECTION_PRIORITIES.get(name, 0), keep, required=name not in SECTION_PRIORITIES)
+        else:
+            context_parts.append(text)
+
     # 0. Context-Engineering 동기화 (세션 시작 시 자동)
     sync_status = sync_context_engineering()
 
     # 1. ULTRATHINK MINDSET (항상 최상단)
-    context_parts.append(ULTRATHINK_MINDSET)
+    add("mindset", ULTRATHINK_MINDSET)
 
     # 2. 환경 정보 (간략)
     env_info = []
@@ -175,49 +264,65 @@ def main():
         env_info.append(sync_status)
     env_info.append(get_git_info())
     env_info.append(get_docker_status())
-    context_parts.append("# 환경 정보\n" + " | ".join(env_info))
+    add("env", "# 환경 정보\n" + " | ".join(env_info))
 
     # 3. todo.md - 미완료 작업 중심
     todo_file = claude_dir / "todo.md"
     if todo_file.exists():
-        content = todo_file.read_text(encoding="utf-8")
-        pending = extract_pending_todos(content)
+        if todo_model is not None:
+            snapshot = todo_model.load(todo_file)
+            pending = '\n'.join(item.line for item in snapshot.of("pending")[:8]) if snapshot else ""
+        else:
+            pending = extract_pending_todos(todo_file.read_text(encoding="utf-8"))
         if pending:
-            context_parts.append(f"# 📋 미완료 작업\n{pending}")
+            add("todo", f"# 📋 미완료 작업\n{pending}")
 
-    # 4. context.md - 전체
+    # 4. context.md - 예산 안에서 최근 기록 우선 (뒤쪽이 최신)
     context_file = claude_dir / "knowledge" / "context.md"
     if context_file.exists():
         content = context_file.read_text(encoding="utf-8").strip()
         if content:
-            context_parts.append(f"# 세션 컨텍스트\n{content}")
+            add("context", f"# 세션 컨텍스트\n{content}", keep="tail")
+
+    # 4-1. 최근 수정 (링 버퍼에서 렌더링)
+    if recent_edits is not None:
+        recent = recent_edits.render(claude_dir, "edits", title="# 최근 수정")
+        if recent:
+            add("recent_edits", recent)
 
     # 5. decisions.md - 최근 3개
     decisions_file = claude_dir / "knowledge" / "decisions.md"
     if decisions_file.exists():
-        content = decisions_file.read_text(encoding="utf-8")
-        recent = extract_recent_decisions(content, max_count=3)
+        recent = load_recent_decisions(decisions_file, max_count=3)
         if recent:
-            context_parts.append(f"# 최근 결정사항\n{recent}")
+            add("decisions", f"# 최근 결정사항\n{recent}")
 
     # 6. patterns.md - 헤더만
     patterns_file = claude_dir / "knowledge" / "patterns.md"
     if patterns_file.exists():
-        content = patterns_file.read_text(encoding="utf-8")
-        summary = extract_patterns_summary(content)
+        summary = load_patterns_summary(patterns_file)
         if summary:
-            context_parts.append(f"# 코드 패턴 (목록)\n{summary}\n> 상세: `.claude/knowledge/patterns.md`")
+            add("patterns", f"# 코드 패턴 (목록)\n{summary}\n> 상세: `.claude/knowledge/patterns.md`")
 
-    # 7. errors.md - 알려진 해결책만
+    # 7. errors.md - 알려진 해결책만 (조립기가 없으면 1000자)
     errors_file = claude_dir / "knowledge" / "errors.md"
+    if error_store is not None:
+        # 쌓인 자동 기록 세그먼트 압축 / errors.md에 남은 이전 형식 기록 이전 (필요할 때만)
+        try:
+            headers = knowledge_index.header_lines(errors_file, levels=(2,)) if knowledge_index else None
+            error_store.maintain(claude_dir / "knowledge", headers)
+        except Exception:
+            pass
     if errors_file.exists():
-        content = errors_file.read_text(encoding="utf-8")
-        solutions = extract_known_solutions(content)
+        solutions = load_known_solutions(errors_file)
         if solutions:
-            context_parts.append(f"# 알려진 오류 해결책\n{solutions}")
+            if assembler is None:
+                solutions = solutions[:1000]
+            add("errors", f"# 알려진 오류 해결책\n{solutions}")
 
-    if context_parts:
-        output = {"additionalContext": "\n\n---\n\n".join(context_parts)}
+    additional = assembler.assemble() if assembler is not None else "\n\n---\n\n".join(context_parts)
+    if additional:
+        output = {"additionalContext": additional}
         print(json.dumps(output, ensure_ascii=False))
 
     sys.exit(0)
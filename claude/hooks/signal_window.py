@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Signal Window - 완료/취소 신호를 transcript 끝부분에서만 감지
+
+ralph-loop/unified-loop가 transcript 전체에서 완료/취소 신호를 찾으면, 3번째 반복에서 한 번
+출력한 "[DONE]"이나 "취소"가 이후 모든 반복에서 계속 일치하고 검색 비용도 반복마다 커집니다.
+이 모듈은 마지막 assistant 턴(없으면 끝 N KB) 안에서만, 단어 경계 기준으로 신호를 찾습니다.
+
+- 창 설정: .claude/agent-state.json의 "signalWindow"
+  {"lastTurn": true, "kb": 8}
+  kb: 끝에서 볼 최대 크기 (KB, 문자 수 기준 - 0 이하면 제한 없음)
+  lastTurn: 창 안의 마지막 assistant 턴 표시(줄 시작 "assistant:"/"Assistant:") 이후만 봄
+           (표시가 없으면 창 전체)
+- 단어 경계: 신호 앞뒤가 글자/숫자/_가 아니어야 일치
+  ("RALPH_COMPLETED"는 "RALPH_COMPLETE"가 아님, "완료되지"는 "완료"가 아님)
+- 비용은 창 크기에 비례 (transcript 길이와 무관)
+
+사용법:
+    window = signal_window.load_window(state=state)              # 또는 claude_dir=...
+    tail = signal_window.tail(transcript, window)
+    if signal_window.has_signal(tail, COMPLETION_SIGNALS): ...
+"""
+import json
+import os
+import re
+from functools import lru_cache
+
+WINDOW_KEY = "signalWindow"
+DEFAULT_WINDOW = {"lastTurn": True, "kb": 8}
+STATE_FILE = "agent-state.json"
+
+ASSISTANT_TURN = re.compile(r"^[ \t]*assistant[ \t]*:", re.IGNORECASE | re.MULTILINE)
+
+
+def load_window(state: dict | None = None, claude_dir=None) -> dict:
+    """창 설정 (state 또는 claude_dir/agent-state.json의 signalWindow + 기본값)"""
+    if state is None:
+        claude_dir = claude_dir or os.path.join(os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd(), ".claude")
+        try:
+            with open(os.path.join(str(claude_dir), STATE_FILE), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+    configured = state.get(WINDOW_KEY) if isinstance(state, dict) else None
+    window = dict(DEFAULT_WINDOW)
+    if isinstance(configured, dict):
+        window.update((key, configured[key]) for key in DEFAULT_WINDOW if key in configured)
+    return window
+
+
+def tail(transcript: str, window: dict | None = None) -> str:
+    """신호를 찾을 transcript 끝부분 (마지막 assistant 턴 또는 끝 kb KB)"""
+    window = window or DEFAULT_WINDOW
+    try:
+        size = int(float(window.get("kb", DEFAULT_WINDOW["kb"])) * 1024)
+    except (TypeError, ValueError):
+        size = DEFAULT_WINDOW["kb"] * 1024
+    text = transcript[-size:] if size > 0 else transcript
+    if window.get("lastTurn", True):
+        last = None
+        for last in ASSISTANT_TURN.finditer(text):
+            pass
+        if last is not None:
+            text = text[last.start():]
+    return text
+
+
+@lru_cache(maxsize=32)
+def signal_pattern(signals: tuple) -> re.Pattern:
+    """신호 목록 → 단어 경계 결합 정규식 (대소문자 무시)"""
+    alternatives = "|".join(map(re.escape, sorted(signals, key=len, reverse=True)))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE)
+
+
+def has_signal(text: str, signals) -> bool:
+    """text 안에 신호 중 하나가 단어 경계로 있는지"""
+    signals = tuple(signal for signal in signals if signal)
+    return bool(signals) and signal_pattern(signals).search(text) is not None
@@ -54,6 +54,7 @@ SPEC_INDICATORS = [
 ]
 
 # Patterns that suggest significant implementation
+# (preconditions.json의 spec-check 항목과 같게 유지 - hook_preconditions.py --check로 확인)
 SIGNIFICANT_CHANGE_PATTERNS = [
     r"^(src|lib|app)/.*\.(ts|tsx|js|jsx|py|go|rs)$",  # Source files
     r".*/(components|services|api|controllers|models)/.*",  # Architecture
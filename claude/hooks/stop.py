@@ -16,6 +16,49 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# utils 모듈 로드 (없으면 기본 동작)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import read_cached_text, update_file
+except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+
+    def update_file(path, *transforms, default=""):
+        content = read_cached_text(path, default)
+        for transform in transforms:
+            content = transform(content)
+        Path(path).write_text(content, encoding="utf-8")
+        return True
+
+# knowledge 섹션 색인 (없으면 파일 전체를 읽어 계산)
+try:
+    import knowledge_index
+except ImportError:
+    knowledge_index = None
+
+# todo.md 파싱 결과 캐시 (없으면 직접 파싱)
+try:
+    import todo_model
+except ImportError:
+    todo_model = None
+
+# 최근 수정 링 버퍼
+try:
+    import recent_edits
+except ImportError:
+    recent_edits = None
+
+# 입력 파일 해시 매니페스트 (없으면 매번 context.md 갱신)
+try:
+    import change_cache
+except ImportError:
+    change_cache = None
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ULTRATHINK: WHAT DENT DID WE MAKE?
 # ═══════════════════════════════════════════════════════════════════════════
@@ -45,17 +88,22 @@ ITERATE_SUGGESTION = """
 
 def get_pending_todos(todo_file: Path) -> list[str]:
     """미완료 작업 목록 반환"""
+    if todo_model is not None:
+        return todo_model.load_status(todo_file)["pending"]
     if not todo_file.exists():
         return []
-    content = todo_file.read_text(encoding="utf-8")
+    content = read_cached_text(todo_file)
     return re.findall(r"- \[ \] (.+)", content)
 
 
 def get_completed_today(todo_file: Path) -> list[str]:
     """오늘 완료된 작업 목록 반환"""
+    if todo_model is not None:
+        snapshot = todo_model.load(todo_file)
+        return snapshot.completed_on(datetime.now().strftime("%Y-%m-%d")) if snapshot else []
     if not todo_file.exists():
         return []
-    content = todo_file.read_text(encoding="utf-8")
+    content = read_cached_text(todo_file)
     today = datetime.now().strftime("%Y-%m-%d")
 
     completed = []
@@ -74,28 +122,44 @@ def get_session_metrics(claude_dir: Path) -> dict:
         "decisions_made": 0,
     }
 
-    # 최근 수정 파일 수 (context.md에서)
+    # 최근 수정 파일 수 (링 버퍼, 없으면 context.md에서)
     context_file = claude_dir / "knowledge" / "context.md"
-    if context_file.exists():
-        content = context_file.read_text(encoding="utf-8")
+    if recent_edits is not None:
+        edited = recent_edits.entries(claude_dir, "edits") + recent_edits.entries(claude_dir, "attempts")
+        metrics["files_modified"] = len({e.get("path") for e in edited if not str(e.get("path", "")).startswith("[Agent:")})
+    elif context_file.exists():
+        content = read_cached_text(context_file)
         metrics["files_modified"] = content.count("- `")
 
     # 결정 사항 수 (decisions.md에서)
     decisions_file = claude_dir / "knowledge" / "decisions.md"
     if decisions_file.exists():
-        content = decisions_file.read_text(encoding="utf-8")
-        metrics["decisions_made"] = content.count("## [")
+        if knowledge_index is not None:
+            titles = knowledge_index.header_lines(decisions_file, levels=(2, 3, 4, 5, 6))
+            metrics["decisions_made"] = sum(1 for title in titles if "## [" in title)
+        else:
+            content = read_cached_text(decisions_file)
+            metrics["decisions_made"] = content.count("## [")
 
     return metrics
 
 
 def update_context_file(claude_dir: Path, pending: list[str], completed: list[str]):
-    """context.md에 세션 종료 기록 추가"""
+    """context.md에 세션 종료 기록 추가
+
+    todo.md와 context.md가 마지막 기록 이후 그대로면 (같은 날) 다시 쓰지 않음
+    """
     context_file = claude_dir / "knowledge" / "context.md"
     if not context_file.exists():
         return
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M")
+    cache = change_cache.ChangeCache(claude_dir, "stop") if change_cache else None
+    if cache is not None:
+        inputs = [claude_dir / "todo.md", context_file]
+        if cache.get("context", inputs, key=now.strftime("%Y-%m-%d")) is not None:
+            return
 
     section = f"\n\n## 세션 종료 기록 ({timestamp})\n"
 
@@ -107,15 +171,17 @@ def update_context_file(claude_dir: Path, pending: list[str], completed: list[st
         if len(pending) > 1:
             section += f"**📋 대기 중**: {len(pending)-1}개 추가 작업\n"
 
-    try:
-        content = context_file.read_text(encoding="utf-8")
-
+    def replace_session_record(content: str) -> str:
         # 이전 세션 종료 기록 제거 (최신 것만 유지)
         if "## 세션 종료 기록" in content:
             content = content.split("## 세션 종료 기록")[0].rstrip()
+        return content + section
 
-        content += section
-        context_file.write_text(content, encoding="utf-8")
+    try:
+        update_file(context_file, replace_session_record)
+        if cache is not None:
+            cache.put("context", timestamp, key=now.strftime("%Y-%m-%d"), changed=[context_file])
+            cache.save()
     except Exception:
         pass
 
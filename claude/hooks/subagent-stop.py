@@ -6,7 +6,7 @@
 기능:
 - 8개 이상 항목 나열 시 경고 (날조 임계점)
 - 결과 품질 간단 검증
-- 완료된 작업을 todo.md에 기록
+- 완료된 작업을 최근 수정 링(.claude/recent-edits.json)에 기록
 """
 import json
 import os
@@ -15,6 +15,33 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+# utils 모듈 로드 (없으면 기본 동작)
+try:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from utils import read_cached_text, read_hook_input
+except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+    def read_hook_input(): return json.loads(sys.stdin.read())
+
+# 지연 쓰기 (없으면 즉시 갱신)
+try:
+    from deferred_writes import defer_transform
+except ImportError:
+    def defer_transform(hook, path, transform, *args):
+        content = transform(read_cached_text(path), *args)
+        if content is not None:
+            Path(path).write_text(content, encoding="utf-8")
+
+# 최근 수정 링 버퍼 (없으면 todo.md "## 최근 수정" 섹션을 직접 갱신)
+try:
+    import recent_edits
+except ImportError:
+    recent_edits = None
+
 
 def count_list_items(text: str) -> int:
     """텍스트에서 리스트 항목 수 세기"""
@@ -52,30 +79,42 @@ def detect_fabrication_risk(result: str) -> dict:
     return {"risk": "LOW", "message": "", "action": "none"}
 
 
+def push_agent_completion(content: str, agent_name: str, timestamp: str) -> str | None:
+    """recent-edits.json 링 맨 앞에 서브에이전트 완료 추가 (지연 쓰기 transform)"""
+    return recent_edits.push_entry(content, "edits", f"[Agent: {agent_name}]", timestamp)
+
+
+def add_agent_completion(content: str, entry: str) -> str | None:
+    """todo.md 내용의 "## 최근 수정" 섹션 맨 앞에 항목 추가 (지연 쓰기 transform)"""
+    if "## 최근 수정" not in content:
+        return None
+    parts = content.split("## 최근 수정", 1)
+    return parts[0] + "## 최근 수정\n" + entry + "\n" + parts[1].lstrip('\n')
+
+
 def log_subagent_completion(agent_name: str, project_dir: str):
-    """서브에이전트 완료를 todo.md에 기록"""
+    """서브에이전트 완료를 최근 수정 링에 기록 (지연 쓰기, todo.md가 있는 프로젝트만)"""
     try:
         todo_file = Path(project_dir) / ".claude" / "todo.md"
         if not todo_file.exists():
             return
 
-        content = todo_file.read_text(encoding="utf-8")
         timestamp = datetime.now().strftime("%H:%M")
+        if recent_edits is not None:
+            ring = recent_edits.ensure_ring(todo_file.parent)
+            defer_transform("subagent-stop", ring, push_agent_completion, agent_name, timestamp)
+            return
 
         # "## 최근 수정" 섹션에 서브에이전트 완료 기록
         entry = f"- `[Agent: {agent_name}]` ({timestamp})"
-
-        if "## 최근 수정" in content:
-            parts = content.split("## 최근 수정", 1)
-            new_content = parts[0] + "## 최근 수정\n" + entry + "\n" + parts[1].lstrip('\n')
-            todo_file.write_text(new_content, encoding="utf-8")
+        defer_transform("subagent-stop", todo_file, add_agent_completion, entry)
     except Exception:
         pass
 
 
 def main():
     try:
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_hook_input()
 
         # 서브에이전트 정보
         agent_type = input_data.get("agent_type", "unknown")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Todo Model - todo.md 단일 파서 + 파싱 결과 캐시
+
+unified-loop, ralph-loop, continuation-enforcer, session-start, session-recovery,
+pre-compact, stop, utils가 각자 조금씩 다르게 todo.md를 파싱하던 것을 하나로 모읍니다.
+
+- 체크박스: "- [ ]" 대기, "- [x]" 완료, "- [~]"/"- [>]" 진행 중, "- [!]"/"- [b]" 막힘
+- load(): (mtime_ns, size)가 같으면 이전 파싱 결과 재사용 → 반복 조회는 stat() 한 번
+  (fan-out 프로세스 안에서 hook 사이에 공유, 데몬은 fork 전에 부모에서 갱신해 이벤트 사이에도 유지)
+- 읽기 전용 - 줄 단위 갱신 API는 두지 않음: todo.md 체크박스는 모델이 직접 고치고,
+  hook 쪽 기록은 recent_edits 링/지연 쓰기로 감
+
+사용법:
+    python3 todo_model.py [<todo.md>]     # 상태별 개수와 다음 작업
+"""
+import os
+import re
+import sys
+from collections import namedtuple
+
+# 체크박스 마커 → 상태
+MARKERS = {
+    " ": "pending",
+    "x": "completed",
+    "X": "completed",
+    "~": "in_progress",
+    ">": "in_progress",
+    "!": "blocked",
+    "b": "blocked",
+}
+
+STATUSES = ("pending", "in_progress", "completed", "blocked")
+
+# 앞 공백, 마커, 본문 (기존 hook들과 같이 "- [?] " 뒤를 작업 내용으로 봄)
+ITEM_PATTERN = re.compile(r"^([ \t]*)- \[(.)\](.*)$")
+COMPLETED_DATE = re.compile(r"^(.+?)(?:\s*\(\d{4}-\d{2}-\d{2}\))?$")
+
+
+# line_no: 0부터 센 줄 번호,
+# text: "- [?] " 뒤의 작업 내용 (앞뒤 공백 제거), line: 앞 공백을 제거한 원래 줄
+# (typing.NamedTuple 대신 namedtuple - utils가 import하므로 시작 비용 최소화)
+TodoItem = namedtuple("TodoItem", "line_no marker status text line")
+
+
+class TodoSnapshot:
+    """한 시점의 todo.md 파싱 결과"""
+    __slots__ = ("content", "items", "_by_status")
+
+    def __init__(self, content: str, items: list):
+        self.content = content
+        self.items = items
+        self._by_status = None
+
+    def by_status(self) -> dict:
+        """{"pending": [...], "in_progress": [...], "completed": [...], "blocked": [...]} (작업 내용)"""
+        if self._by_status is None:
+            grouped = {status: [] for status in STATUSES}
+            for item in self.items:
+                grouped[item.status].append(item.text)
+            self._by_status = grouped
+        return {status: list(texts) for status, texts in self._by_status.items()}
+
+    def of(self, status: str) -> list:
+        return [item for item in self.items if item.status == status]
+
+    def count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+    def incomplete_count(self) -> int:
+        return sum(1 for item in self.items if item.status in ("pending", "in_progress"))
+
+    def next_task(self) -> str:
+        """다음 작업 (진행 중 우선, 없으면 "")"""
+        for status in ("in_progress", "pending"):
+            for item in self.items:
+                if item.status == status:
+                    return item.text
+        return ""
+
+    def completed_on(self, date: str) -> list:
+        """해당 날짜가 적힌 완료 작업 (끝의 "(YYYY-MM-DD)" 제거)"""
+        result = []
+        for item in self.items:
+            if item.marker == "x" and date in item.line:
+                match = COMPLETED_DATE.match(item.line[6:])
+                if match:
+                    result.append(match.group(1))
+        return result
+
+    def find(self, text: str, status: str | None = None):
+        """작업 내용이 text로 시작하는 첫 항목 (없으면 None)"""
+        for item in self.items:
+            if item.text.startswith(text) and (status is None or item.status == status):
+                return item
+        return None
+
+
+def parse_bytes(raw: bytes) -> TodoSnapshot:
+    """todo.md 바이트 → 스냅샷"""
+    items = []
+    lines = []
+    for line_no, raw_line in enumerate(raw.split(b"\n")):
+        line = raw_line.decode("utf-8", errors="replace")
+        lines.append(line)
+        if b"- [" in raw_line:
+            match = ITEM_PATTERN.match(line.rstrip("\r"))
+            if match and match.group(2) in MARKERS:
+                stripped = line.strip()
+                items.append(TodoItem(line_no, match.group(2), MARKERS[match.group(2)],
+                                      stripped[6:].strip(), stripped))
+    return TodoSnapshot("\n".join(lines), items)
+
+
+def parse(content: str) -> TodoSnapshot:
+    """todo.md 텍스트 → 스냅샷"""
+    return parse_bytes(content.encode("utf-8"))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CACHED LOAD
+# ═══════════════════════════════════════════════════════════════════════════
+
+# 절대 경로 → (mtime_ns, size, TodoSnapshot)
+_snapshots: dict = {}
+
+
+def todo_path(project_dir: str | None = None) -> str:
+    project_dir = project_dir or os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    return os.path.join(str(project_dir), ".claude", "todo.md")
+
+
+def load(path=None) -> TodoSnapshot | None:
+    """todo.md 스냅샷 (파일이 없으면 None, 바뀌지 않았으면 캐시 재사용)"""
+    key = os.path.abspath(str(path or todo_path()))
+    try:
+        st = os.stat(key)
+    except OSError:
+        _snapshots.pop(key, None)
+        return None
+
+    cached = _snapshots.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    try:
+        with open(key, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    snapshot = parse_bytes(raw)
+    _snapshots[key] = (st.st_mtime_ns, st.st_size, snapshot)
+    return snapshot
+
+
+def load_status(path=None) -> dict:
+    """상태별 작업 내용 (파일이 없으면 빈 목록)"""
+    snapshot = load(path)
+    if snapshot is None:
+        return {status: [] for status in STATUSES}
+    return snapshot.by_status()
+
+
+def invalidate(path=None):
+    _snapshots.pop(os.path.abspath(str(path or todo_path())), None)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else todo_path()
+    snapshot = load(path)
+    if snapshot is None:
+        print(f"no todo file: {path}", file=sys.stderr)
+        sys.exit(1)
+    for status in STATUSES:
+        print(f"{status:<12} {snapshot.count(status)}")
+    next_task = snapshot.next_task()
+    if next_task:
+        print(f"next         {next_task}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
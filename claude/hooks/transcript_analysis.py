@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Transcript Analysis - 루프/검증 hook 공용 transcript 분석
+
+Stop/SubagentStop에서 같은 transcript를 hook마다 따로 .lower()/.upper()하고
+완료/취소 신호, 연구/리뷰 키워드, TDD/검증 패턴, DOI/arXiv, 심각도 정규식을
+각각 다시 검색하던 것을 한 번의 분석으로 모아 특징 기록 하나를 만듭니다.
+
+- 소문자 변환 1회 - 모든 리터럴 그룹은 같은 소문자 텍스트에서 포함 여부 확인
+  (str `in`이 리터럴 결합 정규식보다 빠르므로 그대로 사용)
+- 심각도는 그룹별 겹치지 않는 일치 수 (count_issues_by_severity와 같은 값)
+- 포함 여부 정규식(TDD 단계, 검증 트리거)은 결합 정규식으로 먼저 확인하고 일치할 때만 개별 확인
+- 인용(DOI/arXiv/학술 URL)은 원문에서 패턴별 건수 합 (count_citations와 같은 값)
+- 결과는 평평한 특징 기록 {이름: int} - 포함 여부는 0/1, severity.*와 citations는 건수
+- 텍스트 해시별로 .claude/.transcript-analysis.json(최근 CACHE_ENTRIES개)에 캐시
+  → 같은 이벤트의 여러 hook은 한 번 계산한 기록을 공유
+- scan()은 transcript_cursor와 결합해 이전 호출 이후 추가된 부분만 분석하고 누적 값을 반환
+
+어휘 표는 각 hook의 상수와 같게 유지합니다 (hook은 이 모듈이 없으면 자기 상수로 직접 검사).
+`python3 transcript_analysis.py --check`로 hook 상수와 일치하는지 확인할 수 있습니다.
+
+사용법:
+    features = transcript_analysis.scan(transcript, "continuous-review", input_data).totals
+    if features["review.complete"]: ...
+
+    python3 transcript_analysis.py < transcript.txt    # 특징 기록 출력
+    python3 transcript_analysis.py --check             # hook 상수와 어휘 표 비교
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from utils import write_json
+except ImportError:
+    def write_json(path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+try:
+    import transcript_cursor
+except ImportError:
+    transcript_cursor = None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# VOCABULARY (각 hook 상수와 같게 유지)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# 리터럴 그룹 - 대소문자 무시 포함 여부 (0/1)
+KEYWORD_GROUPS = {
+    # unified-loop COMPLETION_SIGNALS / CANCEL_SIGNALS
+    "unified.complete": ["LOOP_COMPLETE", "[DONE]", "[COMPLETE]", "작업완료", "완료",
+                         "RALPH_COMPLETE", "CONTINUOUS_COMPLETE", "ALL_TASKS_COMPLETE"],
+    "unified.cancel": ["LOOP_CANCEL", "[CANCEL]", "취소", "중단"],
+    # ralph-loop COMPLETION_SIGNALS / CANCEL_SIGNALS
+    "ralph.complete": ["RALPH_COMPLETE", "[RALPH_DONE]", "RALPH_CANCELLED", "[TASK_COMPLETE]",
+                       "[DONE]", "[완료]", "ALL_TASKS_COMPLETE"],
+    "ralph.cancel": ["RALPH_CANCEL", "RALPH_CANCELLED", "[CANCEL]", "[취소]"],
+    # continuous-loop COMPLETION_SIGNALS
+    "continuous.complete": ["CONTINUOUS_COMPLETE", "CONTINUOUS_CLAUDE_PROJECT_COMPLETE",
+                            "[LOOP_COMPLETE]", "[CONTINUOUS_DONE]"],
+    # continuous-research RESEARCH_COMPLETION_SIGNALS / RESEARCH_KEYWORDS / RESEARCH_PHASES
+    "research.complete": ["RESEARCH_COMPLETE", "[RESEARCH_DONE]", "[LITERATURE_COMPLETE]",
+                          "[연구완료]", "ALL_PAPERS_REVIEWED"],
+    "research.keywords": ["research", "literature", "paper", "systematic review",
+                          "연구", "논문", "문헌", "리서치"],
+    "research.phase.searching": ["search", "find paper", "검색", "논문 찾"],
+    "research.phase.analyzing": ["analyze", "read", "분석", "읽"],
+    "research.phase.synthesizing": ["synthesize", "summary", "종합", "요약"],
+    # continuous-review REVIEW_COMPLETION_SIGNALS / REVIEW_KEYWORDS / REVIEW_PERSPECTIVES (key, name)
+    "review.complete": ["REVIEW_COMPLETE", "[REVIEW_DONE]", "[CRITICAL_REVIEW_COMPLETE]",
+                        "[리뷰완료]", "ALL_PERSPECTIVES_REVIEWED"],
+    "review.keywords": ["review", "critique", "audit", "evaluate", "리뷰", "검토", "평가", "비판"],
+    "review.perspective.security": ["security", "🛡️ Security"],
+    "review.perspective.performance": ["performance", "⚡ Performance"],
+    "review.perspective.architecture": ["architecture", "🏗️ Architecture"],
+    "review.perspective.maintainability": ["maintainability", "🔧 Maintainability"],
+    "review.perspective.correctness": ["correctness", "✅ Correctness"],
+    "review.perspective.best_practices": ["best_practices", "📚 Best Practices"],
+    # verification-loop WORK_TYPE_KEYWORDS (각각) / E2E_KEYWORDS
+    "work.bug": ["bug"],
+    "work.fix": ["fix"],
+    "work.refactor": ["refactor"],
+    "work.feature": ["feature"],
+    "work.implement": ["implement"],
+    "work.test": ["test"],
+    "e2e": ["frontend", "ui", "component", "page", "button", "form"],
+}
+
+# 건수 그룹 - continuous-review SEVERITY_KEYWORDS (count_issues_by_severity와 같은 겹치지 않는 일치 수)
+COUNTED_GROUPS = {
+    "severity.critical": ["critical", "🔴", "심각"],
+    "severity.high": ["high", "🟠", "높음"],
+    "severity.medium": ["medium", "🟡", "중간"],
+    "severity.low": ["low", "🟢", "낮음"],
+}
+
+# 정규식 그룹 - 소문자 텍스트에서 포함 여부 (0/1)
+PATTERN_GROUPS = {
+    # verification-loop TDD_PATTERNS
+    "tdd.red": [r"(wrote|created|added)\s+.*test.*fail", r"test.*should\s+fail",
+                r"red\s+phase", r"failing\s+test"],
+    "tdd.green": [r"(implement|add|create).*pass\s+test", r"test.*pass",
+                  r"green\s+phase", r"make.*test.*pass"],
+    "tdd.refactor": [r"refactor", r"clean\s*up", r"improve.*code", r"remove.*duplication"],
+    # verification-loop VERIFICATION_TRIGGERS (순서대로 trigger.0 ~)
+    "trigger.0": [r"(created?|wrote|generated)\s+\d+\s+files?"],
+    "trigger.1": [r"(implemented|added|built)\s+.*(feature|function|component)"],
+    "trigger.2": [r"(fixed|resolved|patched)\s+.*(bug|issue|error)"],
+    "trigger.3": [r"(refactored|restructured|reorganized)"],
+    "trigger.4": [r"(deleted|removed)\s+\d+\s+files?"],
+    "trigger.5": [r"(test|spec)\s+.*(added|created|wrote)"],
+}
+
+# continuous-research count_citations (DOI, arXiv, 학술 URL) - 원문 기준 건수 합
+CITATION_PATTERNS = [
+    r"10\.\d{4,}/[^\s]+",
+    r"arXiv:\d{4}\.\d{4,}",
+    r"(arxiv\.org|doi\.org|scholar\.google|semanticscholar\.org)",
+]
+
+FEATURES = sorted(list(KEYWORD_GROUPS) + list(COUNTED_GROUPS) + list(PATTERN_GROUPS) + ["citations"])
+
+# 어휘가 바뀌면 캐시와 커서가 자동으로 무효가 되도록 이름에 포함
+VOCABULARY_SIGNATURE = hashlib.blake2b(
+    repr((KEYWORD_GROUPS, COUNTED_GROUPS, PATTERN_GROUPS, CITATION_PATTERNS)).encode("utf-8"), digest_size=4
+).hexdigest()
+DETECTOR_NAME = f"features@{VOCABULARY_SIGNATURE}"
+
+CACHE_FILE = ".transcript-analysis.json"
+CACHE_ENTRIES = 8
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════
+
+_compiled = None
+
+
+def _tables():
+    """(소문자 리터럴, 심각도 정규식, 결합 정규식, 그룹별 정규식, 인용 정규식) - 프로세스당 한 번 컴파일"""
+    global _compiled
+    if _compiled is None:
+        keywords = [(group, [literal.lower() for literal in literals]) for group, literals in KEYWORD_GROUPS.items()]
+        counted = [(group, re.compile("(" + "|".join(map(re.escape, words)) + ")", re.IGNORECASE))
+                   for group, words in COUNTED_GROUPS.items()]
+        patterns = [(group, [re.compile(p) for p in sources]) for group, sources in PATTERN_GROUPS.items()]
+        any_pattern = re.compile("|".join(f"(?:{p})" for sources in PATTERN_GROUPS.values() for p in sources))
+        citations = [re.compile(p) for p in CITATION_PATTERNS]
+        _compiled = (keywords, counted, any_pattern, patterns, citations)
+    return _compiled
+
+
+def analyze(text: str) -> dict:
+    """텍스트 하나의 특징 기록 {특징 이름: int}"""
+    record = dict.fromkeys(FEATURES, 0)
+    if not text:
+        return record
+    keywords, counted, any_pattern, patterns, citations = _tables()
+    text_lower = text.lower()
+    for group, literals in keywords:
+        record[group] = int(any(literal in text_lower for literal in literals))
+    for group, pattern in counted:
+        record[group] = len(pattern.findall(text_lower))
+    if any_pattern.search(text_lower):
+        for group, compiled in patterns:
+            record[group] = int(any(pattern.search(text_lower) for pattern in compiled))
+    record["citations"] = sum(len(pattern.findall(text)) for pattern in citations)
+    return record
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CACHE (텍스트 해시별)
+# ═══════════════════════════════════════════════════════════════════════════
+
+_memo = {}  # 해시 → 기록 (데몬 프로세스 안에서 재사용)
+
+
+def text_hash(text: str) -> str:
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16)
+    digest.update(VOCABULARY_SIGNATURE.encode())
+    return digest.hexdigest()
+
+
+def _default_claude_dir() -> str:
+    return os.path.join(os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd(), ".claude")
+
+
+def cached_analyze(text: str, claude_dir=None) -> dict:
+    """analyze() + 텍스트 해시 캐시 (같은 이벤트의 다른 hook이 이미 계산했으면 재사용)"""
+    if not text:
+        return analyze(text)
+    key = text_hash(text)
+    if key in _memo:
+        return dict(_memo[key])
+
+    path = os.path.join(str(claude_dir or _default_claude_dir()), CACHE_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f).get("entries", [])
+    except (OSError, ValueError, AttributeError):
+        entries = []
+    entries = [e for e in entries if isinstance(e, list) and len(e) == 2]
+    for cached_key, record in entries:
+        if cached_key == key and isinstance(record, dict):
+            _memo[key] = record
+            return dict(record)
+
+    record = analyze(text)
+    _memo[key] = record
+    entries = [e for e in entries if e[0] != key][-(CACHE_ENTRIES - 1):] + [[key, record]]
+    try:
+        write_json(path, {"version": 1, "entries": entries})
+    except OSError:
+        pass
+    return dict(record)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INCREMENTAL SCAN
+# ═══════════════════════════════════════════════════════════════════════════
+
+def scan(transcript: str, hook: str, input_data: dict | None = None, claude_dir=None, state: dict | None = None):
+    """transcript 전체 기준 특징 누적 값 (transcript_cursor 커서 이후 추가된 부분만 분석)
+
+    반환: (totals, new, rescanned) - 키는 특징 이름
+    """
+    claude_dir = claude_dir or _default_claude_dir()
+    detectors = {DETECTOR_NAME: lambda text: cached_analyze(text, claude_dir)}
+
+    if transcript_cursor is None:
+        totals = cached_analyze(transcript, claude_dir)
+        return totals, totals, True
+
+    key = transcript_cursor.cursor_key(hook, input_data)
+    result = transcript_cursor.scan(transcript, detectors, key, claude_dir, state)
+    prefix = DETECTOR_NAME + ":"
+
+    def strip(counts: dict) -> dict:
+        return {name[len(prefix):] if name.startswith(prefix) else name: value for name, value in counts.items()}
+
+    return transcript_cursor.ScanResult(strip(result.totals), strip(result.new), result.rescanned)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# VOCABULARY CHECK
+# ═══════════════════════════════════════════════════════════════════════════
+
+def hook_vocabulary() -> dict:
+    """hook 모듈의 상수로 만든 어휘 표 (KEYWORD_GROUPS/PATTERN_GROUPS와 같아야 함)"""
+    from hook_runtime import load_hook
+
+    unified, ralph, continuous = load_hook("unified-loop"), load_hook("ralph-loop"), load_hook("continuous-loop")
+    research, review, verification = (load_hook("continuous-research"), load_hook("continuous-review"),
+                                      load_hook("verification-loop"))
+    groups = {
+        "unified.complete": unified.COMPLETION_SIGNALS,
+        "unified.cancel": unified.CANCEL_SIGNALS,
+        "ralph.complete": ralph.COMPLETION_SIGNALS,
+        "ralph.cancel": ralph.CANCEL_SIGNALS,
+        "continuous.complete": continuous.COMPLETION_SIGNALS,
+        "research.complete": research.RESEARCH_COMPLETION_SIGNALS,
+        "research.keywords": research.RESEARCH_KEYWORDS,
+        "review.complete": review.REVIEW_COMPLETION_SIGNALS,
+        "review.keywords": review.REVIEW_KEYWORDS,
+        "e2e": verification.E2E_KEYWORDS,
+    }
+    groups.update((f"research.phase.{phase}", keywords) for phase, keywords in research.RESEARCH_PHASES)
+    groups.update((f"review.perspective.{key}", [key, name]) for key, name, _ in review.REVIEW_PERSPECTIVES)
+    groups.update((f"work.{keyword}", [keyword]) for keyword in verification.WORK_TYPE_KEYWORDS)
+
+    patterns = {f"tdd.{phase}": sources for phase, sources in verification.TDD_PATTERNS.items()}
+    patterns.update((f"trigger.{idx}", [pattern]) for idx, (pattern, _) in enumerate(verification.VERIFICATION_TRIGGERS))
+    counted = {f"severity.{level}": words for level, words in review.SEVERITY_KEYWORDS.items()}
+    return {"keywords": groups, "counted": counted, "patterns": patterns}
+
+
+def main():
+    if "--check" in sys.argv[1:]:
+        expected = hook_vocabulary()
+        mismatched = [
+            name
+            for kind, table in (("keywords", KEYWORD_GROUPS), ("counted", COUNTED_GROUPS), ("patterns", PATTERN_GROUPS))
+            for name in sorted(set(expected[kind]) | set(table))
+            if list(expected[kind].get(name, [])) != table.get(name)
+        ]
+        for name in mismatched:
+            print(f"✗ {name}: hook 상수와 다름", file=sys.stderr)
+        print(f"vocabulary {VOCABULARY_SIGNATURE}: {'OK' if not mismatched else f'{len(mismatched)} mismatched'}")
+        sys.exit(1 if mismatched else 0)
+
+    record = analyze(sys.stdin.read())
+    for name in FEATURES:
+        if record[name]:
+            print(f"{name:38} {record[name]}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Transcript Cursor - Stop/SubagentStop hook의 transcript 증분 스캔
+
+루프 hook(unified-loop, ralph-loop, continuous-*, verification-loop)이 매 Stop마다 받은
+transcript 전체를 .upper()/.lower()하고 신호/키워드를 검색하던 것을 새로 추가된 부분만
+검색하도록 바꿉니다. (반복 N회 루프의 총 작업량 O(N²) → O(N))
+
+- 커서는 .claude/agent-state.json의 "transcriptCursors"에 hook별로 저장
+  {"offset": 마지막으로 본 길이, "boundary": 그 직전 BOUNDARY_CHARS자의 adler32,
+   "detectors": 감지기 이름 목록, "counts": 감지기별 누적 값}
+- 다음 호출에서 transcript가 offset 이상이고 경계 해시가 같으면 이어진 transcript로 보고
+  transcript[offset:]만 감지기에 넘겨 누적 값에 더함
+- 경계가 다르거나(새 세션, 압축, 다른 서브에이전트) 감지기 구성이 바뀌면 처음부터 다시 스캔
+- 감지기: 텍스트 → int/bool, 또는 {하위 이름: int} (결과 키는 "감지기:하위 이름")
+  bool 감지기의 누적 값 > 0 은 "전체 transcript 어딘가에 있음"과 같음
+  (이전 커서 끝에 걸친 일치는 놓칠 수 있음 - 신호/키워드는 메시지 안에 있으므로 실제로는 해당 없음)
+
+상태 파일은 hook마다 잠금 read-modify-write로 자기 커서만 갱신합니다. 다른 hook이 예전 상태로
+파일을 덮어써 커서가 이전 값으로 돌아가더라도 offset과 counts가 함께 저장되므로 결과는 그대로 맞고,
+다음 호출에서 조금 더 스캔할 뿐입니다.
+
+사용법:
+    detectors = {"complete": has_completion_signal, "cancel": has_cancel_signal}
+    result = transcript_cursor.scan(transcript, detectors, cursor_key("ralph-loop", input_data), claude_dir)
+    if result.totals["complete"]: ...
+    result.new["citations"]              # 이번에 추가된 부분만의 값
+
+    # 상태 dict를 직접 저장하는 hook (unified-loop)은 state=로 넘기고 직접 저장
+    result = transcript_cursor.scan(transcript, detectors, "unified-loop", state=state)
+"""
+import json
+import os
+import sys
+import zlib
+from collections import namedtuple
+
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from utils import update_json
+except ImportError:
+    def update_json(path, *mutators):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        for mutate in mutators:
+            mutate(data)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return data
+
+STATE_FILE = "agent-state.json"
+CURSORS_KEY = "transcriptCursors"
+BOUNDARY_CHARS = 64
+
+# totals: 전체 transcript 기준 누적 값, new: 이번에 추가된 부분의 값, rescanned: 처음부터 다시 스캔했는지
+ScanResult = namedtuple("ScanResult", "totals new rescanned")
+
+
+def boundary_hash(transcript: str, offset: int) -> int:
+    """offset 직전 BOUNDARY_CHARS자의 adler32 (앞부분이 그대로인지 확인용)"""
+    window = transcript[max(0, offset - BOUNDARY_CHARS):offset]
+    return zlib.adler32(window.encode("utf-8", "surrogatepass"))
+
+
+def cursor_key(hook: str, input_data: dict | None = None) -> str:
+    """커서 키 (SubagentStop은 메인 transcript와 따로)"""
+    event = (input_data or {}).get("hook_event_name", "")
+    return f"{hook}:{event}" if event and event != "Stop" else hook
+
+
+def run_detectors(detectors: dict, text: str) -> dict:
+    """감지기 결과를 {이름: int}로 (dict를 반환하는 감지기는 "이름:하위 이름"으로 펼침)"""
+    counts = {}
+    for name, detect in detectors.items():
+        value = detect(text)
+        if isinstance(value, dict):
+            counts.update((f"{name}:{sub}", int(v)) for sub, v in value.items())
+        else:
+            counts[name] = int(value)
+    return counts
+
+
+def advance(cursor, transcript: str, detectors: dict) -> tuple[dict, ScanResult]:
+    """저장된 커서에서 이어서 스캔 → (새 커서, 결과)"""
+    names = sorted(detectors)
+    offset = cursor.get("offset") if isinstance(cursor, dict) else None
+    resumable = (
+        isinstance(offset, int) and 0 < offset <= len(transcript)
+        and cursor.get("detectors") == names
+        and cursor.get("boundary") == boundary_hash(transcript, offset)
+        and isinstance(cursor.get("counts"), dict)
+    )
+    previous = cursor["counts"] if resumable else {}
+    new = run_detectors(detectors, transcript[offset:] if resumable else transcript)
+    totals = dict(previous)
+    for name, value in new.items():
+        totals[name] = totals.get(name, 0) + value
+    updated = {
+        "offset": len(transcript),
+        "boundary": boundary_hash(transcript, len(transcript)),
+        "detectors": names,
+        "counts": totals,
+    }
+    return updated, ScanResult(totals, new, not resumable)
+
+
+def _store(data: dict, key: str, cursor: dict):
+    cursors = data.get(CURSORS_KEY)
+    if not isinstance(cursors, dict):
+        cursors = data[CURSORS_KEY] = {}
+    cursors[key] = cursor
+
+
+def scan(transcript: str, detectors: dict, key: str, claude_dir=None, state: dict | None = None) -> ScanResult:
+    """감지기 누적 결과 (저장된 커서 이후의 transcript만 새로 검사)
+
+    state를 넘기면 그 dict에 커서를 기록만 하고 (호출한 쪽이 저장),
+    아니면 claude_dir/agent-state.json의 자기 커서만 잠금 갱신합니다.
+    """
+    if state is not None:
+        stored = state.get(CURSORS_KEY, {}).get(key) if isinstance(state.get(CURSORS_KEY), dict) else None
+        cursor, result = advance(stored, transcript, detectors)
+        _store(state, key, cursor)
+        return result
+
+    if claude_dir is None:
+        claude_dir = os.path.join(os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd(), ".claude")
+    path = os.path.join(str(claude_dir), STATE_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            cursors = json.load(f).get(CURSORS_KEY)
+        stored = cursors.get(key) if isinstance(cursors, dict) else None
+    except (OSError, ValueError, AttributeError):
+        stored = None
+
+    cursor, result = advance(stored, transcript, detectors)
+    if cursor != stored:
+        try:
+            os.makedirs(str(claude_dir), exist_ok=True)
+            update_json(path, lambda data: _store(data, key, cursor))
+        except Exception:
+            pass
+    return result
@@ -11,19 +11,39 @@ ralph-loop, continuous-loop, continuation-enforcer를 통합한 단일 루프 
 완료 신호 (통일):
 - LOOP_COMPLETE, [DONE], 작업완료
 
+상태: .claude/agent-state.json 최상위 필드 (loop_engine.py로 이벤트당 한 번 저장)
+- 완료/취소되면 "stopped" 기록을 남기고, 루프가 다시 시작될 때까지 (mode/active를 새로 쓰거나
+  새 세션) todo.md/HANDOFF.md 자동 감지로 다시 시작하지 않음
+- continuous-research/continuous-review 전략도 같은 이벤트에서 함께 실행
+  (명시적으로 시작된 루프만 - "research"/"review" 섹션, 키워드만으로는 시작하지 않음)
+
 References:
 - Boris Journey: 30일 259 PR, 40,000줄 코드 자동 생성
 - Ralph Wiggum: Stop Hook 기반 자율 루프
 - Continuous Claude: HANDOFF.md 릴레이 패턴
 """
 
-import json
-import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# 루프 공용 엔진 (상태 파일, todo.md/HANDOFF.md 파싱, 로그)
+sys.path.insert(0, str(Path(__file__).parent))
+import loop_engine  # noqa: E402
+
+# 함께 실행할 모드 전략 (없으면 unified 루프만)
+try:
+    from hook_runtime import load_hook
+except ImportError:
+    load_hook = None
+
+# 완료/취소 신호 끝부분 감지 (없으면 transcript 전체 검사)
+try:
+    import signal_window
+except ImportError:
+    signal_window = None
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -44,43 +64,17 @@ COMPLETION_SIGNALS = [
 # 취소 신호
 CANCEL_SIGNALS = ["LOOP_CANCEL", "[CANCEL]", "취소", "중단"]
 
-# 통합 상태 파일
-STATE_FILE = ".claude/agent-state.json"
-LOG_FILE = ".claude/loop-log.md"
-
 # 기본 설정
 DEFAULT_MAX_ITERATIONS = 15
 DEFAULT_MODE = "auto"  # auto, ralph, continuous, research, review
 
 # ═══════════════════════════════════════════════════════════════════════════
-# UTILITIES
+# STATE (agent-state.json 최상위, loop_engine.py로 저장)
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def get_project_root() -> Path:
-    return Path(os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd()))
-
-
-def output_context(msg: str):
-    print(json.dumps({"additionalContext": msg}, ensure_ascii=False))
-
-
-def log_event(message: str):
-    log_path = get_project_root() / LOG_FILE
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {message}\n")
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# STATE MANAGEMENT (통합)
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def load_state() -> dict:
-    state_path = get_project_root() / STATE_FILE
-    default_state = {
+def default_state() -> dict:
+    return {
         "mode": "idle",  # idle, ralph, continuous, research, review
         "active": False,
         "iteration": 0,
@@ -91,98 +85,31 @@ def load_state() -> dict:
         "todos": {"pending": [], "in_progress": [], "completed": []},
         # Continuous 관련
         "handoff": {"runNumber": 0, "nextSteps": []},
-        # Research 관련
-        "research": {"phase": "idle", "papersFound": 0, "papersAnalyzed": 0},
-        # Review 관련
-        "review": {"perspective": 0, "completedPerspectives": [], "issues": {}},
+        # Research/Review 관련은 각 전략의 "research"/"review" 섹션
+        # 완료/취소 신호 감지 창 (signal_window.py)
+        "signalWindow": {"lastTurn": True, "kb": 8},
+        # 완료/취소 기록 {"reason": "cancel" | "complete", "session", "at"} (다시 시작하면 None)
+        "stopped": None,
     }
 
-    if not state_path.exists():
-        return default_state
-
-    try:
-        loaded = json.loads(state_path.read_text(encoding="utf-8"))
-        # 기본값 병합
-        for key, value in default_state.items():
-            if key not in loaded:
-                loaded[key] = value
-        return loaded
-    except Exception:
-        return default_state
-
-
-def save_state(state: dict):
-    state_path = get_project_root() / STATE_FILE
-    state_path.parent.mkdir(parents=True, exist_ok=True)
-    state["lastUpdated"] = datetime.now().isoformat()
-    state_path.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# TODO PARSING (from todo.md)
-# ═══════════════════════════════════════════════════════════════════════════
-
-
-def parse_todo_file() -> dict:
-    todo_path = get_project_root() / ".claude" / "todo.md"
-    result = {"pending": [], "in_progress": [], "completed": []}
-
-    if not todo_path.exists():
-        return result
-
-    try:
-        content = todo_path.read_text(encoding="utf-8")
-        for line in content.split("\n"):
-            line = line.strip()
-            if line.startswith("- [ ]"):
-                result["pending"].append(line[6:].strip())
-            elif line.startswith("- [x]"):
-                result["completed"].append(line[6:].strip())
-            elif line.startswith("- [~]") or line.startswith("- [>]"):
-                result["in_progress"].append(line[6:].strip())
-    except Exception:
-        pass
-
-    return result
-
-
-# ═══════════════════════════════════════════════════════════════════════════
-# HANDOFF PARSING (from HANDOFF.md)
-# ═══════════════════════════════════════════════════════════════════════════
-
 
-def parse_handoff_file() -> dict:
-    handoff_path = get_project_root() / ".claude" / "HANDOFF.md"
-    result = {"runNumber": 0, "nextSteps": [], "status": ""}
-
-    if not handoff_path.exists():
-        return result
-
-    try:
-        content = handoff_path.read_text(encoding="utf-8")
-
-        # Run 번호 추출
-        match = re.search(r"\*\*Run #\*\*\s*\|\s*(\d+)", content)
-        if match:
-            result["runNumber"] = int(match.group(1))
-
-        # 다음 단계 추출
-        next_section = re.search(r"## Next Steps.*?\n(.*?)(?=\n##|\n---|\Z)", content, re.DOTALL)
-        if next_section:
-            for line in next_section.group(1).split("\n"):
-                match = re.match(r"\d+\.\s+(.+)", line.strip())
-                if match:
-                    result["nextSteps"].append(match.group(1).strip())
-
-        # 상태 추출
-        status_match = re.search(r"\*\*상태\*\*:\s*`?(\w+)`?", content)
-        if status_match:
-            result["status"] = status_match.group(1).upper()
+def stop_loop(ctx, state: dict, reason: str):
+    """루프 종료 + 종료 기록 (이후 Stop에서 자동 감지로 다시 시작하지 않도록)"""
+    state["active"] = False
+    state["mode"] = "idle"
+    state["stopped"] = {
+        "reason": reason,
+        "session": ctx.input_data.get("session_id") or "",
+        "at": datetime.now().isoformat(timespec="seconds"),
+    }
 
-    except Exception:
-        pass
 
-    return result
+def restarted(ctx, state: dict) -> bool:
+    """종료 기록 이후 루프가 다시 시작됐는지 (mode/active를 새로 씀 또는 새 세션)"""
+    if state.get("mode") not in ("idle", "auto") or state.get("active"):
+        return True
+    session = ctx.input_data.get("session_id") or ""
+    return bool(session) and session != state["stopped"].get("session")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -200,20 +127,42 @@ def has_cancel_signal(text: str) -> bool:
     return any(signal.upper() in text_upper for signal in CANCEL_SIGNALS)
 
 
-def detect_mode(state: dict) -> str:
+def detect_signals(transcript: str, state: dict) -> dict:
+    """이번 반복의 완료/취소 신호 (state["signalWindow"] 창 안에서 단어 경계로 검사)"""
+    if signal_window is None:
+        return {"complete": has_completion_signal(transcript), "cancel": has_cancel_signal(transcript)}
+    tail = signal_window.tail(transcript, signal_window.load_window(state=state))
+    return {
+        "complete": signal_window.has_signal(tail, COMPLETION_SIGNALS),
+        "cancel": signal_window.has_signal(tail, CANCEL_SIGNALS),
+    }
+
+
+def todo_lists(ctx) -> dict:
+    """todo.md 상태별 작업 (state["todos"]에 저장하는 형태)"""
+    todos = ctx.todos()
+    return {key: list(todos[key]) for key in ("pending", "in_progress", "completed")}
+
+
+def handoff_summary(ctx) -> dict:
+    """HANDOFF.md 요약 (state["handoff"]에 저장하는 형태)"""
+    handoff = ctx.handoff()
+    return {key: handoff[key] for key in ("runNumber", "nextSteps", "status")}
+
+
+def detect_mode(ctx, state: dict) -> str:
     """현재 활성화된 루프 모드 감지"""
     # 명시적 모드 설정 확인
     if state.get("mode") not in ["idle", "auto"]:
         return state["mode"]
 
     # todo.md 존재 여부로 Ralph 모드 감지
-    todos = parse_todo_file()
+    todos = ctx.todos()
     if todos["pending"] or todos["in_progress"]:
         return "ralph"
 
     # HANDOFF.md 존재 여부로 Continuous 모드 감지
-    handoff = parse_handoff_file()
-    if handoff["nextSteps"]:
+    if ctx.handoff()["nextSteps"]:
         return "continuous"
 
     return "idle"
@@ -262,7 +211,7 @@ def format_continuation_message(state: dict, mode: str, next_task: str) -> str:
 def format_completion_message(state: dict, mode: str) -> str:
     """경량화된 완료 메시지"""
     iteration = state.get("iteration", 0)
-    elapsed = format_elapsed_time(state.get("startTime"))
+    elapsed = loop_engine.format_elapsed_time(state.get("startTime"), compact=True)
 
     if mode == "ralph":
         completed = len(state.get("todos", {}).get("completed", []))
@@ -283,100 +232,85 @@ def format_max_iterations_message(state: dict) -> str:
     return f"⚠️ 최대 반복({max_iter}) 도달 | 계속하려면 --max-iterations 증가"
 
 
-def format_elapsed_time(start_time_str: str) -> str:
-    if not start_time_str:
-        return "?"
-    try:
-        start = datetime.fromisoformat(start_time_str)
-        elapsed = datetime.now() - start
-        minutes = int(elapsed.total_seconds() // 60)
-        if minutes < 60:
-            return f"{minutes}m"
-        return f"{minutes // 60}h {minutes % 60}m"
-    except Exception:
-        return "?"
-
-
 # ═══════════════════════════════════════════════════════════════════════════
-# MAIN HANDLER
+# LOOP STRATEGY
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def main():
-    try:
-        input_data = json.loads(sys.stdin.read())
-        transcript = input_data.get("transcript", "")
-        stop_reason = input_data.get("stop_reason", "")
+class UnifiedStrategy(loop_engine.LoopStrategy):
+    """통합 루프 (agent-state.json 최상위 필드)"""
+    name = ""
 
-        # 사용자 인터럽트 시 무시
-        if stop_reason in ["user_interrupt", "max_tokens"]:
-            sys.exit(0)
+    def defaults(self) -> dict:
+        return default_state()
 
-        # 상태 로드
-        state = load_state()
+    def active(self, ctx, status, auto_activate=True) -> bool:
+        # 완료/취소된 루프는 다시 시작될 때까지 자동 감지보다 우선해 멈춰 있음
+        if isinstance(status.get("stopped"), dict):
+            if not restarted(ctx, status):
+                return False
+            if status.get("mode") in ("idle", "auto") and not status.get("active"):
+                status["iteration"] = 0  # 새 세션의 새 루프
+            status["stopped"] = None
 
-        # 모드 감지
-        mode = detect_mode(state)
+        mode = ctx.memo("unified-mode", lambda: detect_mode(ctx, status))
 
         # 비활성 상태면 무시
-        if mode == "idle" and not state.get("active", False):
-            sys.exit(0)
+        if mode == "idle" and not status.get("active", False):
+            return False
+
+        # research/review 루프가 진행 중이면 그 전략이 이번 반복을 맡음
+        section = ctx.state.get(mode) if mode in ("research", "review") else None
+        return not (isinstance(section, dict) and section.get("active"))
+
+    def step(self, ctx, state) -> str:
+        mode = ctx.memo("unified-mode", lambda: detect_mode(ctx, state))
+        state["lastUpdated"] = datetime.now().isoformat()
+
+        # 이번 반복에서 출력된 신호만 (마지막 assistant 턴 / 끝 N KB)
+        signals = detect_signals(ctx.transcript, state)
 
         # 취소 신호 확인
-        if has_cancel_signal(transcript):
-            state["active"] = False
-            state["mode"] = "idle"
-            save_state(state)
-            log_event(f"Loop cancelled at iteration {state.get('iteration', 0)}")
-            output_context(format_cancel_message(state))
-            sys.exit(0)
+        if signals["cancel"]:
+            stop_loop(ctx, state, "cancel")
+            self.log(ctx, "cancel", iteration=state.get("iteration", 0), mode=mode)
+            return format_cancel_message(state)
 
         # 완료 신호 확인
-        if has_completion_signal(transcript):
-            state["active"] = False
-            state["mode"] = "idle"
-            save_state(state)
-            log_event(f"Loop completed at iteration {state.get('iteration', 0)}")
-            output_context(format_completion_message(state, mode))
-            sys.exit(0)
+        if signals["complete"]:
+            stop_loop(ctx, state, "complete")
+            self.log(ctx, "complete", iteration=state.get("iteration", 0), mode=mode)
+            return format_completion_message(state, mode)
 
         # 최대 반복 확인
         max_iter = state.get("maxIterations", DEFAULT_MAX_ITERATIONS)
         if state.get("iteration", 0) >= max_iter:
             state["active"] = False
-            save_state(state)
-            log_event(f"Max iterations ({max_iter}) reached")
-            output_context(format_max_iterations_message(state))
-            sys.exit(0)
+            self.log(ctx, "max_iterations", iteration=state.get("iteration", 0), mode=mode)
+            return format_max_iterations_message(state)
 
         # 모드별 상태 업데이트
         next_task = ""
 
         if mode == "ralph":
-            todos = parse_todo_file()
+            todos = todo_lists(ctx)
             state["todos"] = todos
 
             # 모든 작업 완료 확인
             if get_incomplete_count(todos) == 0 and len(todos.get("completed", [])) > 0:
-                state["active"] = False
-                state["mode"] = "idle"
-                save_state(state)
-                log_event("All tasks completed")
-                output_context(format_completion_message(state, mode))
-                sys.exit(0)
+                stop_loop(ctx, state, "complete")
+                self.log(ctx, "complete", "All tasks completed", iteration=state.get("iteration", 0), mode=mode)
+                return format_completion_message(state, mode)
 
             next_task = get_next_task(todos)
 
         elif mode == "continuous":
-            handoff = parse_handoff_file()
+            handoff = handoff_summary(ctx)
             state["handoff"] = handoff
 
             if handoff.get("status") == "CONTINUOUS_COMPLETE":
-                state["active"] = False
-                state["mode"] = "idle"
-                save_state(state)
-                output_context(format_completion_message(state, mode))
-                sys.exit(0)
+                stop_loop(ctx, state, "complete")
+                return format_completion_message(state, mode)
 
             next_task = handoff["nextSteps"][0] if handoff["nextSteps"] else "HANDOFF.md 확인"
 
@@ -384,17 +318,36 @@ def main():
         state["iteration"] = state.get("iteration", 0) + 1
         state["active"] = True
         state["mode"] = mode
-        save_state(state)
-
-        log_event(f"Iteration {state['iteration']}: mode={mode}, next={next_task[:30]}")
+        self.log(ctx, "iteration", iteration=state["iteration"], mode=mode, next=next_task[:50])
 
         # 계속 진행 메시지
-        output_context(format_continuation_message(state, mode, next_task))
+        return format_continuation_message(state, mode, next_task)
+
+
+STRATEGY = UnifiedStrategy()
 
-    except Exception as e:
-        log_event(f"Error: {str(e)}")
 
-    sys.exit(0)
+def hosted_strategies() -> list:
+    """같은 이벤트에서 함께 실행할 모드 전략 (research, review)"""
+    strategies = []
+    if load_hook is None:
+        return strategies
+    for hook in ("continuous-research", "continuous-review"):
+        try:
+            strategies.append(load_hook(hook).STRATEGY)
+        except Exception:
+            pass
+    return strategies
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MAIN HANDLER
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+def main():
+    # 키워드만으로 research/review 루프를 시작하지 않음 (개별 hook 등록 시에만 자동 시작)
+    loop_engine.main(hosted_strategies() + [STRATEGY], auto_activate=False)
 
 
 if __name__ == "__main__":
@@ -16,6 +16,43 @@ import re
 import sys
 from pathlib import Path
 
+# 규칙 번들 (없으면 첫 사용 시 직접 빌드)
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from rule_bundle import get_rules
+except ImportError:
+    get_rules = None
+
+# 다중 키워드 매처 (없으면 키워드별 `in` 검사)
+try:
+    from keyword_matcher import KeywordMatcher
+except ImportError:
+    KeywordMatcher = None
+
+# knowledge 섹션 색인 (없으면 파일 전체를 읽어 추출)
+try:
+    import knowledge_index
+except ImportError:
+    knowledge_index = None
+
+# mmap 섹션 추출 (색인을 쓸 수 없을 때 - 읽기 전용 디렉토리 등)
+try:
+    import section_reader
+except ImportError:
+    section_reader = None
+
+# 프롬프트 관련 섹션 BM25 검색 (없으면 키워드 매핑으로 파일 앞부분/지정 섹션)
+try:
+    import knowledge_search
+except ImportError:
+    knowledge_search = None
+
+# 최근 오류 기록 (errors.d 세그먼트 끝부분만 읽음)
+try:
+    from error_store import recent_errors
+except ImportError:
+    recent_errors = None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ULTRATHINK PROMPTS - 작업 유형별 철학적 프레이밍
 # ═══════════════════════════════════════════════════════════════════════════
@@ -91,14 +128,46 @@ KEYWORD_MAPPINGS = {
 }
 
 
-def detect_task_type(prompt: str) -> str | None:
-    """프롬프트에서 작업 유형 감지"""
+_rules: dict | None = None
+
+
+def build_rules() -> dict:
+    """작업 유형/knowledge 키워드 매처 (rule_bundle에 캐시됨)
+
+    매처의 value는 ("task", 작업 유형) 또는 ("mapping", 키워드)입니다.
+    """
+    keywords = [
+        (keyword, ("task", task_type))
+        for task_type, task_keywords in TASK_KEYWORDS.items()
+        for keyword in task_keywords
+    ]
+    keywords += [(keyword, ("mapping", keyword)) for keyword in KEYWORD_MAPPINGS]
+
+    matcher = KeywordMatcher(keywords) if KeywordMatcher is not None else None
+    return {"matcher": matcher, "keywords": keywords}
+
+
+def find_keywords(prompt: str) -> set:
+    """프롬프트에 나타난 키워드 value 집합 (한 번의 스캔)"""
+    global _rules
+    if _rules is None:
+        _rules = get_rules("user-prompt-submit", build_rules) if get_rules else build_rules()
+
+    if _rules["matcher"] is not None:
+        return _rules["matcher"].find(prompt)
+
     prompt_lower = prompt.lower()
+    return {value for keyword, value in _rules["keywords"] if keyword in prompt_lower}
+
+
+def detect_task_type(prompt: str, found: set | None = None) -> str | None:
+    """프롬프트에서 작업 유형 감지 (TASK_KEYWORDS 순서가 우선순위)"""
+    if found is None:
+        found = find_keywords(prompt)
 
-    for task_type, keywords in TASK_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in prompt_lower:
-                return task_type
+    for task_type in TASK_KEYWORDS:
+        if ("task", task_type) in found:
+            return task_type
     return None
 
 
@@ -109,25 +178,60 @@ def extract_section(content: str, section_name: str) -> str:
     return match.group(0).strip() if match else ""
 
 
-def find_relevant_context(prompt: str, claude_dir: Path) -> list[str]:
+def load_knowledge(filepath: Path, section: str | None) -> str:
+    """knowledge 파일의 섹션(없으면 앞부분) - 색인/mmap으로 필요한 바이트만 읽음"""
+    if knowledge_index is not None and knowledge_index.get_index(filepath) is not None:
+        if not section:
+            return knowledge_index.read_head(filepath, 1000)
+        found = knowledge_index.find_section(filepath, section, min_level=2)
+        return knowledge_index.read_section(filepath, found).strip() if found else ""
+    if section_reader is not None:
+        if not section:
+            return section_reader.read_head(filepath, 1000)
+        return section_reader.read_section(filepath, section, min_level=2).strip()
+    content = filepath.read_text(encoding="utf-8")
+    return extract_section(content, section) if section else content[:1000]
+
+
+def find_relevant_context(prompt: str, claude_dir: Path, found: set | None = None) -> list[str]:
     """프롬프트 분석하여 관련 컨텍스트 찾기"""
-    prompt_lower = prompt.lower()
+    if found is None:
+        found = find_keywords(prompt)
     context_parts = []
     loaded_files = set()
 
+    # 관련도 순 섹션 (토큰 예산 안) - 찾으면 키워드 매핑의 파일 앞부분 대신 사용
+    if knowledge_search is not None:
+        try:
+            hits = knowledge_search.search(claude_dir / "knowledge", prompt)
+        except Exception:
+            hits = []
+        for hit in hits:
+            title = hit["title"].lstrip("#").strip()
+            context_parts.append(f"[{hit['file']} - {title}]\n{hit['text']}")
+            loaded_files.add(hit["file"])
+        if hits:
+            loaded_files.update(filename for filename, _ in KEYWORD_MAPPINGS.values())
+
     for keyword, (filename, section) in KEYWORD_MAPPINGS.items():
-        if keyword in prompt_lower and filename not in loaded_files:
+        if ("mapping", keyword) in found:
             filepath = claude_dir / "knowledge" / filename
-            if filepath.exists():
-                content = filepath.read_text(encoding="utf-8")
+            if filename not in loaded_files and filepath.exists():
+                extracted = load_knowledge(filepath, section)
                 if section:
-                    extracted = extract_section(content, section)
                     if extracted:
                         context_parts.append(f"[{filename} - {section}]\n{extracted[:800]}")
                 else:
-                    context_parts.append(f"[{filename}]\n{content[:1000]}")
+                    context_parts.append(f"[{filename}]\n{extracted}")
                 loaded_files.add(filename)
 
+            # 자동 기록된 오류는 errors.d/에 있음 - 최근 것만
+            if filename == "errors.md" and recent_errors is not None and "errors.d" not in loaded_files:
+                recent = recent_errors(claude_dir / "knowledge", limit=2)
+                if recent:
+                    context_parts.append("[errors.d - 최근 오류]\n" + "\n\n".join(recent)[:800])
+                loaded_files.add("errors.d")
+
     return context_parts
 
 
@@ -142,15 +246,16 @@ def main():
         project_dir = os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
         claude_dir = Path(project_dir) / ".claude"
         context_parts = []
+        found = find_keywords(prompt)
 
         # 1. Ultrathink 철학 주입 (작업 유형 기반)
-        task_type = detect_task_type(prompt)
+        task_type = detect_task_type(prompt, found)
         if task_type and task_type in ULTRATHINK_PROMPTS:
             context_parts.append(ULTRATHINK_PROMPTS[task_type])
 
         # 2. 관련 knowledge 파일 로드
         if claude_dir.exists():
-            relevant = find_relevant_context(prompt, claude_dir)
+            relevant = find_relevant_context(prompt, claude_dir, found)
             context_parts.extend(relevant)
 
         if context_parts:
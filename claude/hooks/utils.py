@@ -9,23 +9,36 @@
 - 날조 임계점 검증
 - 오류 분류
 - 로깅 유틸리티
+- hook 지연 시간 기록 (.claude/hook-latency.jsonl)
+- 공유 상태 파일 원자적 갱신 (advisory 잠금 + 임시 파일 + fsync + rename)
 - 크로스플랫폼 호환성 (Windows, macOS, Linux)
 """
 import json
 import os
 import re
 import sys
-import platform
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# todo.md 단일 파서 (없으면 직접 파싱)
+try:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import todo_model
+except ImportError:
+    todo_model = None
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 크로스플랫폼 호환성
 # ═══════════════════════════════════════════════════════════════════════════
 
-PLATFORM = platform.system().lower()  # 'windows', 'darwin', 'linux'
+# platform 모듈 import 없이 판별 (hook 시작 비용 절감)
+PLATFORM = 'windows' if sys.platform.startswith('win') else sys.platform  # 'windows', 'darwin', 'linux'
 IS_WINDOWS = PLATFORM == 'windows'
 IS_MACOS = PLATFORM == 'darwin'
 IS_LINUX = PLATFORM == 'linux'
@@ -46,7 +59,7 @@ def get_claude_home() -> Path:
     return get_home_dir() / '.claude'
 
 
-def normalize_path(path: Union[str, Path]) -> Path:
+def normalize_path(path: str | Path) -> Path:
     """경로 정규화 (크로스플랫폼)"""
     p = Path(path)
     # Windows에서 ~ 확장
@@ -55,34 +68,24 @@ def normalize_path(path: Union[str, Path]) -> Path:
     return p.resolve()
 
 
-def ensure_dir(path: Union[str, Path]) -> Path:
+def ensure_dir(path: str | Path) -> Path:
     """디렉토리 생성 후 반환 (크로스플랫폼)"""
     p = normalize_path(path)
     p.mkdir(parents=True, exist_ok=True)
     return p
 
 
-def safe_read_file(path: Union[str, Path], default: str = "") -> str:
-    """안전한 파일 읽기 (인코딩 자동 감지)"""
-    p = normalize_path(path)
-    if not p.exists():
-        return default
-
-    encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1']
-    for encoding in encodings:
-        try:
-            return p.read_text(encoding=encoding)
-        except (UnicodeDecodeError, LookupError):
-            continue
-    return default
+def safe_read_file(path: str | Path, default: str = "") -> str:
+    """안전한 파일 읽기 (인코딩 자동 감지, 읽기 캐시 경유)"""
+    return read_cached_text(normalize_path(path), default)
 
 
-def safe_write_file(path: Union[str, Path], content: str) -> bool:
-    """안전한 파일 쓰기"""
+def safe_write_file(path: str | Path, content: str) -> bool:
+    """안전한 파일 쓰기 (잠금 + 원자적 교체)"""
     try:
         p = normalize_path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(content, encoding='utf-8')
+        with FileLock(p):
+            atomic_write(p, content)
         return True
     except Exception:
         return False
@@ -95,6 +98,157 @@ def get_python_cmd() -> str:
     return 'python3'
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Hook 입력 & 읽기 캐시 (fan-out 실행 시 hook 간 공유)
+# ═══════════════════════════════════════════════════════════════════════════
+
+READ_ENCODINGS = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1']
+
+_hook_input: dict | None = None
+
+# 경로 → ((mtime_ns, size), text)
+_text_cache: dict = {}
+
+
+def set_hook_input(data: dict | None) -> None:
+    """파싱된 hook 입력 등록 (hook_runtime이 이벤트당 한 번 호출)"""
+    global _hook_input
+    _hook_input = data
+
+
+def read_hook_input() -> dict:
+    """hook 입력 JSON 반환 (등록된 입력이 없으면 stdin 파싱)
+
+    hook마다 독립된 사본을 반환하므로 수정해도 다른 hook에 영향이 없습니다.
+    """
+    if _hook_input is not None:
+        import copy
+        return copy.deepcopy(_hook_input)
+    return json.loads(sys.stdin.read())
+
+
+def read_cached_text(path: str | Path, default: str = "") -> str:
+    """(mtime_ns, size)가 같으면 캐시된 내용을 반환하는 read-through 읽기"""
+    p = Path(path)
+    try:
+        st = p.stat()
+    except OSError:
+        return default
+
+    key = str(p)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _text_cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    try:
+        raw = p.read_bytes()
+    except OSError:
+        return default
+
+    # 앞부분 샘플로 판별한 인코딩을 먼저, 실패하면 나머지 후보 (파일은 한 번만 읽음)
+    # section_reader는 실제로 파일을 읽을 때만 import (utils만 쓰는 hook의 시작 비용 유지)
+    candidates = READ_ENCODINGS
+    try:
+        from section_reader import detect_encoding, SAMPLE_BYTES
+        detected = detect_encoding(raw[:SAMPLE_BYTES])
+        candidates = [detected] + [e for e in READ_ENCODINGS if e != detected]
+    except ImportError:
+        pass
+    for encoding in candidates:
+        try:
+            text = raw.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        if '\r' in text:  # read_text와 같은 줄바꿈 변환
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        _text_cache[key] = (signature, text)
+        return text
+    return default
+
+
+def invalidate_cached_text(path: str | Path) -> None:
+    """쓰기 후 캐시 항목 제거"""
+    _text_cache.pop(str(Path(path)), None)
+
+
+def reset_hook_context() -> None:
+    """등록된 입력과 읽기 캐시 초기화"""
+    set_hook_input(None)
+    _text_cache.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Hook 지연 시간 기록 (.claude/hook-latency.jsonl)
+# ═══════════════════════════════════════════════════════════════════════════
+
+LATENCY_LEDGER = 'hook-latency.jsonl'
+LATENCY_LEDGER_MAX_BYTES = 1_000_000  # 초과 시 .1로 교체 (최근 2개 파일 유지)
+
+
+def latency_ledger_path(claude_dir: str | Path | None = None) -> Path:
+    """hook 지연 시간 기록 파일 경로"""
+    return Path(claude_dir or get_claude_dir()) / LATENCY_LEDGER
+
+
+def record_hook_latency(entries: list[dict]) -> None:
+    """hook 실행 기록을 한 번의 append로 추가
+
+    기록 항목: ts(시작 epoch), event, hook 또는 command, ms, stdin/stdout(bytes), exit.
+    .claude/ 디렉토리가 없는 프로젝트나 CLAUDE_HOOK_LATENCY=0 이면 기록하지 않습니다.
+    """
+    if not entries or os.environ.get('CLAUDE_HOOK_LATENCY', '1') == '0':
+        return
+    path = latency_ledger_path()
+    try:
+        if not path.parent.is_dir():
+            return
+        try:
+            if path.stat().st_size > LATENCY_LEDGER_MAX_BYTES:
+                os.replace(path, path.with_name(LATENCY_LEDGER + '.1'))
+        except FileNotFoundError:
+            pass
+        data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in entries)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode('utf-8'))
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def read_hook_latency(claude_dir: str | Path | None = None) -> list[dict]:
+    """교체된 파일(.1)을 포함한 모든 기록 (오래된 순, ms가 숫자인 항목만)
+
+    scripts/setup.py doctor --hook-latency 보고와 scripts/bench-hooks.py도 이 함수를 씀
+    """
+    path = latency_ledger_path(claude_dir)
+    entries = []
+    for ledger in (path.with_name(LATENCY_LEDGER + '.1'), path):
+        try:
+            lines = ledger.read_text(encoding='utf-8').splitlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and isinstance(entry.get('ms'), (int, float)):
+                entries.append(entry)
+    return entries
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """nearest-rank 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 경로 관리
 # ═══════════════════════════════════════════════════════════════════════════
@@ -167,6 +321,36 @@ def check_fabrication_risk(text: str) -> dict:
     return {"risk": "LOW", "count": count, "message": ""}
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# 토큰 추정 (context-window-monitor, knowledge_compactor, context_assembler 공용)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def estimate_token_count(text: str) -> int:
+    """텍스트 토큰 수 추정 (대략적)
+
+    Claude 토큰 추정:
+    - 영어: ~4자 = 1토큰
+    - 한글: ~2자 = 1토큰 (UTF-8 특성)
+    - 코드: ~3.5자 = 1토큰
+    """
+    if not text:
+        return 0
+
+    # 한글 비율 체크
+    korean_chars = len([c for c in text if '\uac00' <= c <= '\ud7a3'])
+    return estimate_tokens_from_counts(len(text), korean_chars)
+
+
+def estimate_tokens_from_counts(total_chars: int, korean_chars: int) -> int:
+    """문자 수/한글 문자 수로 토큰 수 추정 (estimate_token_count와 같은 규칙)"""
+    if korean_chars > total_chars * 0.3:
+        # 한글 비중 높음
+        return total_chars // 2
+    else:
+        # 영어/코드 비중 높음
+        return total_chars // 4
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 오류 분류
 # ═══════════════════════════════════════════════════════════════════════════
@@ -199,7 +383,7 @@ def classify_error(output: str) -> tuple[str, str]:
     return "Unknown", ""
 
 
-def find_solution(output: str) -> Optional[str]:
+def find_solution(output: str) -> str | None:
     """알려진 해결책 찾기"""
     for keyword, solution in KNOWN_SOLUTIONS.items():
         if keyword.lower() in output.lower():
@@ -211,7 +395,7 @@ def find_solution(output: str) -> Optional[str]:
 # 파일 I/O 유틸리티
 # ═══════════════════════════════════════════════════════════════════════════
 
-def read_knowledge_file(filename: str) -> Optional[str]:
+def read_knowledge_file(filename: str) -> str | None:
     """knowledge 파일 읽기 (없으면 None)"""
     filepath = get_knowledge_dir() / filename
     if filepath.exists():
@@ -231,7 +415,7 @@ def append_to_knowledge_file(filename: str, content: str) -> bool:
         return False
 
 
-def read_todo_file() -> Optional[str]:
+def read_todo_file() -> str | None:
     """todo.md 읽기"""
     todo_file = get_claude_dir() / "todo.md"
     if todo_file.exists():
@@ -241,13 +425,17 @@ def read_todo_file() -> Optional[str]:
 
 def extract_pending_todos(content: str) -> list[str]:
     """todo.md에서 미완료 항목 추출"""
+    if todo_model is not None:
+        return todo_model.parse(content).by_status()["pending"]
     return [line.strip()[6:] for line in content.split('\n')
             if line.strip().startswith('- [ ]')]
 
 
 def extract_completed_today(content: str) -> list[str]:
     """오늘 완료된 작업 추출"""
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = time.strftime("%Y-%m-%d")
+    if todo_model is not None:
+        return todo_model.parse(content).completed_on(today)
     completed = []
     for line in content.split('\n'):
         if line.strip().startswith('- [x]') and today in line:
@@ -257,6 +445,205 @@ def extract_completed_today(content: str) -> list[str]:
     return completed
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# 원자적 파일 갱신 (잠금 + 임시 파일 + fsync + rename)
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# 병렬 서브에이전트의 hook이 같은 .claude/ 파일을 동시에 고쳐도 갱신이 사라지거나
+# 잘린 파일이 남지 않도록, 공유 상태 파일은 이 계층으로 씁니다.
+#
+#     with FileUpdate(todo_file) as update:      # 잠금 1회 + 쓰기 1회
+#         update.apply(add_recent_edit, rel_path, timestamp)
+#         update.content += "..."
+#
+#     update_json(state_file, lambda state: state.update(active=False))
+
+LOCK_TIMEOUT = 5.0  # 초과하면 LockTimeout - 잠금 없이 덮어써 다른 hook의 갱신을 지우지 않음
+
+# 이 프로세스가 잡은 잠금 → [fd, 중첩 횟수] (같은 파일 중첩 잠금 허용)
+_held_locks: dict = {}
+
+
+def lock_path(path: str | Path) -> Path:
+    """path의 advisory 잠금 파일 (.<이름>.lock, rename으로 교체되는 파일 대신 잠금)"""
+    p = Path(path)
+    return p.with_name(f".{p.name}.lock")
+
+
+class LockTimeout(TimeoutError):
+    """LOCK_TIMEOUT 안에 잠금을 얻지 못함 (갱신하지 않음 - OSError로 처리하는 호출부는 그대로 건너뜀)"""
+
+
+class FileLock:
+    """path에 대한 배타적 advisory 잠금 (fcntl이 없는 Windows에서는 아무것도 하지 않음)
+
+    Raises:
+        LockTimeout: 다른 프로세스가 timeout초 넘게 잠금을 잡고 있을 때
+    """
+
+    def __init__(self, path: str | Path, timeout: float = LOCK_TIMEOUT):
+        self.key = str(lock_path(Path(path).absolute()))
+        self.timeout = timeout
+
+    def __enter__(self):
+        held = _held_locks.get(self.key)
+        if held:
+            held[1] += 1
+            return self
+        fd = None
+        if fcntl is not None:
+            try:
+                fd = os.open(self.key, os.O_RDWR | os.O_CREAT, 0o644)
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            os.close(fd)
+                            raise LockTimeout(f"lock busy for {self.timeout}s: {self.key}") from None
+                        time.sleep(0.005)
+            except LockTimeout:
+                raise
+            except OSError:
+                # 잠금 파일을 만들 수 없는 디렉토리 (읽기 전용 등) - 잠금 없이 진행
+                if fd is not None:
+                    os.close(fd)
+                fd = None
+        _held_locks[self.key] = [fd, 1]
+        return self
+
+    def __exit__(self, *exc):
+        held = _held_locks[self.key]
+        held[1] -= 1
+        if held[1] == 0:
+            del _held_locks[self.key]
+            if held[0] is not None:
+                os.close(held[0])  # close가 flock 해제
+        return False
+
+
+def atomic_write(path: str | Path, content: str | bytes) -> None:
+    """같은 디렉토리의 임시 파일에 쓰고 fsync 후 rename (읽는 쪽은 이전/새 내용 중 하나만 봄)"""
+    p = Path(path)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        mode = p.stat().st_mode & 0o777
+    except FileNotFoundError:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        mode = 0o644
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{time.time_ns()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        tmp.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    try:
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    invalidate_cached_text(p)
+
+
+class FileUpdate:
+    """잠금을 잡은 채 여러 변경을 모아 한 번에 쓰는 read-modify-write
+
+    content는 잠금 후 디스크에서 새로 읽고 (파일이 없으면 default), 블록이 예외 없이
+    끝났고 내용이 바뀌었으면 나갈 때 atomic_write 한 번으로 씁니다.
+    """
+
+    def __init__(self, path: str | Path, default: str = ""):
+        self.path = Path(path)
+        self.default = default
+        self.lock = FileLock(self.path)
+        self.original = None
+        self.content = None
+        self.exists = False
+
+    def __enter__(self):
+        self.lock.__enter__()
+        try:
+            self.original = self.path.read_text(encoding='utf-8')
+            self.exists = True
+        except FileNotFoundError:
+            self.original = self.default
+        except BaseException:
+            self.lock.__exit__(None, None, None)
+            raise
+        self.content = self.original
+        return self
+
+    def apply(self, transform, *args) -> bool:
+        """transform(content, *args) → 새 내용 (None이면 변경 없음). 바뀌었으면 True"""
+        updated = transform(self.content, *args)
+        if updated is None or updated == self.content:
+            return False
+        self.content = updated
+        return True
+
+    @property
+    def changed(self) -> bool:
+        return self.content != self.original
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and self.changed:
+                atomic_write(self.path, self.content)
+        finally:
+            self.lock.__exit__(exc_type, exc, tb)
+        return False
+
+
+class JsonUpdate(FileUpdate):
+    """FileUpdate의 JSON 버전 - data(dict)를 고치면 나갈 때 한 번에 씀 (깨진 파일은 {}로 시작)"""
+
+    def __enter__(self):
+        super().__enter__()
+        try:
+            loaded = json.loads(self.content) if self.content.strip() else {}
+        except json.JSONDecodeError:
+            loaded = {}
+        self.data = loaded if isinstance(loaded, dict) else {}
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.content = json.dumps(self.data, indent=2, ensure_ascii=False)
+        return super().__exit__(exc_type, exc, tb)
+
+
+def update_file(path: str | Path, *transforms, default: str = "") -> bool:
+    """transform(content)들을 잠금 한 번 안에서 순서대로 적용 (바뀌었으면 True)"""
+    with FileUpdate(path, default) as update:
+        for transform in transforms:
+            update.apply(transform)
+    return update.changed
+
+
+def update_json(path: str | Path, *mutators) -> dict:
+    """JSON 상태 파일 read-modify-write (mutator는 dict를 고치거나 새 dict 반환)"""
+    with JsonUpdate(path) as update:
+        for mutate in mutators:
+            result = mutate(update.data)
+            if isinstance(result, dict):
+                update.data = result
+    return update.data
+
+
+def write_json(path: str | Path, data) -> None:
+    """JSON 상태 파일을 잠금 + 원자적 교체로 저장"""
+    with FileLock(path):
+        atomic_write(path, json.dumps(data, indent=2, ensure_ascii=False))
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 출력 유틸리티
 # ═══════════════════════════════════════════════════════════════════════════
@@ -266,7 +653,7 @@ def output_context(context: str) -> None:
     print(json.dumps({"additionalContext": context}, ensure_ascii=False))
 
 
-def output_updated_input(updates: dict, context: Optional[str] = None) -> None:
+def output_updated_input(updates: dict, context: str | None = None) -> None:
     """updatedInput 출력 (선택적 컨텍스트 포함)"""
     output = {"updatedInput": updates}
     if context:
@@ -287,14 +674,14 @@ def block_action(message: str) -> None:
 
 def get_timestamp() -> str:
     """현재 시간 HH:MM 형식"""
-    return datetime.now().strftime("%H:%M")
+    return time.strftime("%H:%M")
 
 
 def get_datestamp() -> str:
     """현재 날짜 YYYY-MM-DD 형식"""
-    return datetime.now().strftime("%Y-%m-%d")
+    return time.strftime("%Y-%m-%d")
 
 
 def get_full_timestamp() -> str:
     """현재 시간 YYYY-MM-DD HH:MM 형식"""
-    return datetime.now().strftime("%Y-%m-%d %H:%M")
+    return time.strftime("%Y-%m-%d %H:%M")
@@ -15,20 +15,36 @@ References:
 
 import json
 import os
-import subprocess
 import sys
 import re
 from pathlib import Path
-from datetime import datetime
 
 # utils 모듈 로드
 try:
     sys.path.insert(0, str(Path(__file__).parent))
-    from utils import output_context, check_fabrication_risk
+    from utils import output_context, check_fabrication_risk, read_cached_text, read_hook_input
 except ImportError:
+    def read_cached_text(path, default=""):
+        try:
+            return Path(path).read_text(encoding="utf-8")
+        except Exception:
+            return default
+    def read_hook_input(): return json.loads(sys.stdin.read())
     def output_context(ctx): print(json.dumps({"additionalContext": ctx}))
     def check_fabrication_risk(text): return {"risk": False}
 
+# 루프 상태 섹션 조회 (없으면 ralph-status.json만)
+try:
+    import loop_engine
+except ImportError:
+    loop_engine = None
+
+# 루프 hook 공용 transcript 분석 (없으면 매번 transcript 전체 검사)
+try:
+    import transcript_analysis
+except ImportError:
+    transcript_analysis = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -70,6 +86,12 @@ TDD_PATTERNS = {
     ],
 }
 
+# 작업 유형 분류 키워드 (VERIFICATION_TRIGGERS가 감지된 경우)
+WORK_TYPE_KEYWORDS = ["bug", "fix", "refactor", "feature", "implement", "test"]
+
+# E2E 테스트 제안 키워드
+E2E_KEYWORDS = ["frontend", "ui", "component", "page", "button", "form"]
+
 # 검증 체크리스트
 VERIFICATION_CHECKLIST = {
     "code_change": [
@@ -133,12 +155,14 @@ def get_project_root() -> Path:
 
 
 def load_ralph_status() -> dict:
-    """Ralph Loop 상태 로드"""
+    """Ralph Loop 상태 로드 (agent-state.json "ralph" 섹션)"""
+    if loop_engine is not None:
+        return loop_engine.load_section("ralph", RALPH_STATUS_FILE, get_project_root())
     status_path = get_project_root() / RALPH_STATUS_FILE
     if not status_path.exists():
         return {}
     try:
-        return json.loads(status_path.read_text(encoding="utf-8"))
+        return json.loads(read_cached_text(status_path))
     except Exception:
         return {}
 
@@ -148,6 +172,8 @@ def save_test_result(test_type: str, passed: bool, details: str = ""):
     results_path = get_project_root() / TEST_RESULTS_FILE
     results_path.parent.mkdir(parents=True, exist_ok=True)
 
+    from datetime import datetime  # 결과 저장 시에만 필요 (지연 import)
+
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     status_icon = "✅" if passed else "❌"
 
@@ -157,7 +183,7 @@ def save_test_result(test_type: str, passed: bool, details: str = ""):
         entry += f"**상세**: {details}\n"
 
     if results_path.exists():
-        content = results_path.read_text(encoding="utf-8")
+        content = read_cached_text(results_path)
     else:
         content = "# Ralph Loop Test Results\n\n"
         content += "> TDD 사이클 및 E2E 테스트 결과 로그\n\n---\n"
@@ -185,7 +211,7 @@ def detect_e2e_framework() -> str:
     pkg_json = project_root / "package.json"
     if pkg_json.exists():
         try:
-            pkg = json.loads(pkg_json.read_text(encoding="utf-8"))
+            pkg = json.loads(read_cached_text(pkg_json))
             deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
             if "@playwright/test" in deps:
                 return "playwright"
@@ -201,6 +227,8 @@ def detect_e2e_framework() -> str:
 
 def run_verification_command(command: str, timeout: int = 120) -> tuple[bool, str]:
     """검증 명령 실행"""
+    import subprocess  # verifyCommand가 있을 때만 필요 (지연 import)
+
     try:
         result = subprocess.run(
             command,
@@ -224,20 +252,35 @@ def run_verification_command(command: str, timeout: int = 120) -> tuple[bool, st
 # ═══════════════════════════════════════════════════════════════════════════
 
 
-def detect_work_type(transcript: str) -> tuple[str, str]:
-    """작업 유형 감지"""
-    transcript_lower = transcript.lower()
+def match_work_signals(text: str) -> dict:
+    """작업 유형 트리거/분류 키워드 포함 여부"""
+    text_lower = text.lower()
+    signals = {f"trigger{idx}": bool(re.search(pattern, text_lower))
+               for idx, (pattern, _) in enumerate(VERIFICATION_TRIGGERS)}
+    signals.update((keyword, keyword in text_lower) for keyword in WORK_TYPE_KEYWORDS)
+    signals["e2e"] = any(keyword in text_lower for keyword in E2E_KEYWORDS)
+    return signals
+
+
+def match_tdd_phases(text: str) -> dict:
+    """TDD 단계별 패턴 포함 여부"""
+    text_lower = text.lower()
+    return {phase: any(re.search(pattern, text_lower) for pattern in patterns)
+            for phase, patterns in TDD_PATTERNS.items()}
 
-    for pattern, description in VERIFICATION_TRIGGERS:
-        if re.search(pattern, transcript_lower):
+
+def detect_work_type(signals: dict) -> tuple[str, str]:
+    """작업 유형 감지 (scan_transcript 누적 값 기준)"""
+    for idx, (_, description) in enumerate(VERIFICATION_TRIGGERS):
+        if signals[f"work:trigger{idx}"]:
             # 작업 유형 분류
-            if "bug" in transcript_lower or "fix" in transcript_lower:
+            if signals["work:bug"] or signals["work:fix"]:
                 return "bugfix", description
-            elif "refactor" in transcript_lower:
+            elif signals["work:refactor"]:
                 return "refactor", description
-            elif "feature" in transcript_lower or "implement" in transcript_lower:
+            elif signals["work:feature"] or signals["work:implement"]:
                 return "feature", description
-            elif "test" in transcript_lower:
+            elif signals["work:test"]:
                 return "test", description
             else:
                 return "code_change", description
@@ -245,18 +288,31 @@ def detect_work_type(transcript: str) -> tuple[str, str]:
     return "", ""
 
 
-def detect_tdd_phase(transcript: str) -> str:
-    """TDD 사이클 단계 감지"""
-    transcript_lower = transcript.lower()
-
-    for phase, patterns in TDD_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, transcript_lower):
-                return phase
+def detect_tdd_phase(signals: dict) -> str:
+    """TDD 사이클 단계 감지 (scan_transcript 누적 값 기준)"""
+    for phase in TDD_PATTERNS:
+        if signals[f"tdd:{phase}"]:
+            return phase
 
     return ""
 
 
+def scan_transcript(transcript: str, input_data: dict) -> dict:
+    """transcript 전체 기준 감지 결과 (이전 호출 이후 추가된 부분만 검사)"""
+    if transcript_analysis is not None:
+        features = transcript_analysis.scan(transcript, "verification-loop", input_data,
+                                            get_project_root() / ".claude").totals
+        signals = {f"work:trigger{idx}": features[f"trigger.{idx}"] for idx in range(len(VERIFICATION_TRIGGERS))}
+        signals.update((f"work:{keyword}", features[f"work.{keyword}"]) for keyword in WORK_TYPE_KEYWORDS)
+        signals["work:e2e"] = features["e2e"]
+        signals.update((f"tdd:{phase}", features[f"tdd.{phase}"]) for phase in TDD_PATTERNS)
+        return signals
+    signals = {}
+    for name, detect in {"work": match_work_signals, "tdd": match_tdd_phases}.items():
+        signals.update((f"{name}:{sub}", int(value)) for sub, value in detect(transcript).items())
+    return signals
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # VERIFICATION MESSAGES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -348,9 +404,15 @@ def format_checklist(items: list[str]) -> str:
 
 def main():
     try:
-        input_data = json.loads(sys.stdin.read())
+        input_data = read_hook_input()
         transcript = input_data.get("transcript", "")
 
+        # 사전 필터: 모든 감지는 transcript 기반이므로 비어 있으면 상태 파일도 읽지 않음
+        if not transcript.strip():
+            sys.exit(0)
+
+        signals = scan_transcript(transcript, input_data)
+
         # Ralph Loop 상태 확인 (TDD 모드 여부)
         ralph_status = load_ralph_status()
         is_tdd_mode = ralph_status.get("tddMode", False)
@@ -358,7 +420,7 @@ def main():
 
         # TDD 모드 처리
         if is_tdd_mode:
-            tdd_phase = detect_tdd_phase(transcript)
+            tdd_phase = detect_tdd_phase(signals)
 
             if tdd_phase == "red":
                 checklist = format_checklist(VERIFICATION_CHECKLIST["tdd_red"])
@@ -390,8 +452,7 @@ def main():
 
         # E2E 테스트 감지 및 제안
         e2e_framework = detect_e2e_framework()
-        if e2e_framework and any(keyword in transcript.lower() for keyword in
-                                   ["frontend", "ui", "component", "page", "button", "form"]):
+        if e2e_framework and signals["work:e2e"]:
             command = E2E_COMMANDS.get(e2e_framework, "npm run test:e2e")
             checklist = format_checklist(VERIFICATION_CHECKLIST["e2e"])
 
@@ -403,7 +464,7 @@ def main():
             sys.exit(0)
 
         # 일반 작업 유형 감지
-        work_type, description = detect_work_type(transcript)
+        work_type, description = detect_work_type(signals)
 
         if not work_type:
             sys.exit(0)
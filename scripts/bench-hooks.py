@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""Hook Benchmark - 세션 이벤트 스트림 재생 벤치마크
+
+claude/hooks에 이벤트 스트림을 재생하며 hook별 지연 시간과 처리량을 측정합니다.
+
+이벤트 스트림:
+- 합성 (기본): SessionStart, UserPromptSubmit 프롬프트, 크기가 다양한
+  PreToolUse/PostToolUse 페이로드(Bash/Edit/MCP), SubagentStop, PreCompact,
+  10KB~5MB transcript를 가진 Stop 이벤트
+- 기록된 스트림: CLAUDE_HOOKS_RECORD=<파일>로 hook-client.py가 남긴 JSONL (--stream)
+
+디스패치 방식:
+- subprocess: hook마다 `python <hook>.py` 프로세스 (데몬 이전 방식)
+- inprocess:  hook_runtime.run_hooks() (워밍된 모듈, 인터프리터 시작 없음)
+- daemon:     hook-daemon.py + `python hook-client.py <hooks>` (settings.json 경로)
+
+매 실행마다 임시 fixture(.claude/ + knowledge 파일을 실제 크기로 채움)와
+hooks 복사본을 만들어 실제 설치 디렉토리와 프로젝트를 건드리지 않습니다.
+inprocess/daemon의 hook별 시간은 fixture의 .claude/hook-latency.jsonl에서 읽습니다.
+
+사용법:
+    python bench-hooks.py                                  # 합성 스트림, 3가지 방식
+    python bench-hooks.py --modes inprocess,daemon --repeat 3
+    python bench-hooks.py --transcript-sizes 10KB,1MB --knowledge-kb 1024
+    python bench-hooks.py --stream ~/hook-events.jsonl     # 기록된 스트림 재생
+    python bench-hooks.py --write-stream events.jsonl      # 합성 스트림만 저장
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.resolve()
+HOOKS_SRC = REPO_ROOT / "claude" / "hooks"
+SETTINGS_SRC = REPO_ROOT / "claude" / "settings.json"
+
+sys.path.insert(0, str(HOOKS_SRC))
+from utils import percentile, read_hook_latency  # noqa: E402
+
+MODES = ["subprocess", "inprocess", "daemon"]
+
+WORDS = [
+    "auth", "parser", "cache", "session", "router", "config", "worker", "query",
+    "token", "index", "handler", "schema", "migration", "component", "render",
+    "the", "a", "to", "of", "and", "in", "is", "for", "with", "this", "that",
+    "function", "class", "return", "value", "request", "response", "update",
+]
+
+
+def parse_size(text: str) -> int:
+    """'10KB', '5MB', '512' → 바이트"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size: {text}")
+    unit = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2,
+            "G": 1024 ** 3, "GB": 1024 ** 3}[match.group(2)]
+    return int(float(match.group(1)) * unit)
+
+
+def format_size(size: int) -> str:
+    if size >= 1024 ** 2:
+        return f"{size / 1024 ** 2:.0f}MB"
+    if size >= 1024:
+        return f"{size / 1024:.0f}KB"
+    return f"{size}B"
+
+
+def prose(rng: random.Random, size: int) -> str:
+    """대략 size 바이트의 단어 텍스트"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FIXTURE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def grow_file(path: Path, header: str, section, target: int, rng: random.Random):
+    """section(i) 블록을 반복해 target 바이트까지 채움"""
+    parts = [header]
+    size = len(header.encode("utf-8"))
+    i = 0
+    while size < target:
+        block = section(i, rng)
+        parts.append(block)
+        size += len(block.encode("utf-8"))
+        i += 1
+    path.write_text("".join(parts), encoding="utf-8")
+
+
+def build_fixture(root: Path, knowledge_bytes: int, rng: random.Random) -> dict:
+    """벤치마크용 프로젝트/홈/hooks 디렉토리 구성"""
+    project = root / "project"
+    claude_dir = project / ".claude"
+    knowledge = claude_dir / "knowledge"
+    (knowledge / "research").mkdir(parents=True)
+    home = root / "home"
+    (home / ".claude").mkdir(parents=True)
+
+    hooks = root / "hooks"
+    shutil.copytree(HOOKS_SRC, hooks, ignore=shutil.ignore_patterns(
+        "__pycache__", ".hookd.*", ".rule-bundle.pickle", ".pending-writes.jsonl*"))
+    subprocess.run([sys.executable, str(hooks / "rule_bundle.py")],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    grow_file(knowledge / "errors.md", "# 오류 기록\n\n", lambda i, r: (
+        f"\n## [2025-01-{i % 28 + 1:02d} 10:{i % 60:02d}] {r.choice(['Import', 'Type', 'Network'])} Error\n"
+        f"**패턴**: `{r.choice(['TypeError', 'KeyError', 'ModuleNotFoundError'])}`\n"
+        f"**명령어**:\n```bash\npytest tests/test_{r.choice(WORDS)}.py\n```\n"
+        f"**출력**:\n```\n{prose(r, 300)}\n```\n\n---\n"
+    ), knowledge_bytes, rng)
+    grow_file(knowledge / "patterns.md", "# 패턴\n\n## Cypher\nMATCH (n) RETURN n\n\n## Python\n", lambda i, r: (
+        f"\n### {r.choice(WORDS)} pattern {i}\n```python\ndef {r.choice(WORDS)}_{i}():\n"
+        f"    return {r.choice(WORDS)!r}\n```\n{prose(r, 200)}\n"
+    ), knowledge_bytes, rng)
+    grow_file(knowledge / "decisions.md", "# 결정 기록\n", lambda i, r: (
+        f"\n## ADR-{i:04d}: {r.choice(WORDS)} {r.choice(WORDS)}\n- 상태: 승인\n- 근거: {prose(r, 250)}\n"
+    ), knowledge_bytes, rng)
+    grow_file(knowledge / "context.md", "# 프로젝트 컨텍스트\n", lambda i, r: (
+        f"\n## {r.choice(WORDS)} {i}\n{prose(r, 300)}\n"
+    ), knowledge_bytes, rng)
+    grow_file(claude_dir / "todo.md", "# TODO\n\n## 진행 중\n", lambda i, r: (
+        f"- [{'x' if i % 3 else ' '}] {r.choice(WORDS)} {r.choice(WORDS)} 작업 {i}\n"
+    ), knowledge_bytes // 4, rng)
+    with open(claude_dir / "todo.md", "a", encoding="utf-8") as f:
+        f.write("\n## 최근 수정\n- `src/main.py` (10:00)\n")
+
+    return {"root": root, "project": project, "claude_dir": claude_dir, "home": home, "hooks": hooks}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# EVENT STREAMS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def load_commands(settings_path: Path) -> dict:
+    """settings.json → 이벤트별 [(matcher, [hook, ...]), ...]"""
+    settings = json.loads(settings_path.read_text(encoding="utf-8"))
+    commands = {}
+    for event, matchers in settings.get("hooks", {}).items():
+        for matcher in matchers:
+            for hook in matcher.get("hooks", []):
+                tokens = hook.get("command", "").split()
+                runner = next((i for i, t in enumerate(tokens)
+                               if Path(t).stem in ("hook-client", "run-hook")), None)
+                if runner is None:
+                    continue
+                names = [Path(t).stem if t.endswith(".py") else t for t in tokens[runner + 1:]]
+                commands.setdefault(event, []).append((matcher.get("matcher", ""), names))
+    return commands
+
+
+def commands_for(commands: dict, event: str, tool_name: str = "") -> list[list[str]]:
+    return [names for matcher, names in commands.get(event, [])
+            if not matcher or re.fullmatch(matcher, tool_name)]
+
+
+def synthetic_events(args, fixture: dict, rng: random.Random) -> list[tuple[str, dict]]:
+    """(label, hook 입력) 목록 - 한 세션 분량"""
+    project = str(fixture["project"])
+    events = [("SessionStart", {"hook_event_name": "SessionStart", "source": "startup"})]
+
+    for size in args.prompt_sizes:
+        prompt = prose(rng, size)
+        if rng.random() < 0.3:
+            prompt = "ultrawork " + prompt
+        events.append((f"UserPromptSubmit {format_size(size)}",
+                       {"hook_event_name": "UserPromptSubmit", "prompt": prompt}))
+
+    for i in range(args.tool_events):
+        size = rng.choice(args.payload_sizes)
+        kind = rng.choice(["Bash", "Bash", "Edit", "Write", "mcp__context7__get-library-docs"])
+        if kind == "Bash":
+            command = rng.choice(["pytest -q", "npm test", "git status", "rm -rf build", "ls -la src"])
+            failed = rng.random() < 0.2
+            output = prose(rng, size) + ("\nTraceback: ModuleNotFoundError: No module named 'x'" if failed else "")
+            tool_input = {"command": command}
+            tool_result = {"stdout": output, "stderr": "", "exit_code": 1 if failed else 0}
+        elif kind in ("Edit", "Write"):
+            file_path = f"{project}/src/{rng.choice(WORDS)}_{i % 7}.py"
+            tool_input = {"file_path": file_path, "old_string": prose(rng, 80),
+                          "new_string": prose(rng, size), "content": prose(rng, size)}
+            tool_result = {"success": True}
+        else:
+            tool_input = {"libraryName": "react", "topic": prose(rng, min(size, 200))}
+            tool_result = {"content": prose(rng, size)}
+
+        label = f"{kind.split('__')[0]} {format_size(size)}"
+        events.append((f"PreToolUse {label}", {
+            "hook_event_name": "PreToolUse", "tool_name": kind, "tool_input": tool_input}))
+        events.append((f"PostToolUse {label}", {
+            "hook_event_name": "PostToolUse", "tool_name": kind, "tool_input": tool_input,
+            "tool_result": tool_result}))
+
+    events.append(("SubagentStop", {
+        "hook_event_name": "SubagentStop", "agent_type": "task-worker",
+        "result": "\n".join(f"- {prose(rng, 60)}" for _ in range(12)),
+        "transcript": prose(rng, 20_000),
+    }))
+    events.append(("PreCompact", {"hook_event_name": "PreCompact", "trigger": "auto"}))
+
+    for size in args.transcript_sizes:
+        transcript = prose(rng, size)
+        path = fixture["root"] / f"transcript-{format_size(size)}.jsonl"
+        path.write_text(json.dumps({"type": "assistant", "message": {"content": transcript}}) + "\n",
+                        encoding="utf-8")
+        events.append((f"Stop {format_size(size)}", {
+            "hook_event_name": "Stop", "stop_hook_active": False,
+            "transcript_path": str(path), "transcript": transcript,
+        }))
+    return events
+
+
+def synthetic_stream(args, fixture: dict, rng: random.Random) -> list[dict]:
+    """이벤트 → settings.json 명령 단위 레코드 {"label", "hooks", "stdin"}"""
+    commands = load_commands(SETTINGS_SRC)
+    stream = []
+    for label, payload in synthetic_events(args, fixture, rng):
+        payload.setdefault("session_id", "bench")
+        payload.setdefault("cwd", str(fixture["project"]))
+        stdin_text = json.dumps(payload, ensure_ascii=False)
+        for names in commands_for(commands, payload["hook_event_name"], payload.get("tool_name", "")):
+            stream.append({"label": label, "hooks": names, "stdin": stdin_text})
+    return stream
+
+
+def load_stream(path: Path) -> list[dict]:
+    """기록된 스트림 (hook-client.py CLAUDE_HOOKS_RECORD 형식)"""
+    stream = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(record, dict) or not record.get("hooks"):
+            continue
+        if "label" not in record:
+            try:
+                event = json.loads(record.get("stdin", "")).get("hook_event_name", "")
+            except (json.JSONDecodeError, AttributeError):
+                event = ""
+            size = len(record.get("stdin", "").encode("utf-8"))
+            record["label"] = f"{event or ' '.join(record['hooks'])} {format_size(size)}"
+        stream.append(record)
+    return stream
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DISPATCH MODES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def hook_env(fixture: dict) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "HOME": str(fixture["home"]),
+        "USERPROFILE": str(fixture["home"]),
+        "CLAUDE_PROJECT_DIR": str(fixture["project"]),
+        "CLAUDE_HOOKD_SOCKET": str(fixture["root"] / "hookd.sock"),
+        "CLAUDE_HOOKD_IDLE": "120",
+    })
+    env.pop("CLAUDE_HOOKS_RECORD", None)
+    env.pop("CLAUDE_HOOK_LATENCY", None)
+    return env
+
+
+def run_subprocess(stream: list[dict], fixture: dict, env: dict):
+    """hook마다 별도 프로세스 - (명령별 ms, hook별 [(hook, ms)])"""
+    command_ms, hook_ms = [], []
+    for record in stream:
+        total = 0.0
+        for name in record["hooks"]:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(fixture["hooks"] / f"{name}.py")],
+                           input=record["stdin"].encode("utf-8"), cwd=fixture["project"], env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            ms = (time.perf_counter() - start) * 1000
+            hook_ms.append((name, ms))
+            total += ms
+        command_ms.append(total)
+    return command_ms, hook_ms
+
+
+def run_inprocess(stream: list[dict], fixture: dict, env: dict):
+    """hook_runtime.run_hooks를 현재 프로세스에서 호출"""
+    saved_env, saved_cwd = dict(os.environ), os.getcwd()
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(fixture["project"])
+    sys.path.insert(0, str(fixture["hooks"]))
+    try:
+        import hook_runtime
+        import deferred_writes
+        deferred_writes.hold_flush()  # 지연 쓰기는 측정 구간 밖에서 처리
+        hook_runtime.preload_hooks()
+
+        command_ms = []
+        for record in stream:
+            start = time.perf_counter()
+            hook_runtime.run_hooks(record["hooks"], record["stdin"])
+            command_ms.append((time.perf_counter() - start) * 1000)
+            deferred_writes.flush_pending()
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+    return command_ms, None
+
+
+def run_daemon(stream: list[dict], fixture: dict, env: dict):
+    """hook-daemon.py를 띄우고 settings.json과 같은 hook-client.py 명령으로 호출"""
+    client = str(fixture["hooks"] / "hook-client.py")
+    daemon = subprocess.Popen([sys.executable, str(fixture["hooks"] / "hook-daemon.py")],
+                              cwd=fixture["project"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = Path(env["CLAUDE_HOOKD_SOCKET"])
+    deadline = time.time() + 10
+    while not socket_path.exists() and time.time() < deadline:
+        time.sleep(0.05)
+
+    try:
+        command_ms = []
+        for record in stream:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, client, *record["hooks"]],
+                           input=record["stdin"].encode("utf-8"), cwd=fixture["project"], env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            command_ms.append((time.perf_counter() - start) * 1000)
+    finally:
+        subprocess.run([sys.executable, str(fixture["hooks"] / "hook-daemon.py"), "--stop"],
+                       env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            daemon.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            daemon.kill()
+    return command_ms, None
+
+
+RUNNERS = {"subprocess": run_subprocess, "inprocess": run_inprocess, "daemon": run_daemon}
+
+
+def ledger_hook_times(claude_dir: Path) -> list[tuple[str, float]]:
+    """hook_runtime이 기록한 hook별 실행 시간"""
+    return [(entry["hook"], float(entry["ms"])) for entry in read_hook_latency(claude_dir) if entry.get("hook")]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REPORT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def stats_row(name: str, values: list[float], width: int) -> str:
+    return (f"{name[:width]:<{width}} {len(values):>6} {percentile(values, 50):>9.2f} "
+            f"{percentile(values, 95):>9.2f} {percentile(values, 99):>9.2f} {max(values):>9.2f}")
+
+
+def print_table(title: str, groups: dict, width: int):
+    print(f"\n{title}")
+    print(f"{'':<{width}} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, values in sorted(groups.items(), key=lambda item: -statistics.median(item[1])):
+        print(stats_row(name, values, width))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hook 이벤트 스트림 재생 벤치마크")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"디스패치 방식 (기본 {','.join(MODES)})")
+    parser.add_argument("--stream", type=Path, help="기록된 이벤트 스트림 (CLAUDE_HOOKS_RECORD JSONL)")
+    parser.add_argument("--write-stream", type=Path, help="합성 스트림을 JSONL로 저장하고 종료")
+    parser.add_argument("--repeat", type=int, default=1, help="스트림 반복 재생 횟수 (기본 1)")
+    parser.add_argument("--tool-events", type=int, default=30, help="Pre/PostToolUse 쌍 개수 (기본 30)")
+    parser.add_argument("--prompt-sizes", default="200,2KB,50KB",
+                        help="UserPromptSubmit 프롬프트 크기 목록 (기본 200,2KB,50KB)")
+    parser.add_argument("--payload-sizes", default="200,4KB,64KB,256KB",
+                        help="도구 입출력 페이로드 크기 목록 (기본 200,4KB,64KB,256KB)")
+    parser.add_argument("--transcript-sizes", default="10KB,100KB,1MB,5MB",
+                        help="Stop 이벤트 transcript 크기 목록 (기본 10KB,100KB,1MB,5MB)")
+    parser.add_argument("--knowledge-kb", type=int, default=256,
+                        help="fixture knowledge 파일당 크기 KB (기본 256)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="fixture 디렉토리 유지")
+    args = parser.parse_args()
+
+    for option in ("prompt_sizes", "payload_sizes", "transcript_sizes"):
+        setattr(args, option, [parse_size(s) for s in getattr(args, option).split(",") if s.strip()])
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in RUNNERS]
+    if unknown:
+        print(f"Error: unknown mode(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    rng = random.Random(args.seed)
+    root = Path(tempfile.mkdtemp(prefix="bench-hooks-"))
+    try:
+        fixture = build_fixture(root, args.knowledge_kb * 1024, rng)
+        if args.stream:
+            stream = load_stream(args.stream.expanduser())
+            source = str(args.stream)
+        else:
+            stream = synthetic_stream(args, fixture, rng)
+            source = f"synthetic (seed={args.seed})"
+
+        if args.write_stream:
+            with open(args.write_stream, "w", encoding="utf-8") as f:
+                for record in stream:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            print(f"wrote {len(stream)} commands to {args.write_stream}")
+            return
+
+        if not stream:
+            print("Error: empty event stream", file=sys.stderr)
+            sys.exit(1)
+
+        stream = stream * args.repeat
+        stdin_bytes = sum(len(r["stdin"].encode("utf-8")) for r in stream)
+        print(f"stream:     {source}")
+        print(f"commands:   {len(stream):,} ({format_size(stdin_bytes)} stdin)")
+        print(f"knowledge:  {args.knowledge_kb}KB per file")
+        print(f"fixture:    {root}")
+
+        env = hook_env(fixture)
+        summary = []
+        for mode in modes:
+            for ledger in fixture["claude_dir"].glob("hook-latency.jsonl*"):
+                ledger.unlink()
+
+            start = time.perf_counter()
+            command_ms, hook_ms = RUNNERS[mode](stream, fixture, env)
+            wall = time.perf_counter() - start
+            if hook_ms is None:
+                hook_ms = ledger_hook_times(fixture["claude_dir"])
+
+            print(f"\n{'═' * 78}\n{mode}: {wall:.2f}s wall, {len(stream) / wall:.1f} commands/s")
+            per_hook: dict = {}
+            for name, ms in hook_ms:
+                per_hook.setdefault(name, []).append(ms)
+            per_label: dict = {}
+            for record, ms in zip(stream, command_ms):
+                per_label.setdefault(record["label"], []).append(ms)
+            if per_hook:
+                print_table("per hook", per_hook, 28)
+            print_table("per event (command wall time)", per_label, 28)
+            summary.append((mode, wall, command_ms))
+
+        print(f"\n{'═' * 78}\n{'mode':<12} {'wall s':>8} {'cmd/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for mode, wall, command_ms in summary:
+            print(f"{mode:<12} {wall:>8.2f} {len(command_ms) / wall:>8.1f} {percentile(command_ms, 50):>9.2f} "
+                  f"{percentile(command_ms, 95):>9.2f} {percentile(command_ms, 99):>9.2f}")
+    finally:
+        if args.keep:
+            print(f"\nfixture kept: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Knowledge Search Benchmark - knowledge_search.py BM25 조회 지연 측정
+
+합성 knowledge 파일(섹션 수 지정) 또는 실제 프로젝트의 .claude/knowledge에 대해
+색인 빌드, 새 프로세스 기준 색인 로드(search.json + search.postings mmap, 구조 검사 포함),
+질의당 순위 계산 비용, 새 프로세스의 첫 search() 전체(로드 + 순위 + search.refs.json + 섹션 읽기),
+데몬이 warm()해 둔 상태의 search() 전체를 측정합니다.
+
+사용법:
+    python bench-knowledge-search.py                         # 합성 5000 섹션
+    python bench-knowledge-search.py --sections 20000
+    python bench-knowledge-search.py --project ~/my-project  # 실제 knowledge (색인 디렉토리에 씀)
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.resolve()
+HOOKS_DIR = REPO_ROOT / "claude" / "hooks"
+
+EN_WORDS = (
+    "cache parser router session token budget compaction index neo4j cypher query graph retry "
+    "backoff timeout lock atomic rename fsync hook daemon prompt keyword matcher bundle pickle "
+    "error import module docker build deploy test pytest fixture mock database migration schema"
+).split()
+KO_WORDS = (
+    "캐시 파서 라우터 세션 토큰 예산 압축 색인 그래프 쿼리 재시도 타임아웃 잠금 원자적 훅 데몬 "
+    "프롬프트 키워드 오류 모듈 배포 테스트 데이터베이스 마이그레이션 스키마 결정 아키텍처 패턴"
+).split()
+FILES = ["patterns.md", "decisions.md", "errors.md", "context.md"]
+
+
+def synthetic_knowledge(knowledge_dir: Path, sections: int, seed: int):
+    """섹션 sections개를 FILES에 나눠 담은 합성 knowledge"""
+    rng = random.Random(seed)
+    knowledge_dir.mkdir(parents=True, exist_ok=True)
+    per_file = max(sections // len(FILES), 1)
+    vocabulary = EN_WORDS + KO_WORDS
+    for name in FILES:
+        parts = [f"# {name}\n"]
+        for i in range(per_file):
+            title = " ".join(rng.sample(EN_WORDS, 2) + rng.sample(KO_WORDS, 1))
+            body = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(20, 120)))
+            parts.append(f"## {title} {i}\n{body}\n")
+        (knowledge_dir / name).write_text("\n".join(parts), encoding="utf-8")
+
+
+def synthetic_queries(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed + 1)
+    return [" ".join(rng.sample(EN_WORDS, 2) + rng.sample(KO_WORDS, 2)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="knowledge BM25 검색 벤치마크")
+    parser.add_argument("--project", type=Path, help="실제 프로젝트 디렉토리 (.claude/knowledge 사용)")
+    parser.add_argument("--sections", type=int, default=5000, help="합성 섹션 수 (기본 5000)")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수 (기본 200)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(HOOKS_DIR))
+    import knowledge_search
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.project:
+            knowledge_dir = args.project.expanduser().resolve() / ".claude" / "knowledge"
+            source = str(knowledge_dir)
+        else:
+            knowledge_dir = Path(tmp) / ".claude" / "knowledge"
+            synthetic_knowledge(knowledge_dir, args.sections, args.seed)
+            source = f"synthetic ({args.sections:,} sections, seed={args.seed})"
+
+        start = time.perf_counter()
+        index = knowledge_search.get_index(knowledge_dir)
+        build_ms = (time.perf_counter() - start) * 1000
+        if not index:
+            print(f"Error: no knowledge files in {knowledge_dir}", file=sys.stderr)
+            sys.exit(1)
+
+        # 새 프로세스의 첫 조회와 같은 조건: 메모리 캐시 없이 search.json 로드 + 검사
+        search_file = knowledge_search.index_dir(knowledge_dir) / knowledge_search.SEARCH_FILE
+        load_samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            knowledge_search._load_search(search_file.parent)
+            load_samples.append((time.perf_counter() - start) * 1000)
+
+        queries = synthetic_queries(args.queries, args.seed)
+        # 데몬 캐시가 없는 새 프로세스의 첫 조회와 같은 조건
+        cold_samples = []
+        for query in queries[:5]:
+            knowledge_search._loaded.clear()
+            start = time.perf_counter()
+            knowledge_search.search(knowledge_dir, query)
+            cold_samples.append((time.perf_counter() - start) * 1000)
+        # 데몬 부모가 warm()해 둔 색인을 fork된 자식이 쓰는 조건 (get_index는 stat만)
+        knowledge_search.warm(knowledge_dir)
+        warm_samples = []
+        for query in queries:
+            start = time.perf_counter()
+            knowledge_search.search(knowledge_dir, query)
+            warm_samples.append((time.perf_counter() - start) * 1000)
+        warm_samples.sort()
+
+        rank_samples = []
+        for query in queries:
+            start = time.perf_counter()
+            knowledge_search.rank(index, query)
+            rank_samples.append((time.perf_counter() - start) * 1000)
+        rank_samples.sort()
+        index_kb = search_file.stat().st_size / 1024
+
+    print(f"knowledge:  {source}")
+    print(f"sections:   {len(index['norms']):,}")
+    print(f"terms:      {len(index['postings']):,}")
+    print(f"index size: {index_kb:,.0f} KB")
+    print()
+    print(f"build:      {build_ms:8.1f} ms (cold, all files)")
+    print(f"load:       {statistics.median(load_samples):8.2f} ms (search.json + postings mmap, median of 5)")
+    print(f"cold query: {statistics.median(cold_samples):8.2f} ms (load + rank + refs + sections, median of 5)")
+    print(f"warm query: {warm_samples[len(warm_samples) // 2]:8.2f} ms p50, "
+          f"{warm_samples[int(len(warm_samples) * 0.95) - 1]:.2f} ms p95 (daemon warm: stat + rank + sections)")
+    print(f"rank p50:   {rank_samples[len(rank_samples) // 2]:8.2f} ms")
+    print(f"rank p95:   {rank_samples[int(len(rank_samples) * 0.95) - 1]:8.2f} ms")
+    print(f"rank max:   {rank_samples[-1]:8.2f} ms")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Pre-Bash Benchmark - pre-bash.py 위험 명령 분류 마이크로 벤치마크
+
+10k개 셸 명령 코퍼스에 대해 명령당 분류 비용을 측정합니다.
+
+비교 대상:
+- sequential: 기존 방식 (CRITICAL → HIGH → MEDIUM 목록을 순서대로 re.search)
+- combined:   단일 결합 정규식 (classify_command, 한 번의 스캔)
+
+두 방식의 분류 결과가 모든 명령에서 같은지도 함께 검증합니다.
+
+사용법:
+    python bench-pre-bash.py                         # 합성 코퍼스 10k
+    python bench-pre-bash.py --corpus ~/.bash_history
+    python bench-pre-bash.py --count 50000 --repeat 5
+"""
+
+import argparse
+import importlib.util
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.resolve()
+HOOKS_DIR = REPO_ROOT / "claude" / "hooks"
+
+
+# 일상적인 개발 명령 템플릿 (합성 코퍼스)
+SAFE_TEMPLATES = [
+    "git status", "git diff {file}", "git log --oneline -n {n}", "git add {file}",
+    "git commit -m \"fix {word}\"", "git checkout -b feature/{word}", "git pull --rebase",
+    "git push origin feature/{word}", "git stash pop", "git rebase main",
+    "ls -la {dir}", "cat {file}", "head -n {n} {file}", "tail -f logs/{word}.log",
+    "grep -rn \"{word}\" {dir}", "find {dir} -name \"*.py\"", "wc -l {file}",
+    "npm install", "npm run build", "npm test -- {word}", "pnpm lint", "npx tsc --noEmit",
+    "uv sync", "uv run pytest -q tests/test_{word}.py", "pytest -x -k {word}",
+    "python -m {word}", "python3 scripts/{word}.py --verbose", "ruff check {dir}",
+    "cargo build --release", "cargo test {word}", "go test ./...",
+    "docker compose up -d", "docker ps", "docker logs {word} --tail {n}",
+    "curl -s http://localhost:{port}/health", "mkdir -p {dir}/{word}", "cp {file} {dir}/",
+    "mv {file} {dir}/{word}.bak", "rm {file}", "rm -rf {dir}/__pycache__",
+    "rm -rf node_modules", "rm -rf build dist", "echo \"{word}\" >> notes.md",
+    "make {word}", "kubectl get pods -n {word}", "jq '.{word}' package.json",
+]
+
+# 위험/주의 명령 템플릿 (코퍼스의 일부로 섞음)
+RISKY_TEMPLATES = [
+    "rm -rf /", "rm -rf ~/{word}", "rm -rf $HOME/{dir}", "sudo rm -rf /home/{word}",
+    "dd if=/dev/zero of=/dev/sda bs=1M", "mkfs.ext4 /dev/sdb1", "chmod -R 777 /var",
+    "git push origin --force main", "git push -u origin --force master",
+    "git reset --hard origin/main", "psql -c 'drop database {word}'",
+    "mysql -e 'DROP TABLE {word}'", "rm -rf ./{dir}", "git push --force",
+    "npm publish --access public", "pip install --upgrade {word}",
+]
+
+WORDS = ["auth", "parser", "cache", "api", "session", "router", "config", "utils", "worker", "db"]
+DIRS = ["src", "tests", "lib", "app", "docs", "scripts", "packages/core", "services/api"]
+FILES = ["README.md", "src/main.py", "package.json", "app/models.py", "lib/index.ts", "Cargo.toml"]
+
+
+def synthetic_corpus(count: int, risky_ratio: float, seed: int) -> list[str]:
+    """재현 가능한 합성 명령 코퍼스"""
+    rng = random.Random(seed)
+    commands = []
+    for _ in range(count):
+        templates = RISKY_TEMPLATES if rng.random() < risky_ratio else SAFE_TEMPLATES
+        command = rng.choice(templates).format(
+            file=rng.choice(FILES), dir=rng.choice(DIRS), word=rng.choice(WORDS),
+            n=rng.randint(1, 200), port=rng.choice([3000, 5173, 8000, 8080]),
+        )
+        # 일부는 파이프/체인으로 길게
+        if rng.random() < 0.2:
+            command += " && " + rng.choice(SAFE_TEMPLATES).format(
+                file=rng.choice(FILES), dir=rng.choice(DIRS), word=rng.choice(WORDS),
+                n=rng.randint(1, 200), port=8000,
+            )
+        commands.append(command)
+    return commands
+
+
+def load_corpus(path: Path, count: int) -> list[str]:
+    """셸 히스토리 파일 로드 (zsh 확장 히스토리 형식 지원)"""
+    commands = []
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        if line.startswith(": ") and ";" in line:
+            line = line.split(";", 1)[1]  # ": 1700000000:0;command"
+        line = line.strip()
+        if line:
+            commands.append(line)
+    if not commands:
+        return commands
+    # count에 맞춰 반복
+    return [commands[i % len(commands)] for i in range(count)]
+
+
+def load_pre_bash():
+    """claude/hooks/pre-bash.py 모듈 로드"""
+    sys.path.insert(0, str(HOOKS_DIR))
+    spec = importlib.util.spec_from_file_location("pre_bash", HOOKS_DIR / "pre-bash.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sequential_classifier(module):
+    """기존 방식: 수준별 목록을 순서대로 re.search"""
+    levels = [
+        ("CRITICAL", module.CRITICAL_PATTERNS),
+        ("HIGH", module.HIGH_PATTERNS),
+        ("MEDIUM", module.MEDIUM_PATTERNS),
+    ]
+
+    def classify(command: str):
+        for level, patterns in levels:
+            for pattern, description in patterns:
+                if re.search(pattern, command, re.IGNORECASE):
+                    return level, description
+        return None
+
+    return classify
+
+
+def measure(classify, commands: list[str], repeat: int) -> list[float]:
+    """명령당 평균 비용(µs)을 repeat회 측정"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for command in commands:
+            classify(command)
+        samples.append((time.perf_counter() - start) / len(commands) * 1e6)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pre-bash 위험 명령 분류 벤치마크")
+    parser.add_argument("--corpus", type=Path, help="셸 명령 파일 (한 줄에 하나, 예: ~/.bash_history)")
+    parser.add_argument("--count", type=int, default=10_000, help="명령 수 (기본 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수 (기본 5)")
+    parser.add_argument("--risky-ratio", type=float, default=0.05, help="합성 코퍼스의 위험 명령 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.corpus:
+        commands = load_corpus(args.corpus.expanduser(), args.count)
+        source = str(args.corpus)
+    else:
+        commands = synthetic_corpus(args.count, args.risky_ratio, args.seed)
+        source = f"synthetic (seed={args.seed}, risky={args.risky_ratio:.0%})"
+
+    if not commands:
+        print("Error: empty corpus", file=sys.stderr)
+        sys.exit(1)
+
+    module = load_pre_bash()
+    sequential = sequential_classifier(module)
+    combined = module.classify_command
+
+    # 분류 결과 동일성 검증 (워밍업 겸)
+    mismatches = [c for c in commands if sequential(c) != combined(c)]
+    flagged = sum(1 for c in commands if combined(c))
+
+    seq_samples = measure(sequential, commands, args.repeat)
+    comb_samples = measure(combined, commands, args.repeat)
+
+    seq_us = statistics.median(seq_samples)
+    comb_us = statistics.median(comb_samples)
+
+    print(f"corpus:     {source}")
+    print(f"commands:   {len(commands):,} ({flagged:,} flagged)")
+    print(f"repeat:     {args.repeat}")
+    print()
+    print(f"{'matcher':<12} {'µs/command':>12} {'min':>8} {'max':>8}")
+    print(f"{'sequential':<12} {seq_us:>12.2f} {min(seq_samples):>8.2f} {max(seq_samples):>8.2f}")
+    print(f"{'combined':<12} {comb_us:>12.2f} {min(comb_samples):>8.2f} {max(comb_samples):>8.2f}")
+    print()
+    print(f"speedup:    {seq_us / comb_us:.2f}x")
+    print(f"mismatches: {len(mismatches)}")
+    for command in mismatches[:10]:
+        print(f"  {command!r}: sequential={sequential(command)} combined={combined(command)}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Loop Replay - 루프 hook 완료/취소 유지 재생 검사
+
+transcript가 한 턴씩 늘어나는 Stop 이벤트를 unified-loop/ralph-loop에 재생하며,
+완료/취소 신호가 감지 창(signal_window.py) 밖으로 밀려난 뒤의 Stop에서도 루프가
+다시 시작되지 않는지 확인합니다.
+
+시나리오:
+- unified cancel / complete: todo.md에 미완료 항목이 남아 있어도 이후 Stop은 조용해야 함
+- unified restart: 같은 상태에서 새 세션(session_id)이면 반복 1부터 다시 시작
+- ralph cancel / complete: /ralph-loop가 ralph-status.json을 다시 쓰기 전까지 진행하지 않음
+
+매 시나리오마다 임시 프로젝트(.claude/)를 만들어 실제 프로젝트를 건드리지 않습니다.
+
+사용법:
+    python replay-loops.py            # 모든 시나리오, 실패 시 종료 코드 1
+    python replay-loops.py -v         # Stop마다 출력 표시
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent.resolve()
+HOOKS_DIR = REPO_ROOT / "claude" / "hooks"
+
+TODO = "# Todo\n\n- [ ] 첫 작업\n- [ ] 둘째 작업\n"
+
+# (이름, hook, 준비할 파일, [(assistant 출력, 세션, 출력에 있어야 할 문자열 또는 None=출력 없음)])
+SCENARIOS = [
+    ("unified cancel", "unified-loop", {"todo.md": TODO}, [
+        ("첫 작업 진행 중", "s1", "Loop 1/15"),
+        ("그만합니다 LOOP_CANCEL", "s1", "Loop 취소됨"),
+        ("다른 질문에 답함", "s1", None),
+        ("또 다른 답", "s1", None),
+    ]),
+    ("unified complete", "unified-loop", {"todo.md": TODO}, [
+        ("첫 작업 진행 중", "s1", "Loop 1/15"),
+        ("모두 끝냄 LOOP_COMPLETE", "s1", "LOOP_COMPLETE |"),
+        ("다른 질문에 답함", "s1", None),
+        ("또 다른 답", "s1", None),
+    ]),
+    ("unified restart", "unified-loop", {"todo.md": TODO}, [
+        ("첫 작업 진행 중", "s1", "Loop 1/15"),
+        ("LOOP_CANCEL", "s1", "Loop 취소됨"),
+        ("다른 답", "s1", None),
+        ("새 세션 시작", "s2", "Loop 1/15"),
+    ]),
+    ("ralph cancel", "ralph-loop", {"todo.md": TODO, "ralph-status.json": json.dumps({"status": "running"})}, [
+        ("첫 작업 진행 중", "s1", "Iteration 1/10"),
+        ("RALPH_CANCEL", "s1", "CANCELLED"),
+        ("다른 질문에 답함", "s1", None),
+        ("또 다른 답", "s1", None),
+    ]),
+    ("ralph complete", "ralph-loop", {"todo.md": TODO, "ralph-status.json": json.dumps({"status": "running"})}, [
+        ("첫 작업 진행 중", "s1", "Iteration 1/10"),
+        ("RALPH_COMPLETE", "s1", "COMPLETE!"),
+        ("다른 질문에 답함", "s1", None),
+        ("또 다른 답", "s1", None),
+    ]),
+]
+
+
+def headline(context: str) -> str:
+    """메시지의 첫 내용 줄 (상자 테두리 줄은 건너뜀)"""
+    return next((line.strip(" │") for line in context.splitlines() if any(c.isalnum() for c in line)), "(없음)")
+
+
+def replay(name: str, hook: str, files: dict, turns: list, verbose: bool) -> list[str]:
+    """시나리오 하나 재생 → 실패 설명 목록"""
+    from hook_runtime import run_hooks
+
+    failures = []
+    with tempfile.TemporaryDirectory(prefix="replay-loops-") as project:
+        claude_dir = Path(project) / ".claude"
+        claude_dir.mkdir()
+        for file_name, content in files.items():
+            (claude_dir / file_name).write_text(content, encoding="utf-8")
+        os.environ["CLAUDE_PROJECT_DIR"] = project
+
+        transcript = ""
+        for number, (said, session, expected) in enumerate(turns, 1):
+            transcript += f"user: 계속\nassistant: {said}\n"
+            event = {"hook_event_name": "Stop", "session_id": session, "transcript": transcript}
+            output = run_hooks([hook], json.dumps(event, ensure_ascii=False), check_preconditions=False).stdout
+            context = json.loads(output).get("additionalContext", "") if output.strip() else ""
+            if verbose:
+                print(f"  [{name} #{number}] {headline(context)}")
+            if expected is None and context:
+                failures.append(f"{name} Stop {number}: 출력이 없어야 함, 실제: {headline(context)}")
+            elif expected is not None and expected not in context:
+                failures.append(f"{name} Stop {number}: '{expected}' 없음, 실제: {headline(context)}")
+    return failures
+
+
+def main():
+    verbose = "-v" in sys.argv[1:]
+    sys.path.insert(0, str(HOOKS_DIR))
+    os.environ["CLAUDE_HOOK_LATENCY"] = "0"
+
+    failures = []
+    for name, hook, files, turns in SCENARIOS:
+        result = replay(name, hook, files, turns, verbose)
+        print(f"{'✓' if not result else '✗'} {name}")
+        failures.extend(result)
+    for failure in failures:
+        print(f"  {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,11 @@ Claude Context Engineering - Cross-Platform Setup Script (Python)
 Usage:
     python scripts/setup.py install    # Full installation
     python scripts/setup.py hooks      # Install hooks only
+    python scripts/setup.py bundle     # Rebuild hook rule bundle
     python scripts/setup.py config     # Configure settings.json
     python scripts/setup.py project    # Initialize current project
     python scripts/setup.py doctor     # Verify installation
+    python scripts/setup.py doctor --hook-latency  # Hook p50/p95/p99 vs timeouts
     python scripts/setup.py uninstall  # Remove installation
 """
 
@@ -37,6 +39,14 @@ SETTINGS_FILE = CLAUDE_DIR / "settings.json"
 SCRIPT_DIR = Path(__file__).parent.resolve()
 REPO_ROOT = SCRIPT_DIR.parent
 
+# Per-project hook timing ledger written by hook-client.py / hook_runtime.py
+HOOK_LATENCY_LEDGER = Path(".claude") / "hook-latency.jsonl"
+
+DEFAULT_HOOK_TIMEOUT = 60  # seconds, Claude Code default when "timeout" is omitted
+
+# Declarative hook preconditions evaluated before a hook is launched
+PRECONDITIONS_FILE = REPO_ROOT / "claude" / "hooks" / "preconditions.json"
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # COLORS
@@ -160,12 +170,60 @@ def hook_path(name: str) -> str:
     return f"~/.claude/hooks/{name}.py"
 
 
+def hook_command(*names: str, python_cmd: str = "python") -> str:
+    """Generate hook command routed through the hook daemon client
+
+    Several names run as one fan-out invocation (single process, merged output).
+    """
+    return f"{python_cmd} {hook_path('hook-client')} {' '.join(names)}"
+
+
+def command_hook_names(command: str) -> list[str]:
+    """Hook names passed to hook-client.py / run-hook.py in a settings.json command"""
+    tokens = command.replace('"', " ").split()
+    runner = next((i for i, t in enumerate(tokens)
+                   if Path(t).stem in ("hook-client", "run-hook")), None)
+    if runner is None:
+        return []
+    return [Path(t).stem if t.endswith(".py") else t for t in tokens[runner + 1:]]
+
+
+def precondition_guard(names: list[str]) -> str:
+    """Shell test that skips the command when no hook's required files exist
+
+    Only hooks whose preconditions include top-level file checks qualify; if any
+    hook in the command has none, the command always starts. Other conditions
+    (input fields, state files) are evaluated by hook-client.py.
+    """
+    if IS_WINDOWS or not names:
+        return ""
+    try:
+        manifest = json.loads(PRECONDITIONS_FILE.read_text(encoding="utf-8")).get("hooks", {})
+    except (OSError, ValueError, AttributeError):
+        return ""
+
+    clauses = []
+    for name in names:
+        files = [c["file"] for c in manifest.get(name, []) if isinstance(c, dict) and "file" in c]
+        if not files:
+            return ""
+        tests = " && ".join(f'[ -f "${{CLAUDE_PROJECT_DIR:-.}}/{f}" ]' for f in files)
+        clauses.append(tests if len(files) == 1 else f"{{ {tests}; }}")
+
+    unique = list(dict.fromkeys(clauses))
+    return " || ".join(unique) + " || exit 0; "
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # HOOKS CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
 
 def generate_hooks_config() -> dict:
-    """Generate hooks configuration for settings.json"""
+    """Generate hooks configuration for settings.json
+
+    Commands whose hooks all require a file (preconditions.json) get a shell
+    guard so the interpreter never starts when the file is missing.
+    """
     python_cmd = "python"
 
     def env_cmd(var: str, value: str, cmd: str) -> str:
@@ -173,19 +231,19 @@ def generate_hooks_config() -> dict:
             return f"set {var}={value} && {cmd}"
         return f"{var}={value} {cmd}"
 
-    return {
+    config = {
         "SessionStart": [
             {
                 "matcher": "",
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('session-recovery')}",
+                        "command": hook_command('session-recovery', python_cmd=python_cmd),
                         "timeout": 5
                     },
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('session-start')}",
+                        "command": hook_command('session-start', python_cmd=python_cmd),
                         "timeout": 10
                     }
                 ]
@@ -197,12 +255,12 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('magic-keywords')}",
+                        "command": hook_command('magic-keywords', python_cmd=python_cmd),
                         "timeout": 3
                     },
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('user-prompt-submit')}",
+                        "command": hook_command('user-prompt-submit', python_cmd=python_cmd),
                         "timeout": 5
                     }
                 ]
@@ -214,7 +272,7 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('pre-bash')}"
+                        "command": hook_command('pre-bash', python_cmd=python_cmd)
                     }
                 ]
             },
@@ -223,7 +281,7 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('pre-edit')}"
+                        "command": hook_command('pre-edit', python_cmd=python_cmd)
                     }
                 ]
             }
@@ -234,7 +292,7 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('post-bash')}"
+                        "command": hook_command('post-bash', python_cmd=python_cmd)
                     }
                 ]
             },
@@ -243,7 +301,7 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('post-edit')}"
+                        "command": hook_command('post-edit', python_cmd=python_cmd)
                     }
                 ]
             }
@@ -252,18 +310,13 @@ def generate_hooks_config() -> dict:
             {
                 "matcher": "",
                 "hooks": [
-                    {
-                        "type": "command",
-                        "command": f"{python_cmd} {hook_path('subagent-stop')}",
-                        "timeout": 5
-                    },
                     {
                         "type": "command",
                         "command": env_cmd(
                             "CLAUDE_HOOK_EVENT", "SubagentStop",
-                            f"{python_cmd} {hook_path('continuation-enforcer')}"
+                            hook_command('subagent-stop', 'continuation-enforcer', python_cmd=python_cmd)
                         ),
-                        "timeout": 5
+                        "timeout": 10
                     }
                 ]
             }
@@ -274,13 +327,8 @@ def generate_hooks_config() -> dict:
                 "hooks": [
                     {
                         "type": "command",
-                        "command": f"{python_cmd} {hook_path('context-window-monitor')}",
-                        "timeout": 5
-                    },
-                    {
-                        "type": "command",
-                        "command": f"{python_cmd} {hook_path('pre-compact')}",
-                        "timeout": 10
+                        "command": hook_command('context-window-monitor', 'pre-compact', python_cmd=python_cmd),
+                        "timeout": 15
                     }
                 ]
             }
@@ -293,19 +341,21 @@ def generate_hooks_config() -> dict:
                         "type": "command",
                         "command": env_cmd(
                             "CLAUDE_HOOK_EVENT", "Stop",
-                            f"{python_cmd} {hook_path('continuation-enforcer')}"
+                            hook_command('continuation-enforcer', 'stop', python_cmd=python_cmd)
                         ),
-                        "timeout": 5
-                    },
-                    {
-                        "type": "command",
-                        "command": f"{python_cmd} {hook_path('stop')}"
+                        "timeout": 15
                     }
                 ]
             }
         ]
     }
 
+    for matchers in config.values():
+        for matcher in matchers:
+            for hook in matcher["hooks"]:
+                hook["command"] = precondition_guard(command_hook_names(hook["command"])) + hook["command"]
+    return config
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # COMMANDS
@@ -354,6 +404,31 @@ def output_context(context):
     hook_count = len(list(HOOKS_DIR.glob("*.py")))
     log_success(f"Copied {hook_count} hooks to {HOOKS_DIR}")
 
+    build_rule_bundle()
+
+    return True
+
+
+def build_rule_bundle() -> bool:
+    """Precompile hook rule tables into ~/.claude/hooks/.rule-bundle.pickle"""
+    builder = HOOKS_DIR / "rule_bundle.py"
+    if not builder.exists():
+        log_warning("rule_bundle.py not installed. Skipping rule bundle.")
+        return False
+
+    python_cmd = get_python_command() or sys.executable
+    result = subprocess.run(
+        [python_cmd, str(builder)],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        log_warning("Rule bundle build failed (hooks will compile rules on demand)")
+        if result.stderr.strip():
+            log(result.stderr.strip(), Colors.YELLOW)
+        return False
+
+    log_success("Built hook rule bundle")
     return True
 
 
@@ -589,6 +664,85 @@ def run_doctor() -> bool:
     return True
 
 
+def configured_hook_timeouts() -> dict:
+    """Map each hook command ("name [name ...]") to (event, timeout seconds)"""
+    settings = read_json(SETTINGS_FILE) if SETTINGS_FILE.exists() else None
+    hooks_config = (settings or {}).get("hooks") or generate_hooks_config()
+
+    timeouts = {}
+    for event, matchers in hooks_config.items():
+        for matcher in matchers:
+            for hook in matcher.get("hooks", []):
+                names = command_hook_names(hook.get("command", ""))
+                if names:
+                    timeouts[" ".join(names)] = (event, hook.get("timeout", DEFAULT_HOOK_TIMEOUT))
+    return timeouts
+
+
+def report_hook_latency(project_dir: Path) -> bool:
+    """Print p50/p95/p99 per hook and per command against settings.json timeouts
+
+    Returns False when a command has exceeded its configured timeout.
+    """
+    # Ledger reader and percentile are shared with the hooks (claude/hooks/utils.py);
+    # imported here so install/uninstall never load the hooks' modules
+    sys.path.insert(0, str(REPO_ROOT / "claude" / "hooks"))
+    from utils import percentile, read_hook_latency
+
+    log("\n⏱  Hook latency report", Colors.BOLD)
+    entries = read_hook_latency(project_dir / ".claude")
+    if not entries:
+        log_warning(f"No hook timing records in {project_dir / HOOK_LATENCY_LEDGER}")
+        log_info("Records are written while hooks run in a project with a .claude/ directory.")
+        return True
+
+    log_info(f"{len(entries)} records from {project_dir / HOOK_LATENCY_LEDGER}")
+
+    def rows(key: str) -> dict:
+        grouped = {}
+        for entry in entries:
+            if entry.get(key):
+                grouped.setdefault(entry[key], []).append(float(entry["ms"]))
+        return grouped
+
+    header = f"{'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+
+    def stats(values: list[float]) -> str:
+        return (f"{len(values):>6} {percentile(values, 50):>9.1f} {percentile(values, 95):>9.1f} "
+                f"{percentile(values, 99):>9.1f} {max(values):>9.1f}")
+
+    per_hook = rows("hook")
+    if per_hook:
+        log("\nPer hook (in-process run time, ms):", Colors.BOLD)
+        log(f"{'hook':<28} {header}")
+        for hook, values in sorted(per_hook.items(), key=lambda item: -percentile(item[1], 95)):
+            log(f"{hook:<28} {stats(values)}")
+
+    ok = True
+    per_command = rows("command")
+    if per_command:
+        timeouts = configured_hook_timeouts()
+        log("\nPer command (wall time incl. daemon round trip, ms):", Colors.BOLD)
+        log(f"{'command':<44} {header} {'timeout':>8}")
+        for command, values in sorted(per_command.items(), key=lambda item: -percentile(item[1], 95)):
+            event, timeout = timeouts.get(command, ("", DEFAULT_HOOK_TIMEOUT))
+            limit_ms = timeout * 1000
+            color = ""
+            if max(values) >= limit_ms:
+                color, ok = Colors.RED, False
+            elif percentile(values, 99) >= limit_ms / 2:
+                color = Colors.YELLOW
+            label = f"{command} ({event})" if event else command
+            log(f"{label[:44]:<44} {stats(values)} {timeout:>7}s", color)
+
+    log("─" * 50)
+    if ok:
+        log_success("No hook command exceeded its timeout")
+    else:
+        log_error("Some hook commands exceeded their settings.json timeout")
+    return ok
+
+
 def uninstall() -> bool:
     """Remove hooks configuration"""
     log("\n🗑️  Uninstalling...", Colors.BOLD)
@@ -707,10 +861,12 @@ def print_help():
   install     Full installation (hooks + commands + config)
   update      Update hooks and commands from repository
   hooks       Install hooks only
+  bundle      Rebuild precompiled hook rule bundle
   commands    Install commands only
   config      Configure settings.json only
   project     Initialize current directory as Claude project
   doctor      Verify installation and diagnose issues
+              (--hook-latency: hook p50/p95/p99 vs settings.json timeouts)
   uninstall   Remove hooks configuration
 
 {Colors.BOLD}Examples:{Colors.RESET}
@@ -735,6 +891,8 @@ def main():
             update()
         elif command == "hooks":
             install_hooks()
+        elif command == "bundle":
+            build_rule_bundle()
         elif command == "commands":
             install_commands()
         elif command == "config":
@@ -742,7 +900,11 @@ def main():
         elif command in ("project", "init"):
             init_project()
         elif command in ("doctor", "check"):
-            run_doctor()
+            if "--hook-latency" in args:
+                if not report_hook_latency(Path.cwd()):
+                    sys.exit(1)
+            else:
+                run_doctor()
         elif command in ("uninstall", "remove"):
             uninstall()
         else: